@@ -49,109 +49,25 @@ ENHANCED_MEDICAL_SAFETY_PROMPT = """
 **违反以上任何一条都是严重的医疗安全事故！**
 """
 
+# AI回复后处理规则表与引擎（规则在导入时一次性编译，见 core/ai_response/response_sanitizer.py）
+from core.ai_response.response_sanitizer import (
+    STRICT_TONGUE_PULSE_PATTERNS,
+    generate_enhanced_prescription_format,
+    get_response_sanitizer
+)
+
+
 def check_symptom_fabrication(ai_response: str, patient_message: str) -> str:
     """
     检查AI是否编造了患者未明确描述的症状细节
     返回编造的症状描述，如果没有编造则返回空字符串
     """
-    # 常见的症状编造模式
-    fabricated_symptoms = [
-        # 便秘相关编造
-        (r'大便干结.*栗', "大便干结如栗"),
-        (r'数日一行', "数日一行"),
-        (r'大便.*干.*硬', "大便干硬"),
-        (r'大便干结', "大便干结"),  # 新增：患者只说便秘，AI添加具体描述
-        (r'排便困难', "排便困难"),  # 新增：患者未描述的排便情况
-        
-        # 消化系统编造
-        (r'腹胀.*嗳气', "腹胀嗳气"),
-        (r'腹胀不舒', "腹胀不舒"),
-        (r'嗳气频频', "嗳气频频"),
-        (r'食欲不佳', "食欲不佳"),
-        (r'食欲不振', "食欲不振"),  # 新增：患者只说挑食，AI编造食欲状态
-        
-        # 体征编造
-        (r'面色[苍白萎黄]', "面色苍白/萎黄"),
-        (r'精神疲倦', "精神疲倦"),
-        (r'精神.*不振', "精神不振"),
-        (r'神疲乏力', "神疲乏力"),
-        (r'精神倦怠', "精神倦怠"),  # 新增：患者未描述的精神状态
-        
-        # 时间和程度编造
-        (r'.*已久', "持续时间编造(已久)"),
-        (r'.*数日', "时间编造(数日)"),
-        (r'.*不舒', "程度编造(不舒)"),
-    ]
-    
-    patient_keywords = set(patient_message.lower().split())
-    found_fabrications = []
-    
-    for pattern, description in fabricated_symptoms:
-        if re.search(pattern, ai_response):
-            # 检查患者消息中是否包含相关关键词
-            pattern_keywords = re.findall(r'[\u4e00-\u9fff]+', pattern.replace('.*', '').replace('[', '').replace(']', ''))
-            
-            # 如果AI回复中的症状描述在患者消息中没有对应的关键词，则认为是编造
-            if not any(keyword in patient_message for keyword in pattern_keywords if len(keyword) > 1):
-                found_fabrications.append(description)
-    
-    return ", ".join(found_fabrications) if found_fabrications else ""
-
-
-# 严格的望诊切诊编造检测
-STRICT_TONGUE_PULSE_PATTERNS = [
-    # 望诊编造模式 - 更严格
-    (r'面色[^，。]*?淡白', "面色淡白描述"),
-    (r'面色[^，。]*?略红', "面色略红描述"),
-    (r'面色[^，。]*?苍白', "面色苍白描述"),
-    (r'面色[^，。]*?潮红', "面色潮红描述"),
-    (r'舌质[^，。]*?淡红', "舌质淡红描述"),
-    (r'舌质[^，。]*?红', "舌质红描述"),
-    (r'舌质[^，。]*?暗', "舌质暗描述"),
-    (r'苔[^，。]*?薄白', "苔薄白描述"),
-    (r'苔[^，。]*?薄黄', "苔薄黄描述"),
-    (r'苔[^，。]*?厚', "苔厚描述"),
-    (r'舌边[^，。]*?齿痕', "舌边齿痕描述"),
-    (r'舌尖[^，。]*?红', "舌尖红描述"),
-    
-    # 切诊编造模式 - 更严格  
-    (r'脉[^，。]*?浮', "脉浮描述"),
-    (r'脉[^，。]*?沉', "脉沉描述"),
-    (r'脉[^，。]*?缓', "脉缓描述"),
-    (r'脉[^，。]*?数', "脉数描述"),
-    (r'脉[^，。]*?细', "脉细描述"),
-    (r'脉[^，。]*?弱', "脉弱描述"),
-    (r'脉[^，。]*?滑', "脉滑描述"),
-    (r'脉[^，。]*?弦', "脉弦描述"),
-    (r'脉象[^，。]*?浮缓', "脉象浮缓描述"),
-    (r'脉象[^，。]*?细弱', "脉象细弱描述"),
-    (r'脉象[^，。]*?沉细', "脉象沉细描述"),
-    
-    # 组合编造模式
-    (r'提示.*?不足', "提示证候描述"),
-    (r'说明.*?未', "说明病机描述"),
-]
+    return get_response_sanitizer().check_symptom_fabrication(ai_response, patient_message)
+
 
 def detect_fabricated_examination(text: str, has_actual_examination: bool = False) -> list:
     """检测编造的望诊切诊内容"""
-    if has_actual_examination:
-        return []  # 如果有实际检查，则不检测
-    
-    fabricated_items = []
-    
-    # 检测望诊内容
-    if "望诊" in text or "面色" in text or "舌" in text:
-        for pattern, description in STRICT_TONGUE_PULSE_PATTERNS:
-            if re.search(pattern, text):
-                fabricated_items.append(f"编造{description}")
-    
-    # 检测切诊内容  
-    if "切诊" in text or "脉" in text:
-        for pattern, description in STRICT_TONGUE_PULSE_PATTERNS:
-            if "脉" in pattern and re.search(pattern, text):
-                fabricated_items.append(f"编造{description}")
-    
-    return fabricated_items
+    return get_response_sanitizer().detect_fabricated_examination(text, has_actual_examination)
 
 
 # 综合医疗安全检查函数 (舌象、脉象、症状编造)
@@ -167,689 +83,42 @@ def check_medical_safety(ai_response: str, has_tongue_image: bool, patient_descr
     4. 患者自述：允许AI引用患者明确描述的内容
     5. 【新增】望诊切诊严格检测：绝不允许编造任何体征信息
     """
-    
-    # 1. 严格检测编造的望诊切诊内容
-    has_actual_examination = has_tongue_image and image_analysis_successful
-    fabricated_examinations = detect_fabricated_examination(ai_response, has_actual_examination)
-    
-    if fabricated_examinations:
-        error_msg = f"检测到编造的体征信息: {', '.join(fabricated_examinations)}"
-        return False, error_msg
-    
-    # 2. 检查症状编造（无论舌象分析是否成功都必须检查）
-    if original_patient_message:
-        symptom_fabrication = check_symptom_fabrication(ai_response, original_patient_message)
-        if symptom_fabrication:
-            return False, f"检测到症状编造: {symptom_fabrication}"
-
-    # 3. 原有的检查逻辑：只有图片分析真正成功时才允许舌象描述
-    if has_tongue_image and image_analysis_successful:
-        return True, ""
-
-    # 4. 检查是否有AI编造的舌象和脉象描述
-    # 第二步：检查是否有AI编造的舌象和脉象描述 - 增强检测模式
-    dangerous_patterns = [
-        # 舌象相关 - 基础模式
-        r'吾观其舌.*[淡红紫暗]',           # "吾观其舌淡红"等明显编造
-        r'舌质[淡红紫暗].*苔[薄厚][白黄腻]',    # 完整舌象描述
-        r'望诊所见.*舌苔.*[薄厚][白黄腻]',     # 望诊中的舌象
-        r'舌[质色][淡红紫暗].*[，,].*苔',      # 舌质+苔象组合
-        r'舌边.*齿痕.*苔',                    # 舌边齿痕+苔象
-        r'观其舌象.*[淡红紫暗]',              # "观其舌象"
-        r'舌诊.*[淡红紫暗].*苔',              # 舌诊相关
-        r'舌[淡红紫暗][，,].*苔[薄厚少][白黄腻]',  # "舌淡红，苔薄白"格式
-        r'<望诊所见>.*舌.*[淡红紫暗].*苔.*</望诊所见>', # XML格式中的望诊
-        r'舌.*[淡红紫暗].*或.*苔',            # "舌淡红或少苔"等
-        r'苔[薄厚][白黄腻]或[少无]苔',         # "苔薄白或少苔"等
-        
-        # 舌象相关 - 新增强化模式 (针对用户反馈的问题)
-        r'舌象[：:].*舌.*[红白黄]',            # "舌象：舌边尖红"等模式
-        r'舌边[尖]?红',                       # "舌边红"、"舌边尖红"
-        r'苔薄[白黄]或薄[黄白]',               # "苔薄白或薄黄"
-        r'舌.*红.*[，,].*苔.*[白黄]',         # "舌边尖红，苔薄白"
-        r'舌边.*红.*苔',                      # 舌边红+苔象组合
-        r'舌.*尖.*红',                        # "舌尖红"等
-        r'舌.*[边尖].*红.*苔',                # 舌边尖红+苔象
-        r'舌.*苔.*[薄厚].*[白黄腻]',          # 任何舌苔具体描述
-        r'舌苔.*[薄厚].*[白黄腻]',            # 直接的舌苔描述
-        r'舌.*红.*或.*苔',                    # "舌红或苔白"等模式
-        
-        # 脉象相关 - 基础模式
-        r'脉象[濡缓细数弦滑沉浮洪微]',         # "脉象濡缓"等编造
-        r'脉[濡缓细数弦滑沉浮洪微][，,]',      # "脉缓，"等编造  
-        r'脉.*[濡缓细数弦滑沉浮洪微].*[，,]',  # "脉象缓弱，"等
-        r'切诊.*脉.*[濡缓细数弦滑沉浮洪微]',   # 切诊中的脉象
-        r'<望诊所见>.*脉.*[濡缓细数弦滑沉浮洪微].*</望诊所见>', # XML中脉象
-        r'脉诊.*[濡缓细数弦滑沉浮洪微]',       # 脉诊相关
-        r'诊得.*脉.*[濡缓细数弦滑沉浮洪微]',   # "诊得脉象"
-        r'按其脉.*[濡缓细数弦滑沉浮洪微]',     # "按其脉"等
-        
-        # 脉象相关 - 新增强化模式
-        r'脉象[：:].*脉.*[濡缓细数弦滑沉浮洪微]',  # "脉象：脉浮数"等
-        r'脉浮数',                            # 具体的脉象描述
-        r'脉.*浮.*数',                        # "脉浮数"等组合
-        r'脉.*[濡缓细数弦滑沉浮洪微].*[濡缓细数弦滑沉浮洪微]', # 多个脉象特征
-        
-        # 通用医疗信息编造模式
-        r'辨证要点.*舌象',                    # 辨证要点中提到舌象
-        r'辨证要点.*脉象',                    # 辨证要点中提到脉象
-        r'望诊.*舌',                          # 望诊提到舌
-        r'切诊.*脉',                          # 切诊提到脉
-        r'四诊.*舌.*脉',                      # 四诊中同时提到舌脉
-    ]
-    
-    found_dangerous = []
-    for pattern in dangerous_patterns:
-        matches = re.findall(pattern, ai_response)
-        if matches:
-            found_dangerous.extend(matches)
-    
-    # 如果患者自己描述了舌象或脉象，也允许AI引用
-    if patient_described_tongue and found_dangerous:
-        # 检查患者描述中是否包含相关舌象和脉象特征
-        tongue_features = ["淡红", "红", "暗红", "紫", "薄白", "厚白", "黄", "腻", "齿痕"]
-        pulse_features = ["濡", "缓", "细", "数", "弦", "滑", "沉", "浮", "洪", "微", "脉象", "脉搏"]
-        all_features = tongue_features + pulse_features
-        
-        patient_features = [feature for feature in all_features if feature in patient_described_tongue]
-        
-        if patient_features:
-            # 检查AI回复中是否只是引用了患者提到的特征
-            for feature in patient_features:
-                if feature in ai_response:
-                    return True, ""
-    
-    if found_dangerous:
-        error_msg = f"检测到可能的无根据舌象/脉象描述: {found_dangerous}"
-        return False, error_msg
-    
-    return True, ""
+    return get_response_sanitizer().check_medical_safety(
+        ai_response, has_tongue_image, patient_described_tongue, image_analysis_successful, original_patient_message
+    )
 
 # 清理AI回复中的非法医疗信息
 def normalize_prescription_dosage(prescription_text: str) -> str:
     """规范化处方用量，将范围用量转换为确定用量"""
-    import re
-    
-    # 匹配 "药名 数字-数字g" 的模式
-    pattern = r'(\w+)\s+(\d+)-(\d+)g'
-    
-    def replace_range(match):
-        herb_name = match.group(1)
-        min_dose = int(match.group(2))
-        max_dose = int(match.group(3))
-        
-        # 选择中间值或偏向较小值
-        if max_dose - min_dose <= 3:
-            recommended_dose = min_dose + 1  # 偏向较小值
-        else:
-            recommended_dose = (min_dose + max_dose) // 2  # 中间值
-            
-        return f"{herb_name} {recommended_dose}g"
-    
-    # 应用规范化
-    normalized = re.sub(pattern, replace_range, prescription_text)
-    return normalized
+    return get_response_sanitizer().normalize_dosage(prescription_text)
 
 def extract_herbs_from_prescription(prescription_text: str):
-    """从处方文本中提取药材信息 - 支持表格格式"""
-    import re
-    
-    herbs = []
-    lines = prescription_text.split('\n')
-    
-    # 先尝试表格格式提取
-    table_herbs = extract_herbs_from_table(prescription_text)
-    if table_herbs:
-        return table_herbs
-    
-    # 如果不是表格格式，使用原来的逻辑
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-            
-        # 跳过明显的标题行和用法行
-        skip_patterns = [
-            r'^【.*】$', r'^\*\*.*\*\*$', r'^##.*$', r'^###.*$',
-            '用法', '煎服', '制法', '功效', '注意', '服法', '【用法】', '【注意】'
-        ]
-        
-        should_skip = any(re.search(pattern, line, re.IGNORECASE) for pattern in skip_patterns)
-        if should_skip:
-            continue
-        
-        # 多种药材匹配模式 - 修复中文字符匹配
-        herb_patterns = [
-            # 带括号格式: 薄荷（净）6g
-            r'([\u4e00-\u9fff]+(?:（[\u4e00-\u9fff]*）)?)\s*(\d+(?:\.\d+)?)[gGg克]',
-            # 标准格式: 人参 9g
-            r'([\u4e00-\u9fff]+)\s+(\d+(?:\.\d+)?)[gGg克]',
-            # 带冒号: 人参: 9g  
-            r'([\u4e00-\u9fff]+)\s*[:：]\s*(\d+(?:\.\d+)?)[gGg克]',
-            # 紧密格式: 人参9g
-            r'([\u4e00-\u9fff]+)(\d+(?:\.\d+)?)[gGg克]',
-            # 序号格式: 1. 人参 9g
-            r'\d+[\.\)]\s*([\u4e00-\u9fff]+(?:（[\u4e00-\u9fff]*）)?)\s*(\d+(?:\.\d+)?)[gGg克]',
-            # 中文单位: 人参9克
-            r'([\u4e00-\u9fff]+(?:（[\u4e00-\u9fff]*）)?)\s*(\d+(?:\.\d+)?)克',
-        ]
-        
-        for pattern in herb_patterns:
-            matches = re.findall(pattern, line)
-            for match in matches:
-                if len(match) == 2:
-                    herb_name, dosage = match
-                    # 过滤掉明显不是药名的词和重复项
-                    if len(herb_name) >= 2 and herb_name not in ['用法', '注意', '功效', '制法']:
-                        # 避免重复添加同一药材
-                        if (herb_name.strip(), dosage.strip()) not in herbs:
-                            herbs.append((herb_name.strip(), dosage.strip()))
-    
-    return herbs
+    """从处方文本中提取药材信息 - 支持表格格式（共享药材提取引擎）"""
+    from core.prescription.herb_extraction import extract_herb_dosage_pairs
+    return extract_herb_dosage_pairs(prescription_text)
 
 def extract_herbs_from_table(text: str):
     """从markdown表格中提取药材信息"""
-    import re
-    
-    herbs = []
-    lines = text.split('\n')
-    
-    # 检测是否包含表格格式
-    table_indicators = ['药物', '剂量', '|', '---']
-    if not any(indicator in text for indicator in table_indicators):
-        return []
-    
-    # 寻找表格数据行
-    for line in lines:
-        line = line.strip()
-        
-        # 跳过表头和分隔线
-        if not line or '药物' in line or '---' in line or '功效' in line:
-            continue
-            
-        # 匹配表格行格式: | 药名 | 剂量 | 其他 |
-        table_match = re.search(r'\|\s*([一-龟\u4e00-\u9fff]+(?:\（[^）]*\）)?)\s*\|\s*(\d+(?:\.\d+)?)g?\s*\|', line)
-        if table_match:
-            herb_name = table_match.group(1).strip()
-            dosage = table_match.group(2).strip()
-            
-            # 清理药名（去除括号内容如"（制）"）
-            herb_name = re.sub(r'[（\(][^）\)]*[）\)]', '', herb_name).strip()
-            
-            # 过滤有效药名
-            if len(herb_name) >= 2 and herb_name not in ['药物', '剂量', '功效', '说明']:
-                if (herb_name, dosage) not in herbs:
-                    herbs.append((herb_name, dosage))
-    
-    return herbs
+    from core.prescription.herb_extraction import extract_table_herb_dosage_pairs
+    return extract_table_herb_dosage_pairs(text)
 
 def standardize_prescription_format(ai_response: str) -> str:
     """统一处方格式为增强版标准格式 - 支持层次感和视觉效果"""
-    import re
-    
-    # 先清理可能存在的重复标签和格式错误
-    ai_response = re.sub(r'\*\*【处方】\*\*[\s\n]*\*\*【处方】\*\*', '**【处方】**', ai_response)
-    ai_response = re.sub(r'【处方】[\s\n]*【处方】', '【处方】', ai_response)
-    ai_response = re.sub(r'\*\*【处方】\*\*[\s\n]*\*\*\*\*', '**【处方】**', ai_response)
-    
-    # 改进的处方识别正则表达式 - 支持表格格式
-    prescription_patterns = [
-        # 表格格式 - 新增
-        (r'(?:\|\s*药物.*?\|.*?\n.*?---.*?\n)(.*?)(?=\n\n|---|###|$)', '表格格式'),
-        # XML格式
-        (r'<处方[^>]*>(.*?)</处方>', 'XML'),
-        # 标准标记格式 - 改进版
-        (r'【处方】[：:]?\s*(.*?)(?=\n\n|【[^】]*】|\*\*【|$)', '标准标记'),
-        (r'\*\*【处方】\*\*[：:]?\s*(.*?)(?=\n\n|【[^】]*】|\*\*【|$)', '标准标记带星号'),
-        # 其他常见格式
-        (r'(?:处方|方剂|药方)[：:]?\s*(.*?)(?=\n\n|\n【|\n\*\*|$)', '通用'),
-    ]
-    
-    processed = False
-    
-    for pattern, pattern_name in prescription_patterns:
-        if processed:
-            break
-            
-        matches = list(re.finditer(pattern, ai_response, re.DOTALL | re.IGNORECASE))
-        
-        for match in matches:
-            original_prescription = match.group(1).strip() if len(match.groups()) > 0 else match.group(0).strip()
-            
-            # 确保处方内容有效
-            if len(original_prescription) < 3:
-                continue
-                
-            # 使用新的药材提取函数
-            herbs = extract_herbs_from_prescription(original_prescription)
-            
-            if not herbs or len(herbs) < 1:
-                continue
-            
-            # 生成增强版标准格式 - 层次清晰、视觉美观
-            standardized_prescription = generate_enhanced_prescription_format(herbs)
-            
-            # 替换原始处方 - 完全替换整个表格区域
-            ai_response = ai_response.replace(match.group(0), standardized_prescription)
-            processed = True
-            break
-    
-    return ai_response
-
-def generate_enhanced_prescription_format(herbs: list) -> str:
-    """生成增强版处方格式 - 层次分明、视觉美观"""
-    
-    # 🎯 处方标题 - 显眼的标题
-    prescription_text = "\n\n" + "=" * 50 + "\n"
-    prescription_text += "# 🏥 **中医处方单**\n"
-    prescription_text += "=" * 50 + "\n\n"
-    
-    # 💊 处方内容 - 清晰的药物列表
-    prescription_text += "## **📋 处方组成**\n\n"
-    
-    herb_count = len(herbs)
-    for i, (herb_name, dosage) in enumerate(herbs, 1):
-        # 使用编号和颜色强调
-        prescription_text += f"**{i}.** **`{herb_name}`** ——— **{dosage}g**\n"
-    
-    prescription_text += f"\n> **处方药味总数：** {herb_count} 味\n\n"
-    
-    # 🔥 煎服方法 - 详细用法说明
-    prescription_text += "## **⚡ 煎服方法**\n\n"
-    prescription_text += "### **煎制方法：**\n"
-    prescription_text += "- 🔸 **第一煎：** 加清水500ml，浸泡30分钟后，大火煮沸转小火煎煮25分钟\n"
-    prescription_text += "- 🔸 **第二煎：** 加清水400ml，直接煎煮20分钟\n"
-    prescription_text += "- 🔸 **混合：** 两次药汁混合，约得药液300ml\n\n"
-    
-    prescription_text += "### **服用方法：**\n"
-    prescription_text += "- 🔸 **用量：** 每日1剂，分2次温服\n"
-    prescription_text += "- 🔸 **时间：** 饭后1小时服用（早晚各1次）\n"
-    prescription_text += "- 🔸 **温度：** 温热服用，避免过烫或过凉\n\n"
-    
-    # 📝 用药注意事项
-    prescription_text += "## **⚠️ 重要注意事项**\n\n"
-    prescription_text += "### **🚨 安全提醒：**\n"
-    prescription_text += "- **❗ 必须在执业中医师指导下使用**\n"
-    prescription_text += "- **❗ 孕妇、哺乳期妇女慎用**\n"
-    prescription_text += "- **❗ 服药期间忌食生冷、辛辣、油腻食物**\n"
-    prescription_text += "- **❗ 如有过敏史，请告知医师**\n\n"
-    
-    prescription_text += "### **👀 用药观察：**\n"
-    prescription_text += "- 🔹 观察症状变化情况\n"
-    prescription_text += "- 🔹 注意有无不良反应\n"
-    prescription_text += "- 🔹 记录服药后的感受\n\n"
-    
-    # 🔄 复诊要求
-    prescription_text += "## **🔄 复诊安排**\n\n"
-    prescription_text += "### **📅 复诊时间：**\n"
-    prescription_text += "- **首次复诊：** 服药3天后\n"
-    prescription_text += "- **后续复诊：** 每周1次，共3次\n\n"
-    
-    prescription_text += "### **📋 复诊要点：**\n"
-    prescription_text += "- ✅ 主要症状变化情况\n"
-    prescription_text += "- ✅ 药物疗效及不良反应\n"
-    prescription_text += "- ✅ 食欲、睡眠、二便情况\n"
-    prescription_text += "- ✅ 舌象、脉象变化\n\n"
-    
-    # 📞 医疗免责声明
-    prescription_text += "## **📞 医疗免责声明**\n\n"
-    prescription_text += "> **🔴 重要声明：**\n"
-    prescription_text += "> 本处方为AI辅助生成的中医建议，仅供参考，不能替代正规医院的专业诊断和治疗。\n"
-    prescription_text += "> - **建议在执业中医师指导下使用**\n\n"
-    
-    prescription_text += "---\n"
-    prescription_text += "*🕒 处方生成时间：" + "今日" + "  |  💻 AI中医助手*\n"
-    prescription_text += "---\n\n"
-    
-    return prescription_text
+    return get_response_sanitizer().standardize_prescription(ai_response)
 
 def enhance_diagnosis_format(ai_response: str) -> str:
     """增强整体诊疗方案的格式化 - 为所有医生回复添加层次感"""
-    import re
-    
-    # 1. 强化标题层次
-    # 将【xxx】格式转换为更显眼的格式
-    ai_response = re.sub(r'【([^】]+)】', r'## **🔸 \1**', ai_response)
-    
-    # 2. 强化重要医学术语
-    medical_terms = [
-        '辨证论治', '证型', '病机', '治法', '方剂', '加减',
-        '脾虚', '肝郁', '肾阳虚', '肾阴虚', '血瘀', '痰湿',
-        '风寒', '风热', '湿热', '寒湿', '气滞', '血虚'
-    ]
-    
-    for term in medical_terms:
-        ai_response = re.sub(f'({term})', r'**\1**', ai_response)
-    
-    # 3. 增强症状描述的可读性
-    symptom_keywords = ['头痛', '发热', '咳嗽', '胸闷', '腹痛', '便秘', '腹泻', '失眠', '疲倦']
-    for symptom in symptom_keywords:
-        ai_response = re.sub(f'({symptom})', r'**`\1`**', ai_response)
-    
-    # 4. 为重要提醒添加视觉强调
-    ai_response = re.sub(r'(请.*?就医|建议.*?医师|注意.*?事项)', r'> **⚠️ \1**', ai_response)
-    
-    # 5. 为方剂名添加特殊格式
-    formula_pattern = r'([一-九十]+[汤|散|丸|膏|汁|饮])'
-    ai_response = re.sub(formula_pattern, r'**📜 `\1`**', ai_response)
-    
-    return ai_response
+    return get_response_sanitizer().enhance_format(ai_response)
 
 def detect_and_filter_western_medicine(ai_response: str) -> tuple[bool, str]:
     """检测并过滤西医内容 - 只清理明确的西药推荐和西医检查建议"""
-    import re
-    
-    # 只检测明确需要过滤的西医内容 - 大幅缩减关键词列表
-    western_medicine_keywords = {
-        # 西药名称 - 只保留明确的西药推荐
-        '西药': ['奥美拉唑', '阿司匹林', '布洛芬', '头孢', '阿莫西林', '青霉素', '氨茶碱', 
-               '地塞米松', '泼尼松', '美托洛尔', '硝苯地平', '阿托伐他汀', '二甲双胍',
-               '胰岛素', '华法林', '氯吡格雷', '雷贝拉唑', '多潘立酮', '蒙脱石散'],
-        
-        # 西医检查项目 - 只检测明确的检查建议
-        '检查建议': ['建议做CT', '建议做MRI', '建议做核磁', '建议做B超', '建议做彩超', 
-                   '建议做X光', '建议做胃镜', '建议做肠镜', '需要做血常规', '需要查肝功能',
-                   '建议病理检查', '建议活检', '建议穿刺', '建议造影'],
-        
-        # 明确的西医诊断术语 - 移除"高血压"等常见病名，只保留严重疾病
-        '严重疾病': ['癌症', '恶性肿瘤', '心肌梗死', '脑梗死'],
-    }
-    
-    # 检测西医内容
-    found_western_content = []
-    
-    # 中医合理上下文关键词 - 如果回复包含这些，说明是在中医语境下讨论
-    tcm_context_keywords = ['中医', '中药', '辨证', '脏腑', '经络', '气血', '阴阳', '寒热', '虚实', 
-                           '风寒', '风热', '湿热', '痰湿', '血瘀', '气滞', '肝郁', '脾虚', '肾虚',
-                           '温阳', '滋阴', '清热', '祛湿', '化痰', '活血', '理气', '证候', '方剂']
-    
-    # 检查是否在中医上下文中
-    has_tcm_context = any(tcm_keyword in ai_response for tcm_keyword in tcm_context_keywords)
-    
-    # 如果已经是中医上下文，只检测明确的西药推荐
-    if has_tcm_context:
-        # 只检测西药推荐
-        for keyword in western_medicine_keywords['西药']:
-            if f"建议服用{keyword}" in ai_response or f"可以用{keyword}" in ai_response:
-                found_western_content.append(f"西药推荐:{keyword}")
-    else:
-        # 非中医上下文，检测所有西医内容
-        for category, keywords in western_medicine_keywords.items():
-            for keyword in keywords:
-                if keyword in ai_response:
-                    found_western_content.append(f"{category}:{keyword}")
-    
-    # 如果发现需要过滤的西医内容，只移除该部分内容，不替换整个回复
-    if found_western_content:
-        logger.warning(f"检测到西医内容: {found_western_content}")
-        
-        # 删除西药推荐语句，但保留其他内容
-        filtered_response = ai_response
-        
-        # 移除西药推荐语句
-        for keyword in western_medicine_keywords['西药']:
-            patterns = [
-                f"建议服用{keyword}[^。]*。?",
-                f"可以用{keyword}[^。]*。?",
-                f"推荐{keyword}[^。]*。?",
-                f"使用{keyword}[^。]*。?"
-            ]
-            for pattern in patterns:
-                filtered_response = re.sub(pattern, "", filtered_response)
-        
-        # 移除检查建议语句
-        for keyword in western_medicine_keywords['检查建议']:
-            pattern = f"{keyword}[^。]*。?"
-            filtered_response = re.sub(pattern, "", filtered_response)
-        
-        # 清理多余的空行和格式
-        filtered_response = re.sub(r'\n\s*\n\s*\n', '\n\n', filtered_response)
-        filtered_response = filtered_response.strip()
-        
-        # 如果过滤后内容太少，添加中医建议
-        if len(filtered_response) < 100:
-            filtered_response += "\n\n建议通过中医辨证论治的方式进行调理，请详细描述症状以便准确诊断。"
-        
-        return True, filtered_response
-    
-    return False, ai_response
+    return get_response_sanitizer().filter_western_medicine(ai_response)
 
 def sanitize_ai_response(ai_response: str, has_tongue_image: bool, patient_described_tongue: str = "", image_analysis_successful: bool = False, original_patient_message: str = "") -> str:
     """清理AI回复中的非法舌象、脉象、症状编造和处方编造信息"""
-    
-    # 首先检查舌象、脉象、症状安全
-    is_safe, error_msg = check_medical_safety(ai_response, has_tongue_image, patient_described_tongue, image_analysis_successful, original_patient_message)
-    
-    # 如果发现传统的医疗安全问题（舌象、脉象、症状编造），先处理
-    tongue_pulse_cleaned = False
-    if not is_safe:
-        logger.warning(f"发现医疗安全问题: {error_msg}")
-        tongue_pulse_cleaned = True
-    
-    # 如果没有图片上传或图片分析失败，清理所有舌象脉象描述
-    if not has_tongue_image or not image_analysis_successful:
-        
-        # 清理策略1: 处理XML格式的望诊部分
-        if '<望诊所见>' in ai_response and '</望诊所见>' in ai_response:
-            safer_observation = '<望诊所见>因未上传舌象图片，建议患者在充足光线下拍摄舌象照片以便更准确的望诊分析。</望诊所见>'
-            ai_response = re.sub(r'<望诊所见>.*?</望诊所见>', safer_observation, ai_response, flags=re.DOTALL)
-            logger.info("已替换XML望诊部分为安全提示")
-        
-        # 清理策略2: 处理"辨证要点"中的舌象脉象描述
-        if "辨证要点" in ai_response:
-            # 替换舌象描述行
-            ai_response = re.sub(
-                r'- 舌象：.*?[\n\r]', 
-                '- 舌象：因未进行实际舌诊，建议患者面诊时由医师观察舌象\n', 
-                ai_response
-            )
-            # 替换脉象描述行
-            ai_response = re.sub(
-                r'- 脉象：.*?[\n\r]', 
-                '- 脉象：因未进行实际脉诊，建议患者面诊时由医师进行脉象诊断\n', 
-                ai_response
-            )
-            logger.info("已清理辨证要点中的舌象脉象描述")
-        
-        # 清理策略3: 智能清理具体舌象脉象描述，保留正常术语讨论
-        # 先检查上下文，如果是教学/说明内容则不清理
-        def should_preserve_term(text, term_pos):
-            """判断是否应该保留术语（基于上下文）"""
-            context_before = text[max(0, term_pos-10):term_pos]
-            return any(indicator in context_before for indicator in ['如', '若', '见', '或', '常', '多', '包括'])
-        
-        # 只清理明确的编造描述，保留教学讨论
-        cleaned_response = ai_response
-        
-        # 处理明确的编造模式 - 扩展版本
-        fabrication_patterns = [
-            r'舌象[：:].*?[，。\n]',  # "舌象：淡红苔白"
-            r'患者舌边尖红[，。]?',   # "患者舌边尖红"  
-            r'患者苔薄[白黄][，。]?', # "患者苔薄白"
-            r'脉象[：:].*?[，。\n]',  # "脉象：浮数有力"
-            r'患者脉[浮沉缓数弦滑][，。]?', # "患者脉浮数"
-            r'^脉[浮沉缓数弦滑][，。]',     # 句首的"脉浮数，"
-            r'脉[浮沉缓数弦滑]+，有力[，。]?', # "脉浮数，有力"
-            r'^舌质[淡红][，。]',          # 句首的"舌质淡红，"
-            r'舌质淡红，苔薄[白黄腻][，。]?', # "舌质淡红，苔薄腻"
-        ]
-        
-        for pattern in fabrication_patterns:
-            matches = list(re.finditer(pattern, cleaned_response))
-            for match in reversed(matches):  # 从后向前替换，避免位置偏移
-                start, end = match.span()
-                # 简单的上下文检查
-                context = cleaned_response[max(0, start-15):start]
-                if not any(indicator in context for indicator in ['如', '若', '见', '或', '常见', '多为']):
-                    if '舌象' in match.group():
-                        cleaned_response = cleaned_response[:start] + '舌象需要面诊观察。' + cleaned_response[end:]
-                    elif '脉象' in match.group():
-                        cleaned_response = cleaned_response[:start] + '脉象需要面诊切诊。' + cleaned_response[end:]
-                    else:
-                        cleaned_response = cleaned_response[:start] + cleaned_response[end:]
-                    logger.info(f"清理了编造描述: {match.group()}")
-        
-        ai_response = cleaned_response
-        
-        
-        # 清理策略5: 严格清理望诊切诊部分的编造内容
-        if "1. 望诊" in ai_response or "### 望诊" in ai_response:
-            # 替换整个望诊部分
-            ai_response = re.sub(
-                r'(?:1\.|###)?\s*望诊[：:]?.*?(?=(?:2\.|###|$))', 
-                '1. 望诊\n\n- 未进行实际望诊，建议患者提供舌象照片或寻求面诊。\n\n',
-                ai_response, 
-                flags=re.DOTALL
-            )
-            logger.info("已清理望诊部分的编造内容")
-        
-        if "4. 切诊" in ai_response or "### 切诊" in ai_response:
-            # 替换整个切诊部分
-            ai_response = re.sub(
-                r'(?:4\.|###)?\s*切诊[：:]?.*?(?=(?:5\.|###|$))', 
-                '4. 切诊\n\n- 未进行实际切诊，脉象诊断需要专业中医师面诊确定。\n\n',
-                ai_response, 
-                flags=re.DOTALL
-            )
-            logger.info("已清理切诊部分的编造内容")
-        
-        # 清理策略6: 清理诊疗方案中的编造体征
-        if "<望诊所见>" in ai_response:
-            # 更严格的望诊清理
-            ai_response = re.sub(
-                r'<望诊所见>.*?</望诊所见>',
-                '<望诊所见>未进行实际望诊，建议患者上传舌象照片或面诊</望诊所见>',
-                ai_response,
-                flags=re.DOTALL
-            )
-            logger.info("已清理XML格式的望诊编造内容")
-
-        # 清理策略7: 检测并阻止AI编造具体处方建议 - 修复过度清理问题
-        prescription_fabrication_patterns = [
-            r'💊 处方建议.*?(?=🔥|⚡|📜|🔄|🎯|---|\n\n\*|$)',              # 整个处方建议部分 (简化)
-            r'💊 药物组成.*?(?=🔥|⚡|📜|🔄|🎯|---|\n\n\*|$)',              # 药物组成部分 (简化)
-            r'处方组成[：:].*?(?=🔥|⚡|📜|🔄|🎯|---|\n\n\*|$)',             # 处方组成部分 (简化)
-            # 删除过度清理的模式：
-            # r'-\s*[^\n]+\s+\d+g',                                              # "- 连翘 15g" 格式 - 会误判OCR分析
-            # r'[一-龯\u4e00-\u9fff]{2,4}\s+\d+g',                              # "连翘 15g" 格式 - 会误判OCR分析
-            r'煎制方法[：:].*?(?=服用方法|🔥|⚡|📜|🔄|🎯|---|\n\n\*|$)',       # 煎制方法 (简化)
-            r'服用方法[：:].*?(?=🔥|⚡|📜|🔄|🎯|---|\n\n\*|$)',               # 服用方法 (简化)
-        ]
-        
-        for pattern in prescription_fabrication_patterns:
-            if re.search(pattern, ai_response, flags=re.DOTALL):
-                logger.warning("检测到AI编造处方内容，进行清理")
-                
-                # 替换处方建议部分 (使用简化模式)
-                ai_response = re.sub(
-                    r'💊 处方建议.*?(?=🔥|⚡|📜|🔄|🎯|---|\n\n\*|$)',
-                    '💊 处方建议\n\n⚠️ 为确保用药安全，具体的处方建议需要由执业中医师根据患者的具体情况，通过面诊后才能开具。\n\n建议患者：\n1. 及时到正规中医院就诊\n2. 由专业中医师进行四诊合参\n3. 根据具体证型开具个性化处方\n\n',
-                    ai_response,
-                    flags=re.DOTALL
-                )
-                
-                # 替换药物组成部分（防止AI编造具体处方）- 使用简化模式
-                ai_response = re.sub(
-                    r'💊 药物组成.*?(?=🔥|⚡|📜|🔄|🎯|---|\n\n\*|$)',
-                    '💊 药物组成\n\n⚠️ 处方的具体药物组成需要由执业中医师根据患者的具体病情，通过详细诊察后才能确定。\n\n请到正规中医医院进行专业诊疗。\n\n',
-                    ai_response,
-                    flags=re.DOTALL
-                )
-                
-                # 清理煎服指导
-                ai_response = re.sub(
-                    r'⚡ 煎服指导\s*.*?(?=---|\n\n[🔥⚡📜🔄]|\n\n[【\[]|$)',
-                    '⚡ 用药指导\n\n具体的煎制和服用方法应当遵循执业中医师的专业指导。\n\n',
-                    ai_response,
-                    flags=re.DOTALL
-                )
-                
-                # 清理辨证加减部分（这也是编造的）
-                ai_response = re.sub(
-                    r'🔄 辨证加减\s*.*?(?=---|\n\n[🔥⚡📜🔄]|\n\n[【\[]|$)',
-                    '🔄 后续调整\n\n具体的药物加减应当由执业中医师根据患者病情变化进行专业调整。\n\n',
-                    ai_response,
-                    flags=re.DOTALL
-                )
-                
-                logger.info("已清理AI编造的处方建议内容")
-                break
-
-        # 清理策略8: 检测并清理编造的望诊信息
-        appearance_fabrication_patterns = [
-            (r'面色[略显]?[苍白红润黯淡][，。]?', '面色需要面诊观察'),
-            (r'精神[疲倦萎靡不振倦怠][，。]?', '精神状态需要面诊评估'), 
-            (r'舌体[胖大瘦薄][，。]?', '舌体特征需要面诊检查'),
-            (r'舌边[有齿痕无异常][，。]?', '舌边情况需要面诊确认'),
-        ]
-        
-        for pattern, replacement in appearance_fabrication_patterns:
-            if re.search(pattern, ai_response):
-                logger.warning(f"检测到编造的望诊信息: {pattern}")
-                # 清理编造的望诊描述
-                ai_response = re.sub(pattern, replacement, ai_response)
-                logger.info(f"已清理编造的望诊信息: {pattern}")
-
-        # 清理策略4: 添加简洁的医疗安全提醒（仅在必要时）
-        if "重要声明" not in ai_response and "仅供参考" not in ai_response:
-            safety_notice = "\n\n**提醒**：以上建议仅供参考，如症状严重请及时就医。"
-            ai_response += safety_notice
-            logger.info("已添加简洁医疗安全提醒")
-    
-    # 🚨 关键修复：处方编造清理逻辑 - 总是运行，不管舌象脉象检查结果
-    # 这个清理逻辑独立于舌象脉象检查，因为处方编造是更严重的安全问题
-    # 修复：移除会误判OCR分析的过度清理模式
-    prescription_fabrication_patterns = [
-        r'💊 处方建议.*?(?=🔥|⚡|📜|🔄|🎯|---|\n\n\*|$)',              # 整个处方建议部分 (简化)
-        r'💊 药物组成.*?(?=🔥|⚡|📜|🔄|🎯|---|\n\n\*|$)',              # 药物组成部分 (简化)
-        r'处方组成[：:].*?(?=🔥|⚡|📜|🔄|🎯|---|\n\n\*|$)',             # 处方组成部分 (简化)
-        # 注释掉会误判OCR分析的模式：
-        # r'-\s*[^\n]+\s+\d+g',                                              # "- 连翘 15g" 格式 - 误判OCR
-        # r'[一-龯\u4e00-\u9fff]{2,4}\s+\d+g',                              # "连翘 15g" 格式 - 误判OCR
-        r'煎制方法[：:].*?(?=服用方法|🔥|⚡|📜|🔄|🎯|---|\n\n\*|$)',       # 煎制方法 (简化)
-        r'服用方法[：:].*?(?=🔥|⚡|📜|🔄|🎯|---|\n\n\*|$)',               # 服用方法 (简化)
-    ]
-    
-    for pattern in prescription_fabrication_patterns:
-        if re.search(pattern, ai_response, flags=re.DOTALL):
-            logger.warning("检测到AI编造处方内容，进行清理")
-            
-            # 替换处方建议部分 (使用简化模式)
-            ai_response = re.sub(
-                r'💊 处方建议.*?(?=🔥|⚡|📜|🔄|🎯|---|\n\n\*|$)',
-                '💊 处方建议\n\n⚠️ 为确保用药安全，具体的处方建议需要由执业中医师根据患者的具体情况，通过面诊后才能开具。\n\n建议患者：\n1. 及时到正规中医院就诊\n2. 由专业中医师进行四诊合参\n3. 根据具体证型开具个性化处方\n\n',
-                ai_response,
-                flags=re.DOTALL
-            )
-            
-            # 替换药物组成部分（防止AI编造具体处方）- 使用简化模式
-            ai_response = re.sub(
-                r'💊 药物组成.*?(?=🔥|⚡|📜|🔄|🎯|---|\n\n\*|$)',
-                '💊 药物组成\n\n⚠️ 处方的具体药物组成需要由执业中医师根据患者的具体病情，通过详细诊察后才能确定。\n\n请到正规中医医院进行专业诊疗。\n\n',
-                ai_response,
-                flags=re.DOTALL
-            )
-            
-            # 清理煎服指导
-            ai_response = re.sub(
-                r'⚡ 煎服指导.*?(?=🔥|⚡|📜|🔄|🎯|---|\n\n\*|$)',
-                '⚡ 用药指导\n\n具体的煎制和服用方法应当遵循执业中医师的专业指导。\n\n',
-                ai_response,
-                flags=re.DOTALL
-            )
-            
-            # 清理辨证加减部分（这也是编造的）
-            ai_response = re.sub(
-                r'🔄 辨证加减.*?(?=🔥|⚡|📜|🔄|🎯|---|\n\n\*|$)',
-                '🔄 后续调整\n\n具体的药物加减应当由执业中医师根据患者病情变化进行专业调整。\n\n',
-                ai_response,
-                flags=re.DOTALL
-            )
-            
-            logger.info("已清理AI编造的处方建议内容")
-            break
-    
-    return ai_response
+    return get_response_sanitizer().sanitize(
+        ai_response, has_tongue_image, patient_described_tongue, image_analysis_successful, original_patient_message
+    )
 
 def check_image_analysis_success(chat_history: list) -> bool:
     """检查最近的图片分析是否成功
@@ -1131,6 +400,7 @@ import faiss
 
 # 导入智能缓存系统
 from core.cache_system.intelligent_cache_system import IntelligentCacheSystem, get_cache_system, init_cache_system
+from core.llm import LLMError, LLMTimeoutError, get_embedding_service, get_llm_gateway
 from core.prescription.integrated_prescription_parser import parse_prescription_text
 from core.prescription.prescription_checker import PrescriptionChecker
 from services.prescription_ocr_system import get_ocr_system, PrescriptionOCRSystem
@@ -1225,7 +495,7 @@ else:
     logger.info("DashScope API Key is set.")
 
 MAIN_LLM_MODEL = AI_CONFIG["main_model"]
-RAG_EMBEDDING_MODEL = "text-embedding-v4"
+RAG_EMBEDDING_MODEL = AI_CONFIG["embedding_model"]
 RAG_EMBEDDING_DIM = 1024
 CONVERSATION_LOG_DIR = "./conversation_logs"
 os.makedirs(CONVERSATION_LOG_DIR, exist_ok=True)
@@ -1574,38 +844,27 @@ async def embed_query(texts: list[str]) -> list[list[float]]:
     if not texts: return []
     logger.info(f"EMBEDDING [QUERY]: Starting for {len(texts)} texts...")
     try:
-        resp = await asyncio.to_thread(dashscope.TextEmbedding.call, model=RAG_EMBEDDING_MODEL, input=texts, text_type="query")
-        if resp.status_code != HTTPStatus.OK:
-            raise RuntimeError(f"DashScope Embedding API Error: {getattr(resp, 'message', 'Unknown')}")
+        # 经两级缓存与合批后才调用向量接口
+        vectors = await get_embedding_service(RAG_EMBEDDING_MODEL).embed(texts, text_type="query")
         logger.info(f"EMBEDDING [QUERY]: Successfully completed.")
-        return [r['embedding'] for r in resp.output['embeddings']]
+        return vectors
     except Exception as e:
         logger.error(f"EMBEDDING [QUERY]: Exception: {e}", exc_info=True)
         return [[]]
 
-async def bailian_llm_complete(model: str, messages: List[Dict[str, str]], timeout: float = 40.0) -> str:
+async def bailian_llm_complete(model: str, messages: List[Dict[str, str]], timeout: float = 40.0,
+                               call_site: str = "main.llm_complete") -> str:
     try:
-        # qwen3.6-plus 是多模态模型，需要转换为 MultiModalConversation 的消息格式
-        mm_messages = []
-        for msg in messages:
-            mm_messages.append({
-                "role": msg["role"],
-                "content": [{"text": msg["content"]}]
-            })
-
-        response = await asyncio.wait_for(
-            asyncio.to_thread(MultiModalConversation.call, model=model, messages=mm_messages),
-            timeout=timeout
+        return await get_llm_gateway().complete_text(
+            messages, model=model, timeout=timeout, call_site=call_site
         )
-        if response.status_code == HTTPStatus.OK and response.output and response.output.choices:
-            return response.output.choices[0].message.content[0]["text"]
-        else:
-            error_msg = f"LLM Error: {getattr(response, 'message', 'Unknown')}"
-            logger.error(error_msg)
-            return f"【系统错误】{error_msg}"
-    except asyncio.TimeoutError:
+    except LLMTimeoutError:
         logger.error(f"LLM call timed out after {timeout} seconds")
         return "【系统提示】AI医生正在分析中，响应时间较长，请稍后重试或提供更简洁的症状描述。"
+    except LLMError as e:
+        error_msg = f"LLM Error: {e}"
+        logger.error(error_msg)
+        return f"【系统错误】{error_msg}"
     except Exception as e:
         logger.error(f"LLM Exception: {e}", exc_info=True)
         return "【系统错误】调用AI时发生未知异常。"
@@ -1632,7 +891,11 @@ async def extract_keywords_from_query(query: str) -> List[str]:
 "{query}"
 '''
     try:
-        response_str = await bailian_llm_complete(model=MAIN_LLM_MODEL, messages=[{"role": "user", "content": prompt}])
+        response_str = await bailian_llm_complete(
+            model=MAIN_LLM_MODEL,
+            messages=[{"role": "user", "content": prompt}],
+            call_site="main.extract_keywords"
+        )
         logger.info(f"LLM - Raw keyword extraction response: {response_str}")
         match = re.search(r'```json\s*([\s\S]*?)\s*```', response_str)
         if match:
@@ -1829,8 +1092,28 @@ def extract_features_from_image(image_bytes: bytes, image_type: str) -> str:
 @asynccontextmanager
 async def lifespan(app_instance: FastAPI):
     logger.info("Application startup: Initializing online-only resources...")
-    # 不需要加载本地模型
+    # 不需要加载本地模型；药材注册表在启动时加载，避免首个处方请求承担加载开销
+    try:
+        from core.prescription.herb_registry import get_herb_registry
+        get_herb_registry()
+    except Exception as e:
+        logger.warning(f"药材注册表预加载失败，将在首次使用时重试: {e}")
     yield
+    # 写入尚未落库的会话活动时间
+    try:
+        from core.security.unified_auth_service import unified_auth_service
+        unified_auth_service.shutdown()
+    except Exception as e:
+        logger.warning(f"会话活动时间写入失败: {e}")
+    # 关闭多设备同步通道，注销本worker在同步总线上的订阅
+    try:
+        from api.routes.websocket_sync_routes import manager as sync_connection_manager
+        await sync_connection_manager.close()
+    except Exception as e:
+        logger.warning(f"实时同步总线关闭失败: {e}")
+    # 写回个性化学习统计中尚未落库的增量
+    if learning_system:
+        learning_system.flush()
     logger.info("Application shutdown.")
 
 app = FastAPI(
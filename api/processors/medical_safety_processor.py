@@ -10,6 +10,8 @@ import re
 from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime
 
+from core.prescription.safety_rules import INCOMPATIBILITY_RULES, get_safety_rule_index
+
 from ..utils.common_utils import safe_execute, get_current_timestamp_iso
 from ..utils.text_utils import extract_herb_names, has_medical_keywords, validate_prescription_format
 
@@ -22,6 +24,9 @@ class MedicalSafetyProcessor:
         self.db_manager = db_manager
         self.config = config_manager
         
+        # 十八反/十九畏、有毒药材、妊娠禁忌共用预编译规则索引
+        self.rule_index = get_safety_rule_index()
+        
         # 安全检查配置
         self.safety_config = {
             'enable_drug_interaction_check': True,
@@ -204,29 +209,38 @@ class MedicalSafetyProcessor:
         }
         
         try:
-            # 检查已知的药物配伍禁忌
             herb_names = [herb['name'] for herb in herbs]
+            interactions = []
             
-            for i, herb1 in enumerate(herb_names):
-                for j, herb2 in enumerate(herb_names[i+1:], i+1):
-                    interaction = self._check_herb_pair_interaction(herb1, herb2)
-                    
-                    if interaction['has_interaction']:
-                        interaction_result['has_interactions'] = True
-                        interaction_result['interaction_pairs'].append({
-                            'herb1': herb1,
-                            'herb2': herb2,
-                            'interaction_type': interaction['type'],
-                            'severity': interaction['severity'],
-                            'description': interaction['description']
-                        })
-                        
-                        warning_msg = f"{herb1}与{herb2}存在{interaction['type']}相互作用: {interaction['description']}"
-                        interaction_result['warnings'].append(warning_msg)
-                        
-                        # 根据严重程度调整风险评分
-                        severity_scores = {'轻微': 1, '中度': 2, '严重': 3, '禁用': 4}
-                        interaction_result['risk_score'] += severity_scores.get(interaction['severity'], 2)
+            # 十八反、十九畏：整张处方一次位运算求交
+            for pair in self.rule_index.incompatible_pairs(herb_names):
+                interactions.append((pair.herb1, pair.herb2, self._pair_interaction_info(pair)))
+            
+            # 寒热药性冲突：大寒药与大热药两组的笛卡尔积
+            natures = {}
+            for herb in herbs:
+                nature = herb.get('nature') or self._get_herb_properties(herb['name']).get('nature')
+                natures.setdefault(nature, []).append(herb['name'])
+            for cold_herb in natures.get('大寒', []):
+                for hot_herb in natures.get('大热', []):
+                    interactions.append((cold_herb, hot_herb, self._NATURE_CONFLICT))
+            
+            severity_scores = {'轻微': 1, '中度': 2, '严重': 3, '禁用': 4}
+            for herb1, herb2, interaction in interactions:
+                interaction_result['has_interactions'] = True
+                interaction_result['interaction_pairs'].append({
+                    'herb1': herb1,
+                    'herb2': herb2,
+                    'interaction_type': interaction['type'],
+                    'severity': interaction['severity'],
+                    'description': interaction['description']
+                })
+                
+                warning_msg = f"{herb1}与{herb2}存在{interaction['type']}相互作用: {interaction['description']}"
+                interaction_result['warnings'].append(warning_msg)
+                
+                # 根据严重程度调整风险评分
+                interaction_result['risk_score'] += severity_scores.get(interaction['severity'], 2)
             
         except Exception as e:
             logger.error(f"药物相互作用检查失败: {e}")
@@ -235,37 +249,34 @@ class MedicalSafetyProcessor:
         
         return interaction_result
     
+    _NATURE_CONFLICT = {
+        'has_interaction': True,
+        'type': '药性冲突',
+        'severity': '中度',
+        'description': '寒热药性相反，可能影响药效'
+    }
+    
+    @staticmethod
+    def _pair_interaction_info(pair) -> Dict[str, Any]:
+        """配伍禁忌规则 -> 相互作用描述（十八反为禁用，十九畏为严重）"""
+        return {
+            'has_interaction': True,
+            'type': pair.rule_type,
+            'severity': '禁用' if pair.rule_type == '十八反' else '严重',
+            'description': pair.description
+        }
+    
     def _check_herb_pair_interaction(self, herb1: str, herb2: str) -> Dict[str, Any]:
         """检查两味药材的相互作用"""
-        # 检查十八反、十九畏等配伍禁忌
-        forbidden_pairs = self.safety_config.get('forbidden_combinations', {})
-        
-        # 标准化药材名称
-        herb1_normalized = self._normalize_herb_name(herb1)
-        herb2_normalized = self._normalize_herb_name(herb2)
-        
-        # 检查是否在禁忌组合中
-        pair_key1 = f"{herb1_normalized}-{herb2_normalized}"
-        pair_key2 = f"{herb2_normalized}-{herb1_normalized}"
-        
-        if pair_key1 in forbidden_pairs:
-            return forbidden_pairs[pair_key1]
-        elif pair_key2 in forbidden_pairs:
-            return forbidden_pairs[pair_key2]
+        # 检查十八反、十九畏等配伍禁忌（药名经规则索引归一，不分先后）
+        pair = self.rule_index.pair_interaction(herb1, herb2)
+        if pair is not None:
+            return self._pair_interaction_info(pair)
         
         # 检查药性冲突
-        herb1_properties = self._get_herb_properties(herb1)
-        herb2_properties = self._get_herb_properties(herb2)
-        
-        # 寒热冲突检查
-        if (herb1_properties.get('nature') == '大寒' and herb2_properties.get('nature') == '大热') or \
-           (herb1_properties.get('nature') == '大热' and herb2_properties.get('nature') == '大寒'):
-            return {
-                'has_interaction': True,
-                'type': '药性冲突',
-                'severity': '中度',
-                'description': '寒热药性相反，可能影响药效'
-            }
+        natures = {self._get_herb_properties(herb1).get('nature'), self._get_herb_properties(herb2).get('nature')}
+        if natures == {'大寒', '大热'}:
+            return dict(self._NATURE_CONFLICT)
         
         return {'has_interaction': False}
     
@@ -362,15 +373,14 @@ class MedicalSafetyProcessor:
                     dosage_result['risk_score'] += 1
                     dosage_result['has_issues'] = True
                 
-                # 特殊药材剂量检查
-                if herb_name in self.safety_config['high_risk_herbs']:
-                    risk_info = self.safety_config['high_risk_herbs'][herb_name]
-                    if dosage > risk_info.get('max_dosage', 10):
-                        dosage_result['warnings'].append(
-                            f"{herb_name} 为{risk_info['risk_type']}药材，用量{dosage}g超过安全限制"
-                        )
-                        dosage_result['risk_score'] += 3
-                        dosage_result['has_issues'] = True
+                # 特殊药材剂量检查（上限已在规则索引中解析为数值）
+                finding = self.rule_index.toxic_finding(herb_name, dosage)
+                if finding is not None and finding.exceeded:
+                    dosage_result['warnings'].append(
+                        f"{herb_name} 为有毒药材，用量{dosage}g超过安全限制"
+                    )
+                    dosage_result['risk_score'] += 3
+                    dosage_result['has_issues'] = True
             
             # 检查总剂量
             total_herbs = len(herbs)
@@ -397,26 +407,16 @@ class MedicalSafetyProcessor:
             'risk_score': 0
         }
         
-        # 妊娠禁用药材列表
-        pregnancy_forbidden = [
-            '附子', '川乌', '草乌', '巴豆', '大戟', '芫花', '甘遂',
-            '商陆', '斑蝥', '蜈蚣', '水蛭', '虻虫', '干漆', '麝香',
-            '红花', '桃仁', '牛膝', '薏苡仁', '王不留行'
-        ]
-        
-        # 妊娠慎用药材列表
-        pregnancy_caution = [
-            '当归尾', '川芎', '桃仁', '红花', '牛膝', '薏苡仁',
-            '厚朴', '枳壳', '大黄', '芒硝'
-        ]
-        
         try:
-            for herb in herbs:
-                herb_name = self._normalize_herb_name(herb['name'])
-                
-                if herb_name in pregnancy_forbidden:
+            herb_names = [herb['name'] for herb in herbs]
+            hits = self.rule_index.population_hits(herb_names, ('孕妇禁用', '孕妇慎用'))
+            forbidden = set(hits.get('孕妇禁用', []))
+            caution = set(hits.get('孕妇慎用', []))
+            
+            for herb_name in herb_names:
+                if herb_name in forbidden:
                     pregnancy_result['contraindications'].append({
-                        'herb': herb['name'],
+                        'herb': herb_name,
                         'type': '妊娠禁用',
                         'description': '该药材妊娠期绝对禁用，可能导致流产或胎儿畸形',
                         'severity': '禁用'
@@ -424,9 +424,9 @@ class MedicalSafetyProcessor:
                     pregnancy_result['risk_score'] += 4
                     pregnancy_result['has_risks'] = True
                 
-                elif herb_name in pregnancy_caution:
+                elif herb_name in caution:
                     pregnancy_result['contraindications'].append({
-                        'herb': herb['name'],
+                        'herb': herb_name,
                         'type': '妊娠慎用',
                         'description': '该药材妊娠期需谨慎使用，建议在医师指导下使用',
                         'severity': '严重'
@@ -600,40 +600,28 @@ class MedicalSafetyProcessor:
         return risks
     
     def _load_forbidden_combinations(self) -> Dict[str, Dict[str, Any]]:
-        """加载禁忌配伍组合"""
-        # 十八反配伍禁忌
-        forbidden_combinations = {
-            '甘草-甘遂': {
-                'has_interaction': True,
-                'type': '十八反',
-                'severity': '禁用',
-                'description': '甘草反甘遂，禁忌配伍'
-            },
-            '乌头-半夏': {
-                'has_interaction': True,
-                'type': '十八反',
-                'severity': '禁用',
-                'description': '乌头反半夏，禁忌配伍'
-            }
-            # 实际应该包含完整的十八反、十九畏配伍禁忌
-        }
+        """加载禁忌配伍组合（由十八反、十九畏规则表展开，键为"主药-相反药"）"""
+        forbidden_combinations = {}
+        for rule_type, primary, opposed in INCOMPATIBILITY_RULES:
+            verb = '反' if rule_type == '十八反' else '畏'
+            for herb1 in primary:
+                for herb2 in opposed:
+                    forbidden_combinations[f"{herb1}-{herb2}"] = {
+                        'has_interaction': True,
+                        'type': rule_type,
+                        'severity': '禁用' if rule_type == '十八反' else '严重',
+                        'description': f'{herb1}{verb}{herb2}，禁忌配伍'
+                    }
         return forbidden_combinations
     
     def _load_high_risk_herbs(self) -> Dict[str, Dict[str, Any]]:
-        """加载高风险药材列表"""
-        high_risk_herbs = {
-            '附子': {
-                'risk_type': '有毒',
-                'max_dosage': 10,
-                'special_preparation': '需要炮制',
-                'monitoring_required': True
-            },
-            '川乌': {
+        """加载高风险药材列表（与 PrescriptionSafetyChecker 共用有毒药材上限）"""
+        high_risk_herbs = {}
+        for herb_name, (_, max_grams, warning) in self.rule_index.toxic_herbs.items():
+            high_risk_herbs[herb_name] = {
                 'risk_type': '有毒',
-                'max_dosage': 6,
-                'special_preparation': '需要炮制',
+                'max_dosage': max_grams,
+                'special_preparation': warning,
                 'monitoring_required': True
             }
-            # 实际应该包含完整的有毒、峻烈药材列表
-        }
-        return high_risk_herbs
\ No newline at end of file
+        return high_risk_herbs
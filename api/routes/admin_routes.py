@@ -22,6 +22,7 @@ import sqlite3
 import logging
 from datetime import datetime
 from app.services import local_sqlite_service as sqlite_service
+from core.security.unified_auth_service import unified_auth_service
 
 logger = logging.getLogger(__name__)
 
@@ -126,6 +127,8 @@ async def update_user(
         if update_result["status"] != "updated":
             raise HTTPException(status_code=500, detail="更新失败")
         
+        # 账户状态、显示名等变更后，已缓存的会话需重新加载
+        unified_auth_service.invalidate_user(user_id)
         logger.info(f"管理员更新用户信息成功: {user_id}")
         
         return {
@@ -168,6 +171,7 @@ async def reset_user_password(
         if not updated:
             raise HTTPException(status_code=500, detail="密码重置失败")
         
+        unified_auth_service.invalidate_user(user_id)
         logger.info(f"管理员重置用户密码成功: {user['username']} ({user_id})")
         
         return {
@@ -198,6 +202,7 @@ async def disable_user(
         if update_result["status"] != "updated":
             raise HTTPException(status_code=500, detail="禁用失败")
 
+        unified_auth_service.invalidate_user(user_id)
         logger.info(f"管理员禁用用户: {user_id}")
         return {"success": True, "message": "用户已禁用"}
 
@@ -250,6 +255,7 @@ async def delete_user(
         if update_result["status"] != "updated":
             raise HTTPException(status_code=500, detail="删除失败")
 
+        unified_auth_service.invalidate_user(user_id)
         logger.info(f"管理员删除用户(软删除): {user_id}")
         return {"success": True, "message": "用户已删除"}
 
@@ -264,6 +270,7 @@ async def get_system_stats(admin: bool = Depends(get_current_admin)):
     """获取系统统计信息"""
     try:
         stats = sqlite_service.fetch_admin_system_stats()
+        stats["auth"] = unified_auth_service.get_stats()
         
         return {
             "success": True,
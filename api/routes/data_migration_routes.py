@@ -18,6 +18,8 @@ import base64
 import hashlib
 from datetime import datetime, timedelta
 
+from core.conversation.consultation_turn_store import iter_turns
+
 router = APIRouter(prefix="/api/data-migration", tags=["数据迁移与导出"])
 
 def get_db_connection():
@@ -337,6 +339,9 @@ async def get_exportable_user_data(user_id: str, include_data: List[str], date_r
         query = f"SELECT * FROM consultations WHERE patient_id = ?{date_filter}"
         cursor.execute(query, [user_id] + date_params)
         data["consultations"] = [dict(row) for row in cursor.fetchall()]
+        # 对话内容按轮次存储在 consultation_turns，conversation_log 只有摘要
+        for consultation in data["consultations"]:
+            consultation["conversation_turns"] = list(iter_turns(cursor, consultation["uuid"]))
     
     if "all" in include_data or "prescriptions" in include_data:
         query = f"""
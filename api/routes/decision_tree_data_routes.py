@@ -19,7 +19,7 @@ sys.path.insert(0, str(project_root))
 
 from services.decision_tree_data_service import DecisionTreeDataService
 from app.core.settings import AI_CONFIG
-import dashscope
+from core.llm import get_llm_gateway
 
 
 # ============================================
@@ -68,11 +68,6 @@ router = APIRouter(prefix="/api/decision-tree-data", tags=["决策树数据"])
 # 初始化服务
 data_service = DecisionTreeDataService()
 
-# 初始化dashscope
-DASHSCOPE_API_KEY = AI_CONFIG.get("dashscope_api_key", "")
-if DASHSCOPE_API_KEY:
-    dashscope.api_key = DASHSCOPE_API_KEY
-
 
 @router.post("/generate")
 async def generate_from_natural_language(request: GenerateFromTextRequest):
@@ -110,18 +105,19 @@ async def generate_from_natural_language(request: GenerateFromTextRequest):
 请生成：
 """
 
-        # 调用AI生成
+        # 调用AI生成（经由统一大模型网关）
         try:
-            response = dashscope.MultiModalConversation.call(
+            generated_text = await get_llm_gateway().complete_text(
+                [{"role": "user", "content": prompt}],
                 model=AI_CONFIG.get('decision_tree_model', 'qwen3.5-omni-plus-2026-03-15'),
-                messages=[{"role": "user", "content": [{"text": prompt}]}]
+                call_site="decision_tree_data.generate"
             )
 
-            if response.status_code != 200 or not response.output:
+            if not generated_text:
                 raise HTTPException(status_code=500, detail="AI生成失败")
 
-            generated_text = response.output.choices[0].message.content[0]["text"]
-
+        except HTTPException:
+            raise
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"AI调用失败: {str(e)}")
 
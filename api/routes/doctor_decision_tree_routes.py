@@ -21,6 +21,10 @@ from services.famous_doctor_learning_system import FamousDoctorLearningSystem
 from api.security_integration import get_current_user
 from core.security.rbac_system import UserSession, UserRole
 from core.doctor_management.doctor_auth import doctor_auth_manager
+from core.consultation.semantic_score_cache import get_semantic_score_cache
+from core.consultation.decision_tree_registry import get_decision_tree_registry
+from core.llm import get_llm_gateway
+from core.conversation.consultation_turn_store import materialize_conversation_log
 from app.core.settings import AI_CONFIG, PATHS
 
 # 检查Dashscope可用性
@@ -579,6 +583,13 @@ async def save_decision_tree_v3(
         
         # 这里应该调用数据库保存功能
         logger.info(f"V3决策树保存数据: {save_data}")
+
+        # 决策树已变更，清除该疾病决策树的AI语义匹配分数缓存并刷新注册表
+        get_semantic_score_cache().invalidate_pattern(
+            doctor_id=current_user.user_id,
+            disease_name=request.disease_name
+        )
+        get_decision_tree_registry().notify_changed()
         
         return {
             "success": True,
@@ -1644,21 +1655,16 @@ async def _extract_clinical_info_with_ai(
 
     try:
         # 调用AI生成
-        response = await asyncio.to_thread(
-            dashscope.MultiModalConversation.call,
+        content = await get_llm_gateway().complete_text(
+            [{"role": "user", "content": prompt}],
             model=AI_CONFIG.get('decision_tree_model', 'qwen3.5-omni-plus-2026-03-15'),
-            messages=[{"role": "user", "content": [{"text": prompt}]}]
+            call_site="doctor_decision_tree.extract_clinical_info"
         )
 
-        if response.status_code == 200:
-            content = response.output.choices[0].message.content[0]["text"]
-            
-            # 解析JSON响应
-            ai_result = _parse_prescription_json(content)
-            
-            return ai_result
-        else:
-            raise Exception(f"AI调用失败: {response.message}")
+        # 解析JSON响应
+        ai_result = _parse_prescription_json(content)
+
+        return ai_result
             
     except Exception as e:
         logger.error(f"AI提取失败: {e}")
@@ -1840,6 +1846,13 @@ async def save_clinical_pattern(
         }
         
         pattern_id = await _save_pattern_to_database(pattern_data)
+
+        # 同一医生同一疾病的旧决策树已被替换，清除其AI语义匹配分数缓存并刷新注册表
+        get_semantic_score_cache().invalidate_pattern(
+            doctor_id=doctor_id,
+            disease_name=request.disease_name
+        )
+        get_decision_tree_registry().notify_changed()
         
         # 📊 分析模式类型
         pattern_type = _analyze_pattern_type(request.clinical_patterns, request.doctor_expertise)
@@ -2006,6 +2019,13 @@ async def delete_clinical_pattern(
             cursor.execute("DELETE FROM doctor_clinical_patterns WHERE id = ?", (pattern_id,))
             conn.commit()
 
+            get_semantic_score_cache().invalidate_pattern(
+                pattern_id=pattern_id,
+                doctor_id=doctor_id,
+                disease_name=disease_name
+            )
+            get_decision_tree_registry().notify_changed()
+
             logger.info(f"✅ 成功删除临床模式: {pattern_id} ({disease_name})")
 
             return {
@@ -2266,48 +2286,57 @@ async def get_pattern_usage_statistics(
         elif time_range == "month":
             time_filter = "AND c.created_at >= datetime('now', '-30 days')"
 
+        # 1. 决策树列表来自内存注册表，无需扫描 doctor_clinical_patterns
+        entries = get_decision_tree_registry().get_all(doctor_id)
+
         conn = sqlite3.connect(USER_DB_PATH)
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
 
-        # 1. 获取总体统计
-        cursor.execute(f"""
-            SELECT
-                COUNT(DISTINCT p.id) as total_patterns,
-                COUNT(DISTINCT c.uuid) as total_calls,
-                COUNT(DISTINCT CASE WHEN pr.status = 'reviewed' THEN c.uuid END) as success_calls,
-                ROUND(CAST(COUNT(DISTINCT CASE WHEN c.used_pattern_id IS NOT NULL THEN c.uuid END) AS FLOAT) /
-                      NULLIF(COUNT(DISTINCT c.uuid), 0) * 100, 2) as coverage_rate
-            FROM doctor_clinical_patterns p
-            LEFT JOIN consultations c ON c.used_pattern_id = p.id {time_filter}
-            LEFT JOIN prescriptions pr ON pr.consultation_id = c.uuid
-            WHERE p.doctor_id = ?
-        """, (doctor_id,))
-
-        overall_stats = dict(cursor.fetchone())
-
-        # 2. 获取每个决策树的详细统计
-        cursor.execute(f"""
-            SELECT
-                p.id as pattern_id,
-                p.disease_name,
-                p.thinking_process,
-                p.created_at as pattern_created_at,
-                COUNT(DISTINCT c.uuid) as call_count,
-                COUNT(DISTINCT CASE WHEN pr.status = 'reviewed' THEN c.uuid END) as success_count,
-                ROUND(CAST(COUNT(DISTINCT CASE WHEN pr.status = 'reviewed' THEN c.uuid END) AS FLOAT) /
-                      NULLIF(COUNT(DISTINCT c.uuid), 0) * 100, 2) as success_rate,
-                MAX(c.created_at) as last_used_at,
-                AVG(c.pattern_match_score) as avg_match_score
-            FROM doctor_clinical_patterns p
-            LEFT JOIN consultations c ON c.used_pattern_id = p.id {time_filter}
-            LEFT JOIN prescriptions pr ON pr.consultation_id = c.uuid
-            WHERE p.doctor_id = ?
-            GROUP BY p.id
-            ORDER BY call_count DESC
-        """, (doctor_id,))
-
-        pattern_stats = [dict(row) for row in cursor.fetchall()]
+        # 2. 按决策树聚合问诊调用情况
+        call_stats = {}
+        if entries:
+            placeholders = ",".join("?" for _ in entries)
+            cursor.execute(f"""
+                SELECT
+                    c.used_pattern_id as pattern_id,
+                    COUNT(DISTINCT c.uuid) as call_count,
+                    COUNT(DISTINCT CASE WHEN pr.status = 'reviewed' THEN c.uuid END) as success_count,
+                    MAX(c.created_at) as last_used_at,
+                    AVG(c.pattern_match_score) as avg_match_score
+                FROM consultations c
+                LEFT JOIN prescriptions pr ON pr.consultation_id = c.uuid
+                WHERE c.used_pattern_id IN ({placeholders}) {time_filter}
+                GROUP BY c.used_pattern_id
+            """, [entry.pattern_id for entry in entries])
+            call_stats = {row['pattern_id']: dict(row) for row in cursor.fetchall()}
+
+        pattern_stats = []
+        for entry in entries:
+            stats = call_stats.get(entry.pattern_id, {})
+            call_count = stats.get('call_count', 0)
+            success_count = stats.get('success_count', 0)
+            pattern_stats.append({
+                "pattern_id": entry.pattern_id,
+                "disease_name": entry.disease_name,
+                "thinking_process": entry.thinking_process,
+                "pattern_created_at": entry.created_at,
+                "call_count": call_count,
+                "success_count": success_count,
+                "success_rate": round(success_count / call_count * 100, 2) if call_count else None,
+                "last_used_at": stats.get('last_used_at'),
+                "avg_match_score": stats.get('avg_match_score')
+            })
+        pattern_stats.sort(key=lambda item: item['call_count'], reverse=True)
+
+        total_calls = sum(item['call_count'] for item in pattern_stats)
+        overall_stats = {
+            "total_patterns": len(entries),
+            "total_calls": total_calls,
+            "success_calls": sum(item['success_count'] for item in pattern_stats),
+            # 只统计关联了决策树的问诊，因此有调用时覆盖率即为100%
+            "coverage_rate": 100.0 if total_calls else None
+        }
 
         # 3. 获取总问诊数（用于计算使用率）
         cursor.execute(f"""
@@ -2467,6 +2496,11 @@ async def get_consultation_detail(
             raise HTTPException(status_code=404, detail="问诊记录不存在")
 
         consultation = dict(consultation)
+        # conversation_log 只存摘要投影，详情弹窗读取的 conversation_history 从消息行还原
+        consultation['conversation_log'] = json.dumps(
+            materialize_conversation_log(cursor, consultation_id, consultation.get('conversation_log')),
+            ensure_ascii=False
+        )
 
         # 2. 获取处方信息
         cursor.execute("""
@@ -12,7 +12,7 @@ import logging
 from datetime import datetime
 
 from core.doctor_matching.doctor_matching_service import (
-    DoctorMatchingService, MatchingCriteria, DoctorInfo
+    DoctorMatchingService, MatchingCriteria, DoctorInfo, matching_request_scope
 )
 
 logger = logging.getLogger(__name__)
@@ -60,11 +60,12 @@ matching_service = DoctorMatchingService()
 async def recommend_doctors(request: DoctorRecommendationRequest):
     """根据症状智能推荐医生"""
     try:
-        # 获取推荐医生
-        recommended_doctors = matching_service.recommend_doctors_for_symptoms(
-            symptoms=request.symptoms,
-            patient_id=request.patient_id
-        )
+        # 获取推荐医生（本次请求内患者偏好只查询一次）
+        with matching_request_scope():
+            recommended_doctors = matching_service.recommend_doctors_for_symptoms(
+                symptoms=request.symptoms,
+                patient_id=request.patient_id
+            )
         
         # 转换为响应格式
         doctors_data = []
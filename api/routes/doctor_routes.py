@@ -270,6 +270,10 @@ async def update_doctor_profile(
         if cursor.rowcount == 0:
             raise HTTPException(status_code=404, detail="医生信息未找到")
         
+        # 专科、简介变化后重建推荐用的医生专科索引
+        from core.doctor_matching.doctor_index import get_doctor_specialty_index
+        get_doctor_specialty_index().notify_changed()
+        
         # 获取更新后的信息
         cursor.execute("SELECT * FROM doctors WHERE id = ?", (current_doctor.id,))
         updated_doctor = cursor.fetchone()
@@ -352,6 +356,13 @@ async def change_password(
         if cursor.rowcount == 0:
             raise HTTPException(status_code=500, detail="密码更新失败")
         
+        # 统一认证会话缓存中的医生资料含旧密码信息，按关联用户失效
+        cursor.execute("SELECT user_id FROM doctors WHERE id = ?", (current_doctor.id,))
+        linked = cursor.fetchone()
+        if linked and linked[0]:
+            from core.security.unified_auth_service import unified_auth_service
+            unified_auth_service.invalidate_user(linked[0])
+        
         logger.info(f"医生 {current_doctor.id} 密码修改成功")
         
         return {
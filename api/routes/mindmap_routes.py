@@ -92,7 +92,7 @@ async def generate_mindmap(request: GenerateMindMapRequest):
         logger.info(f"📝 收到思维导图生成请求: {request.topic}")
 
         # 调用生成器
-        mindmap = mindmap_generator.generate_mindmap(
+        mindmap = await mindmap_generator.generate_mindmap(
             topic=request.topic,
             description=request.description,
             domain=request.domain,
@@ -109,18 +109,18 @@ async def analyze_prescription_with_ai(
         ai_analyzer = get_ai_analyzer()
 
         if request.analysis_type == "comprehensive":
-            analysis_result = ai_analyzer.analyze_prescription_comprehensive(
+            analysis_result = await ai_analyzer.analyze_prescription_comprehensive(
                 prescription_content=prescription['ai_prescription'] or prescription['doctor_prescription'] or '',
                 diagnosis=prescription['diagnosis'] or '',
                 symptoms=prescription['symptoms'] or ''
             )
         elif request.analysis_type == "safety":
-            analysis_result = ai_analyzer.analyze_prescription_safety(
+            analysis_result = await ai_analyzer.analyze_prescription_safety(
                 prescription_content=prescription['ai_prescription'] or prescription['doctor_prescription'] or ''
             )
         else:
             # 其他类型使用全面分析
-            analysis_result = ai_analyzer.analyze_prescription_comprehensive(
+            analysis_result = await ai_analyzer.analyze_prescription_comprehensive(
                 prescription_content=prescription['ai_prescription'] or prescription['doctor_prescription'] or '',
                 diagnosis=prescription['diagnosis'] or '',
                 symptoms=prescription['symptoms'] or ''
@@ -307,7 +307,7 @@ async def get_risk_analysis(authorization: Optional[str] = Header(None)):
                 'priority': 'normal'  # 已审查=正常优先级
             })
 
-        risk_analysis = ai_analyzer.analyze_risk_assessment(prescriptions_data)
+        risk_analysis = await ai_analyzer.analyze_risk_assessment(prescriptions_data)
 
         # 🔑 识别高风险处方ID（用于前端筛选）
         high_risk_prescription_ids = []
@@ -395,7 +395,7 @@ async def get_ai_insights(authorization: Optional[str] = Header(None)):
         # 🔑 使用真实的AI洞察分析
         from core.ai_prescription_analyzer import get_ai_analyzer
         ai_analyzer = get_ai_analyzer()
-        insights = ai_analyzer.generate_insights(dict(stats) if stats else {}, recent_prescriptions)
+        insights = await ai_analyzer.generate_insights(dict(stats) if stats else {}, recent_prescriptions)
 
         return {
             "success": True,
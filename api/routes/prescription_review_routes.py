@@ -13,6 +13,10 @@ import json
 import logging
 from datetime import datetime
 
+from core.conversation.consultation_turn_store import load_conversation_history
+from core.prescription.herb_extraction import extract_herb_dosage_pairs
+from core.prescription.safety_rules import get_safety_rule_index
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/prescription-review", tags=["处方审核"])
@@ -139,15 +143,15 @@ async def get_doctor_review_queue(doctor_id: str):
         for row in cursor.fetchall():
             # 提取患者主诉
             chief_complaint = "无记录"
-            if row['conversation_log']:
+            if row['consultation_id']:
                 try:
-                    log_data = json.loads(row['conversation_log'])
-                    if isinstance(log_data, dict) and 'conversation_history' in log_data:
-                        history = log_data['conversation_history']
-                        if history and len(history) > 0:
-                            first_query = history[0].get('patient_query', '')
-                            if first_query:
-                                chief_complaint = first_query[:50] + ("..." if len(first_query) > 50 else "")
+                    history, _ = load_conversation_history(
+                        cursor, row['consultation_id'], row['conversation_log'], limit=1
+                    )
+                    if history:
+                        first_query = history[0].get('patient_query', '')
+                        if first_query:
+                            chief_complaint = first_query[:50] + ("..." if len(first_query) > 50 else "")
                 except:
                     pass
             
@@ -166,6 +170,21 @@ async def get_doctor_review_queue(doctor_id: str):
         
         conn.close()
         
+        # 整个队列一次批量做规则安全检查，供医生优先处理存在配伍禁忌/超量的处方
+        reports = get_safety_rule_index().check_many(
+            extract_herb_dosage_pairs(review["ai_prescription"] or "") for review in pending_reviews
+        )
+        for review, report in zip(pending_reviews, reports):
+            review["safety_flags"] = {
+                "incompatible_pairs": [
+                    f"{pair.herb1}-{pair.herb2}（{pair.rule_type}）" for pair in report.incompatible_pairs
+                ],
+                "overdosed_herbs": [
+                    f"{finding.herb} {finding.dosage}g > {finding.max_daily}"
+                    for finding in report.toxic_findings if finding.exceeded
+                ]
+            }
+        
         return {
             "success": True,
             "data": {
@@ -367,15 +386,15 @@ async def get_all_prescriptions(
         for row in cursor.fetchall():
             # 提取患者主诉
             chief_complaint = "无记录"
-            if row['conversation_log']:
+            if row['consultation_id']:
                 try:
-                    log_data = json.loads(row['conversation_log'])
-                    if isinstance(log_data, dict) and 'conversation_history' in log_data:
-                        history = log_data['conversation_history']
-                        if history and len(history) > 0:
-                            first_query = history[0].get('patient_query', '')
-                            if first_query:
-                                chief_complaint = first_query[:100] + ("..." if len(first_query) > 100 else "")
+                    history, _ = load_conversation_history(
+                        cursor, row['consultation_id'], row['conversation_log'], limit=1
+                    )
+                    if history:
+                        first_query = history[0].get('patient_query', '')
+                        if first_query:
+                            chief_complaint = first_query[:100] + ("..." if len(first_query) > 100 else "")
                 except:
                     pass
 
@@ -5,8 +5,10 @@
 """
 
 from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import List, Dict, Optional, Any
+import asyncio
 import logging
 import traceback
 import sqlite3
@@ -22,6 +24,15 @@ from core.consultation.unified_consultation_service import (
     ConsultationRequest,
     ConsultationResponse
 )
+from core.consultation.semantic_score_cache import get_semantic_score_cache
+from core.database.connection import connect as db_connect
+from core.conversation.consultation_turn_store import (
+    ROLE_ASSISTANT, ROLE_PATIENT, append_turns, backfill_from_log,
+    build_log_projection, count_turns, ensure_turn_table,
+    begin_write, load_conversation_histories, load_conversation_history
+)
+
+USER_HISTORY_DB_PATH = "/home/ute/tcm-ai/data/user_history.sqlite"
 
 logger = logging.getLogger(__name__)
 
@@ -30,9 +41,7 @@ router = APIRouter(prefix="/api/consultation", tags=["unified-consultation"])
 
 def get_db_connection():
     """获取数据库连接"""
-    conn = sqlite3.connect("/home/ute/tcm-ai/data/user_history.sqlite")
-    conn.row_factory = sqlite3.Row
-    return conn
+    return db_connect(USER_HISTORY_DB_PATH, row_factory=sqlite3.Row)
 
 
 def _first_non_empty(*values: Any) -> Optional[Any]:
@@ -116,6 +125,59 @@ def _normalize_chat_message(raw_request: ChatMessage) -> ChatMessage:
     )
 
 
+async def _resolve_user_id(http_request: Request, normalized_request: ChatMessage) -> str:
+    """获取真实用户ID：优先认证用户，回退到前端传递的patient_id或guest"""
+    # 1. 尝试从认证token获取用户ID
+    auth_header = http_request.headers.get('authorization')
+    if auth_header and auth_header.startswith('Bearer '):
+        token = auth_header.replace('Bearer ', '')
+        try:
+            from api.main import get_user_info_by_token
+            auth_user_info = await get_user_info_by_token(token)
+            if auth_user_info and auth_user_info.get('user_id'):
+                logger.info(f"✅ 使用认证用户ID进行问诊: {auth_user_info['user_id']}")
+                return auth_user_info['user_id']
+        except:
+            pass
+    
+    # 2. 如果没有认证用户，使用前端传递的patient_id或生成设备用户
+    real_user_id = normalized_request.patient_id or "guest"
+    logger.info(f"⚠️ 使用设备/guest用户进行问诊: {real_user_id}")
+    return real_user_id
+
+
+def _build_consultation_request(normalized_request: ChatMessage, real_user_id: str) -> ConsultationRequest:
+    return ConsultationRequest(
+        message=normalized_request.message or "",
+        conversation_id=normalized_request.conversation_id or "",
+        selected_doctor=normalized_request.selected_doctor or "zhang_zhongjing",
+        conversation_history=normalized_request.conversation_history or [],
+        patient_id=real_user_id,  # 🔑 使用真实用户ID
+        has_images=normalized_request.has_images
+    )
+
+
+def _build_response_data(response: ConsultationResponse) -> Dict[str, Any]:
+    return {
+        "reply": response.reply,
+        "conversation_id": response.conversation_id,
+        "doctor_name": response.doctor_name,
+        "contains_prescription": response.contains_prescription,
+        "prescription_data": response.prescription_data,
+        "confidence_score": response.confidence_score,
+        "processing_time": response.processing_time,
+        "stage": response.stage,
+        # 🔑 关键修复：添加处方支付相关字段
+        "prescription_id": response.prescription_data.get("prescription_id") if response.prescription_data else None,
+        "is_paid": response.prescription_data.get("is_paid", False) if response.prescription_data else False,
+        "stage_timings": response.stage_timings
+    }
+
+
+def _sse_event(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
 @router.post("/chat", response_model=ChatResponse)
 async def unified_chat_endpoint(request: ChatMessage, http_request: Request):
     """
@@ -130,38 +192,13 @@ async def unified_chat_endpoint(request: ChatMessage, http_request: Request):
         )
         
         # 🔑 获取真实用户ID (优先认证用户，回退到设备用户)
-        real_user_id = None
-        
-        # 1. 尝试从认证token获取用户ID
-        auth_header = http_request.headers.get('authorization')
-        if auth_header and auth_header.startswith('Bearer '):
-            token = auth_header.replace('Bearer ', '')
-            try:
-                from api.main import get_user_info_by_token
-                auth_user_info = await get_user_info_by_token(token)
-                if auth_user_info and auth_user_info.get('user_id'):
-                    real_user_id = auth_user_info['user_id']
-                    logger.info(f"✅ 使用认证用户ID进行问诊: {real_user_id}")
-            except:
-                pass
-        
-        # 2. 如果没有认证用户，使用前端传递的patient_id或生成设备用户
-        if not real_user_id:
-            real_user_id = normalized_request.patient_id or "guest"
-            logger.info(f"⚠️ 使用设备/guest用户进行问诊: {real_user_id}")
+        real_user_id = await _resolve_user_id(http_request, normalized_request)
         
         # 获取统一问诊服务
         consultation_service = get_consultation_service()
         
         # 构建请求对象 (使用真实用户ID)
-        consultation_request = ConsultationRequest(
-            message=normalized_request.message or "",
-            conversation_id=normalized_request.conversation_id or "",
-            selected_doctor=normalized_request.selected_doctor or "zhang_zhongjing",
-            conversation_history=normalized_request.conversation_history or [],
-            patient_id=real_user_id,  # 🔑 使用真实用户ID
-            has_images=normalized_request.has_images
-        )
+        consultation_request = _build_consultation_request(normalized_request, real_user_id)
         
         # 处理问诊
         response = await consultation_service.process_consultation(consultation_request)
@@ -170,19 +207,7 @@ async def unified_chat_endpoint(request: ChatMessage, http_request: Request):
         await _store_consultation_record(real_user_id, normalized_request, response)
         
         # 构建响应数据
-        response_data = {
-            "reply": response.reply,
-            "conversation_id": response.conversation_id,
-            "doctor_name": response.doctor_name,
-            "contains_prescription": response.contains_prescription,
-            "prescription_data": response.prescription_data,
-            "confidence_score": response.confidence_score,
-            "processing_time": response.processing_time,
-            "stage": response.stage,
-            # 🔑 关键修复：添加处方支付相关字段
-            "prescription_id": response.prescription_data.get("prescription_id") if response.prescription_data else None,
-            "is_paid": response.prescription_data.get("is_paid", False) if response.prescription_data else False
-        }
+        response_data = _build_response_data(response)
         
         logger.info(f"统一问诊响应: 包含处方={response.contains_prescription}, 阶段={response.stage}")
         
@@ -216,6 +241,62 @@ async def unified_chat_endpoint(request: ChatMessage, http_request: Request):
             message=f"处理失败: {str(e)}"
         )
 
+@router.post("/chat/stream")
+async def unified_chat_stream_endpoint(request: ChatMessage, http_request: Request):
+    """
+    统一问诊聊天接口（SSE流式版）
+
+    事件依次为：
+    - start: {"conversation_id", "doctor_name"}，收到请求后立即发出
+    - delta: {"text": 增量文本}，AI回复逐段推送
+    - final: 与 /chat 的 data 字段相同，reply 为后处理后的完整回复，客户端应以其替换增量文本
+    - error: {"message": 错误信息, "conversation_id": ...}
+    问诊记录在生成 final 帧时即交给独立任务写库，客户端随后断开也不会丢失。
+    """
+    normalized_request = _normalize_chat_message(request)
+    real_user_id = await _resolve_user_id(http_request, normalized_request)
+    consultation_request = _build_consultation_request(normalized_request, real_user_id)
+
+    async def event_stream():
+        yield _sse_event("start", {
+            "conversation_id": normalized_request.conversation_id,
+            "doctor_name": normalized_request.selected_doctor
+        })
+        try:
+            async for kind, payload in get_consultation_service().stream_consultation(consultation_request):
+                if kind == "delta":
+                    yield _sse_event("delta", {"text": payload})
+                else:
+                    # 🔑 存储问诊记录到数据库（流式接口的唯一保存点）
+                    # 先于 final 帧发出；独立任务不随生成器被取消
+                    _store_record_detached(real_user_id, normalized_request, payload)
+                    yield _sse_event("final", _build_response_data(payload))
+        except Exception as e:
+            logger.error(f"统一问诊流式处理失败: {e}")
+            logger.error(traceback.format_exc())
+            yield _sse_event("error", {
+                "message": "抱歉，AI医生暂时无法回应，请稍后重试。",
+                "conversation_id": normalized_request.conversation_id
+            })
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+# 流式接口的写库任务，保留引用直到完成
+_record_tasks: set = set()
+
+
+def _store_record_detached(user_id: str, request: ChatMessage, response) -> asyncio.Task:
+    """在独立任务中存储问诊记录，客户端断开导致响应生成器被取消时仍会完成"""
+    task = asyncio.ensure_future(_store_consultation_record(user_id, request, response))
+    _record_tasks.add(task)
+    task.add_done_callback(_record_tasks.discard)
+    return task
+
 @router.post("/chat-legacy", response_model=Dict[str, Any])
 async def legacy_chat_endpoint(request: ChatMessage, http_request: Request):
     """
@@ -323,7 +404,8 @@ async def get_service_status():
                     "zhu_danxi",
                     "liu_duzhou",
                     "zheng_qin_an"
-                ]
+                ],
+                "decision_tree_score_cache": get_semantic_score_cache().get_stats()
             }
         }
         
@@ -421,17 +503,19 @@ async def save_consultation(request: ConsultationSaveRequest):
         
         if existing:
             # 记录已存在时也要同步最新状态与对话，避免历史页状态滞后
+            # 对话已按轮次追加存储时以 consultation_turns 为准，不用客户端整包覆盖摘要投影
             cursor.execute("""
                 UPDATE consultations
                 SET patient_id = ?,
                     selected_doctor_id = ?,
-                    conversation_log = ?,
+                    conversation_log = CASE WHEN ? THEN conversation_log ELSE ? END,
                     status = ?,
                     updated_at = ?
                 WHERE uuid = ?
             """, (
                 normalized["patient_id"],
                 normalized["doctor_id"],
+                1 if count_turns(cursor, normalized["consultation_id"]) else 0,
                 normalized["conversation_log"],
                 normalized["status"],
                 normalized["updated_at"],
@@ -729,8 +813,10 @@ async def _store_consultation_record(user_id: str, request: ChatMessage, respons
         import uuid
         from datetime import datetime
         
-        conn = sqlite3.connect('/home/ute/tcm-ai/data/user_history.sqlite')
+        conn = db_connect(USER_HISTORY_DB_PATH)
         cursor = conn.cursor()
+        # 查询已有记录到追加消息行之间持有写锁，并发请求不会算出相同的 seq
+        begin_write(cursor)
         
         # 1. 存储到 consultations 表（问诊主记录）
         # 🔑 v3.0 修复：只根据conversation_id精确查找，避免错误复用其他对话
@@ -742,34 +828,24 @@ async def _store_consultation_record(user_id: str, request: ChatMessage, respons
         """, (user_id, request.conversation_id))
         
         existing = cursor.fetchone()
+
+        # 对话内容追加写入 consultation_turns，conversation_log 只保留摘要投影
+        ensure_turn_table(cursor)
+        turn_timestamp = datetime.now().isoformat()
+        new_turns = [
+            (ROLE_PATIENT, request.message, response.stage, turn_timestamp),
+            (ROLE_ASSISTANT, response.reply, response.stage, turn_timestamp)
+        ]
         
         if existing:
-            # 更新现有记录，合并对话历史
-            existing_log = json.loads(existing[1]) if existing[1] else {}
-
-            # 🔧 修复：处理 existing_log 可能是 list 的情况
-            if isinstance(existing_log, list):
-                # 如果是列表，转换为标准格式
-                existing_log = {"conversation_history": existing_log}
-
-            conversation_history = existing_log.get('conversation_history', [])
-
-            # 添加新的对话轮次
-            conversation_history.append({
-                "patient_query": request.message,
-                "ai_response": response.reply,
-                "timestamp": datetime.now().isoformat(),
-                "stage": response.stage
-            })
+            # 旧记录的历史仍在 conversation_log 中时先回填，再追加本轮
+            backfill_from_log(cursor, existing[0], existing[1])
+            message_count = append_turns(cursor, existing[0], new_turns)
 
-            updated_log = {
-                "conversation_id": request.conversation_id,
-                "conversation_history": conversation_history,
-                "current_stage": response.stage,
-                "confidence_score": response.confidence_score,
-                "last_query": request.message,
-                "last_response": response.reply
-            }
+            updated_log = build_log_projection(
+                request.conversation_id, message_count, response.stage,
+                response.confidence_score, request.message, response.reply
+            )
             
             cursor.execute("""
                 UPDATE consultations
@@ -782,7 +858,7 @@ async def _store_consultation_record(user_id: str, request: ChatMessage, respons
                     pattern_match_score = ?
                 WHERE uuid = ?
             """, (
-                json.dumps(updated_log),
+                updated_log,
                 json.dumps({
                     "confidence_score": response.confidence_score,
                     "stage": response.stage,
@@ -806,19 +882,11 @@ async def _store_consultation_record(user_id: str, request: ChatMessage, respons
         else:
             # 🔑 关键修复：统一使用conversation_id作为consultation UUID
             consultation_uuid = request.conversation_id
-            conversation_log = json.dumps({
-                "conversation_id": request.conversation_id,
-                "conversation_history": [{
-                    "patient_query": request.message,
-                    "ai_response": response.reply,
-                    "timestamp": datetime.now().isoformat(),
-                    "stage": response.stage
-                }],
-                "current_stage": response.stage,
-                "confidence_score": response.confidence_score,
-                "last_query": request.message,
-                "last_response": response.reply
-            })
+            message_count = append_turns(cursor, consultation_uuid, new_turns)
+            conversation_log = build_log_projection(
+                request.conversation_id, message_count, response.stage,
+                response.confidence_score, request.message, response.reply
+            )
             
             cursor.execute("""
                 INSERT INTO consultations (
@@ -1040,7 +1108,7 @@ async def _sync_prescription_status_to_patient(prescription_id: int, new_status:
     实现医生审核结果的实时同步
     """
     try:
-        conn = sqlite3.connect('/home/ute/tcm-ai/data/user_history.sqlite')
+        conn = db_connect(USER_HISTORY_DB_PATH)
         cursor = conn.cursor()
         
         # 根据审核结果更新患者端可见性
@@ -1175,8 +1243,12 @@ async def update_consultation_status(request: ConsultationUpdateRequest):
             conn.close()
 
 @router.get("/detail/{session_id}")
-async def get_conversation_detail(session_id: str):
-    """获取对话详细信息，用于详情弹窗显示"""
+async def get_conversation_detail(session_id: str, after_seq: int = 0, limit: Optional[int] = None):
+    """
+    获取对话详细信息，用于详情弹窗显示
+
+    对话历史支持keyset分页：after_seq 为上一页返回的 next_cursor，limit 为每页轮数
+    """
     try:
         logger.info(f"🔍 获取对话详情: session_id={session_id}")
         conn = get_db_connection()
@@ -1241,6 +1313,7 @@ async def get_conversation_detail(session_id: str):
                 "created_at": ds_result['created_at'],
                 "updated_at": ds_result['last_updated'],
                 "conversation_history": [],
+                "next_cursor": None,
                 "symptoms_summary": ds_result['chief_complaint'] if ds_result['chief_complaint'] else "暂无详细症状记录",
                 "diagnosis": "基于主诉的初步评估",
                 "syndrome": "待进一步辨证",
@@ -1249,11 +1322,14 @@ async def get_conversation_detail(session_id: str):
             }
             
             # 如果有关联的完整consultation记录，使用更详细的信息
-            if ds_result['conversation_log']:
+            if ds_result['uuid']:
                 try:
-                    log_data = json.loads(ds_result['conversation_log'])
+                    conversation_history, next_cursor = load_conversation_history(
+                        cursor, ds_result['uuid'], ds_result['conversation_log'], after_seq, limit
+                    )
                     conversation_data.update({
-                        "conversation_history": log_data.get('conversation_history', []),
+                        "conversation_history": conversation_history,
+                        "next_cursor": next_cursor,
                         "symptoms_analysis": ds_result['symptoms_analysis'],
                         "syndrome": ds_result['tcm_syndrome']
                     })
@@ -1262,6 +1338,7 @@ async def get_conversation_detail(session_id: str):
         else:
             # 解析conversation_log获取对话历史
             conversation_history = []
+            next_cursor = None
             symptoms_summary = ""
             diagnosis = ""
             syndrome = ""
@@ -1269,35 +1346,14 @@ async def get_conversation_detail(session_id: str):
             logger.info(f"📝 开始解析conversation_log, 有数据: {bool(result['conversation_log'])}")
 
             try:
-                if result['conversation_log']:
-                    log_data = json.loads(result['conversation_log'])
-
-                    # 🔑 兼容旧格式和新格式
-                    if isinstance(log_data, list):
-                        # 旧格式: [{type, content, time}]
-                        conversation_history = []
-                        for i in range(0, len(log_data), 2):
-                            if i < len(log_data):
-                                user_msg = log_data[i] if isinstance(log_data[i], dict) and log_data[i].get('type') == 'user' else None
-                                ai_msg = log_data[i+1] if i+1 < len(log_data) and isinstance(log_data[i+1], dict) and log_data[i+1].get('type') == 'ai' else None
-
-                                if user_msg:
-                                    conversation_history.append({
-                                        'patient_query': user_msg.get('content', ''),
-                                        'ai_response': ai_msg.get('content', '') if ai_msg else '',
-                                        'timestamp': user_msg.get('timestamp', '')
-                                    })
-                        symptoms_summary = log_data[0].get('content', '') if len(log_data) > 0 and isinstance(log_data[0], dict) and log_data[0].get('type') == 'user' else ""
-                    elif isinstance(log_data, dict) and 'conversation_history' in log_data:
-                        # 新格式: {conversation_id, conversation_history: [{patient_query, ai_response}]}
-                        conversation_history = log_data.get('conversation_history', [])
-                        if conversation_history and len(conversation_history) > 0:
-                            symptoms_summary = conversation_history[0].get('patient_query', '') if isinstance(conversation_history[0], dict) else ""
-                    else:
-                        conversation_history = []
-                        symptoms_summary = ""
-
-                    logger.info(f"📜 解析到 {len(conversation_history)} 轮对话")
+                # 🔑 对话历史以 consultation_turns 为准，旧记录回退解析 conversation_log（兼容旧格式和新格式）
+                conversation_history, next_cursor = load_conversation_history(
+                    cursor, result['uuid'], result['conversation_log'], after_seq, limit
+                )
+                if conversation_history:
+                    symptoms_summary = conversation_history[0].get('patient_query', '')
+
+                logger.info(f"📜 解析到 {len(conversation_history)} 轮对话")
                 
                 # 解析症状分析
                 if result['symptoms_analysis']:
@@ -1362,6 +1418,7 @@ async def get_conversation_detail(session_id: str):
                 "created_at": result['created_at'],
                 "updated_at": result['updated_at'],
                 "conversation_history": conversation_history,
+                "next_cursor": next_cursor,
                 "symptoms_summary": symptoms_summary,
                 "diagnosis": diagnosis,
                 "syndrome": syndrome,
@@ -1505,15 +1562,17 @@ async def get_patient_consultation_history(http_request: Request):
         # 构建历史记录数据
         consultation_history = []
         
+        # 一次查询读取全部问诊的对话历史
+        try:
+            histories = load_conversation_histories(
+                cursor, [(row['uuid'], row['conversation_log']) for row in rows]
+            )
+        except:
+            histories = {}
+        
         for row in rows:
             # 解析对话历史
-            conversation_history = []
-            try:
-                if row['conversation_log']:
-                    log_data = json.loads(row['conversation_log'])
-                    conversation_history = log_data.get('conversation_history', [])
-            except:
-                pass
+            conversation_history = histories.get(row['uuid'], [])
             
             # 医生信息映射
             doctor_names = {
@@ -15,6 +15,8 @@ import hashlib
 import asyncio
 from datetime import datetime, timedelta
 
+from core.conversation.consultation_turn_store import materialize_conversation_log
+
 router = APIRouter(prefix="/api/user-sync", tags=["用户数据云同步"])
 
 def get_db_connection():
@@ -293,6 +295,12 @@ async def get_complete_user_data(user_id: str) -> Dict[str, Any]:
         ORDER BY created_at DESC LIMIT 50
     """, (user_id,))
     user_data["consultations"] = [dict(row) for row in cursor.fetchall()]
+    # conversation_log 只存摘要投影，按消息行还原完整历史后再下发
+    for consultation in user_data["consultations"]:
+        consultation["conversation_log"] = json.dumps(
+            materialize_conversation_log(cursor, consultation["uuid"], consultation.get("conversation_log")),
+            ensure_ascii=False
+        )
     
     # 获取处方记录
     cursor.execute("""
@@ -80,8 +80,10 @@ async def get_user_sessions(user_id: str = None, authorization: Optional[str] =
         }
 
 @router.get("/conversation/{session_id}")
-async def get_conversation_detail(session_id: str, user_id: str = None, authorization: Optional[str] = Header(None)):
-    """获取单个会话的详细信息"""
+async def get_conversation_detail(session_id: str, user_id: str = None,
+                                  after_seq: int = 0, limit: Optional[int] = None,
+                                  authorization: Optional[str] = Header(None)):
+    """获取单个会话的详细信息（对话历史按 after_seq/limit 做keyset分页）"""
     try:
         current_user_data = await get_current_user_from_header(authorization)
 
@@ -94,7 +96,9 @@ async def get_conversation_detail(session_id: str, user_id: str = None, authoriz
         elif not user_id:
             raise HTTPException(status_code=400, detail="缺少 user_id 或 Authorization")
 
-        detail_data = sqlite_service.fetch_conversation_detail_data(session_id, user_id=resolved_user_id)
+        detail_data = sqlite_service.fetch_conversation_detail_data(
+            session_id, user_id=resolved_user_id, after_seq=after_seq, limit=limit
+        )
         if not detail_data:
             raise HTTPException(status_code=404, detail="会话不存在")
 
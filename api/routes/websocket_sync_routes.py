@@ -7,42 +7,28 @@ WebSocket实时同步服务
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, HTTPException
 from fastapi.websockets import WebSocketState
-from typing import Dict, List, Set, Any
 import json
-import asyncio
 import logging
 from datetime import datetime
 import uuid
 from app.services import local_sqlite_service as sqlite_service
+from core.realtime import ConnectionHub
 
 router = APIRouter()
 
 # 活跃连接管理
-class ConnectionManager:
-    def __init__(self):
-        # 用户连接映射: user_id -> [websockets]
-        self.active_connections: Dict[str, List[WebSocket]] = {}
-        # 设备连接映射: device_id -> websocket
-        self.device_connections: Dict[str, WebSocket] = {}
-        # 用户设备映射: user_id -> [device_ids]
-        self.user_devices: Dict[str, Set[str]] = {}
-        
+class ConnectionManager(ConnectionHub):
+    """
+    WebSocket连接管理
+    连接索引、每设备发送通道与跨worker广播见 core.realtime.ConnectionHub
+    """
+
     async def connect(self, websocket: WebSocket, user_id: str, device_id: str):
         """新设备连接"""
         await websocket.accept()
-        
-        # 添加到用户连接列表
-        if user_id not in self.active_connections:
-            self.active_connections[user_id] = []
-        self.active_connections[user_id].append(websocket)
-        
-        # 记录设备连接
-        self.device_connections[device_id] = websocket
-        
-        # 更新用户设备列表
-        if user_id not in self.user_devices:
-            self.user_devices[user_id] = set()
-        self.user_devices[user_id].add(device_id)
+
+        self.register(websocket, user_id, device_id,
+                      is_open=lambda: websocket.client_state == WebSocketState.CONNECTED)
         
         # 通知其他设备有新设备连接
         await self.broadcast_to_user_devices(user_id, {
@@ -56,88 +42,24 @@ class ConnectionManager:
         
         logging.info(f"✅ 用户 {user_id} 设备 {device_id} 已连接实时同步")
         
-    def disconnect(self, user_id: str, device_id: str):
+    def disconnect(self, user_id: str, device_id: str, websocket: WebSocket = None):
         """设备断开连接"""
-        # 从用户连接列表移除
-        if user_id in self.active_connections:
-            websocket = self.device_connections.get(device_id)
-            if websocket in self.active_connections[user_id]:
-                self.active_connections[user_id].remove(websocket)
-            
-            # 如果用户没有其他连接，清理
-            if not self.active_connections[user_id]:
-                del self.active_connections[user_id]
-        
-        # 清理设备连接
-        if device_id in self.device_connections:
-            del self.device_connections[device_id]
-        
-        # 清理用户设备列表
-        if user_id in self.user_devices:
-            self.user_devices[user_id].discard(device_id)
-            if not self.user_devices[user_id]:
-                del self.user_devices[user_id]
-        
-        logging.info(f"❌ 用户 {user_id} 设备 {device_id} 已断开实时同步")
+        if self.unregister(user_id, device_id, websocket):
+            logging.info(f"❌ 用户 {user_id} 设备 {device_id} 已断开实时同步")
     
     async def send_personal_message(self, message: dict, websocket: WebSocket):
         """发送个人消息"""
         try:
             if websocket.client_state == WebSocketState.CONNECTED:
-                await websocket.send_text(json.dumps(message, ensure_ascii=False))
+                if not self.send_to_websocket(websocket, message):
+                    await websocket.send_text(json.dumps(message, ensure_ascii=False))
         except Exception as e:
             logging.error(f"发送个人消息失败: {e}")
     
     async def broadcast_to_user_devices(self, user_id: str, message: dict, exclude_device: str = None):
-        """广播消息给用户的所有设备"""
-        if user_id not in self.active_connections:
-            return
-            
+        """广播消息给用户的所有设备（包括其他worker上的连接）"""
         message["timestamp"] = datetime.now().isoformat()
-        
-        disconnect_devices = []
-        
-        for websocket in self.active_connections[user_id]:
-            # 排除指定设备
-            device_id = self.get_device_id_by_websocket(websocket)
-            if exclude_device and device_id == exclude_device:
-                continue
-                
-            try:
-                if websocket.client_state == WebSocketState.CONNECTED:
-                    await websocket.send_text(json.dumps(message, ensure_ascii=False))
-                else:
-                    disconnect_devices.append((user_id, device_id))
-            except Exception as e:
-                logging.error(f"广播消息失败: {e}")
-                disconnect_devices.append((user_id, device_id))
-        
-        # 清理断开的连接
-        for user_id, device_id in disconnect_devices:
-            if device_id:
-                self.disconnect(user_id, device_id)
-    
-    def get_device_id_by_websocket(self, websocket: WebSocket) -> str:
-        """根据websocket获取设备ID"""
-        for device_id, ws in self.device_connections.items():
-            if ws == websocket:
-                return device_id
-        return None
-    
-    def get_user_connection_count(self, user_id: str) -> int:
-        """获取用户连接设备数量"""
-        return len(self.active_connections.get(user_id, []))
-    
-    def get_all_connection_stats(self) -> dict:
-        """获取所有连接统计"""
-        return {
-            "total_users": len(self.active_connections),
-            "total_devices": len(self.device_connections),
-            "user_connections": {
-                user_id: len(connections) 
-                for user_id, connections in self.active_connections.items()
-            }
-        }
+        await self.broadcast(user_id, message, exclude_device)
 
 # 全局连接管理器
 manager = ConnectionManager()
@@ -159,10 +81,10 @@ async def websocket_sync_endpoint(websocket: WebSocket, user_id: str, device_id:
             await handle_sync_message(user_id, device_id, message, websocket)
             
     except WebSocketDisconnect:
-        manager.disconnect(user_id, device_id)
+        manager.disconnect(user_id, device_id, websocket)
     except Exception as e:
         logging.error(f"WebSocket连接异常: {e}")
-        manager.disconnect(user_id, device_id)
+        manager.disconnect(user_id, device_id, websocket)
 
 async def handle_sync_message(user_id: str, device_id: str, message: dict, websocket: WebSocket):
     """处理同步消息"""
@@ -122,10 +122,10 @@ class SecurityMiddleware(BaseHTTPMiddleware):
             # 2. 继续处理请求
             response = await call_next(request)
             
-            # 3. 记录API访问日志
+            # 3. 记录API访问日志（仅入队，用户由后台写入时按token补全，请求路径上不访问数据库）
             process_time = (time.time() - start_time) * 1000  # 转换为毫秒
             
-            current_user = await self._get_current_user_safe(request)
+            session_token = self._get_session_token(request)
             
             security_monitor.log_api_access(
                 ip_address=self._get_client_ip(request),
@@ -134,8 +134,8 @@ class SecurityMiddleware(BaseHTTPMiddleware):
                 endpoint=request.url.path,
                 status_code=response.status_code,
                 response_time_ms=process_time,
-                user_id=current_user.user_id if current_user else None,
-                session_token=current_user.session_token if current_user else None
+                user_id=None if session_token else "anonymous",
+                session_token=session_token
             )
             
             return response
@@ -159,12 +159,12 @@ class SecurityMiddleware(BaseHTTPMiddleware):
             # 继续处理请求，让其他错误处理机制处理
             return await call_next(request)
     
-    async def _get_current_user_safe(self, request: Request) -> Optional[UserSession]:
-        """安全地获取当前用户，不抛出异常"""
-        try:
-            return await get_current_user(request)
-        except:
-            return None
+    def _get_session_token(self, request: Request) -> Optional[str]:
+        """从Authorization头或cookie取会话token（不做校验）"""
+        auth_header = request.headers.get("Authorization")
+        if auth_header and auth_header.startswith("Bearer "):
+            return auth_header[7:]
+        return request.cookies.get("session_token")
     
     def _get_client_ip(self, request: Request) -> str:
         """获取客户端IP"""
@@ -383,7 +383,8 @@ def setup_security_routes(app: FastAPI):
                 "unique_ips_1h": metrics.unique_ips_1h,
                 "error_rate_1h": metrics.error_rate_1h,
                 "avg_response_time_ms": metrics.avg_response_time_ms
-            }
+            },
+            "access_log": security_monitor.get_access_log_stats()
         }
     
     # 保护现有的路由
@@ -414,6 +415,8 @@ def setup_background_tasks(app: FastAPI):
     async def shutdown_event():
         """应用关闭时的清理任务"""
         logger.info("Shutting down security system...")
+        # 写完队列中剩余的API访问日志
+        security_monitor.shutdown()
 
 # 创建一个函数来保护现有的API路由
 def protect_api_routes(app: FastAPI):
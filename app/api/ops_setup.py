@@ -28,18 +28,19 @@ def register_operational_routes(
     @app.get("/db_stats")
     async def get_database_stats():
         try:
-            from simple_db_pool import get_db_pool
+            from core.database.connection import db_manager, get_pool_stats
 
-            pool = get_db_pool()
-            stats = pool.get_stats()
+            stats = db_manager.get_database_stats()
+            pools = get_pool_stats()
 
             return {
                 "status": "healthy",
-                "active_connections": stats["active_connections"],
-                "total_connections": stats["total_connections"],
-                "max_connections": stats["max_connections"],
-                "total_queries": stats["total_queries"],
-                "uptime_minutes": stats["uptime_minutes"],
+                "active_connections": sum(p["in_use_connections"] for p in pools),
+                "idle_connections": sum(p["idle_connections"] for p in pools),
+                "total_connections": sum(p["created_connections"] for p in pools),
+                "journal_mode": stats["journal_mode"],
+                "database_size_mb": stats["database_size_mb"],
+                "pools": pools,
             }
         except Exception as e:
             logger.error(f"获取数据库统计失败: {e}")
@@ -11,16 +11,22 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional, Tuple
 
 from app.core.settings import PATHS
+from core.conversation.consultation_turn_store import (
+    ROLE_PATIENT,
+    fetch_turns,
+    load_conversation_history,
+    materialize_conversation_log,
+)
+from core.database.connection import connect as db_connect
+from core.doctor_matching.doctor_index import get_doctor_specialty_index
 
 USER_HISTORY_DB_PATH = str(PATHS["data_dir"] / "user_history.sqlite")
 LEARNING_DB_PATH = str(PATHS["data_dir"] / "learning_db.sqlite")
 
 
 def _connect_user_history(*, row_factory: bool = False) -> sqlite3.Connection:
-    conn = sqlite3.connect(USER_HISTORY_DB_PATH)
-    if row_factory:
-        conn.row_factory = sqlite3.Row
-    return conn
+    # 连接池借出，调用方 close() 即归还
+    return db_connect(USER_HISTORY_DB_PATH, row_factory=sqlite3.Row if row_factory else None)
 
 
 def _derive_session_status(
@@ -464,6 +470,7 @@ def admin_add_doctor(doctor_data: Dict[str, Any]) -> Dict[str, Any]:
         )
         doctor_id = cursor.lastrowid
         conn.commit()
+        get_doctor_specialty_index().notify_changed()
         return {"status": "created", "doctor_id": doctor_id}
     finally:
         if conn:
@@ -513,6 +520,7 @@ def admin_update_doctor(doctor_id: int, doctor_data: Dict[str, Any]) -> Dict[str
         sql = f"UPDATE doctors SET {', '.join(update_fields)} WHERE id = ?"
         cursor.execute(sql, values)
         conn.commit()
+        get_doctor_specialty_index().notify_changed()
         return {"status": "updated"}
     finally:
         if conn:
@@ -537,6 +545,7 @@ def admin_approve_doctor(doctor_id: int) -> Dict[str, str]:
             (doctor_id,),
         )
         conn.commit()
+        get_doctor_specialty_index().notify_changed()
         return {"status": "approved"}
     finally:
         if conn:
@@ -561,6 +570,7 @@ def admin_reject_doctor(doctor_id: int) -> Dict[str, str]:
             (doctor_id,),
         )
         conn.commit()
+        get_doctor_specialty_index().notify_changed()
         return {"status": "rejected"}
     finally:
         if conn:
@@ -1450,12 +1460,9 @@ def fetch_conversation_history_bundle(
                 if not conversation_log:
                     continue
 
-                try:
-                    log_data = json.loads(conversation_log)
-                except json.JSONDecodeError:
-                    continue
+                log_data = materialize_conversation_log(cursor, log_row[0], conversation_log)
 
-                if "conversation_history" in log_data:
+                if log_data["conversation_history"]:
                     conversation_history = log_data["conversation_history"]
                     if isinstance(conversation_history, list):
                         for conv_item in conversation_history:
@@ -1781,7 +1788,7 @@ def fetch_user_sessions_summary(*, user_id: Optional[str]) -> List[Dict[str, Any
 
                 if row["conversation_log"]:
                     try:
-                        log_data = json.loads(row["conversation_log"])
+                        log_data = materialize_conversation_log(cursor, session_id, row["conversation_log"])
                         if isinstance(log_data, dict):
                             conversation_history = log_data.get("conversation_history", [])
                             if conversation_history and len(conversation_history) > 0:
@@ -1945,8 +1952,18 @@ def fetch_user_sessions_summary(*, user_id: Optional[str]) -> List[Dict[str, Any
             conn.close()
 
 
-def fetch_conversation_detail_data(session_id: str, user_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
-    """Fetch one conversation detail with normalized history and prescription info."""
+def fetch_conversation_detail_data(
+    session_id: str,
+    user_id: Optional[str] = None,
+    *,
+    after_seq: int = 0,
+    limit: Optional[int] = None,
+) -> Optional[Dict[str, Any]]:
+    """Fetch one conversation detail with normalized history and prescription info.
+
+    History is read from consultation_turns with keyset pagination: pass the
+    returned ``next_cursor`` as ``after_seq`` to fetch the next ``limit`` rounds.
+    """
     conn: Optional[sqlite3.Connection] = None
     try:
         conn = _connect_user_history(row_factory=True)
@@ -2007,23 +2024,14 @@ def fetch_conversation_detail_data(session_id: str, user_id: Optional[str] = Non
         except json.JSONDecodeError:
             conversation_log = {}
 
-        conversation_history: List[Dict[str, Any]] = []
         chief_complaint = "未记录"
         diagnosis_summary = "问诊记录"
         prescription_given = "未知"
         has_prescription = bool(row["prescription_id"])
 
-        if isinstance(conversation_log, dict):
-            conversation_history = conversation_log.get("conversation_history", [])
-        elif isinstance(conversation_log, list):
-            conversation_history = []
-            user_messages = [msg for msg in conversation_log if msg.get("type") == "user"]
-            ai_messages = [msg for msg in conversation_log if msg.get("type") == "ai"]
-            for i, user_msg in enumerate(user_messages):
-                item = {"patient_query": user_msg.get("content", "")}
-                if i < len(ai_messages):
-                    item["ai_response"] = ai_messages[i].get("content", "")
-                conversation_history.append(item)
+        conversation_history, next_cursor = load_conversation_history(
+            cursor, session_id, row["conversation_log"], after_seq, limit
+        )
 
         if conversation_history and len(conversation_history) > 0:
             for item in conversation_history:
@@ -2101,6 +2109,7 @@ def fetch_conversation_detail_data(session_id: str, user_id: Optional[str] = Non
             "session_id": session_id,
             "doctor_name": row["doctor_display_name"] or row["selected_doctor_id"],
             "conversation_history": conversation_history,
+            "next_cursor": next_cursor,
             "chief_complaint": chief_complaint,
             "diagnosis_summary": diagnosis_summary,
             "prescription_given": prescription_given,
@@ -2573,6 +2582,25 @@ def switch_doctor_conversation(*, user_id: str, doctor_id: str) -> Dict[str, Any
                     "message": f"上次对话已完成（处方ID: {prescription[0]}），已开启新对话",
                 }
 
+            turns = fetch_turns(cursor, consultation_id)
+            if turns:
+                messages = [
+                    {
+                        "type": "user" if turn["role"] == ROLE_PATIENT else "ai",
+                        "content": turn["content"],
+                        "time": turn["ts"],
+                        "timestamp": turn["ts"],
+                    }
+                    for turn in turns
+                ]
+                return {
+                    "consultation_id": consultation_id,
+                    "messages": messages,
+                    "is_new": False,
+                    "reason": "continue_unfinished_conversation",
+                    "message": f"继续未完成的对话（{len(messages)}条消息）",
+                }
+
             try:
                 log_data = json.loads(conversation_log) if conversation_log else {}
                 if isinstance(log_data, list):
@@ -92,6 +92,7 @@ PATHS = {
     "cache_db": PROJECT_ROOT / "data" / "cache.sqlite",
     "user_db": PROJECT_ROOT / "data" / "user_history.sqlite",
     "tcm_knowledge_graph_db": PROJECT_ROOT / "data" / "tcm_knowledge_graph.sqlite",
+    "sync_bus_db": PROJECT_ROOT / "data" / "realtime_sync.sqlite",
     "herb_database": PROJECT_ROOT / "data" / "unified_herb_database.json"
 }
 
@@ -101,6 +102,11 @@ API_CONFIG = {
     "port": _get_env_int("PORT", 8000, "SERVER_PORT"),
     "workers": _get_env_int("WORKERS", 1, "UVICORN_WORKERS"),
     "log_level": _get_env_str("LOG_LEVEL", "INFO"),
+    # 多设备实时同步：跨worker消息总线(sqlite/local)、轮询间隔、事件保留时间、每设备待发送上限
+    "sync_backplane": _get_env_str("SYNC_BACKPLANE", "sqlite"),
+    "sync_poll_interval_ms": _get_env_int("SYNC_POLL_INTERVAL_MS", 50),
+    "sync_event_retention_seconds": _get_env_int("SYNC_EVENT_RETENTION_SECONDS", 60),
+    "sync_channel_max_pending": _get_env_int("SYNC_CHANNEL_MAX_PENDING", 256),
 }
 
 # 数据库配置
@@ -124,6 +130,23 @@ AI_CONFIG = {
     "multimodal_timeout": _multimodal_timeout,
     # 决策树生成专用模型
     "decision_tree_model": _get_env_str("DECISION_TREE_MODEL", "qwen3.5-omni-plus-2026-03-15"),
+    # 决策树匹配：关键词预筛后仅对前N个候选并发调用AI语义打分
+    "decision_tree_match_candidates": _get_env_int("DECISION_TREE_MATCH_CANDIDATES", 8),
+    "decision_tree_match_concurrency": _get_env_int("DECISION_TREE_MATCH_CONCURRENCY", 4),
+    "decision_tree_match_timeout": _get_env_int("DECISION_TREE_MATCH_TIMEOUT", 20),
+    # 大模型统一网关：后端(auto/http/sdk/fake)、连接池上限、每个模型的并发上限
+    "llm_backend": _get_env_str("LLM_BACKEND", "auto"),
+    "llm_base_url": _get_env_str("LLM_BASE_URL", "https://dashscope.aliyuncs.com/api/v1", "DASHSCOPE_BASE_URL"),
+    "llm_max_connections": _get_env_int("LLM_MAX_CONNECTIONS", 32),
+    "llm_model_concurrency": _get_env_int("LLM_MODEL_CONCURRENCY", 8),
+    # 按模型覆盖并发上限，格式：model=N,model2=M
+    "llm_model_concurrency_overrides": _get_env_csv("LLM_MODEL_CONCURRENCY_OVERRIDES", ""),
+    # 向量化：后端(dashscope/hashing)、合批等待时间与单批上限、内存LRU容量
+    "embedding_model": _get_env_str("EMBEDDING_MODEL", "text-embedding-v4"),
+    "embedding_backend": _get_env_str("EMBEDDING_BACKEND", "dashscope"),
+    "embedding_batch_window_ms": _get_env_int("EMBEDDING_BATCH_WINDOW_MS", 5),
+    "embedding_max_batch_size": _get_env_int("EMBEDDING_MAX_BATCH_SIZE", 10),
+    "embedding_memory_entries": _get_env_int("EMBEDDING_MEMORY_ENTRIES", 4096),
     # OCR服务配置（兼容旧变量名）
     "baidu_ocr_api_key": _get_env_str("BAIDU_OCR_API_KEY", "", "BAIDU_API_KEY"),
     "baidu_ocr_secret_key": _get_env_str("BAIDU_OCR_SECRET_KEY", "", "BAIDU_SECRET_KEY"),
@@ -2,16 +2,15 @@
 # -*- coding: utf-8 -*-
 """
 真实的AI处方分析服务
-使用阿里云Dashscope API进行真实的中医处方智能分析
+使用阿里云Dashscope API进行真实的中医处方智能分析（经由统一大模型网关）
 """
 
-import dashscope
-from dashscope import MultiModalConversation
 import logging
 import json
 import re
 from typing import Dict, List, Optional
 from config.settings import AI_CONFIG
+from core.llm import get_llm_gateway
 
 logger = logging.getLogger(__name__)
 
@@ -21,7 +20,7 @@ class AIPrescriptionAnalyzer:
     def __init__(self):
         self.model = AI_CONFIG.get("main_model", "qwen3.5-omni-plus-2026-03-15")
 
-    def analyze_prescription_comprehensive(self, prescription_content: str, diagnosis: str = "", symptoms: str = "") -> Dict:
+    async def analyze_prescription_comprehensive(self, prescription_content: str, diagnosis: str = "", symptoms: str = "") -> Dict:
         """
         全面分析处方
 
@@ -113,17 +112,15 @@ class AIPrescriptionAnalyzer:
 }}
 """
 
-            response = MultiModalConversation.call(
+            result_text = (await get_llm_gateway().complete_text(
+                [{"role": "user", "content": prompt}],
                 model=self.model,
-                messages=[{"role": "user", "content": [{"text": prompt}]}],
+                call_site="prescription_ai.comprehensive",
                 max_tokens=2000,
                 temperature=0.3,
                 top_p=0.8
-            )
-
-            if response.status_code == 200:
-                result_text = response.output.choices[0].message.content[0]["text"].strip()
-
+            )).strip()
+            if result_text:
                 # 提取JSON内容
                 json_match = re.search(r'\{[\s\S]*\}', result_text)
                 if json_match:
@@ -134,14 +131,14 @@ class AIPrescriptionAnalyzer:
                     logger.error("❌ 无法从AI响应中提取JSON")
                     return self._get_fallback_analysis()
             else:
-                logger.error(f"❌ AI API调用失败: {response.code} - {response.message}")
+                logger.error("❌ AI API返回内容为空")
                 return self._get_fallback_analysis()
 
         except Exception as e:
             logger.error(f"❌ AI处方分析失败: {e}")
             return self._get_fallback_analysis()
 
-    def analyze_prescription_safety(self, prescription_content: str) -> Dict:
+    async def analyze_prescription_safety(self, prescription_content: str) -> Dict:
         """
         安全性分析
 
@@ -178,16 +175,15 @@ class AIPrescriptionAnalyzer:
 }}
 """
 
-            response = MultiModalConversation.call(
+            result_text = (await get_llm_gateway().complete_text(
+                [{"role": "user", "content": prompt}],
                 model=self.model,
-                messages=[{"role": "user", "content": [{"text": prompt}]}],
+                call_site="prescription_ai.safety",
                 max_tokens=1500,
                 temperature=0.2,
                 top_p=0.7
-            )
-
-            if response.status_code == 200:
-                result_text = response.output.choices[0].message.content[0]["text"].strip()
+            )).strip()
+            if result_text:
                 json_match = re.search(r'\{[\s\S]*\}', result_text)
                 if json_match:
                     result = json.loads(json_match.group())
@@ -200,7 +196,7 @@ class AIPrescriptionAnalyzer:
             logger.error(f"❌ AI安全性分析失败: {e}")
             return self._get_fallback_safety_analysis()
 
-    def analyze_risk_assessment(self, prescriptions_data: List[Dict]) -> Dict:
+    async def analyze_risk_assessment(self, prescriptions_data: List[Dict]) -> Dict:
         """
         批量处方风险评估
 
@@ -253,16 +249,15 @@ class AIPrescriptionAnalyzer:
 }}
 """
 
-            response = MultiModalConversation.call(
+            result_text = (await get_llm_gateway().complete_text(
+                [{"role": "user", "content": prompt}],
                 model=self.model,
-                messages=[{"role": "user", "content": [{"text": prompt}]}],
+                call_site="prescription_ai.risk",
                 max_tokens=2000,
                 temperature=0.3,
                 top_p=0.8
-            )
-
-            if response.status_code == 200:
-                result_text = response.output.choices[0].message.content[0]["text"].strip()
+            )).strip()
+            if result_text:
                 json_match = re.search(r'\{[\s\S]*\}', result_text)
                 if json_match:
                     result = json.loads(json_match.group())
@@ -275,7 +270,7 @@ class AIPrescriptionAnalyzer:
             logger.error(f"❌ AI风险评估失败: {e}")
             return self._get_fallback_risk_assessment(len(prescriptions_data))
 
-    def generate_insights(self, stats: Dict, recent_prescriptions: List[Dict] = None) -> Dict:
+    async def generate_insights(self, stats: Dict, recent_prescriptions: List[Dict] = None) -> Dict:
         """
         生成AI洞察分析
 
@@ -333,16 +328,15 @@ class AIPrescriptionAnalyzer:
 }}
 """
 
-            response = MultiModalConversation.call(
+            result_text = (await get_llm_gateway().complete_text(
+                [{"role": "user", "content": prompt}],
                 model=self.model,
-                messages=[{"role": "user", "content": [{"text": prompt}]}],
+                call_site="prescription_ai.insights",
                 max_tokens=1500,
                 temperature=0.4,
                 top_p=0.8
-            )
-
-            if response.status_code == 200:
-                result_text = response.output.choices[0].message.content[0]["text"].strip()
+            )).strip()
+            if result_text:
                 json_match = re.search(r'\{[\s\S]*\}', result_text)
                 if json_match:
                     result = json.loads(json_match.group())
@@ -17,6 +17,13 @@ from .template_prompt_generator_simple import (
     get_simple_prompt_generator
 )
 
+from .response_sanitizer import (
+    ResponseSanitizer,
+    SanitizationReport,
+    SanitizationResult,
+    get_response_sanitizer
+)
+
 __all__ = [
     'ResponseStage',
     'TemplateContext',
@@ -25,5 +32,9 @@ __all__ = [
     'PromptType',
     'TemplatePromptContext',
     'TemplatePromptGenerator',
-    'get_prompt_generator'
+    'get_prompt_generator',
+    'ResponseSanitizer',
+    'SanitizationReport',
+    'SanitizationResult',
+    'get_response_sanitizer'
 ]
\ No newline at end of file
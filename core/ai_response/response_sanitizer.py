@@ -0,0 +1,894 @@
+#!/usr/bin/env python3
+"""
+AI回复后处理引擎（预编译规则表）
+
+每条AI回复都要经过 api/main.py 中的一串后处理：
+sanitize_ai_response（内含 check_medical_safety / detect_fabricated_examination /
+check_symptom_fabrication）、normalize_prescription_dosage、standardize_prescription_format、
+enhance_diagnosis_format、detect_and_filter_western_medicine。
+原实现每次调用都以字符串形式重新传入上百条正则，绝大多数规则对一条回复根本不可能命中，
+却仍然各自完整扫描一遍文本。
+
+本模块把这些规则整理为声明式规则表，在导入时一次性编译：
+
+- 每条规则从正则中推导出"必现文字"（如 r'吾观其舌.*[淡红紫暗]' 必须包含 吾观其舌），
+  先做子串判断，文字不全时直接跳过，不再运行正则
+- 只有命中的规则才执行替换，并记录到 SanitizationReport.fired
+
+规则、顺序与替换文本与原函数完全一致，输出逐字节相同（见 tests/benchmarks/bench_response_sanitizer.py）。
+
+用法：
+    sanitizer = get_response_sanitizer()
+    result = sanitizer.process(reply, has_tongue_image=False, original_patient_message=message)
+    result.text, result.report.fired
+"""
+
+import logging
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Pattern, Tuple
+
+from core.prescription.herb_extraction import extract_herb_dosage_pairs
+
+logger = logging.getLogger(__name__)
+
+_QUANTIFIERS = "*?+{"
+_METACHARS = ".^$*+?{}|"
+
+
+def required_literals(pattern: str, flags: int = 0) -> Tuple[str, ...]:
+    """
+    正则匹配成功时文本中必然出现的文字片段（保守推导）
+
+    只取顶层的普通字符：字符类、分组（含前后断言）、带量词的字符都不计入；
+    顶层出现 | 时无法推导，返回空元组（即不做预筛）。
+    """
+    runs: List[str] = []
+    current: List[str] = []
+    depth = 0
+    index = 0
+
+    def flush():
+        if current:
+            runs.append("".join(current))
+            current.clear()
+
+    while index < len(pattern):
+        char = pattern[index]
+        if char == "\\":
+            escaped = pattern[index + 1:index + 2]
+            index += 2
+            if depth:
+                continue
+            if escaped and not escaped.isalnum():
+                current.append(escaped)  # \* \. 等转义为普通字符
+            else:
+                flush()  # \s \d \n 等为字符类
+            continue
+        if char == "[":
+            index += 1
+            if pattern[index:index + 1] == "^":
+                index += 1
+            if pattern[index:index + 1] == "]":
+                index += 1
+            while index < len(pattern) and pattern[index] != "]":
+                index += 2 if pattern[index] == "\\" else 1
+            index += 1
+            if not depth:
+                flush()
+            continue
+        if char == "(":
+            depth += 1
+            flush()
+            index += 1
+            continue
+        if char == ")":
+            depth -= 1
+            index += 1
+            continue
+        index += 1
+        if depth:
+            continue
+        if char == "|":
+            return ()
+        if char == "{":
+            index = pattern.find("}", index) + 1 or len(pattern)
+        if char in _QUANTIFIERS and current:
+            current.pop()  # 量词作用于前一个字符，该字符不是必现的
+        if char in _METACHARS:
+            flush()
+            continue
+        current.append(char)
+    flush()
+
+    if flags & re.IGNORECASE:
+        runs = [run for run in runs if run.lower() == run.upper()]
+    return tuple(runs)
+
+
+@dataclass(frozen=True)
+class SanitizationRule:
+    """一条预编译规则：requires 全部出现且 any_of（若有）至少出现一个时才运行正则"""
+    rule_id: str
+    regex: Pattern
+    requires: Tuple[str, ...] = ()
+    any_of: Tuple[str, ...] = ()
+    replacement: Optional[str] = None
+    description: str = ""
+
+
+def _rule(rule_id: str, pattern: str, flags: int = 0, replacement: Optional[str] = None,
+          description: str = "", requires: Optional[Tuple[str, ...]] = None,
+          any_of: Tuple[str, ...] = ()) -> SanitizationRule:
+    return SanitizationRule(
+        rule_id=rule_id,
+        regex=re.compile(pattern, flags),
+        requires=required_literals(pattern, flags) if requires is None else requires,
+        any_of=any_of,
+        replacement=replacement,
+        description=description,
+    )
+
+
+@dataclass
+class SanitizationReport:
+    """一次后处理的命中记录；regex_scans 为实际运行的正则次数，skipped 为被文字预筛跳过的次数"""
+    fired: List[str] = field(default_factory=list)
+    regex_scans: int = 0
+    skipped: int = 0
+
+    def fire(self, rule_id: str):
+        self.fired.append(rule_id)
+
+
+@dataclass
+class SanitizationResult:
+    """完整后处理流水线的结果"""
+    text: str
+    is_safe: bool
+    safety_message: str
+    has_western_content: bool
+    report: SanitizationReport
+
+
+class _TextView:
+    """当前版本的文本及其命中记录；规则先做子串预筛，通过后才运行正则"""
+
+    __slots__ = ("text", "report")
+
+    def __init__(self, text: str, report: SanitizationReport):
+        self.text = text
+        self.report = report
+
+    def update(self, text: str):
+        self.text = text
+
+    def has(self, literal: str) -> bool:
+        return literal in self.text
+
+    def admits(self, rule: SanitizationRule) -> bool:
+        text = self.text
+        for literal in rule.requires:
+            if literal not in text:
+                self.report.skipped += 1
+                return False
+        if rule.any_of:
+            for literal in rule.any_of:
+                if literal in text:
+                    break
+            else:
+                self.report.skipped += 1
+                return False
+        self.report.regex_scans += 1
+        return True
+
+    def search(self, rule: SanitizationRule):
+        return rule.regex.search(self.text) if self.admits(rule) else None
+
+    def sub(self, rule: SanitizationRule, replacement=None) -> int:
+        """在当前文本上执行替换，返回替换次数"""
+        if not self.admits(rule):
+            return 0
+        text, count = rule.regex.subn(rule.replacement if replacement is None else replacement, self.text)
+        if count:
+            self.update(text)
+            self.report.fire(rule.rule_id)
+        return count
+
+
+# ============================================================
+# 规则表
+# ============================================================
+
+# 症状编造：(正则, 描述)
+SYMPTOM_FABRICATION_PATTERNS: Tuple[Tuple[str, str], ...] = (
+    # 便秘相关编造
+    (r'大便干结.*栗', "大便干结如栗"),
+    (r'数日一行', "数日一行"),
+    (r'大便.*干.*硬', "大便干硬"),
+    (r'大便干结', "大便干结"),  # 患者只说便秘，AI添加具体描述
+    (r'排便困难', "排便困难"),  # 患者未描述的排便情况
+
+    # 消化系统编造
+    (r'腹胀.*嗳气', "腹胀嗳气"),
+    (r'腹胀不舒', "腹胀不舒"),
+    (r'嗳气频频', "嗳气频频"),
+    (r'食欲不佳', "食欲不佳"),
+    (r'食欲不振', "食欲不振"),  # 患者只说挑食，AI编造食欲状态
+
+    # 体征编造
+    (r'面色[苍白萎黄]', "面色苍白/萎黄"),
+    (r'精神疲倦', "精神疲倦"),
+    (r'精神.*不振', "精神不振"),
+    (r'神疲乏力', "神疲乏力"),
+    (r'精神倦怠', "精神倦怠"),  # 患者未描述的精神状态
+
+    # 时间和程度编造
+    (r'.*已久', "持续时间编造(已久)"),
+    (r'.*数日', "时间编造(数日)"),
+    (r'.*不舒', "程度编造(不舒)"),
+)
+
+# 严格的望诊切诊编造检测：(正则, 描述)
+STRICT_TONGUE_PULSE_PATTERNS: List[Tuple[str, str]] = [
+    # 望诊编造模式 - 更严格
+    (r'面色[^，。]*?淡白', "面色淡白描述"),
+    (r'面色[^，。]*?略红', "面色略红描述"),
+    (r'面色[^，。]*?苍白', "面色苍白描述"),
+    (r'面色[^，。]*?潮红', "面色潮红描述"),
+    (r'舌质[^，。]*?淡红', "舌质淡红描述"),
+    (r'舌质[^，。]*?红', "舌质红描述"),
+    (r'舌质[^，。]*?暗', "舌质暗描述"),
+    (r'苔[^，。]*?薄白', "苔薄白描述"),
+    (r'苔[^，。]*?薄黄', "苔薄黄描述"),
+    (r'苔[^，。]*?厚', "苔厚描述"),
+    (r'舌边[^，。]*?齿痕', "舌边齿痕描述"),
+    (r'舌尖[^，。]*?红', "舌尖红描述"),
+
+    # 切诊编造模式 - 更严格
+    (r'脉[^，。]*?浮', "脉浮描述"),
+    (r'脉[^，。]*?沉', "脉沉描述"),
+    (r'脉[^，。]*?缓', "脉缓描述"),
+    (r'脉[^，。]*?数', "脉数描述"),
+    (r'脉[^，。]*?细', "脉细描述"),
+    (r'脉[^，。]*?弱', "脉弱描述"),
+    (r'脉[^，。]*?滑', "脉滑描述"),
+    (r'脉[^，。]*?弦', "脉弦描述"),
+    (r'脉象[^，。]*?浮缓', "脉象浮缓描述"),
+    (r'脉象[^，。]*?细弱', "脉象细弱描述"),
+    (r'脉象[^，。]*?沉细', "脉象沉细描述"),
+
+    # 组合编造模式
+    (r'提示.*?不足', "提示证候描述"),
+    (r'说明.*?未', "说明病机描述"),
+]
+
+# 无根据的舌象/脉象描述（re.findall 的结果会原样写入错误信息）
+DANGEROUS_TONGUE_PULSE_PATTERNS: Tuple[str, ...] = (
+    # 舌象相关 - 基础模式
+    r'吾观其舌.*[淡红紫暗]',           # "吾观其舌淡红"等明显编造
+    r'舌质[淡红紫暗].*苔[薄厚][白黄腻]',    # 完整舌象描述
+    r'望诊所见.*舌苔.*[薄厚][白黄腻]',     # 望诊中的舌象
+    r'舌[质色][淡红紫暗].*[，,].*苔',      # 舌质+苔象组合
+    r'舌边.*齿痕.*苔',                    # 舌边齿痕+苔象
+    r'观其舌象.*[淡红紫暗]',              # "观其舌象"
+    r'舌诊.*[淡红紫暗].*苔',              # 舌诊相关
+    r'舌[淡红紫暗][，,].*苔[薄厚少][白黄腻]',  # "舌淡红，苔薄白"格式
+    r'<望诊所见>.*舌.*[淡红紫暗].*苔.*</望诊所见>', # XML格式中的望诊
+    r'舌.*[淡红紫暗].*或.*苔',            # "舌淡红或少苔"等
+    r'苔[薄厚][白黄腻]或[少无]苔',         # "苔薄白或少苔"等
+
+    # 舌象相关 - 强化模式
+    r'舌象[：:].*舌.*[红白黄]',            # "舌象：舌边尖红"等模式
+    r'舌边[尖]?红',                       # "舌边红"、"舌边尖红"
+    r'苔薄[白黄]或薄[黄白]',               # "苔薄白或薄黄"
+    r'舌.*红.*[，,].*苔.*[白黄]',         # "舌边尖红，苔薄白"
+    r'舌边.*红.*苔',                      # 舌边红+苔象组合
+    r'舌.*尖.*红',                        # "舌尖红"等
+    r'舌.*[边尖].*红.*苔',                # 舌边尖红+苔象
+    r'舌.*苔.*[薄厚].*[白黄腻]',          # 任何舌苔具体描述
+    r'舌苔.*[薄厚].*[白黄腻]',            # 直接的舌苔描述
+    r'舌.*红.*或.*苔',                    # "舌红或苔白"等模式
+
+    # 脉象相关 - 基础模式
+    r'脉象[濡缓细数弦滑沉浮洪微]',         # "脉象濡缓"等编造
+    r'脉[濡缓细数弦滑沉浮洪微][，,]',      # "脉缓，"等编造
+    r'脉.*[濡缓细数弦滑沉浮洪微].*[，,]',  # "脉象缓弱，"等
+    r'切诊.*脉.*[濡缓细数弦滑沉浮洪微]',   # 切诊中的脉象
+    r'<望诊所见>.*脉.*[濡缓细数弦滑沉浮洪微].*</望诊所见>', # XML中脉象
+    r'脉诊.*[濡缓细数弦滑沉浮洪微]',       # 脉诊相关
+    r'诊得.*脉.*[濡缓细数弦滑沉浮洪微]',   # "诊得脉象"
+    r'按其脉.*[濡缓细数弦滑沉浮洪微]',     # "按其脉"等
+
+    # 脉象相关 - 强化模式
+    r'脉象[：:].*脉.*[濡缓细数弦滑沉浮洪微]',  # "脉象：脉浮数"等
+    r'脉浮数',                            # 具体的脉象描述
+    r'脉.*浮.*数',                        # "脉浮数"等组合
+    r'脉.*[濡缓细数弦滑沉浮洪微].*[濡缓细数弦滑沉浮洪微]', # 多个脉象特征
+
+    # 通用医疗信息编造模式
+    r'辨证要点.*舌象',                    # 辨证要点中提到舌象
+    r'辨证要点.*脉象',                    # 辨证要点中提到脉象
+    r'望诊.*舌',                          # 望诊提到舌
+    r'切诊.*脉',                          # 切诊提到脉
+    r'四诊.*舌.*脉',                      # 四诊中同时提到舌脉
+)
+
+# 患者自述中可被AI引用的舌象/脉象特征
+PATIENT_TONGUE_FEATURES = ("淡红", "红", "暗红", "紫", "薄白", "厚白", "黄", "腻", "齿痕")
+PATIENT_PULSE_FEATURES = ("濡", "缓", "细", "数", "弦", "滑", "沉", "浮", "洪", "微", "脉象", "脉搏")
+
+# 需要过滤的西医内容
+WESTERN_MEDICINE_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    # 西药名称 - 只保留明确的西药推荐
+    '西药': ('奥美拉唑', '阿司匹林', '布洛芬', '头孢', '阿莫西林', '青霉素', '氨茶碱',
+           '地塞米松', '泼尼松', '美托洛尔', '硝苯地平', '阿托伐他汀', '二甲双胍',
+           '胰岛素', '华法林', '氯吡格雷', '雷贝拉唑', '多潘立酮', '蒙脱石散'),
+
+    # 西医检查项目 - 只检测明确的检查建议
+    '检查建议': ('建议做CT', '建议做MRI', '建议做核磁', '建议做B超', '建议做彩超',
+               '建议做X光', '建议做胃镜', '建议做肠镜', '需要做血常规', '需要查肝功能',
+               '建议病理检查', '建议活检', '建议穿刺', '建议造影'),
+
+    # 明确的西医诊断术语 - 只保留严重疾病
+    '严重疾病': ('癌症', '恶性肿瘤', '心肌梗死', '脑梗死'),
+}
+
+# 中医上下文关键词 - 回复包含这些时只检测明确的西药推荐
+TCM_CONTEXT_KEYWORDS = ('中医', '中药', '辨证', '脏腑', '经络', '气血', '阴阳', '寒热', '虚实',
+                        '风寒', '风热', '湿热', '痰湿', '血瘀', '气滞', '肝郁', '脾虚', '肾虚',
+                        '温阳', '滋阴', '清热', '祛湿', '化痰', '活血', '理气', '证候', '方剂')
+
+# 加粗显示的医学术语与症状
+EMPHASIZED_MEDICAL_TERMS = ('辨证论治', '证型', '病机', '治法', '方剂', '加减',
+                            '脾虚', '肝郁', '肾阳虚', '肾阴虚', '血瘀', '痰湿',
+                            '风寒', '风热', '湿热', '寒湿', '气滞', '血虚')
+EMPHASIZED_SYMPTOMS = ('头痛', '发热', '咳嗽', '胸闷', '腹痛', '便秘', '腹泻', '失眠', '疲倦')
+
+_OBSERVATION_SAFE_HINT = '<望诊所见>因未上传舌象图片，建议患者在充足光线下拍摄舌象照片以便更准确的望诊分析。</望诊所见>'
+_PRESCRIPTION_ADVICE_NOTICE = '💊 处方建议\n\n⚠️ 为确保用药安全，具体的处方建议需要由执业中医师根据患者的具体情况，通过面诊后才能开具。\n\n建议患者：\n1. 及时到正规中医院就诊\n2. 由专业中医师进行四诊合参\n3. 根据具体证型开具个性化处方\n\n'
+_HERB_COMPOSITION_NOTICE = '💊 药物组成\n\n⚠️ 处方的具体药物组成需要由执业中医师根据患者的具体病情，通过详细诊察后才能确定。\n\n请到正规中医医院进行专业诊疗。\n\n'
+_DECOCTION_NOTICE = '⚡ 用药指导\n\n具体的煎制和服用方法应当遵循执业中医师的专业指导。\n\n'
+_MODIFICATION_NOTICE = '🔄 后续调整\n\n具体的药物加减应当由执业中医师根据患者病情变化进行专业调整。\n\n'
+_SECTION_END = r'(?=🔥|⚡|📜|🔄|🎯|---|\n\n\*|$)'
+
+
+def _symptom_keywords(pattern: str) -> Tuple[str, ...]:
+    """患者消息中出现任一关键词即视为症状有出处（与原实现的取词方式一致）"""
+    keywords = re.findall(r'[\u4e00-\u9fff]+', pattern.replace('.*', '').replace('[', '').replace(']', ''))
+    return tuple(keyword for keyword in keywords if len(keyword) > 1)
+
+
+_SYMPTOM_RULES = tuple(
+    (_rule(f"symptom.{description}", pattern, description=description), _symptom_keywords(pattern))
+    for pattern, description in SYMPTOM_FABRICATION_PATTERNS
+)
+
+# (规则, 是否切诊规则)
+_EXAMINATION_RULES = tuple(
+    (_rule(f"examination.{description}", pattern, description=description), "脉" in pattern)
+    for pattern, description in STRICT_TONGUE_PULSE_PATTERNS
+)
+
+_DANGEROUS_RULES = tuple(
+    _rule(f"tongue_pulse.{index}", pattern) for index, pattern in enumerate(DANGEROUS_TONGUE_PULSE_PATTERNS)
+)
+
+# sanitize：未做实际舌诊时的清理
+_OBSERVATION_XML = _rule("sanitize.observation_xml", r'<望诊所见>.*?</望诊所见>', re.DOTALL, _OBSERVATION_SAFE_HINT)
+_KEY_POINT_TONGUE = _rule("sanitize.key_point_tongue", r'- 舌象：.*?[\n\r]',
+                          replacement='- 舌象：因未进行实际舌诊，建议患者面诊时由医师观察舌象\n')
+_KEY_POINT_PULSE = _rule("sanitize.key_point_pulse", r'- 脉象：.*?[\n\r]',
+                         replacement='- 脉象：因未进行实际脉诊，建议患者面诊时由医师进行脉象诊断\n')
+
+# 明确的编造描述，前文出现 如/若/见 等教学语境词时保留
+_FABRICATION_RULES = tuple(_rule(f"sanitize.fabrication.{index}", pattern) for index, pattern in enumerate((
+    r'舌象[：:].*?[，。\n]',  # "舌象：淡红苔白"
+    r'患者舌边尖红[，。]?',   # "患者舌边尖红"
+    r'患者苔薄[白黄][，。]?', # "患者苔薄白"
+    r'脉象[：:].*?[，。\n]',  # "脉象：浮数有力"
+    r'患者脉[浮沉缓数弦滑][，。]?', # "患者脉浮数"
+    r'^脉[浮沉缓数弦滑][，。]',     # 句首的"脉浮数，"
+    r'脉[浮沉缓数弦滑]+，有力[，。]?', # "脉浮数，有力"
+    r'^舌质[淡红][，。]',          # 句首的"舌质淡红，"
+    r'舌质淡红，苔薄[白黄腻][，。]?', # "舌质淡红，苔薄腻"
+)))
+_FABRICATION_CONTEXT = ('如', '若', '见', '或', '常见', '多为')
+
+_INSPECTION_SECTION = _rule(
+    "sanitize.inspection_section", r'(?:1\.|###)?\s*望诊[：:]?.*?(?=(?:2\.|###|$))', re.DOTALL,
+    '1. 望诊\n\n- 未进行实际望诊，建议患者提供舌象照片或寻求面诊。\n\n')
+_PALPATION_SECTION = _rule(
+    "sanitize.palpation_section", r'(?:4\.|###)?\s*切诊[：:]?.*?(?=(?:5\.|###|$))', re.DOTALL,
+    '4. 切诊\n\n- 未进行实际切诊，脉象诊断需要专业中医师面诊确定。\n\n')
+_OBSERVATION_XML_STRICT = _rule(
+    "sanitize.observation_xml_strict", r'<望诊所见>.*?</望诊所见>', re.DOTALL,
+    '<望诊所见>未进行实际望诊，建议患者上传舌象照片或面诊</望诊所见>')
+
+# 处方编造：任一触发规则命中即整体清理
+_PRESCRIPTION_TRIGGERS = tuple(_rule(f"prescription.trigger.{index}", pattern, re.DOTALL) for index, pattern in enumerate((
+    r'💊 处方建议.*?' + _SECTION_END,              # 整个处方建议部分
+    r'💊 药物组成.*?' + _SECTION_END,              # 药物组成部分
+    r'处方组成[：:].*?' + _SECTION_END,            # 处方组成部分
+    r'煎制方法[：:].*?(?=服用方法|🔥|⚡|📜|🔄|🎯|---|\n\n\*|$)',  # 煎制方法
+    r'服用方法[：:].*?' + _SECTION_END,            # 服用方法
+)))
+_PRESCRIPTION_ADVICE = _rule("prescription.advice", r'💊 处方建议.*?' + _SECTION_END, re.DOTALL,
+                             _PRESCRIPTION_ADVICE_NOTICE)
+_HERB_COMPOSITION = _rule("prescription.composition", r'💊 药物组成.*?' + _SECTION_END, re.DOTALL,
+                          _HERB_COMPOSITION_NOTICE)
+# 未做舌诊时的清理版本：煎服指导/辨证加减截止到下一个分段
+_DECOCTION_GUIDE_SECTIONED = _rule(
+    "prescription.decoction_guide", r'⚡ 煎服指导\s*.*?(?=---|\n\n[🔥⚡📜🔄]|\n\n[【\[]|$)', re.DOTALL,
+    _DECOCTION_NOTICE)
+_MODIFICATION_SECTIONED = _rule(
+    "prescription.modification", r'🔄 辨证加减\s*.*?(?=---|\n\n[🔥⚡📜🔄]|\n\n[【\[]|$)', re.DOTALL,
+    _MODIFICATION_NOTICE)
+# 总是执行的清理版本：截止到下一个标记符号
+_DECOCTION_GUIDE = _rule("prescription.decoction_guide", r'⚡ 煎服指导.*?' + _SECTION_END, re.DOTALL,
+                         _DECOCTION_NOTICE)
+_MODIFICATION = _rule("prescription.modification", r'🔄 辨证加减.*?' + _SECTION_END, re.DOTALL,
+                      _MODIFICATION_NOTICE)
+
+_APPEARANCE_RULES = tuple(
+    _rule(f"sanitize.appearance.{index}", pattern, replacement=replacement, description=pattern)
+    for index, (pattern, replacement) in enumerate((
+        (r'面色[略显]?[苍白红润黯淡][，。]?', '面色需要面诊观察'),
+        (r'精神[疲倦萎靡不振倦怠][，。]?', '精神状态需要面诊评估'),
+        (r'舌体[胖大瘦薄][，。]?', '舌体特征需要面诊检查'),
+        (r'舌边[有齿痕无异常][，。]?', '舌边情况需要面诊确认'),
+    ))
+)
+_SAFETY_NOTICE = "\n\n**提醒**：以上建议仅供参考，如症状严重请及时就医。"
+
+# 处方用量：范围用量转为确定用量
+_DOSAGE_RANGE = _rule("dosage.range", r'(\w+)\s+(\d+)-(\d+)g')
+
+# 处方格式统一
+_PRESCRIPTION_TAG_CLEANUP = (
+    _rule("prescription_format.duplicate_starred_tag", r'\*\*【处方】\*\*[\s\n]*\*\*【处方】\*\*',
+          replacement='**【处方】**'),
+    _rule("prescription_format.duplicate_tag", r'【处方】[\s\n]*【处方】', replacement='【处方】'),
+    _rule("prescription_format.dangling_stars", r'\*\*【处方】\*\*[\s\n]*\*\*\*\*', replacement='**【处方】**'),
+)
+_PRESCRIPTION_BLOCKS = (
+    # 表格格式
+    _rule("prescription_format.table", r'(?:\|\s*药物.*?\|.*?\n.*?---.*?\n)(.*?)(?=\n\n|---|###|$)',
+          re.DOTALL | re.IGNORECASE, requires=("药物", "---", "\n")),
+    # XML格式
+    _rule("prescription_format.xml", r'<处方[^>]*>(.*?)</处方>', re.DOTALL | re.IGNORECASE),
+    # 标准标记格式
+    _rule("prescription_format.tag", r'【处方】[：:]?\s*(.*?)(?=\n\n|【[^】]*】|\*\*【|$)',
+          re.DOTALL | re.IGNORECASE),
+    _rule("prescription_format.starred_tag", r'\*\*【处方】\*\*[：:]?\s*(.*?)(?=\n\n|【[^】]*】|\*\*【|$)',
+          re.DOTALL | re.IGNORECASE),
+    # 其他常见格式
+    _rule("prescription_format.generic", r'(?:处方|方剂|药方)[：:]?\s*(.*?)(?=\n\n|\n【|\n\*\*|$)',
+          re.DOTALL | re.IGNORECASE, any_of=("处方", "方剂", "药方")),
+)
+
+# 诊疗方案格式增强
+_SECTION_TITLE = _rule("format.section_title", r'【([^】]+)】', replacement=r'## **🔸 \1**')
+_REMINDER = _rule("format.reminder", r'(请.*?就医|建议.*?医师|注意.*?事项)', replacement=r'> **⚠️ \1**',
+                  any_of=("请", "建议", "注意"))
+_FORMULA_NAME = _rule("format.formula_name", r'([一-九十]+[汤|散|丸|膏|汁|饮])', replacement=r'**📜 `\1`**',
+                      any_of=("汤", "|", "散", "丸", "膏", "汁", "饮"))
+
+# 西医内容过滤：西药推荐语句与检查建议语句
+_WESTERN_DRUG_RULES = tuple(
+    _rule(f"western.drug.{keyword}", template.format(keyword=keyword), replacement="")
+    for keyword in WESTERN_MEDICINE_KEYWORDS['西药']
+    for template in ("建议服用{keyword}[^。]*。?", "可以用{keyword}[^。]*。?", "推荐{keyword}[^。]*。?", "使用{keyword}[^。]*。?")
+)
+_WESTERN_EXAM_RULES = tuple(
+    _rule(f"western.examination.{keyword}", f"{keyword}[^。]*。?", replacement="")
+    for keyword in WESTERN_MEDICINE_KEYWORDS['检查建议']
+)
+_EXTRA_BLANK_LINES = _rule("western.blank_lines", r'\n\s*\n\s*\n', replacement='\n\n', requires=("\n",))
+
+
+def generate_enhanced_prescription_format(herbs: list) -> str:
+    """生成增强版处方格式 - 层次分明、视觉美观"""
+
+    # 🎯 处方标题 - 显眼的标题
+    prescription_text = "\n\n" + "=" * 50 + "\n"
+    prescription_text += "# 🏥 **中医处方单**\n"
+    prescription_text += "=" * 50 + "\n\n"
+
+    # 💊 处方内容 - 清晰的药物列表
+    prescription_text += "## **📋 处方组成**\n\n"
+
+    herb_count = len(herbs)
+    for i, (herb_name, dosage) in enumerate(herbs, 1):
+        # 使用编号和颜色强调
+        prescription_text += f"**{i}.** **`{herb_name}`** ——— **{dosage}g**\n"
+
+    prescription_text += f"\n> **处方药味总数：** {herb_count} 味\n\n"
+
+    # 🔥 煎服方法 - 详细用法说明
+    prescription_text += "## **⚡ 煎服方法**\n\n"
+    prescription_text += "### **煎制方法：**\n"
+    prescription_text += "- 🔸 **第一煎：** 加清水500ml，浸泡30分钟后，大火煮沸转小火煎煮25分钟\n"
+    prescription_text += "- 🔸 **第二煎：** 加清水400ml，直接煎煮20分钟\n"
+    prescription_text += "- 🔸 **混合：** 两次药汁混合，约得药液300ml\n\n"
+
+    prescription_text += "### **服用方法：**\n"
+    prescription_text += "- 🔸 **用量：** 每日1剂，分2次温服\n"
+    prescription_text += "- 🔸 **时间：** 饭后1小时服用（早晚各1次）\n"
+    prescription_text += "- 🔸 **温度：** 温热服用，避免过烫或过凉\n\n"
+
+    # 📝 用药注意事项
+    prescription_text += "## **⚠️ 重要注意事项**\n\n"
+    prescription_text += "### **🚨 安全提醒：**\n"
+    prescription_text += "- **❗ 必须在执业中医师指导下使用**\n"
+    prescription_text += "- **❗ 孕妇、哺乳期妇女慎用**\n"
+    prescription_text += "- **❗ 服药期间忌食生冷、辛辣、油腻食物**\n"
+    prescription_text += "- **❗ 如有过敏史，请告知医师**\n\n"
+
+    prescription_text += "### **👀 用药观察：**\n"
+    prescription_text += "- 🔹 观察症状变化情况\n"
+    prescription_text += "- 🔹 注意有无不良反应\n"
+    prescription_text += "- 🔹 记录服药后的感受\n\n"
+
+    # 🔄 复诊要求
+    prescription_text += "## **🔄 复诊安排**\n\n"
+    prescription_text += "### **📅 复诊时间：**\n"
+    prescription_text += "- **首次复诊：** 服药3天后\n"
+    prescription_text += "- **后续复诊：** 每周1次，共3次\n\n"
+
+    prescription_text += "### **📋 复诊要点：**\n"
+    prescription_text += "- ✅ 主要症状变化情况\n"
+    prescription_text += "- ✅ 药物疗效及不良反应\n"
+    prescription_text += "- ✅ 食欲、睡眠、二便情况\n"
+    prescription_text += "- ✅ 舌象、脉象变化\n\n"
+
+    # 📞 医疗免责声明
+    prescription_text += "## **📞 医疗免责声明**\n\n"
+    prescription_text += "> **🔴 重要声明：**\n"
+    prescription_text += "> 本处方为AI辅助生成的中医建议，仅供参考，不能替代正规医院的专业诊断和治疗。\n"
+    prescription_text += "> - **建议在执业中医师指导下使用**\n\n"
+
+    prescription_text += "---\n"
+    prescription_text += "*🕒 处方生成时间：" + "今日" + "  |  💻 AI中医助手*\n"
+    prescription_text += "---\n\n"
+
+    return prescription_text
+
+
+def _replace_dosage_range(match) -> str:
+    herb_name = match.group(1)
+    min_dose = int(match.group(2))
+    max_dose = int(match.group(3))
+
+    # 选择中间值或偏向较小值
+    if max_dose - min_dose <= 3:
+        recommended_dose = min_dose + 1  # 偏向较小值
+    else:
+        recommended_dose = (min_dose + max_dose) // 2  # 中间值
+
+    return f"{herb_name} {recommended_dose}g"
+
+
+class ResponseSanitizer:
+    """
+    AI回复后处理引擎
+
+    各方法与 api/main.py 中同名函数一一对应（签名与输出不变），另接受可选的
+    SanitizationReport 收集命中的规则；process() 按线上顺序执行完整流水线。
+    """
+
+    # ---------------- 医疗安全检查 ----------------
+
+    def check_symptom_fabrication(self, ai_response: str, patient_message: str,
+                                  report: Optional[SanitizationReport] = None) -> str:
+        """返回AI编造的症状描述（患者消息中没有对应关键词），没有编造则返回空字符串"""
+        view = _TextView(ai_response, report or SanitizationReport())
+        found_fabrications = []
+        for rule, keywords in _SYMPTOM_RULES:
+            if view.search(rule) and not any(keyword in patient_message for keyword in keywords):
+                found_fabrications.append(rule.description)
+                view.report.fire(rule.rule_id)
+        return ", ".join(found_fabrications)
+
+    def detect_fabricated_examination(self, text: str, has_actual_examination: bool = False,
+                                      report: Optional[SanitizationReport] = None) -> list:
+        """检测编造的望诊切诊内容"""
+        if has_actual_examination:
+            return []  # 如果有实际检查，则不检测
+
+        view = _TextView(text, report or SanitizationReport())
+        results: Dict[str, bool] = {}
+
+        def matched(rule: SanitizationRule) -> bool:
+            # 切诊规则在望诊、切诊两轮中都会用到，每条规则只扫描一次
+            if rule.rule_id not in results:
+                results[rule.rule_id] = view.search(rule) is not None
+            return results[rule.rule_id]
+
+        fabricated_items = []
+        if view.has("望诊") or view.has("面色") or view.has("舌"):
+            for rule, _ in _EXAMINATION_RULES:
+                if matched(rule):
+                    fabricated_items.append(f"编造{rule.description}")
+                    view.report.fire(rule.rule_id)
+        if view.has("切诊") or view.has("脉"):
+            for rule, is_pulse in _EXAMINATION_RULES:
+                if is_pulse and matched(rule):
+                    fabricated_items.append(f"编造{rule.description}")
+                    view.report.fire(rule.rule_id)
+        return fabricated_items
+
+    def check_medical_safety(self, ai_response: str, has_tongue_image: bool, patient_described_tongue: str = "",
+                             image_analysis_successful: bool = False, original_patient_message: str = "",
+                             report: Optional[SanitizationReport] = None) -> Tuple[bool, str]:
+        """检查AI回复中的舌象、脉象、症状描述是否有依据，返回 (is_safe, error_message)"""
+        report = report or SanitizationReport()
+
+        # 1. 严格检测编造的望诊切诊内容
+        has_actual_examination = has_tongue_image and image_analysis_successful
+        fabricated_examinations = self.detect_fabricated_examination(ai_response, has_actual_examination, report)
+        if fabricated_examinations:
+            return False, f"检测到编造的体征信息: {', '.join(fabricated_examinations)}"
+
+        # 2. 检查症状编造（无论舌象分析是否成功都必须检查）
+        if original_patient_message:
+            symptom_fabrication = self.check_symptom_fabrication(ai_response, original_patient_message, report)
+            if symptom_fabrication:
+                return False, f"检测到症状编造: {symptom_fabrication}"
+
+        # 3. 只有图片分析真正成功时才允许舌象描述
+        if has_tongue_image and image_analysis_successful:
+            return True, ""
+
+        # 4. 检查是否有AI编造的舌象和脉象描述
+        view = _TextView(ai_response, report)
+        found_dangerous = []
+        for rule in _DANGEROUS_RULES:
+            if view.admits(rule):
+                matches = rule.regex.findall(ai_response)
+                if matches:
+                    found_dangerous.extend(matches)
+                    report.fire(rule.rule_id)
+
+        # 患者自己描述了舌象或脉象时，允许AI引用
+        if patient_described_tongue and found_dangerous:
+            patient_features = [feature for feature in PATIENT_TONGUE_FEATURES + PATIENT_PULSE_FEATURES
+                                if feature in patient_described_tongue]
+            if any(feature in ai_response for feature in patient_features):
+                return True, ""
+
+        if found_dangerous:
+            return False, f"检测到可能的无根据舌象/脉象描述: {found_dangerous}"
+        return True, ""
+
+    # ---------------- 清理 ----------------
+
+    def _clean_prescription_fabrication(self, view: _TextView, sectioned: bool):
+        """处方编造：任一触发规则命中时替换处方建议、药物组成、煎服指导与辨证加减"""
+        if not any(view.search(rule) for rule in _PRESCRIPTION_TRIGGERS):
+            return
+        logger.warning("检测到AI编造处方内容，进行清理")
+        view.sub(_PRESCRIPTION_ADVICE)
+        view.sub(_HERB_COMPOSITION)
+        if sectioned:
+            view.sub(_DECOCTION_GUIDE_SECTIONED)
+            view.sub(_MODIFICATION_SECTIONED)
+        else:
+            view.sub(_DECOCTION_GUIDE)
+            view.sub(_MODIFICATION)
+        logger.info("已清理AI编造的处方建议内容")
+
+    def _clean_fabricated_descriptions(self, view: _TextView):
+        """清理明确的编造描述（从后向前替换，保留教学/说明语境）"""
+        for rule in _FABRICATION_RULES:
+            if not view.admits(rule):
+                continue
+            cleaned_response = view.text
+            for match in reversed(list(rule.regex.finditer(cleaned_response))):
+                start, end = match.span()
+                context = cleaned_response[max(0, start - 15):start]
+                if any(indicator in context for indicator in _FABRICATION_CONTEXT):
+                    continue
+                if '舌象' in match.group():
+                    cleaned_response = cleaned_response[:start] + '舌象需要面诊观察。' + cleaned_response[end:]
+                elif '脉象' in match.group():
+                    cleaned_response = cleaned_response[:start] + '脉象需要面诊切诊。' + cleaned_response[end:]
+                else:
+                    cleaned_response = cleaned_response[:start] + cleaned_response[end:]
+                logger.info(f"清理了编造描述: {match.group()}")
+                view.report.fire(rule.rule_id)
+            view.update(cleaned_response)
+
+    def sanitize(self, ai_response: str, has_tongue_image: bool, patient_described_tongue: str = "",
+                 image_analysis_successful: bool = False, original_patient_message: str = "",
+                 report: Optional[SanitizationReport] = None) -> str:
+        """清理AI回复中的非法舌象、脉象、症状编造和处方编造信息"""
+        return self._sanitize(ai_response, has_tongue_image, patient_described_tongue,
+                              image_analysis_successful, original_patient_message,
+                              report or SanitizationReport())[0]
+
+    def _sanitize(self, ai_response: str, has_tongue_image: bool, patient_described_tongue: str,
+                  image_analysis_successful: bool, original_patient_message: str,
+                  report: SanitizationReport) -> Tuple[str, bool, str]:
+        """返回 (清理后的文本, is_safe, error_message)"""
+        is_safe, error_msg = self.check_medical_safety(
+            ai_response, has_tongue_image, patient_described_tongue,
+            image_analysis_successful, original_patient_message, report)
+        if not is_safe:
+            logger.warning(f"发现医疗安全问题: {error_msg}")
+
+        view = _TextView(ai_response, report)
+
+        # 没有图片上传或图片分析失败时，清理所有舌象脉象描述
+        if not has_tongue_image or not image_analysis_successful:
+            # 清理策略1: XML格式的望诊部分
+            if view.has('<望诊所见>') and view.has('</望诊所见>'):
+                view.sub(_OBSERVATION_XML)
+                logger.info("已替换XML望诊部分为安全提示")
+
+            # 清理策略2: "辨证要点"中的舌象脉象描述行
+            if view.has("辨证要点"):
+                view.sub(_KEY_POINT_TONGUE)
+                view.sub(_KEY_POINT_PULSE)
+                logger.info("已清理辨证要点中的舌象脉象描述")
+
+            # 清理策略3: 明确的编造描述
+            self._clean_fabricated_descriptions(view)
+
+            # 清理策略5: 望诊切诊部分整体替换
+            if view.has("1. 望诊") or view.has("### 望诊"):
+                view.sub(_INSPECTION_SECTION)
+                logger.info("已清理望诊部分的编造内容")
+            if view.has("4. 切诊") or view.has("### 切诊"):
+                view.sub(_PALPATION_SECTION)
+                logger.info("已清理切诊部分的编造内容")
+
+            # 清理策略6: 诊疗方案中的望诊编造
+            if view.has("<望诊所见>"):
+                view.sub(_OBSERVATION_XML_STRICT)
+                logger.info("已清理XML格式的望诊编造内容")
+
+            # 清理策略7: AI编造的具体处方建议
+            self._clean_prescription_fabrication(view, sectioned=True)
+
+            # 清理策略8: 编造的望诊信息
+            for rule in _APPEARANCE_RULES:
+                if view.sub(rule):
+                    logger.warning(f"检测到编造的望诊信息: {rule.description}")
+                    logger.info(f"已清理编造的望诊信息: {rule.description}")
+
+            # 清理策略4: 简洁的医疗安全提醒（仅在必要时）
+            if not view.has("重要声明") and not view.has("仅供参考"):
+                view.update(view.text + _SAFETY_NOTICE)
+                report.fire("sanitize.safety_notice")
+                logger.info("已添加简洁医疗安全提醒")
+
+        # 处方编造清理独立于舌象脉象检查，总是运行
+        self._clean_prescription_fabrication(view, sectioned=False)
+        return view.text, is_safe, error_msg
+
+    # ---------------- 格式化 ----------------
+
+    def normalize_dosage(self, prescription_text: str, report: Optional[SanitizationReport] = None) -> str:
+        """规范化处方用量，将范围用量转换为确定用量"""
+        view = _TextView(prescription_text, report or SanitizationReport())
+        view.sub(_DOSAGE_RANGE, _replace_dosage_range)
+        return view.text
+
+    def standardize_prescription(self, ai_response: str, report: Optional[SanitizationReport] = None) -> str:
+        """统一处方格式为增强版标准格式"""
+        view = _TextView(ai_response, report or SanitizationReport())
+
+        # 先清理可能存在的重复标签和格式错误
+        for rule in _PRESCRIPTION_TAG_CLEANUP:
+            view.sub(rule)
+
+        for rule in _PRESCRIPTION_BLOCKS:
+            if not view.admits(rule):
+                continue
+            for match in list(rule.regex.finditer(view.text)):
+                original_prescription = match.group(1).strip()
+                # 确保处方内容有效
+                if len(original_prescription) < 3:
+                    continue
+                herbs = extract_herb_dosage_pairs(original_prescription)
+                if not herbs:
+                    continue
+                # 完全替换整个处方区域
+                view.update(view.text.replace(match.group(0), generate_enhanced_prescription_format(herbs)))
+                view.report.fire(rule.rule_id)
+                return view.text
+        return view.text
+
+    def enhance_format(self, ai_response: str, report: Optional[SanitizationReport] = None) -> str:
+        """增强整体诊疗方案的格式化 - 为所有医生回复添加层次感"""
+        view = _TextView(ai_response, report or SanitizationReport())
+
+        # 1. 【xxx】标题转换为更显眼的格式
+        view.sub(_SECTION_TITLE)
+
+        # 2-3. 医学术语与症状加粗；词条都是普通文字，str.replace 与逐条 re.sub 结果相同
+        for terms, template, rule_id in ((EMPHASIZED_MEDICAL_TERMS, "**{}**", "format.medical_term"),
+                                         (EMPHASIZED_SYMPTOMS, "**`{}`**", "format.symptom")):
+            for term in terms:
+                if view.has(term):
+                    view.update(view.text.replace(term, template.format(term)))
+                    view.report.fire(f"{rule_id}.{term}")
+
+        # 4. 重要提醒
+        view.sub(_REMINDER)
+
+        # 5. 方剂名
+        view.sub(_FORMULA_NAME)
+        return view.text
+
+    def filter_western_medicine(self, ai_response: str,
+                                report: Optional[SanitizationReport] = None) -> Tuple[bool, str]:
+        """检测并过滤西医内容 - 只清理明确的西药推荐和西医检查建议"""
+        view = _TextView(ai_response, report or SanitizationReport())
+        found_western_content = []
+
+        if any(view.has(keyword) for keyword in TCM_CONTEXT_KEYWORDS):
+            # 中医上下文中只检测明确的西药推荐
+            for keyword in WESTERN_MEDICINE_KEYWORDS['西药']:
+                if view.has(f"建议服用{keyword}") or view.has(f"可以用{keyword}"):
+                    found_western_content.append(f"西药推荐:{keyword}")
+        else:
+            for category, keywords in WESTERN_MEDICINE_KEYWORDS.items():
+                for keyword in keywords:
+                    if view.has(keyword):
+                        found_western_content.append(f"{category}:{keyword}")
+
+        if not found_western_content:
+            return False, ai_response
+
+        logger.warning(f"检测到西医内容: {found_western_content}")
+
+        # 只移除西药推荐语句和检查建议语句，保留其他内容
+        for rule in _WESTERN_DRUG_RULES + _WESTERN_EXAM_RULES:
+            view.sub(rule)
+
+        # 清理多余的空行和格式
+        view.sub(_EXTRA_BLANK_LINES)
+        filtered_response = view.text.strip()
+
+        # 过滤后内容太少时补充中医建议
+        if len(filtered_response) < 100:
+            filtered_response += "\n\n建议通过中医辨证论治的方式进行调理，请详细描述症状以便准确诊断。"
+
+        return True, filtered_response
+
+    # ---------------- 完整流水线 ----------------
+
+    def process(self, ai_response: str, has_tongue_image: bool, patient_described_tongue: str = "",
+                image_analysis_successful: bool = False, original_patient_message: str = "") -> SanitizationResult:
+        """
+        按线上顺序执行完整后处理：安全清理 -> 用量规范 -> 处方格式 -> 格式增强 -> 西医过滤
+        """
+        report = SanitizationReport()
+        text, is_safe, safety_message = self._sanitize(
+            ai_response, has_tongue_image, patient_described_tongue,
+            image_analysis_successful, original_patient_message, report)
+        text = self.normalize_dosage(text, report)
+        text = self.standardize_prescription(text, report)
+        text = self.enhance_format(text, report)
+        has_western_content, filtered = self.filter_western_medicine(text, report)
+        if has_western_content:
+            text = filtered
+        return SanitizationResult(text=text, is_safe=is_safe, safety_message=safety_message,
+                                  has_western_content=has_western_content, report=report)
+
+
+_sanitizer: Optional[ResponseSanitizer] = None
+_sanitizer_lock = threading.Lock()
+
+
+def get_response_sanitizer() -> ResponseSanitizer:
+    """进程内共享的后处理引擎（规则表在导入时已编译）"""
+    global _sanitizer
+    if _sanitizer is None:
+        with _sanitizer_lock:
+            if _sanitizer is None:
+                _sanitizer = ResponseSanitizer()
+    return _sanitizer
@@ -14,15 +14,17 @@ import hashlib
 import time
 import sqlite3
 import logging
+import threading
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass, asdict
 from collections import defaultdict
 import jieba
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
 import numpy as np
 
+from core.database.connection import connect as db_connect
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -48,18 +50,92 @@ class CacheStats:
     cache_size_mb: float
     last_cleanup: datetime
 
+class SymptomVectorIndex:
+    """
+    单个医生的症状向量索引
+
+    对已标准化的 symptom_pattern 做字符n-gram向量化，一次拟合IDF后常驻内存，
+    查询时一次稀疏矩阵乘法即可得到与全部缓存条目的余弦相似度。
+    使用哈希特征空间，未登录n-gram同样参与归一化，避免查询被"截断"后相似度虚高。
+    """
+
+    def __init__(self, rows: List[Tuple[str, str, int, Optional[float]]]):
+        # rows: (cache_key, symptom_pattern, access_count, user_rating)
+        self.hasher = HashingVectorizer(
+            analyzer='char',
+            ngram_range=(1, 2),
+            n_features=2 ** 18,
+            alternate_sign=False,
+            norm=None
+        )
+        self.transformer = TfidfTransformer(norm='l2')
+        self.built_at = time.time()
+        self.generation = 0
+
+        self.cache_keys = [row[0] for row in rows]
+        self.key_positions = {key: i for i, key in enumerate(self.cache_keys)}
+        self.access_counts = np.array([row[2] or 0 for row in rows], dtype=np.float64)
+        self.user_ratings = np.array(
+            [row[3] if row[3] is not None else 0.0 for row in rows], dtype=np.float64
+        )
+
+        if rows:
+            counts = self.hasher.transform([row[1] or '' for row in rows])
+            self.matrix = self.transformer.fit_transform(counts).tocsr()
+        else:
+            self.matrix = None
+
+    def __len__(self) -> int:
+        return len(self.cache_keys)
+
+    def query(self, normalized_symptoms: str, top_k: int = 1,
+              min_similarity: float = 0.0) -> List[Tuple[str, float, float]]:
+        """返回相似度不低于 min_similarity 的 [(cache_key, similarity, score)]，按综合评分降序"""
+        if self.matrix is None or not normalized_symptoms:
+            return []
+
+        query_vector = self.transformer.transform(self.hasher.transform([normalized_symptoms]))
+        similarities = np.asarray((self.matrix @ query_vector.T).todense()).ravel()
+
+        # 综合评分：相似度 + 访问次数权重 + 用户评分权重
+        scores = (similarities * 0.7
+                  + np.minimum(self.access_counts / 100, 0.2) * 0.2
+                  + (self.user_ratings / 5.0) * 0.1)
+
+        eligible = np.flatnonzero(similarities >= min_similarity)
+        top_k = min(top_k, len(eligible))
+        if top_k <= 0:
+            return []
+        top = eligible[np.argpartition(-scores[eligible], top_k - 1)[:top_k]]
+        top = top[np.argsort(-scores[top])]
+        return [(self.cache_keys[i], float(similarities[i]), float(scores[i])) for i in top]
+
+    def record_access(self, cache_key: str):
+        """命中后原地更新访问次数，无需重建索引"""
+        position = self.key_positions.get(cache_key)
+        if position is not None:
+            self.access_counts[position] += 1
+
+    def update_rating(self, cache_key: str, rating: Optional[float]):
+        """评分变更后原地更新，无需重建索引"""
+        position = self.key_positions.get(cache_key)
+        if position is not None:
+            self.user_ratings[position] = rating if rating is not None else 0.0
+
 class IntelligentCacheSystem:
     """智能缓存系统"""
     
     def __init__(self, cache_db_path: str = "./data/cache.sqlite", 
                  similarity_threshold: float = 0.85,
                  max_cache_entries: int = 10000,
-                 cache_expiry_days: int = 30):
+                 cache_expiry_days: int = 30,
+                 index_ttl_seconds: int = 300):
         
         self.cache_db_path = cache_db_path
         self.similarity_threshold = similarity_threshold
         self.max_cache_entries = max_cache_entries
         self.cache_expiry_days = cache_expiry_days
+        self.index_ttl_seconds = index_ttl_seconds
         
         # 确保目录存在
         os.makedirs(os.path.dirname(cache_db_path), exist_ok=True)
@@ -67,12 +143,12 @@ class IntelligentCacheSystem:
         # 初始化数据库
         self._init_database()
         
-        # TF-IDF向量化器用于相似度计算 - 针对中文优化
-        self.vectorizer = TfidfVectorizer(
-            analyzer='char',
-            ngram_range=(1, 2),  # 降低ngram范围，提升中文匹配
-            max_features=3000
-        )
+        # 按医生维护的症状向量索引，缓存表变更后惰性重建
+        # index_ttl_seconds 兜底其他worker进程对缓存表的写入
+        self._symptom_indexes: Dict[str, SymptomVectorIndex] = {}
+        self._index_generations: Dict[str, int] = {}
+        self._index_build_locks: Dict[str, threading.Lock] = {}
+        self._index_lock = threading.Lock()
         
         # 缓存统计
         self.cache_hits = 0
@@ -83,7 +159,7 @@ class IntelligentCacheSystem:
     
     def _init_database(self):
         """初始化缓存数据库"""
-        conn = sqlite3.connect(self.cache_db_path)
+        conn = db_connect(self.cache_db_path)
         cursor = conn.cursor()
         
         # 创建缓存表
@@ -167,28 +243,85 @@ class IntelligentCacheSystem:
         
         return ' '.join(sorted(normalized_words))
     
-    def _calculate_symptom_similarity(self, symptoms1: str, symptoms2: str) -> float:
-        """计算症状相似度"""
-        if not symptoms1 or not symptoms2:
-            return 0.0
-        
+    def _get_symptom_index(self, doctor_selected: str) -> SymptomVectorIndex:
+        """
+        获取医生的症状向量索引，缺失、失效或过期时从缓存表重建
+
+        重建在全局锁之外进行，完成后整体替换；同一医生的重建进行中时，
+        其他查询直接使用旧索引（缓存命中允许短暂滞后），不会被写入阻塞
+        """
+        with self._index_lock:
+            index = self._symptom_indexes.get(doctor_selected)
+            generation = self._index_generations.get(doctor_selected, 0)
+            if self._index_is_fresh(index, generation):
+                return index
+            build_lock = self._index_build_locks.setdefault(doctor_selected, threading.Lock())
+        
+        if not build_lock.acquire(blocking=index is None):
+            return index
         try:
-            # 使用TF-IDF向量化
-            texts = [symptoms1, symptoms2]
-            tfidf_matrix = self.vectorizer.fit_transform(texts)
+            with self._index_lock:
+                index = self._symptom_indexes.get(doctor_selected)
+                generation = self._index_generations.get(doctor_selected, 0)
+                if self._index_is_fresh(index, generation):
+                    return index
             
-            # 计算余弦相似度
-            similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
-            return float(similarity)
+            conn = db_connect(self.cache_db_path)
+            cursor = conn.cursor()
+            # symptom_pattern 入库时已经标准化，无需再次分词
+            cursor.execute("""
+                SELECT cache_key, symptom_pattern, access_count, user_rating
+                FROM cache_entries
+                WHERE doctor_selected = ?
+            """, (doctor_selected,))
+            rows = cursor.fetchall()
+            conn.close()
             
-        except Exception as e:
-            logger.warning(f"相似度计算失败: {e}")
-            # 回退到简单字符匹配
-            set1 = set(symptoms1.split())
-            set2 = set(symptoms2.split())
-            if not set1 and not set2:
-                return 0.0
-            return len(set1.intersection(set2)) / len(set1.union(set2))
+            index = SymptomVectorIndex(rows)
+            # 记录开始重建时的代数：重建期间又有写入时，下次访问会再次重建
+            index.generation = generation
+            with self._index_lock:
+                self._symptom_indexes[doctor_selected] = index
+            logger.debug(f"症状向量索引已重建: doctor={doctor_selected}, entries={len(index)}")
+            return index
+        finally:
+            build_lock.release()
+    
+    def _index_is_fresh(self, index: Optional[SymptomVectorIndex], generation: int) -> bool:
+        return (index is not None and index.generation == generation
+                and time.time() - index.built_at < self.index_ttl_seconds)
+    
+    def _invalidate_symptom_index(self, doctor_selected: Optional[str] = None):
+        """缓存表变更后使索引失效（提升代数），下次查询时重建，重建完成前沿用旧索引"""
+        with self._index_lock:
+            doctors = list(self._symptom_indexes) if doctor_selected is None else [doctor_selected]
+            for doctor in doctors:
+                self._index_generations[doctor] = self._index_generations.get(doctor, 0) + 1
+    
+    def _update_index_entry(self, doctor_selected: str, cache_key: str, rating: Optional[float],
+                            accessed: bool = False):
+        """已有条目的评分/访问次数变更同步到内存索引（索引尚未建立时无需处理）"""
+        with self._index_lock:
+            index = self._symptom_indexes.get(doctor_selected)
+        if index is None:
+            return
+        index.update_rating(cache_key, rating)
+        if accessed:
+            index.record_access(cache_key)
+    
+    def _load_cache_payload(self, cache_key: str, similarity: float) -> Optional[Tuple[str, str, float, str]]:
+        """按缓存键读取响应内容"""
+        conn = db_connect(self.cache_db_path)
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT ai_response, retrieval_docs FROM cache_entries WHERE cache_key = ?
+        """, (cache_key,))
+        row = cursor.fetchone()
+        conn.close()
+        
+        if not row:
+            return None
+        return row[0], row[1], similarity, cache_key
     
     def get_cached_response(self, symptom_pattern: str, doctor_selected: str, conversation_stage: str = "initial") -> Optional[Tuple[str, List[str], float]]:
         """获取缓存的响应"""
@@ -197,7 +330,7 @@ class IntelligentCacheSystem:
         # 先尝试精确匹配
         cache_key = self._generate_cache_key(symptom_pattern, doctor_selected, conversation_stage)
         
-        conn = sqlite3.connect(self.cache_db_path)
+        conn = db_connect(self.cache_db_path)
         cursor = conn.cursor()
         
         # 精确匹配查询
@@ -221,40 +354,20 @@ class IntelligentCacheSystem:
             logger.info(f"缓存命中(精确匹配): {cache_key}")
             return ai_response, retrieval_docs, 1.0
         
-        # 相似度匹配查询
-        normalized_symptoms = self._normalize_symptoms(symptom_pattern)
-        
-        cursor.execute("""
-            SELECT cache_key, symptom_pattern, ai_response, retrieval_docs, 
-                   similarity_score, access_count, user_rating
-            FROM cache_entries 
-            WHERE doctor_selected = ?
-            ORDER BY access_count DESC, user_rating DESC NULLS LAST
-            LIMIT 50
-        """, (doctor_selected,))
-        
-        candidates = cursor.fetchall()
         conn.close()
         
-        # 计算相似度并找到最佳匹配
-        best_match = None
-        best_similarity = 0.0
+        # 相似度匹配查询：对该医生全部缓存条目一次向量化打分
+        normalized_symptoms = self._normalize_symptoms(symptom_pattern)
+        index = self._get_symptom_index(doctor_selected)
         
-        for candidate in candidates:
-            cache_key_cand, symptom_pattern_cand, ai_response, retrieval_docs_json, stored_sim, access_count, user_rating = candidate
-            
-            # 计算相似度
-            similarity = self._calculate_symptom_similarity(normalized_symptoms, 
-                                                          self._normalize_symptoms(symptom_pattern_cand))
-            
-            # 综合评分：相似度 + 访问次数权重 + 用户评分权重
-            score = similarity * 0.7 + min(access_count / 100, 0.2) * 0.2
-            if user_rating:
-                score += (user_rating / 5.0) * 0.1
-            
-            if score > best_similarity and similarity >= self.similarity_threshold:
-                best_similarity = score
-                best_match = (ai_response, retrieval_docs_json, similarity, cache_key_cand)
+        best_match = None
+        candidates = index.query(normalized_symptoms, top_k=5,
+                                 min_similarity=self.similarity_threshold)
+        for key_cand, similarity, _score in candidates:
+            # 索引可能滞后于其他进程的删除操作，取不到内容时顺延
+            best_match = self._load_cache_payload(key_cand, similarity)
+            if best_match:
+                break
         
         if best_match:
             ai_response, retrieval_docs_json, similarity, matched_key = best_match
@@ -262,6 +375,7 @@ class IntelligentCacheSystem:
             
             # 更新访问统计
             self._update_access_stats(matched_key)
+            index.record_access(matched_key)
             self.cache_hits += 1
             
             logger.info(f"缓存命中(相似度匹配): 相似度={similarity:.3f}")
@@ -278,7 +392,7 @@ class IntelligentCacheSystem:
         cache_key = self._generate_cache_key(symptom_pattern, doctor_selected, conversation_stage)
         normalized_symptoms = self._normalize_symptoms(symptom_pattern)
         
-        conn = sqlite3.connect(self.cache_db_path)
+        conn = db_connect(self.cache_db_path)
         cursor = conn.cursor()
         
         # 检查是否已存在
@@ -306,6 +420,11 @@ class IntelligentCacheSystem:
         conn.commit()
         conn.close()
         
+        if exists:
+            self._update_index_entry(doctor_selected, cache_key, user_rating, accessed=True)
+        else:
+            self._invalidate_symptom_index(doctor_selected)
+        
         # 检查缓存大小并清理
         self._cleanup_cache_if_needed()
         
@@ -313,7 +432,7 @@ class IntelligentCacheSystem:
     
     def _update_access_stats(self, cache_key: str):
         """更新访问统计"""
-        conn = sqlite3.connect(self.cache_db_path)
+        conn = db_connect(self.cache_db_path)
         cursor = conn.cursor()
         
         cursor.execute("""
@@ -327,7 +446,7 @@ class IntelligentCacheSystem:
     
     def _cleanup_cache_if_needed(self):
         """根据需要清理缓存"""
-        conn = sqlite3.connect(self.cache_db_path)
+        conn = db_connect(self.cache_db_path)
         cursor = conn.cursor()
         
         # 检查条目数量
@@ -361,10 +480,13 @@ class IntelligentCacheSystem:
         
         conn.commit()
         conn.close()
+        
+        if count > self.max_cache_entries or expired_count > 0:
+            self._invalidate_symptom_index()
     
     def get_cache_stats(self) -> CacheStats:
         """获取缓存统计信息"""
-        conn = sqlite3.connect(self.cache_db_path)
+        conn = db_connect(self.cache_db_path)
         cursor = conn.cursor()
         
         # 获取基本统计
@@ -396,7 +518,7 @@ class IntelligentCacheSystem:
         """更新用户评分"""
         cache_key = self._generate_cache_key(symptom_pattern, doctor_selected)
         
-        conn = sqlite3.connect(self.cache_db_path)
+        conn = db_connect(self.cache_db_path)
         cursor = conn.cursor()
         
         cursor.execute("""
@@ -408,11 +530,12 @@ class IntelligentCacheSystem:
         conn.commit()
         conn.close()
         
+        self._update_index_entry(doctor_selected, cache_key, rating)
         logger.info(f"更新用户评分: {cache_key} = {rating}")
     
     def get_popular_symptoms(self, limit: int = 20) -> List[Tuple[str, int]]:
         """获取热门症状模式"""
-        conn = sqlite3.connect(self.cache_db_path)
+        conn = db_connect(self.cache_db_path)
         cursor = conn.cursor()
         
         cursor.execute("""
@@ -430,7 +553,7 @@ class IntelligentCacheSystem:
     
     def clear_cache(self, older_than_days: Optional[int] = None):
         """清空缓存"""
-        conn = sqlite3.connect(self.cache_db_path)
+        conn = db_connect(self.cache_db_path)
         cursor = conn.cursor()
         
         if older_than_days:
@@ -444,6 +567,8 @@ class IntelligentCacheSystem:
         conn.commit()
         conn.close()
         
+        self._invalidate_symptom_index()
+        
         # 重置统计
         self.cache_hits = 0
         self.cache_misses = 0
@@ -13,19 +13,19 @@
 import sqlite3
 import json
 import logging
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, AsyncIterator
 from datetime import datetime
 from dataclasses import dataclass
 import asyncio
 from app.core.settings import AI_CONFIG
-
-# 导入dashscope用于AI语义分析
-try:
-    from dashscope import Generation
-    DASHSCOPE_AVAILABLE = True
-except ImportError:
-    DASHSCOPE_AVAILABLE = False
-    logging.warning("Dashscope not available, falling back to basic matching")
+from core.consultation.semantic_score_cache import get_semantic_score_cache
+from core.text_matching.symptom_lexicon import DISEASE_ALIASES, get_symptom_lexicon
+from core.consultation.decision_tree_registry import (
+    DecisionTreeEntry,
+    extract_symptom_node,
+    get_decision_tree_registry
+)
+from core.llm import LLMError, LLMTimeoutError, get_llm_gateway
 
 # 导入jieba用于中文分词
 try:
@@ -59,19 +59,21 @@ class DecisionTreeMatcher:
         self.db_path = db_path
         self.api_key = AI_CONFIG.get("dashscope_api_key", "")
 
+        # 🚀 匹配扇出控制：预筛候选数、AI并发数、单次调用超时(秒)
+        self.max_ai_candidates = AI_CONFIG.get("decision_tree_match_candidates", 8)
+        self.max_ai_concurrency = AI_CONFIG.get("decision_tree_match_concurrency", 4)
+        self.ai_call_timeout = AI_CONFIG.get("decision_tree_match_timeout", 20)
+
+        # 💾 (患者描述, 证候描述, 模型) → AI分数 缓存，重复匹配不再调用大模型
+        self.score_cache = get_semantic_score_cache()
+
+        # 📚 预解析的决策树注册表，避免每次匹配都全表读取并解析JSON
+        self.registry = get_decision_tree_registry(db_path)
+
         # 🔑 疾病别名映射 - 支持中医疾病的多种表述
-        self.disease_aliases = {
-            "感冒": ["感冒", "风寒感冒", "风热感冒", "外感", "伤风", "时行感冒"],
-            "咳嗽": ["咳嗽", "咳", "干咳", "痰多咳嗽", "咳痰"],
-            "失眠": ["失眠", "不寐", "睡眠障碍", "入睡困难", "多梦"],
-            "胃痛": ["胃痛", "胃脘痛", "脘痛", "胃胀", "脾胃不和"],
-            "头痛": ["头痛", "头疼", "偏头痛", "巅顶痛"],
-            "腹泻": ["腹泻", "泄泻", "大便溏薄", "便溏"],
-            "便秘": ["便秘", "大便秘结", "大便难"],
-            "心悸": ["心悸", "心慌", "怔忡"],
-            "眩晕": ["眩晕", "头晕", "晕"],
-            "腰痛": ["腰痛", "腰酸", "腰部疼痛"]
-        }
+        self.disease_aliases = {disease: list(aliases) for disease, aliases in DISEASE_ALIASES.items()}
+        # 症状关键词、证候关键词、疾病别名共用一个词表自动机
+        self.lexicon = get_symptom_lexicon()
 
         logger.info(f"✅ 决策树匹配服务初始化完成 (AI语义匹配版): {db_path}")
         if not self.api_key:
@@ -85,17 +87,10 @@ class DecisionTreeMatcher:
         例如："外感风热，邪袭肺卫。患者发热恶风，汗出不畅，头痛鼻塞..."
         """
         try:
-            nodes = tree_structure.get('nodes', [])
-            for node in nodes:
-                if node.get('type') == 'symptom':
-                    return node
-
-            # 如果没有symptom节点，尝试使用第二个节点（通常是症状描述）
-            if len(nodes) >= 2:
+            symptom_node = extract_symptom_node(tree_structure)
+            if symptom_node and symptom_node.get('type') != 'symptom':
                 logger.info(f"未找到symptom节点，使用第二个节点作为症状描述")
-                return nodes[1]
-
-            return None
+            return symptom_node
         except Exception as e:
             logger.error(f"提取symptom节点失败: {e}")
             return None
@@ -103,17 +98,30 @@ class DecisionTreeMatcher:
     async def _calculate_ai_semantic_similarity(
         self,
         patient_description: str,
-        syndrome_description: str
+        syndrome_description: str,
+        candidate: Optional[DecisionTreeEntry] = None
     ) -> Tuple[float, str]:
         """
         使用AI计算患者描述与决策树证候描述的语义相似度
 
+        candidate 为所属决策树信息，用于缓存条目在决策树编辑后失效
+
         返回：(相似度分数 0-1, 匹配原因说明)
         """
-        if not DASHSCOPE_AVAILABLE or not self.api_key:
+        if not self.api_key:
             # 降级为基础文本匹配
             return self._fallback_similarity(patient_description, syndrome_description)
 
+        model = AI_CONFIG.get('decision_tree_model', 'qwen3.5-omni-plus-2026-03-15')
+        pattern_id = candidate.pattern_id if candidate else None
+        # 缓存读写是同步SQLite操作，放到线程中执行，不阻塞事件循环
+        cached = await asyncio.to_thread(
+            self.score_cache.get, patient_description, syndrome_description, model, pattern_id
+        )
+        if cached:
+            logger.info(f"💾 AI语义匹配缓存命中: 分数={cached[0]:.2f}, 原因={cached[1]}")
+            return cached
+
         try:
             prompt = f"""你是一位资深中医专家，请判断患者症状是否匹配某个临床证候的决策树。
 
@@ -150,31 +158,45 @@ class DecisionTreeMatcher:
 
 只返回JSON，不要其他内容。"""
 
-            from dashscope import MultiModalConversation
-            response = MultiModalConversation.call(
-                model=AI_CONFIG.get('decision_tree_model', 'qwen3.5-omni-plus-2026-03-15'),
+            content = await get_llm_gateway().complete_text(
+                [{"role": "user", "content": prompt}],
+                model=model,
                 api_key=self.api_key,
-                messages=[{"role": "user", "content": [{"text": prompt}]}],
+                timeout=self.ai_call_timeout,
+                call_site="decision_tree.semantic_match",
                 enable_thinking=False
             )
 
-            if response.status_code == 200:
-                content = response.output.choices[0].message.content[0]["text"]
-                # 提取JSON
-                import re
-                json_match = re.search(r'\{.*\}', content, re.DOTALL)
-                if json_match:
-                    result = json.loads(json_match.group())
-                    score = float(result.get('match_score', 0))
-                    reason = result.get('reason', '')
-
-                    logger.info(f"🤖 AI语义匹配: 分数={score:.2f}, 原因={reason}")
-                    return (score, reason)
-
-            # AI调用失败，降级
-            logger.warning("AI调用失败，使用基础匹配")
+            # 提取JSON
+            import re
+            json_match = re.search(r'\{.*\}', content, re.DOTALL)
+            if json_match:
+                result = json.loads(json_match.group())
+                score = float(result.get('match_score', 0))
+                reason = result.get('reason', '')
+
+                logger.info(f"🤖 AI语义匹配: 分数={score:.2f}, 原因={reason}")
+
+                # 仅缓存AI成功打分的结果，降级结果不入缓存
+                await asyncio.to_thread(
+                    self.score_cache.set,
+                    patient_description, syndrome_description, model, score, reason,
+                    pattern_id=pattern_id,
+                    doctor_id=candidate.doctor_id if candidate else None,
+                    disease_name=candidate.disease_name if candidate else None
+                )
+                return (score, reason)
+
+            # AI响应无法解析，降级
+            logger.warning("AI响应无法解析，使用基础匹配")
             return self._fallback_similarity(patient_description, syndrome_description)
 
+        except LLMTimeoutError:
+            logger.warning(f"AI语义分析超时({self.ai_call_timeout}s)，使用基础匹配")
+            return self._fallback_similarity(patient_description, syndrome_description)
+        except LLMError as e:
+            logger.warning(f"AI调用失败，使用基础匹配: {e}")
+            return self._fallback_similarity(patient_description, syndrome_description)
         except Exception as e:
             logger.error(f"AI语义分析失败: {e}")
             return self._fallback_similarity(patient_description, syndrome_description)
@@ -183,32 +205,191 @@ class DecisionTreeMatcher:
         """
         降级方案：基于关键词匹配的相似度计算
         """
-        # 提取关键症状词
-        症状关键词 = [
-            "发热", "恶寒", "恶风", "头痛", "咳嗽", "咽痛", "鼻塞",
-            "口渴", "汗出", "胃痛", "腹痛", "便秘", "腹泻", "失眠",
-            "心悸", "气短", "乏力", "舌红", "舌淡", "苔黄", "苔白",
-            "脉浮", "脉沉", "脉数", "脉迟"
-        ]
-
-        matched_keywords = []
-        total_keywords_in_syndrome = 0
-
-        for keyword in 症状关键词:
-            if keyword in text2:  # 决策树中包含此症状
-                total_keywords_in_syndrome += 1
-                if keyword in text1:  # 患者也有此症状
-                    matched_keywords.append(keyword)
+        match_rate, reason = self._keyword_match_rate(text1, text2)
+        logger.info(f"📊 基础匹配: {reason}, 匹配率={match_rate:.2f}")
+        return (match_rate, reason)
+
+    def _keyword_match_rate(self, text1: str, text2: str) -> Tuple[float, str]:
+        """关键症状词重合率（不记录日志，供降级匹配和候选预筛共用）"""
+        # 决策树中包含的关键症状词，及其中患者也有的
+        syndrome_keywords = self.lexicon.scan(text2).terms("syndrome_keyword")
+        patient_keywords = set(self.lexicon.scan(text1).terms("syndrome_keyword"))
+        matched_keywords = [keyword for keyword in syndrome_keywords if keyword in patient_keywords]
+        total_keywords_in_syndrome = len(syndrome_keywords)
 
         if total_keywords_in_syndrome == 0:
             return (0.0, "无关键症状匹配")
 
         match_rate = len(matched_keywords) / total_keywords_in_syndrome
         reason = f"症状匹配: {len(matched_keywords)}/{total_keywords_in_syndrome} ({', '.join(matched_keywords[:3])}...)"
-
-        logger.info(f"📊 基础匹配: {reason}, 匹配率={match_rate:.2f}")
         return (match_rate, reason)
 
+    def _prefilter_score(
+        self,
+        disease_name: str,
+        patient_text: str,
+        candidate: DecisionTreeEntry
+    ) -> float:
+        """
+        候选预筛打分（纯本地计算，无AI调用）
+
+        关键词重合率 + 疾病名/别名命中加成，仅用于决定哪些决策树值得送AI语义打分
+        """
+        score, _ = self._keyword_match_rate(patient_text, candidate.syndrome_description)
+
+        pattern_disease = candidate.disease_name or ''
+        if disease_name and pattern_disease:
+            if disease_name == pattern_disease or disease_name in pattern_disease:
+                score += 0.3
+            elif self._is_disease_alias(disease_name, pattern_disease):
+                score += 0.25
+        if pattern_disease and pattern_disease in patient_text:
+            score += 0.2
+
+        return score
+
+    def _resolve_doctor_id(self, doctor_id: Optional[str]) -> Optional[str]:
+        """将医生代号映射为 usr_ 开头的用户ID"""
+        if not doctor_id or doctor_id.startswith('usr_'):
+            return doctor_id
+
+        doctor_name_map = {
+            'jin_daifu': '金大夫',
+            'zhang_zhongjing': '张仲景'
+        }
+        doctor_name = doctor_name_map.get(doctor_id, doctor_id)
+
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT user_id FROM doctors
+            WHERE name = ?
+            LIMIT 1
+        """, (doctor_name,))
+        doctor_row = cursor.fetchone()
+        conn.close()
+
+        if doctor_row and doctor_row['user_id']:
+            logger.info(f"🔄 医生ID映射: {doctor_id} ({doctor_name}) → {doctor_row['user_id']}")
+            return doctor_row['user_id']
+        return doctor_id
+
+    def _load_candidate_patterns(self, doctor_id: Optional[str]) -> List[DecisionTreeEntry]:
+        """
+        从注册表获取候选决策树
+
+        返回按 usage_count/success_count 降序排列的候选列表，
+        缺少证候描述的决策树会被跳过
+        """
+        # 🔑 医生ID映射
+        actual_doctor_id = self._resolve_doctor_id(doctor_id)
+
+        if actual_doctor_id:
+            logger.info(f"🔍 查询医生 {actual_doctor_id} 的决策树（AI语义匹配模式）")
+        else:
+            logger.info(f"🔍 查询所有医生的决策树")
+
+        candidates = []
+        for entry in self.registry.get_all(actual_doctor_id):
+            if not entry.syndrome_description:
+                logger.warning(f"决策树 {entry.disease_name} 没有可用的symptom节点描述，跳过")
+                continue
+            candidates.append(entry)
+
+        return candidates
+
+    def _build_match(
+        self,
+        candidate: DecisionTreeEntry,
+        match_score: float,
+        match_reason: str
+    ) -> DecisionTreeMatch:
+        """由候选决策树和AI匹配分数构建匹配结果"""
+        # 计算置信度(基于历史成功率和AI匹配分数)
+        usage = candidate.usage_count
+        success = candidate.success_count
+        confidence = (success / usage * 0.5 + match_score * 0.5) if usage > 0 else match_score
+
+        return DecisionTreeMatch(
+            pattern_id=candidate.pattern_id,
+            doctor_id=candidate.doctor_id,
+            disease_name=candidate.disease_name,
+            match_score=match_score,
+            thinking_process=candidate.thinking_process,
+            tree_structure=candidate.tree_structure,
+            clinical_patterns=candidate.clinical_patterns,
+            usage_count=usage,
+            success_count=success,
+            confidence=confidence,
+            match_reason=match_reason,  # 🆕 匹配原因
+            syndrome_description=candidate.syndrome_description  # 🆕 证候描述
+        )
+
+    async def stream_matching_patterns(
+        self,
+        disease_name: str,
+        symptoms: List[str],
+        patient_description: str = "",
+        doctor_id: Optional[str] = None,
+        min_match_score: float = 0.6
+    ) -> AsyncIterator[DecisionTreeMatch]:
+        """
+        流式返回匹配的决策树
+
+        1. 用关键词重合率和疾病别名对全部决策树做本地预筛
+        2. 仅前 max_ai_candidates 个候选送AI语义打分，受信号量限制并发、单次调用有超时
+        3. 每个候选打分完成即产出（按完成先后），达到阈值的才会返回
+
+        整体耗时随 候选数/并发数 增长，而不是随医生保存的决策树总数增长。
+        """
+        candidates = self._load_candidate_patterns(doctor_id)
+        if not candidates:
+            logger.info("❌ 未找到任何医生决策树")
+            return
+
+        patient_text = patient_description or " ".join(symptoms)
+        prefilter_scores = {
+            candidate.pattern_id: self._prefilter_score(disease_name, patient_text, candidate)
+            for candidate in candidates
+        }
+        # 稳定排序：预筛分相同时保留 usage_count 降序
+        shortlisted = sorted(candidates, key=lambda c: prefilter_scores[c.pattern_id], reverse=True)
+        shortlisted = shortlisted[:self.max_ai_candidates]
+
+        logger.info(
+            f"📚 找到 {len(candidates)} 个决策树，预筛后对 {len(shortlisted)} 个进行AI语义匹配"
+            f"（并发={self.max_ai_concurrency}）..."
+        )
+
+        semaphore = asyncio.Semaphore(self.max_ai_concurrency)
+
+        async def score_candidate(candidate: DecisionTreeEntry):
+            async with semaphore:
+                # 🤖 AI语义匹配
+                match_score, match_reason = await self._calculate_ai_semantic_similarity(
+                    patient_description,
+                    candidate.syndrome_description,
+                    candidate
+                )
+            return candidate, match_score, match_reason
+
+        tasks = [asyncio.ensure_future(score_candidate(c)) for c in shortlisted]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                candidate, match_score, match_reason = await finished
+                logger.info(f"🎯 决策树【{candidate.disease_name}】匹配分数: {match_score:.2f} - {match_reason}")
+
+                if match_score >= min_match_score:
+                    logger.info(f"✅ 决策树【{candidate.disease_name}】匹配成功！")
+                    yield self._build_match(candidate, match_score, match_reason)
+        finally:
+            # 调用方提前结束迭代时，取消尚未完成的AI打分；取消会传递到网关，
+            # 没有其他调用方共享的上游请求随之取消，不再占用模型并发名额
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
     async def find_matching_patterns(
         self,
         disease_name: str,
@@ -222,7 +403,7 @@ class DecisionTreeMatcher:
 
         核心逻辑：
         1. 从决策树中提取symptom节点（包含完整辨证描述）
-        2. 使用AI计算患者描述与symptom节点的语义相似度
+        2. 关键词预筛后，并发使用AI计算患者描述与symptom节点的语义相似度
         3. 基于相似度、历史成功率等综合评分
 
         Args:
@@ -236,104 +417,15 @@ class DecisionTreeMatcher:
             匹配的决策树列表,按匹配分数排序
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-
-            # 🔑 医生ID映射
-            actual_doctor_id = doctor_id
-            if doctor_id and not doctor_id.startswith('usr_'):
-                doctor_name_map = {
-                    'jin_daifu': '金大夫',
-                    'zhang_zhongjing': '张仲景'
-                }
-                doctor_name = doctor_name_map.get(doctor_id, doctor_id)
-
-                cursor.execute("""
-                    SELECT user_id FROM doctors
-                    WHERE name = ?
-                    LIMIT 1
-                """, (doctor_name,))
-
-                doctor_row = cursor.fetchone()
-                if doctor_row and doctor_row['user_id']:
-                    actual_doctor_id = doctor_row['user_id']
-                    logger.info(f"🔄 医生ID映射: {doctor_id} ({doctor_name}) → {actual_doctor_id}")
-
-            # 🔧 查询决策树
-            if actual_doctor_id:
-                logger.info(f"🔍 查询医生 {actual_doctor_id} 的决策树（AI语义匹配模式）")
-                cursor.execute("""
-                    SELECT * FROM doctor_clinical_patterns
-                    WHERE doctor_id = ?
-                    ORDER BY usage_count DESC, success_count DESC
-                """, (actual_doctor_id,))
-            else:
-                logger.info(f"🔍 查询所有医生的决策树")
-                cursor.execute("""
-                    SELECT * FROM doctor_clinical_patterns
-                    ORDER BY usage_count DESC, success_count DESC
-                """)
-
-            patterns = cursor.fetchall()
-            conn.close()
-
-            if not patterns:
-                logger.info("❌ 未找到任何医生决策树")
-                return []
-
-            logger.info(f"📚 找到 {len(patterns)} 个决策树，开始AI语义匹配...")
-
-            # 🆕 使用AI语义匹配
-            matches = []
-            for pattern in patterns:
-                try:
-                    tree_structure = json.loads(pattern['tree_structure'])
-                except:
-                    logger.warning(f"决策树 {pattern['id']} 结构解析失败，跳过")
-                    continue
-
-                # 提取symptom节点
-                symptom_node = self._extract_symptom_node_from_tree(tree_structure)
-                if not symptom_node:
-                    logger.warning(f"决策树 {pattern['disease_name']} 没有symptom节点，跳过")
-                    continue
-
-                syndrome_description = symptom_node.get('description', '') or symptom_node.get('name', '')
-                if not syndrome_description:
-                    logger.warning(f"决策树 {pattern['disease_name']} symptom节点为空，跳过")
-                    continue
-
-                # 🤖 AI语义匹配
-                match_score, match_reason = await self._calculate_ai_semantic_similarity(
-                    patient_description,
-                    syndrome_description
+            matches = [
+                match async for match in self.stream_matching_patterns(
+                    disease_name,
+                    symptoms,
+                    patient_description=patient_description,
+                    doctor_id=doctor_id,
+                    min_match_score=min_match_score
                 )
-
-                logger.info(f"🎯 决策树【{pattern['disease_name']}】匹配分数: {match_score:.2f} - {match_reason}")
-
-                if match_score >= min_match_score:
-                    # 计算置信度(基于历史成功率和AI匹配分数)
-                    usage = pattern['usage_count']
-                    success = pattern['success_count']
-                    confidence = (success / usage * 0.5 + match_score * 0.5) if usage > 0 else match_score
-
-                    match = DecisionTreeMatch(
-                        pattern_id=pattern['id'],
-                        doctor_id=pattern['doctor_id'],
-                        disease_name=pattern['disease_name'],
-                        match_score=match_score,
-                        thinking_process=pattern['thinking_process'],
-                        tree_structure=tree_structure,  # 已经在上面解析过了
-                        clinical_patterns=pattern['clinical_patterns'],
-                        usage_count=usage,
-                        success_count=success,
-                        confidence=confidence,
-                        match_reason=match_reason,  # 🆕 匹配原因
-                        syndrome_description=syndrome_description  # 🆕 证候描述
-                    )
-                    matches.append(match)
-                    logger.info(f"✅ 决策树【{pattern['disease_name']}】匹配成功！")
+            ]
 
             # 🎯 智能排序：考虑疾病类型优先级
             def get_sort_key(match):
@@ -547,37 +639,22 @@ class DecisionTreeMatcher:
     async def get_pattern_by_id(self, pattern_id: str) -> Optional[DecisionTreeMatch]:
         """根据ID获取决策树"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-
-            cursor.execute("""
-                SELECT * FROM doctor_clinical_patterns WHERE id = ?
-            """, (pattern_id,))
-
-            pattern = cursor.fetchone()
-            conn.close()
-
-            if not pattern:
+            entry = self.registry.get(pattern_id)
+            if not entry:
                 return None
 
-            try:
-                tree_structure = json.loads(pattern['tree_structure'])
-            except:
-                tree_structure = {}
-
-            usage = pattern['usage_count']
-            success = pattern['success_count']
+            usage = entry.usage_count
+            success = entry.success_count
             confidence = (success / usage) if usage > 0 else 0.5
 
             return DecisionTreeMatch(
-                pattern_id=pattern['id'],
-                doctor_id=pattern['doctor_id'],
-                disease_name=pattern['disease_name'],
+                pattern_id=entry.pattern_id,
+                doctor_id=entry.doctor_id,
+                disease_name=entry.disease_name,
                 match_score=1.0,
-                thinking_process=pattern['thinking_process'],
-                tree_structure=tree_structure,
-                clinical_patterns=pattern['clinical_patterns'],
+                thinking_process=entry.thinking_process,
+                tree_structure=entry.tree_structure,
+                clinical_patterns=entry.clinical_patterns,
                 usage_count=usage,
                 success_count=success,
                 confidence=confidence
@@ -617,29 +694,16 @@ class DecisionTreeMatcher:
             conn.commit()
             conn.close()
 
+            self.registry.record_usage(pattern_id, success)
+
             logger.info(f"✅ 记录决策树使用: {pattern_id}, 成功: {success}")
 
         except Exception as e:
             logger.error(f"记录决策树使用失败: {e}")
 
     def extract_symptoms_from_text(self, text: str) -> List[str]:
-        """从文本中提取症状关键词"""
-        symptoms = []
-
-        # 常见症状关键词
-        symptom_keywords = [
-            "头痛", "头疼", "发热", "发烧", "咳嗽", "失眠", "多梦",
-            "胃痛", "腹痛", "腹泻", "便秘", "心悸", "心慌", "乏力",
-            "食欲不振", "恶心", "呕吐", "胸闷", "气短", "眩晕",
-            "耳鸣", "怕冷", "怕热", "出汗", "盗汗", "口干", "口苦",
-            "咽痛", "鼻塞", "流涕", "腰痛", "膝痛", "关节痛"
-        ]
-
-        for keyword in symptom_keywords:
-            if keyword in text:
-                symptoms.append(keyword)
-
-        return list(set(symptoms))  # 去重
+        """从文本中提取症状关键词（已去重）"""
+        return self.lexicon.scan(text).terms("tree_symptom")
 
     def extract_disease_from_text(self, text: str) -> Optional[str]:
         """
@@ -648,21 +712,14 @@ class DecisionTreeMatcher:
         策略：找到所有匹配的疾病，优先选择在文本中最早出现的（主要症状）
         例如："胃脘隐痛...大便溏薄" → 优先返回"胃痛"而不是"腹泻"
         """
-        matched_diseases = []
-
-        for main_disease, aliases in self.disease_aliases.items():
-            for alias in aliases:
-                if alias in text:
-                    # 记录疾病名称和在文本中的位置
-                    position = text.find(alias)
-                    matched_diseases.append((main_disease, position, alias))
-                    break  # 找到一个别名就跳出，避免重复
-
-        if not matched_diseases:
+        # 各疾病按别名表顺序第一个出现的别名的位置
+        positions = self.lexicon.disease_positions(self.lexicon.scan(text))
+        if not positions:
             return None
 
-        # 按照在文本中的位置排序，选择最早出现的疾病
-        matched_diseases.sort(key=lambda x: x[1])
+        # 按照在文本中的位置排序，选择最早出现的疾病（同一位置按疾病表顺序）
+        order = self.lexicon.disease_order
+        matched_diseases = sorted(positions.items(), key=lambda item: (item[1], order.get(item[0], len(order))))
 
         selected_disease = matched_diseases[0][0]
         logger.info(f"🔍 疾病提取: 找到 {len(matched_diseases)} 个候选疾病，选择最早出现的 '{selected_disease}'")
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+决策树内存注册表
+
+匹配、按ID查询、使用统计等场景原先每次都要打开 user_history.sqlite，
+对 doctor_clinical_patterns 做 SELECT * 并逐行 json.loads(tree_structure)。
+本模块在进程内维护一份预解析的决策树条目，按医生和疾病建立索引：
+
+- 首次访问全量加载，之后按 updated_at 高水位增量刷新
+- 保存/删除路由调用 notify_changed() 提升版本号，下次访问立即刷新
+- 定期校验行数并同步使用次数，覆盖其他worker进程的写入
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from app.core.settings import PATHS
+from core.database.connection import connect as db_connect
+
+logger = logging.getLogger(__name__)
+
+
+def extract_symptom_node(tree_structure: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    从决策树结构中提取symptom类型的节点
+
+    symptom节点包含了完整的辨证描述，是匹配的核心依据
+    """
+    nodes = tree_structure.get('nodes', []) if isinstance(tree_structure, dict) else []
+    for node in nodes:
+        if node.get('type') == 'symptom':
+            return node
+
+    # 如果没有symptom节点，尝试使用第二个节点（通常是症状描述）
+    if len(nodes) >= 2:
+        return nodes[1]
+
+    return None
+
+
+class DecisionTreeEntry:
+    """预解析的决策树条目"""
+
+    __slots__ = (
+        'pattern_id', 'doctor_id', 'disease_name', 'syndrome_description',
+        'thinking_process', 'clinical_patterns', 'tree_structure',
+        'usage_count', 'success_count', 'created_at', 'updated_at'
+    )
+
+    def __init__(self, row: sqlite3.Row):
+        columns = row.keys()
+        try:
+            tree_structure = json.loads(row['tree_structure']) if row['tree_structure'] else {}
+        except (TypeError, ValueError):
+            logger.warning(f"决策树 {row['id']} 结构解析失败")
+            tree_structure = {}
+
+        symptom_node = extract_symptom_node(tree_structure) or {}
+
+        self.pattern_id = row['id']
+        self.doctor_id = row['doctor_id']
+        self.disease_name = row['disease_name']
+        self.syndrome_description = symptom_node.get('description', '') or symptom_node.get('name', '')
+        self.thinking_process = row['thinking_process'] or ''
+        self.clinical_patterns = row['clinical_patterns'] or ''
+        self.tree_structure = tree_structure
+        self.usage_count = row['usage_count'] or 0
+        self.success_count = (row['success_count'] or 0) if 'success_count' in columns else 0
+        self.created_at = row['created_at'] if 'created_at' in columns else None
+        self.updated_at = (row['updated_at'] if 'updated_at' in columns else None) or ''
+
+    def __getitem__(self, key: str) -> Any:
+        # 兼容按 sqlite3.Row 方式访问字段的旧代码
+        if key == 'id':
+            return self.pattern_id
+        return getattr(self, key)
+
+
+class DecisionTreeRegistry:
+    """进程级决策树注册表"""
+
+    def __init__(self, db_path: Optional[str] = None, refresh_interval: int = 30):
+        self.db_path = db_path or str(PATHS["user_db"])
+        self.refresh_interval = refresh_interval
+
+        self._entries: Dict[str, DecisionTreeEntry] = {}
+        # doctor_id -> disease_name -> pattern_id（表上有 UNIQUE(doctor_id, disease_name)）
+        self._by_doctor: Dict[str, Dict[str, str]] = {}
+        self._high_water_mark = ''
+
+        self._version = 0
+        self._loaded_version = -1
+        self._last_refresh = 0.0
+        self._full_loads = 0
+        self._incremental_refreshes = 0
+        self._lock = threading.RLock()
+
+    # ------------------------------------------------------------------
+    # 刷新
+    # ------------------------------------------------------------------
+
+    def notify_changed(self):
+        """决策树被保存或删除后调用，下次访问时立即刷新"""
+        with self._lock:
+            self._version += 1
+
+    def _ensure_fresh(self):
+        with self._lock:
+            if (self._loaded_version == self._version
+                    and time.time() - self._last_refresh < self.refresh_interval):
+                return
+            version = self._version
+            try:
+                if self._loaded_version < 0:
+                    self._full_load()
+                else:
+                    self._incremental_refresh()
+            except sqlite3.OperationalError as e:
+                # 表尚未创建等情况，视为空注册表
+                logger.warning(f"决策树注册表刷新失败: {e}")
+            self._loaded_version = version
+            self._last_refresh = time.time()
+
+    def _connect(self) -> sqlite3.Connection:
+        return db_connect(self.db_path, row_factory=sqlite3.Row)
+
+    def _full_load(self):
+        conn = self._connect()
+        try:
+            rows = conn.execute("SELECT * FROM doctor_clinical_patterns").fetchall()
+        finally:
+            conn.close()
+
+        self._entries = {}
+        self._by_doctor = {}
+        self._high_water_mark = ''
+        for row in rows:
+            self._upsert(DecisionTreeEntry(row))
+
+        self._full_loads += 1
+        logger.info(f"📚 决策树注册表全量加载: {len(self._entries)} 个决策树")
+
+    def _incremental_refresh(self):
+        conn = self._connect()
+        try:
+            changed = conn.execute("""
+                SELECT * FROM doctor_clinical_patterns WHERE updated_at > ?
+            """, (self._high_water_mark,)).fetchall()
+            for row in changed:
+                self._upsert(DecisionTreeEntry(row))
+
+            # 使用次数不会推进 updated_at，单独同步（不涉及JSON解析）；同时核对删除
+            columns = conn.execute("PRAGMA table_info(doctor_clinical_patterns)").fetchall()
+            has_success = any(col['name'] == 'success_count' for col in columns)
+            counter_rows = conn.execute(
+                "SELECT id, usage_count, {} FROM doctor_clinical_patterns".format(
+                    "success_count" if has_success else "0"
+                )
+            ).fetchall()
+        finally:
+            conn.close()
+
+        live_ids = set()
+        for pattern_id, usage_count, success_count in counter_rows:
+            live_ids.add(pattern_id)
+            entry = self._entries.get(pattern_id)
+            if entry is not None:
+                entry.usage_count = usage_count or 0
+                entry.success_count = success_count or 0
+
+        removed_ids = [pid for pid in self._entries if pid not in live_ids]
+        for pattern_id in removed_ids:
+            self._remove(pattern_id)
+
+        if len(live_ids) != len(self._entries):
+            # 有本进程未见过且 updated_at 未推进的新行，退回全量加载
+            self._full_load()
+            return
+
+        self._incremental_refreshes += 1
+        if changed or removed_ids:
+            logger.info(f"🔄 决策树注册表增量刷新: 更新 {len(changed)} 个, 移除 {len(removed_ids)} 个")
+
+    def _upsert(self, entry: DecisionTreeEntry):
+        if entry.pattern_id in self._entries:
+            # 同ID更新时疾病名可能变化，先移除旧索引
+            self._remove(entry.pattern_id)
+        diseases = self._by_doctor.setdefault(entry.doctor_id, {})
+        previous_id = diseases.get(entry.disease_name)
+        if previous_id and previous_id != entry.pattern_id:
+            # INSERT OR REPLACE 会以新ID替换同一医生同一疾病的旧记录
+            self._entries.pop(previous_id, None)
+        diseases[entry.disease_name] = entry.pattern_id
+        self._entries[entry.pattern_id] = entry
+        if entry.updated_at > self._high_water_mark:
+            self._high_water_mark = entry.updated_at
+
+    def _remove(self, pattern_id: str):
+        entry = self._entries.pop(pattern_id, None)
+        if entry is None:
+            return
+        diseases = self._by_doctor.get(entry.doctor_id, {})
+        if diseases.get(entry.disease_name) == pattern_id:
+            del diseases[entry.disease_name]
+
+    # ------------------------------------------------------------------
+    # 查询
+    # ------------------------------------------------------------------
+
+    def get_all(self, doctor_id: Optional[str] = None) -> List[DecisionTreeEntry]:
+        """获取决策树列表，按使用次数、成功次数降序"""
+        self._ensure_fresh()
+        with self._lock:
+            if doctor_id:
+                ids = self._by_doctor.get(doctor_id, {}).values()
+                entries = [self._entries[pid] for pid in ids if pid in self._entries]
+            else:
+                entries = list(self._entries.values())
+        entries.sort(key=lambda e: (e.usage_count, e.success_count), reverse=True)
+        return entries
+
+    def get(self, pattern_id: str) -> Optional[DecisionTreeEntry]:
+        """按ID获取决策树"""
+        self._ensure_fresh()
+        with self._lock:
+            return self._entries.get(pattern_id)
+
+    def get_by_disease(self, doctor_id: str, disease_name: str) -> Optional[DecisionTreeEntry]:
+        """按医生和疾病获取决策树"""
+        self._ensure_fresh()
+        with self._lock:
+            pattern_id = self._by_doctor.get(doctor_id, {}).get(disease_name)
+            return self._entries.get(pattern_id) if pattern_id else None
+
+    def record_usage(self, pattern_id: str, success: bool = False):
+        """数据库写入使用记录后同步更新内存计数"""
+        with self._lock:
+            entry = self._entries.get(pattern_id)
+            if entry is not None:
+                entry.usage_count += 1
+                if success:
+                    entry.success_count += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """注册表状态"""
+        with self._lock:
+            return {
+                "total_patterns": len(self._entries),
+                "doctors": len(self._by_doctor),
+                "version": self._version,
+                "high_water_mark": self._high_water_mark,
+                "full_loads": self._full_loads,
+                "incremental_refreshes": self._incremental_refreshes,
+            }
+
+
+# 全局实例（按数据库路径）
+_registry_instances: Dict[str, DecisionTreeRegistry] = {}
+_registry_instances_lock = threading.Lock()
+
+
+def get_decision_tree_registry(db_path: Optional[str] = None) -> DecisionTreeRegistry:
+    """获取决策树注册表单例"""
+    db_path = db_path or str(PATHS["user_db"])
+    with _registry_instances_lock:
+        registry = _registry_instances.get(db_path)
+        if registry is None:
+            registry = DecisionTreeRegistry(db_path)
+            _registry_instances[db_path] = registry
+        return registry
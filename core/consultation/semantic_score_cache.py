@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+决策树语义匹配分数缓存
+
+同一患者描述会在每轮对话、症状路径匹配等场景中反复与同一决策树证候描述比较。
+本模块以 (患者描述, 证候描述, 模型名, 决策树ID) 的标准化哈希为键缓存AI打分结果，
+重复匹配只需一次SQLite查询而不是一次大模型调用。
+
+- 过期策略：TTL，超过有效期的条目视为未命中并被清理
+- 容量控制：按 last_accessed 做LRU淘汰
+- 失效策略：医生编辑/删除决策树时按 pattern_id 或 (doctor_id, disease_name) 清除；
+  键中包含 pattern_id，证候描述相同的不同决策树各自一条，互不覆盖归属
+- 读写均为同步SQLite操作，异步调用方应放到线程中执行
+"""
+
+import hashlib
+import logging
+import re
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.settings import PATHS
+from core.database.connection import connect as db_connect
+
+logger = logging.getLogger(__name__)
+
+# 标准化时去除的空白和常见中英文标点
+_NORMALIZE_PATTERN = re.compile(r"[\s，。、；：！？,.;:!?\"'“”‘’（）()【】\[\]]+")
+
+
+class SemanticScoreCache:
+    """决策树AI语义匹配分数缓存（SQLite持久化 + TTL + LRU）"""
+
+    def __init__(self, db_path: Optional[str] = None,
+                 ttl_seconds: int = 7 * 24 * 3600,
+                 max_entries: int = 50000):
+        self.db_path = db_path or str(PATHS["cache_db"])
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        # 进程内命中统计，供 /service-status 展示
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.invalidations = 0
+        self._stats_lock = threading.Lock()
+
+        self._init_database()
+
+    def _init_database(self):
+        """初始化缓存表"""
+        conn = db_connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS decision_tree_score_cache (
+                cache_key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                pattern_id TEXT,
+                doctor_id TEXT,
+                disease_name TEXT,
+                match_score REAL NOT NULL,
+                match_reason TEXT,
+                created_at REAL NOT NULL,
+                last_accessed REAL NOT NULL
+            )
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_score_cache_pattern
+            ON decision_tree_score_cache(pattern_id)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_score_cache_doctor_disease
+            ON decision_tree_score_cache(doctor_id, disease_name)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_score_cache_last_accessed
+            ON decision_tree_score_cache(last_accessed)
+        """)
+
+        conn.commit()
+        conn.close()
+
+    @staticmethod
+    def _normalize_text(text: str) -> str:
+        """标准化文本：去除空白和标点，统一小写"""
+        return _NORMALIZE_PATTERN.sub("", text or "").lower()
+
+    def make_key(self, patient_description: str, syndrome_description: str, model: str,
+                 pattern_id: Optional[str] = None) -> str:
+        """生成内容寻址的缓存键"""
+        combined = "\x1f".join([
+            self._normalize_text(patient_description),
+            self._normalize_text(syndrome_description),
+            model or "",
+            pattern_id or ""
+        ])
+        return hashlib.sha256(combined.encode("utf-8")).hexdigest()
+
+    def get(self, patient_description: str, syndrome_description: str,
+            model: str, pattern_id: Optional[str] = None) -> Optional[Tuple[float, str]]:
+        """查询缓存分数，命中返回 (match_score, match_reason)"""
+        cache_key = self.make_key(patient_description, syndrome_description, model, pattern_id)
+        now = time.time()
+
+        try:
+            conn = db_connect(self.db_path)
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT match_score, match_reason, created_at
+                FROM decision_tree_score_cache
+                WHERE cache_key = ?
+            """, (cache_key,))
+            row = cursor.fetchone()
+
+            if row and now - row[2] < self.ttl_seconds:
+                cursor.execute("""
+                    UPDATE decision_tree_score_cache SET last_accessed = ?
+                    WHERE cache_key = ?
+                """, (now, cache_key))
+                conn.commit()
+                conn.close()
+                self._count("hits")
+                return float(row[0]), row[1] or ""
+
+            if row:
+                # 已过期
+                cursor.execute("DELETE FROM decision_tree_score_cache WHERE cache_key = ?", (cache_key,))
+                conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.warning(f"语义分数缓存查询失败: {e}")
+
+        self._count("misses")
+        return None
+
+    def set(self, patient_description: str, syndrome_description: str, model: str,
+            match_score: float, match_reason: str,
+            pattern_id: Optional[str] = None,
+            doctor_id: Optional[str] = None,
+            disease_name: Optional[str] = None):
+        """写入AI打分结果"""
+        cache_key = self.make_key(patient_description, syndrome_description, model, pattern_id)
+        now = time.time()
+
+        try:
+            conn = db_connect(self.db_path)
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT OR REPLACE INTO decision_tree_score_cache
+                (cache_key, model, pattern_id, doctor_id, disease_name,
+                 match_score, match_reason, created_at, last_accessed)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (cache_key, model, pattern_id, doctor_id, disease_name,
+                  match_score, match_reason, now, now))
+            conn.commit()
+            conn.close()
+            self._count("writes")
+
+            # 每写入一定次数检查一次容量，避免每次写入都统计全表
+            if self.writes % 100 == 0:
+                self.evict()
+        except Exception as e:
+            logger.warning(f"语义分数缓存写入失败: {e}")
+
+    def evict(self):
+        """清理过期条目，并按LRU淘汰超出容量的条目"""
+        try:
+            conn = db_connect(self.db_path)
+            cursor = conn.cursor()
+
+            cursor.execute("DELETE FROM decision_tree_score_cache WHERE created_at < ?",
+                           (time.time() - self.ttl_seconds,))
+
+            cursor.execute("SELECT COUNT(*) FROM decision_tree_score_cache")
+            overflow = cursor.fetchone()[0] - self.max_entries
+            if overflow > 0:
+                cursor.execute("""
+                    DELETE FROM decision_tree_score_cache
+                    WHERE cache_key IN (
+                        SELECT cache_key FROM decision_tree_score_cache
+                        ORDER BY last_accessed ASC
+                        LIMIT ?
+                    )
+                """, (overflow,))
+                logger.info(f"语义分数缓存LRU淘汰 {overflow} 条")
+
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.warning(f"语义分数缓存清理失败: {e}")
+
+    def invalidate_pattern(self, pattern_id: Optional[str] = None,
+                           doctor_id: Optional[str] = None,
+                           disease_name: Optional[str] = None) -> int:
+        """
+        决策树被编辑或删除后清除相关缓存
+
+        保存决策树会以新ID替换同一医生同一疾病的旧记录，
+        因此除了 pattern_id 也支持按 (doctor_id, disease_name) 清除。
+        """
+        if not pattern_id and not (doctor_id and disease_name):
+            return 0
+
+        try:
+            conn = db_connect(self.db_path)
+            cursor = conn.cursor()
+            removed = 0
+            if pattern_id:
+                cursor.execute("DELETE FROM decision_tree_score_cache WHERE pattern_id = ?",
+                               (pattern_id,))
+                removed += cursor.rowcount
+            if doctor_id and disease_name:
+                cursor.execute("""
+                    DELETE FROM decision_tree_score_cache
+                    WHERE doctor_id = ? AND disease_name = ?
+                """, (doctor_id, disease_name))
+                removed += cursor.rowcount
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.warning(f"语义分数缓存失效处理失败: {e}")
+            return 0
+
+        self._count("invalidations", removed)
+        if removed:
+            logger.info(f"🧹 决策树语义分数缓存已失效 {removed} 条 "
+                        f"(pattern_id={pattern_id}, doctor_id={doctor_id}, disease={disease_name})")
+        return removed
+
+    def _count(self, field: str, amount: int = 1):
+        with self._stats_lock:
+            setattr(self, field, getattr(self, field) + amount)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取缓存统计信息"""
+        total = self.hits + self.misses
+        stats = {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "writes": self.writes,
+            "invalidations": self.invalidations,
+            "ttl_seconds": self.ttl_seconds,
+            "max_entries": self.max_entries,
+        }
+        try:
+            conn = db_connect(self.db_path)
+            stats["total_entries"] = conn.execute(
+                "SELECT COUNT(*) FROM decision_tree_score_cache"
+            ).fetchone()[0]
+            conn.close()
+        except Exception:
+            stats["total_entries"] = None
+        return stats
+
+
+# 全局单例
+_score_cache_instance: Optional[SemanticScoreCache] = None
+
+
+def get_semantic_score_cache() -> SemanticScoreCache:
+    """获取语义分数缓存单例"""
+    global _score_cache_instance
+    if _score_cache_instance is None:
+        _score_cache_instance = SemanticScoreCache()
+    return _score_cache_instance
@@ -8,7 +8,9 @@ import asyncio
 import json
 import logging
 import re
-from typing import Dict, List, Any, Optional, Tuple
+import time
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 
@@ -31,9 +33,18 @@ from core.ai_response.template_prompt_generator_simple import (
 
 # 🆕 决策树智能匹配系统
 from core.consultation.decision_tree_matcher import get_decision_tree_matcher
+from core.consultation.decision_tree_registry import get_decision_tree_registry
+from core.text_matching.symptom_lexicon import get_symptom_lexicon, lexicon_request_scope
+from core.llm import LLMError, LLMTimeoutError, get_llm_gateway
 
 logger = logging.getLogger(__name__)
 
+# 问诊摘要中的描述性症状模式
+_SUMMARY_SYMPTOM_PATTERNS = [
+    re.compile(r'(.{0,3})(痛|疼|酸|胀|闷)'),
+    re.compile(r'(拉肚子|腹泻|便秘|失眠|咳嗽)')
+]
+
 @dataclass
 class ConsultationRequest:
     """问诊请求"""
@@ -65,6 +76,50 @@ class ConsultationResponse:
     # 🆕 决策树匹配信息
     used_pattern_id: Optional[str] = None
     pattern_match_score: Optional[float] = None
+    # 各处理阶段耗时（毫秒）
+    stage_timings: Optional[Dict[str, float]] = None
+
+class StageTimer:
+    """记录问诊各阶段耗时（毫秒）"""
+
+    def __init__(self):
+        self._started = time.perf_counter()
+        self._stage_started: Dict[str, float] = {}
+        self.timings: Dict[str, float] = {}
+
+    def record(self, name: str, elapsed_ms: float):
+        self.timings[name] = round(elapsed_ms, 2)
+
+    def elapsed(self, name: str) -> float:
+        """进行中阶段已耗时"""
+        return (time.perf_counter() - self._stage_started[name]) * 1000
+
+    @contextmanager
+    def measure(self, name: str):
+        self._stage_started[name] = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, self.elapsed(name))
+
+    async def run(self, name: str, awaitable):
+        """等待并计时一个异步阶段"""
+        with self.measure(name):
+            return await awaitable
+
+    def attach(self, response: ConsultationResponse) -> ConsultationResponse:
+        """把阶段耗时与总耗时写入响应"""
+        self.record("total", (time.perf_counter() - self._started) * 1000)
+        response.stage_timings = dict(self.timings)
+        return response
+
+@dataclass
+class _PreparedConsultation:
+    """调用AI前准备好的问诊上下文"""
+    conversation_state: Any
+    user_analysis: Any
+    messages: List[Dict[str, str]]
+    timer: StageTimer
 
 class UnifiedConsultationService:
     """统一问诊服务"""
@@ -97,6 +152,9 @@ class UnifiedConsultationService:
             # 决策树匹配结果缓存（新增）
             self.pattern_match_cache = {}  # {conversation_id: (pattern_id, match_score, matched_pattern)}
 
+            # 流式问诊中延后执行的后台任务（响应缓存等）
+            self._background_tasks = set()
+
             logger.info("✅ 统一问诊服务初始化完成（含思维库集成+智能决策树匹配）")
             self.state_manager = conversation_state_manager
             
@@ -144,78 +202,171 @@ class UnifiedConsultationService:
     
     async def process_consultation(self, request: ConsultationRequest) -> ConsultationResponse:
         """处理问诊请求"""
+        # 本次请求内各组件对同一消息的词表扫描只做一次
+        with lexicon_request_scope():
+            return await self._process_consultation(request)
+    
+    async def _process_consultation(self, request: ConsultationRequest) -> ConsultationResponse:
+        start_time = datetime.now()
+        timer = StageTimer()
+        
+        try:
+            # 1-9. 状态管理、消息分析、提示词与上下文构建
+            prepared = await self._prepare_consultation(request, start_time, timer)
+            if isinstance(prepared, ConsultationResponse):
+                return prepared
+            
+            # 10. 调用AI生成响应
+            with timer.measure("llm"):
+                ai_response = await self._call_ai_model(prepared.messages)
+            
+            # 11-15. 后处理、状态更新、缓存、构建最终响应
+            return await self._finalize_consultation(request, prepared, ai_response, start_time)
+            
+        except Exception as e:
+            logger.error(f"问诊处理失败: {e}")
+            return timer.attach(self._create_error_response(request, start_time, str(e)))
+    
+    async def stream_consultation(self, request: ConsultationRequest) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        流式处理问诊请求
+
+        依次产出 ("delta", 增量文本)，最后产出一次 ("final", ConsultationResponse)。
+        final 中的 reply 是经过处方格式与安全后处理的完整回复，客户端应以它替换已显示的增量文本；
+        响应缓存在后台完成，不阻塞 final 帧。
+        """
         start_time = datetime.now()
+        timer = StageTimer()
         
         try:
-            # 1. 对话状态管理
-            conversation_state = await self._manage_conversation_state(request)
-            if not conversation_state:
-                return self._create_error_response(request, start_time, "对话状态初始化失败")
+            with lexicon_request_scope():
+                prepared = await self._prepare_consultation(request, start_time, timer)
+            if isinstance(prepared, ConsultationResponse):
+                yield ("final", prepared)
+                return
             
-            # 2. 检查超时和结束条件
-            timeout_check = self.state_manager.check_timeout(request.conversation_id)
-            if timeout_check[0]:  # 已超时
-                return self._create_end_response(request, start_time, timeout_check[1])
+            parts = []
+            with timer.measure("llm"):
+                async for delta in self._stream_ai_model(prepared.messages):
+                    if not parts:
+                        timer.record("llm_first_token", timer.elapsed("llm"))
+                    parts.append(delta)
+                    yield ("delta", delta)
+            
+            with lexicon_request_scope():
+                final_response = await self._finalize_consultation(
+                    request, prepared, "".join(parts), start_time, defer_cache=True
+                )
+            yield ("final", final_response)
             
-            # 3. 分析用户消息
+        except Exception as e:
+            logger.error(f"流式问诊处理失败: {e}")
+            yield ("final", timer.attach(self._create_error_response(request, start_time, str(e))))
+    
+    async def _prepare_consultation(self, request: ConsultationRequest, start_time: datetime,
+                                    timer: StageTimer):
+        """
+        调用AI之前的准备阶段：
+
+            状态加载 → 超时检查 → 消息分析 → 结束判断 → 症状更新 → 缓存查询 → 思维库匹配 → 人格提示词 → 消息上下文
+
+        返回 _PreparedConsultation；对话需直接结束（初始化失败、超时、用户结束、命中缓存）时返回
+        ConsultationResponse。思维库匹配（决策树，可能调用大模型）在这些判断都通过后才开始，
+        直接结束的请求不会产生大模型调用。
+        """
+        # 1. 对话状态加载（线程中读写数据库，不阻塞事件循环）
+        conversation_state = await timer.run("state_load", self._manage_conversation_state(request))
+        if not conversation_state:
+            return timer.attach(self._create_error_response(request, start_time, "对话状态初始化失败"))
+        
+        # 2. 检查超时和结束条件
+        timeout_check = self.state_manager.check_timeout(request.conversation_id)
+        if timeout_check[0]:  # 已超时
+            return timer.attach(self._create_end_response(request, start_time, timeout_check[1]))
+        
+        # 3. 分析用户消息
+        with timer.measure("analysis"):
             user_analysis = self.analyzer.analyze_user_message(
                 request.message, 
                 conversation_state.current_stage,
                 conversation_state.turn_count,
                 request.conversation_history or []
             )
-            
-            # 4. 检查是否应该结束对话
-            if user_analysis.should_end:
-                self.state_manager.end_conversation(
-                    request.conversation_id,
-                    user_analysis.end_type,
-                    user_analysis.end_reason
-                )
-                return self._create_end_response(request, start_time, user_analysis.end_reason)
-            
-            # 5. 更新症状收集
-            if user_analysis.extracted_symptoms:
-                self.state_manager.update_symptoms(request.conversation_id, user_analysis.extracted_symptoms)
-            
-            # 6. 缓存检查
-            cached_response = await self._check_cache(request)
-            if cached_response:
-                return self._enrich_response_with_state(cached_response, conversation_state)
-            
-            # 7. 生成医生人格提示词（暂时使用原有系统）
+        
+        # 4. 检查是否应该结束对话
+        if user_analysis.should_end:
+            self.state_manager.end_conversation(
+                request.conversation_id,
+                user_analysis.end_type,
+                user_analysis.end_reason
+            )
+            return timer.attach(self._create_end_response(request, start_time, user_analysis.end_reason))
+        
+        # 5. 更新症状收集
+        if user_analysis.extracted_symptoms:
+            self.state_manager.update_symptoms(request.conversation_id, user_analysis.extracted_symptoms)
+        
+        # 6. 缓存命中时跳过依赖大模型的分支（_check_cache 尚未接入缓存系统，目前总是未命中）
+        cached_response = await timer.run("cache_lookup", self._check_cache(request))
+        if cached_response:
+            return timer.attach(self._enrich_response_with_state(cached_response, conversation_state))
+        
+        # 7. 🧠 思维库匹配
+        thinking_context = await timer.run(
+            "thinking_library", self._get_thinking_library_context(request, conversation_state)
+        )
+        
+        # 8. 生成医生人格提示词（暂时使用原有系统）
+        with timer.measure("persona_prompt"):
             persona_prompt = self._generate_doctor_persona_prompt(request, conversation_state)
-            
-            # 8. 🧠 查询思维库（新增）
-            thinking_context = await self._get_thinking_library_context(request, conversation_state)
-            
-            # 9. 构建完整的消息上下文（增强版）
+        # 9. 构建完整的消息上下文（增强版）
+        with timer.measure("message_build"):
             messages = self._build_message_context(request, persona_prompt, thinking_context)
-            
-            # 10. 调用AI生成响应
-            ai_response = await self._call_ai_model(messages)
-            
-            # 10. 分析AI响应
-            ai_analysis = self.analyzer.analyze_ai_response(ai_response, conversation_state.current_stage)
-            
-            # 11. 安全检查和后处理
+        
+        return _PreparedConsultation(conversation_state, user_analysis, messages, timer)
+    
+    async def _finalize_consultation(self, request: ConsultationRequest, prepared: "_PreparedConsultation",
+                                     ai_response: str, start_time: datetime,
+                                     defer_cache: bool = False) -> ConsultationResponse:
+        """AI回复之后的收尾阶段；defer_cache=True 时响应缓存放到后台任务"""
+        timer = prepared.timer
+        
+        # 11. 分析AI响应
+        with timer.measure("response_analysis"):
+            ai_analysis = self.analyzer.analyze_ai_response(ai_response, prepared.conversation_state.current_stage)
+        
+        # 12. 安全检查和后处理
+        with timer.measure("post_process"):
             processed_response = await self._post_process_response(ai_response, request, ai_analysis)
-            
-            # 12. 更新对话状态
-            await self._update_conversation_state(request, user_analysis, ai_analysis, processed_response)
-            
-            # 13. 缓存响应
-            await self._cache_response(request, processed_response)
-            
-            # 14. 构建最终响应
-            final_response = self._create_final_response(request, processed_response, start_time, conversation_state)
-            
-            logger.info(f"问诊处理完成: {request.selected_doctor}, 用时: {final_response.processing_time:.2f}s")
-            return final_response
-            
-        except Exception as e:
-            logger.error(f"问诊处理失败: {e}")
-            return self._create_error_response(request, start_time, str(e))
+        
+        # 13. 更新对话状态
+        with timer.measure("state_update"):
+            await self._update_conversation_state(request, prepared.user_analysis, ai_analysis, processed_response)
+        
+        # 14. 缓存响应
+        if defer_cache:
+            self._run_in_background(self._cache_response(request, processed_response))
+        else:
+            with timer.measure("cache_write"):
+                await self._cache_response(request, processed_response)
+        
+        # 15. 构建最终响应
+        final_response = timer.attach(self._create_final_response(
+            request, processed_response, start_time, prepared.conversation_state
+        ))
+        
+        logger.info(
+            f"问诊处理完成: {request.selected_doctor}, 用时: {final_response.processing_time:.2f}s, "
+            f"阶段耗时(ms): {final_response.stage_timings}"
+        )
+        return final_response
+    
+    def _run_in_background(self, coroutine):
+        """在后台执行不影响本次回复的任务，保留引用直到完成"""
+        task = asyncio.ensure_future(coroutine)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
     
     def _generate_doctor_persona_prompt_old(self, request: ConsultationRequest) -> str:
         """生成医生人格提示词"""
@@ -272,39 +423,38 @@ class UnifiedConsultationService:
     
     
     async def _call_ai_model(self, messages: List[Dict[str, str]]) -> str:
-        """调用AI模型"""
+        """调用AI模型（经由统一大模型网关）"""
         try:
-            import dashscope
-            from http import HTTPStatus
-
-            # qwen3.6-plus 是多模态模型，需要转换为 MultiModalConversation 的消息格式
-            mm_messages = []
-            for msg in messages:
-                mm_messages.append({
-                    "role": msg["role"],
-                    "content": [{"text": msg["content"]}]
-                })
-
-            response = await asyncio.wait_for(
-                asyncio.to_thread(
-                    dashscope.MultiModalConversation.call,
-                    model=self.ai_model,
-                    messages=mm_messages,
-                    enable_thinking=False
-                ),
-                timeout=self.ai_timeout
+            return await get_llm_gateway().complete_text(
+                messages,
+                model=self.ai_model,
+                timeout=self.ai_timeout,
+                call_site="consultation.chat",
+                enable_thinking=False
             )
-
-            if response.status_code == HTTPStatus.OK and response.output and response.output.choices:
-                return response.output.choices[0].message.content[0]["text"]
-            else:
-                raise Exception(f"AI调用失败: {getattr(response, 'message', 'Unknown')}")
-
-        except asyncio.TimeoutError:
+        except LLMTimeoutError:
             raise Exception(f"AI调用超时 ({self.ai_timeout}秒)")
+        except LLMError as e:
+            raise Exception(f"AI调用失败: {str(e)}")
         except Exception as e:
             raise Exception(f"AI调用异常: {str(e)}")
     
+    async def _stream_ai_model(self, messages: List[Dict[str, str]]) -> AsyncIterator[str]:
+        """流式调用AI模型，逐段产出增量文本"""
+        try:
+            async for delta in get_llm_gateway().stream(
+                messages,
+                model=self.ai_model,
+                timeout=self.ai_timeout,
+                call_site="consultation.chat_stream",
+                enable_thinking=False
+            ):
+                yield delta
+        except LLMTimeoutError:
+            raise Exception(f"AI调用超时 ({self.ai_timeout}秒)")
+        except LLMError as e:
+            raise Exception(f"AI调用失败: {str(e)}")
+    
     async def _post_process_response(self, ai_response: str, request: ConsultationRequest) -> Dict[str, Any]:
         """后处理AI响应"""
         try:
@@ -597,20 +747,9 @@ class UnifiedConsultationService:
                 logger.debug("未能提取诊断关键词或症状，跳过决策树匹配")
                 return None, 0.0
 
-            # 连接数据库查询该医生的决策树
-            conn = sqlite3.connect("/home/ute/tcm-ai/data/user_history.sqlite")
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-
-            cursor.execute("""
-                SELECT id, disease_name, thinking_process, clinical_patterns
-                FROM doctor_clinical_patterns
-                WHERE doctor_id = ?
-                ORDER BY updated_at DESC
-            """, (doctor_user_id,))
-
-            patterns = cursor.fetchall()
-            conn.close()
+            # 从决策树注册表获取该医生的决策树（预解析，无需查库）
+            patterns = get_decision_tree_registry().get_all(doctor_user_id)
+            patterns.sort(key=lambda entry: entry.updated_at, reverse=True)
 
             if not patterns:
                 logger.debug(f"医生 {request.selected_doctor} 没有保存的决策树")
@@ -630,7 +769,7 @@ class UnifiedConsultationService:
 
                 if score > best_score:
                     best_score = score
-                    best_pattern_id = pattern['id']
+                    best_pattern_id = pattern.pattern_id
                     logger.debug(f"匹配决策树: {pattern['disease_name']}, 分数: {score:.2f}")
 
             # 只有当匹配分数超过阈值时才返回结果
@@ -753,6 +892,8 @@ class UnifiedConsultationService:
             conn.commit()
             conn.close()
 
+            get_decision_tree_registry().record_usage(pattern_id)
+
             logger.info(f"✅ 决策树使用统计已更新: {pattern_id}")
 
         except Exception as e:
@@ -814,29 +955,31 @@ class UnifiedConsultationService:
     
     # 新增对话状态管理相关方法
     async def _manage_conversation_state(self, request: ConsultationRequest):
-        """管理对话状态"""
+        """管理对话状态（数据库读写放到线程中，不阻塞事件循环）"""
         try:
-            # 获取或创建对话状态
-            state = self.state_manager.get_conversation_state(request.conversation_id)
-            
-            if not state:
-                # 创建新对话状态
-                user_id = request.patient_id or "guest"
-                state = self.state_manager.create_conversation(
-                    request.conversation_id, 
-                    user_id, 
-                    request.selected_doctor
-                )
-            
-            # 增加对话轮数
-            self.state_manager.increment_turn(request.conversation_id)
-            
-            return state
-            
+            return await asyncio.to_thread(self._load_conversation_state, request)
         except Exception as e:
             logger.error(f"对话状态管理失败: {e}")
             return None
     
+    def _load_conversation_state(self, request: ConsultationRequest):
+        # 获取或创建对话状态
+        state = self.state_manager.get_conversation_state(request.conversation_id)
+        
+        if not state:
+            # 创建新对话状态
+            user_id = request.patient_id or "guest"
+            state = self.state_manager.create_conversation(
+                request.conversation_id, 
+                user_id, 
+                request.selected_doctor
+            )
+        
+        # 增加对话轮数
+        self.state_manager.increment_turn(request.conversation_id)
+        
+        return state
+    
     def _generate_doctor_persona_prompt(self, request: ConsultationRequest, state=None) -> str:
         """生成医生人格提示词（增强版）"""
         try:
@@ -1665,27 +1808,12 @@ class UnifiedConsultationService:
     
     def _extract_symptoms_for_summary(self, text: str) -> List[str]:
         """为摘要提取症状信息"""
-        symptoms = []
-        
-        # 常见症状关键词
-        symptom_keywords = [
-            "头痛", "头晕", "胃痛", "腹痛", "咳嗽", "失眠", "便秘", "腹泻",
-            "乏力", "心慌", "胸闷", "恶心", "呕吐", "发热", "口干", "盗汗"
-        ]
-        
-        for keyword in symptom_keywords:
-            if keyword in text:
-                symptoms.append(keyword)
+        # 常见症状关键词（见 symptom_lexicon）
+        symptoms = get_symptom_lexicon().scan(text).terms("summary_symptom")
         
         # 提取描述性症状
-        patterns = [
-            r'(.{0,3})(痛|疼|酸|胀|闷)',
-            r'(拉肚子|腹泻|便秘|失眠|咳嗽)'
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, text)
-            for match in matches:
+        for pattern in _SUMMARY_SYMPTOM_PATTERNS:
+            for match in pattern.findall(text):
                 symptom = ''.join(match).strip()
                 if len(symptom) > 1 and symptom not in symptoms:
                     symptoms.append(symptom)
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+问诊对话轮次存储（追加写）
+
+原先每轮对话都要读出 consultations.conversation_log 整个JSON、json.loads、
+追加一轮再 json.dumps 整体回写，长问诊的写入量随轮数平方增长，并长时间持有写锁。
+本模块把每条消息作为一行追加到 consultation_turns 表：
+
+- 写入：每轮对话追加患者、AI两行，seq 在同一问诊内单调递增
+- conversation_log 只保留摘要字段（兼容投影），不再携带完整历史
+- 读取：按 (consultation_uuid, seq) 做keyset分页，按需还原为旧的
+  [{patient_query, ai_response, timestamp, stage}] 结构
+- 旧记录在第一次追加时把 conversation_log 中的历史回填为轮次行
+- 列表页用 load_conversation_histories 一次查询读取多个问诊的消息行
+
+所有函数都接收调用方的 cursor，与调用方的其他写入处于同一事务中。
+读取 MAX(seq) 前以 BEGIN IMMEDIATE 取得写锁，多个worker同时追加同一问诊时不会算出相同的 seq。
+"""
+
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ROLE_PATIENT = "patient"
+ROLE_ASSISTANT = "assistant"
+
+# 旧格式 [{type, content}] 中的角色名映射
+_LEGACY_ROLE_MAP = {
+    "user": ROLE_PATIENT,
+    "patient": ROLE_PATIENT,
+    "ai": ROLE_ASSISTANT,
+    "assistant": ROLE_ASSISTANT,
+    "doctor": ROLE_ASSISTANT,
+}
+
+
+def ensure_turn_table(cursor) -> None:
+    """创建 consultation_turns 表（UNIQUE(consultation_uuid, seq) 同时作为keyset分页索引）"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS consultation_turns (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            consultation_uuid TEXT NOT NULL,
+            seq INTEGER NOT NULL,
+            role TEXT NOT NULL,
+            content TEXT,
+            stage TEXT,
+            ts TEXT NOT NULL,
+            UNIQUE(consultation_uuid, seq)
+        )
+    """)
+
+
+# IN (...) 每批的参数个数，低于SQLite默认上限999
+_IN_BATCH = 500
+
+
+def begin_write(cursor) -> None:
+    """
+    以 BEGIN IMMEDIATE 开启写事务（已在事务中或连接为自动提交模式时不做处理）
+
+    读取 MAX(seq) 与插入之间持有写锁，调用方负责 commit。
+    """
+    conn = cursor.connection
+    if conn.isolation_level is not None and not conn.in_transaction:
+        cursor.execute("BEGIN IMMEDIATE")
+
+
+def _last_seq(cursor, consultation_uuid: str) -> int:
+    cursor.execute(
+        "SELECT MAX(seq) FROM consultation_turns WHERE consultation_uuid = ?",
+        (consultation_uuid,)
+    )
+    row = cursor.fetchone()
+    return (row[0] if row else None) or 0
+
+
+def count_turns(cursor, consultation_uuid: str) -> int:
+    """问诊已记录的消息条数（不存在时为0）"""
+    try:
+        return _last_seq(cursor, consultation_uuid)
+    except Exception:
+        # 表尚未创建
+        return 0
+
+
+def append_turns(cursor, consultation_uuid: str,
+                 turns: Iterable[Tuple[str, str, Optional[str], Optional[str]]]) -> int:
+    """
+    追加消息行
+
+    Args:
+        turns: (role, content, stage, ts) 序列，ts 为空时取当前时间
+
+    Returns:
+        追加后最后一条消息的 seq
+    """
+    begin_write(cursor)
+    seq = _last_seq(cursor, consultation_uuid)
+    rows = []
+    for role, content, stage, ts in turns:
+        seq += 1
+        rows.append((consultation_uuid, seq, role, content, stage, ts or datetime.now().isoformat()))
+    if rows:
+        cursor.executemany("""
+            INSERT INTO consultation_turns (consultation_uuid, seq, role, content, stage, ts)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, rows)
+    return seq
+
+
+def _legacy_history_to_turns(log_data: Any) -> List[Tuple[str, str, Optional[str], Optional[str]]]:
+    """把旧 conversation_log 中的历史转换为消息行"""
+    turns = []
+    if isinstance(log_data, dict):
+        for item in log_data.get("conversation_history") or []:
+            if not isinstance(item, dict):
+                continue
+            ts = item.get("timestamp")
+            stage = item.get("stage")
+            if item.get("patient_query"):
+                turns.append((ROLE_PATIENT, item.get("patient_query"), stage, ts))
+            if item.get("ai_response"):
+                turns.append((ROLE_ASSISTANT, item.get("ai_response"), stage, ts))
+    elif isinstance(log_data, list):
+        for item in log_data:
+            if not isinstance(item, dict):
+                continue
+            role = _LEGACY_ROLE_MAP.get(item.get("type") or item.get("role"))
+            if role:
+                turns.append((role, item.get("content", ""), item.get("stage"),
+                              item.get("timestamp") or item.get("time")))
+    return turns
+
+
+def backfill_from_log(cursor, consultation_uuid: str, raw_log: Optional[str]) -> int:
+    """
+    旧记录的历史仍在 conversation_log 中时，回填为消息行
+
+    仅在该问诊还没有任何消息行时执行，返回回填后的最后 seq。
+    """
+    begin_write(cursor)
+    last_seq = _last_seq(cursor, consultation_uuid)
+    if last_seq or not raw_log:
+        return last_seq
+    try:
+        log_data = json.loads(raw_log)
+    except (TypeError, ValueError):
+        return 0
+    if isinstance(log_data, dict) and log_data.get("turn_store"):
+        return 0
+
+    turns = _legacy_history_to_turns(log_data)
+    if turns:
+        logger.info(f"📥 问诊 {consultation_uuid} 回填 {len(turns)} 条历史消息到 consultation_turns")
+    return append_turns(cursor, consultation_uuid, turns)
+
+
+def build_log_projection(conversation_id: str, message_count: int, current_stage: Optional[str],
+                         confidence_score: Any, last_query: str, last_response: str) -> str:
+    """
+    生成写回 conversation_log 的摘要投影（不含完整历史）
+
+    message_count 为消息行数（每轮患者、AI各一条），不是对话轮数
+    """
+    return json.dumps({
+        "conversation_id": conversation_id,
+        "turn_store": True,
+        "message_count": message_count,
+        "current_stage": current_stage,
+        "confidence_score": confidence_score,
+        "last_query": last_query,
+        "last_response": last_response
+    })
+
+
+def fetch_turns(cursor, consultation_uuid: str, after_seq: int = 0,
+                limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """按 seq 顺序读取消息行（keyset分页）"""
+    sql = """
+        SELECT seq, role, content, stage, ts FROM consultation_turns
+        WHERE consultation_uuid = ? AND seq > ?
+        ORDER BY seq
+    """
+    params: List[Any] = [consultation_uuid, after_seq]
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(limit)
+    try:
+        cursor.execute(sql, params)
+    except Exception:
+        # 表尚未创建
+        return []
+    return [
+        {"seq": row[0], "role": row[1], "content": row[2], "stage": row[3], "ts": row[4]}
+        for row in cursor.fetchall()
+    ]
+
+
+def iter_turns(cursor, consultation_uuid: str, page_size: int = 500) -> Iterator[Dict[str, Any]]:
+    """按 seq 分页遍历问诊的全部消息行，用于导出等需要完整内容的场景"""
+    after_seq = 0
+    while True:
+        page = fetch_turns(cursor, consultation_uuid, after_seq, page_size)
+        yield from page
+        if len(page) < page_size:
+            return
+        after_seq = page[-1]["seq"]
+
+
+def turns_to_history(turns: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """把消息行配对还原为 [{patient_query, ai_response, timestamp, stage, seq}]"""
+    history: List[Dict[str, Any]] = []
+    for turn in turns:
+        if turn["role"] == ROLE_PATIENT or not history or history[-1]["ai_response"]:
+            history.append({
+                "patient_query": turn["content"] if turn["role"] == ROLE_PATIENT else "",
+                "ai_response": turn["content"] if turn["role"] != ROLE_PATIENT else "",
+                "timestamp": turn["ts"],
+                "stage": turn["stage"],
+                "seq": turn["seq"]
+            })
+        else:
+            history[-1]["ai_response"] = turn["content"]
+            history[-1]["stage"] = turn["stage"] or history[-1]["stage"]
+            history[-1]["seq"] = turn["seq"]
+    return history
+
+
+def load_conversation_history(cursor, consultation_uuid: str, raw_log: Optional[str] = None,
+                              after_seq: int = 0,
+                              limit: Optional[int] = None) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+    """
+    读取问诊对话历史
+
+    有消息行时以消息行为准；否则回退解析旧 conversation_log。
+
+    Args:
+        after_seq: keyset游标，返回 seq 大于该值的轮次
+        limit: 最多返回的轮次数（每轮含患者与AI两条消息）
+
+    Returns:
+        (历史轮次列表, 下一页游标)，没有更多数据时游标为 None
+    """
+    row_limit = limit * 2 if limit else None
+    turns = fetch_turns(cursor, consultation_uuid, after_seq, row_limit)
+    if turns or after_seq:
+        history = turns_to_history(turns)
+        if row_limit and len(turns) >= row_limit and history:
+            history = history[:limit]
+            return history, history[-1]["seq"]
+        return history, None
+
+    # 尚未迁移的旧记录
+    history = _legacy_history(raw_log)
+    if limit and len(history) > limit:
+        return history[:limit], history[limit - 1]["seq"]
+    return history, None
+
+
+def load_conversation_histories(cursor, consultations: Iterable[Tuple[str, Optional[str]]]
+                                ) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    批量读取多个问诊的完整对话历史：{uuid: 历史轮次列表}
+
+    Args:
+        consultations: (uuid, conversation_log) 序列
+
+    消息行按 IN (...) 一次查询读取；没有消息行的旧记录回退解析 conversation_log。
+    """
+    raw_logs = dict(consultations)
+    uuids = list(raw_logs)
+    turns_by_uuid: Dict[str, List[Dict[str, Any]]] = {}
+    try:
+        for start in range(0, len(uuids), _IN_BATCH):
+            batch = uuids[start:start + _IN_BATCH]
+            cursor.execute(f"""
+                SELECT consultation_uuid, seq, role, content, stage, ts FROM consultation_turns
+                WHERE consultation_uuid IN ({",".join("?" * len(batch))})
+                ORDER BY consultation_uuid, seq
+            """, batch)
+            for row in cursor.fetchall():
+                turns_by_uuid.setdefault(row[0], []).append(
+                    {"seq": row[1], "role": row[2], "content": row[3], "stage": row[4], "ts": row[5]}
+                )
+    except Exception:
+        # 表尚未创建
+        turns_by_uuid = {}
+
+    histories = {}
+    for consultation_uuid in uuids:
+        turns = turns_by_uuid.get(consultation_uuid)
+        histories[consultation_uuid] = (
+            turns_to_history(turns) if turns else _legacy_history(raw_logs[consultation_uuid])
+        )
+    return histories
+
+
+def _legacy_history(raw_log: Any) -> List[Dict[str, Any]]:
+    """从尚未迁移的旧 conversation_log 还原历史轮次"""
+    return turns_to_history([
+        {"seq": i + 1, "role": role, "content": content, "stage": stage, "ts": ts}
+        for i, (role, content, stage, ts) in enumerate(_legacy_history_to_turns(_parse_log(raw_log)))
+    ])
+
+
+def _parse_log(raw_log: Any) -> Any:
+    if not raw_log:
+        return {}
+    if isinstance(raw_log, (dict, list)):
+        return raw_log
+    try:
+        return json.loads(raw_log)
+    except (TypeError, ValueError):
+        return {}
+
+
+def materialize_conversation_log(cursor, consultation_uuid: str, raw_log: Optional[str]) -> Dict[str, Any]:
+    """
+    还原旧版 conversation_log 字典结构
+
+    摘要字段取自投影，conversation_history 从消息行还原，供尚按完整日志读取的调用方使用。
+    """
+    log_data = _parse_log(raw_log)
+    if not isinstance(log_data, dict):
+        log_data = {}
+    else:
+        log_data = dict(log_data)
+    history, _ = load_conversation_history(cursor, consultation_uuid, raw_log)
+    log_data["conversation_history"] = history
+    log_data.pop("turn_store", None)
+    return log_data
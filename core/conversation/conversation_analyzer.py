@@ -11,9 +11,19 @@ from typing import Dict, Any, List, Tuple, Optional
 from dataclasses import dataclass
 
 from .conversation_state_manager import ConversationStage, ConversationEndType
+from core.text_matching.symptom_lexicon import get_symptom_lexicon
 
 logger = logging.getLogger(__name__)
 
+# 常见症状描述模式（关键词之外的补充）
+_SYMPTOM_PATTERNS = [
+    re.compile(r'(.{0,5})(痛|疼|酸|胀|闷|紧|重|麻|木)(.{0,3})'),
+    re.compile(r'(头|胃|腰|腹|胸|心|眼|耳|口|咽)(.{0,3})(不舒服|难受|异常)'),
+    re.compile(r'(睡不着|失眠|多梦|易醒|入睡困难)'),
+    re.compile(r'(拉肚子|腹泻|便秘|大便.*)'),
+    re.compile(r'(咳嗽|咳痰|气喘|胸闷)')
+]
+
 @dataclass
 class AnalysisResult:
     """分析结果"""
@@ -38,54 +48,9 @@ class ConversationAnalyzer:
         # 初始化分词器
         jieba.initialize()
         
-        # 症状关键词
-        self.symptom_keywords = {
-            '头痛', '头晕', '头胀', '偏头痛', '头重',
-            '失眠', '多梦', '易醒', '入睡困难', '睡眠浅',
-            '胃痛', '胃胀', '胃酸', '消化不良', '恶心', '呕吐',
-            '便秘', '腹泻', '大便干', '大便稀', '腹胀', '腹痛',
-            '咳嗽', '咳痰', '气喘', '胸闷', '气短',
-            '乏力', '疲劳', '精神差', '倦怠', '无力',
-            '心慌', '心悸', '胸痛', '心跳快',
-            '腰痛', '腰酸', '腿软', '膝盖痛', '关节痛',
-            '月经不调', '痛经', '白带异常', '性功能减退',
-            '眼干', '眼涩', '视力模糊', '耳鸣', '听力下降',
-            '口干', '口苦', '口臭', '牙痛', '咽喉痛',
-            '皮肤干燥', '皮疹', '瘙痒', '湿疹'
-        }
-        
-        # 🔑 修复：移除容易误判的结束关键词，保留明确的结束表达
-        self.end_keywords = {
-            'natural': [
-                # 移除了'谢谢', '明白了', '好的'等容易误判的词
-                '谢谢医生', '感谢医生', '多谢了',
-                '先这样吧', '就这样吧', '够了', '可以了', '不用了',
-                '再见', '拜拜', '问诊结束', '暂时不问了'
-            ],
-            'satisfied': [
-                # 移除了'满意', '很好', '不错'等容易误判的词
-                '很满意', '非常满意', '满意的', '很有帮助', '非常有用',
-                '清楚了谢谢', '明白了谢谢', '知道怎么做了'
-            ]
-        }
-        
-        # 紧急情况关键词
-        self.emergency_keywords = [
-            '剧痛', '剧烈疼痛', '无法忍受', '痛得厉害',
-            '呼吸困难', '喘不过气', '胸痛厉害', '心慌严重',
-            '昏迷', '意识不清', '抽搐', '痉挛',
-            '大出血', '出血不止', '吐血', '大量便血',  # 修改：只有"大量便血"才是紧急情况
-            '高热', '发烧很厉害', '烧得很高',
-            '急诊', '需要急救', '送医院', '叫救护车'
-        ]
-        
-        # 处方相关关键词
-        self.prescription_keywords = [
-            '处方', '方剂', '药方', '中药', '汤剂',
-            '君药', '臣药', '佐药', '使药',
-            '克', 'g', '煎服', '水煎', '用法',
-            '每日', '每天', '早晚', '饭前', '饭后'
-        ]
+        # 症状、结束语、紧急情况、处方提示词统一由症状词表自动机匹配（单遍扫描），
+        # 词表见 core.text_matching.symptom_lexicon
+        self.lexicon = get_symptom_lexicon()
         
         # 继续问诊关键词
         self.continue_keywords = [
@@ -161,67 +126,34 @@ class ConversationAnalyzer:
     
     def _check_conversation_end(self, message: str) -> Tuple[bool, Optional[ConversationEndType], str]:
         """检查是否应该结束对话"""
-        message_lower = message.lower()
+        scan = self.lexicon.scan(message)
         
         # 🔑 修复：更精准的结束检测，避免误判
-        # 检查明确的结束表达，需要单独成句或在句子开头/结尾
-        clear_end_patterns = [
-            '谢谢医生', '谢谢大夫', '多谢了', '感谢医生', '明白了谢谢',
-            '先这样吧', '就这样吧', '够了', '可以了', '不用了',
-            '再见', '拜拜', '就到这里', '问诊结束', '暂时不问了'
-        ]
+        # 检查明确的结束表达
+        hit = scan.first("end_natural")
+        if hit:
+            return True, ConversationEndType.NATURAL, f"用户表示结束: {hit.term}"
         
-        for pattern in clear_end_patterns:
-            if pattern in message:
-                return True, ConversationEndType.NATURAL, f"用户表示结束: {pattern}"
-        
-        # 检查是否是明确的满意表达（独立成句）
-        satisfied_patterns = [
-            '很满意', '非常满意', '满意的', '很有帮助', '非常有用',
-            '清楚了谢谢', '明白了谢谢', '知道怎么做了'
-        ]
-        
-        for pattern in satisfied_patterns:
-            if pattern in message:
-                return True, ConversationEndType.NATURAL, f"用户表示满意: {pattern}"
+        # 检查是否是明确的满意表达
+        hit = scan.first("end_satisfied")
+        if hit:
+            return True, ConversationEndType.NATURAL, f"用户表示满意: {hit.term}"
         
         # 检查紧急情况（保持原有逻辑）
-        for keyword in self.emergency_keywords:
-            if keyword in message:
-                return True, ConversationEndType.EMERGENCY_REFERRAL, f"检测到紧急情况: {keyword}"
-        
-        # 🔑 新增：检查消息长度和症状内容，避免误判症状描述为结束
-        # 如果消息包含症状描述或医学术语，不应该结束
-        medical_indicators = ['痛', '疼', '酸', '胀', '麻', '症状', '不适', '难受', '舌苔', '大便', '小便', '睡眠', '食欲']
-        has_medical_content = any(indicator in message for indicator in medical_indicators)
-        
-        if has_medical_content and len(message) > 10:
-            # 包含医学内容且较长的消息，不应该被判断为结束
-            return False, None, ""
+        hit = scan.first("emergency")
+        if hit:
+            return True, ConversationEndType.EMERGENCY_REFERRAL, f"检测到紧急情况: {hit.term}"
         
         return False, None, ""
     
     def _extract_symptoms(self, message: str) -> List[str]:
         """提取症状信息"""
-        extracted = []
-        
         # 使用关键词匹配
-        for symptom in self.symptom_keywords:
-            if symptom in message:
-                extracted.append(symptom)
+        extracted = self.lexicon.scan(message).terms("symptom")
         
         # 使用正则表达式提取常见症状描述模式
-        patterns = [
-            r'(.{0,5})(痛|疼|酸|胀|闷|紧|重|麻|木)(.{0,3})',
-            r'(头|胃|腰|腹|胸|心|眼|耳|口|咽)(.{0,3})(不舒服|难受|异常)',
-            r'(睡不着|失眠|多梦|易醒|入睡困难)',
-            r'(拉肚子|腹泻|便秘|大便.*)',
-            r'(咳嗽|咳痰|气喘|胸闷)'
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, message)
-            for match in matches:
+        for pattern in _SYMPTOM_PATTERNS:
+            for match in pattern.findall(message):
                 symptom_desc = ''.join(match).strip()
                 if len(symptom_desc) > 1 and symptom_desc not in extracted:
                     extracted.append(symptom_desc)
@@ -285,7 +217,7 @@ class ConversationAnalyzer:
     def _contains_prescription(self, text: str) -> bool:
         """检查是否包含处方"""
         # 处方关键词计数
-        prescription_count = sum(1 for keyword in self.prescription_keywords if keyword in text)
+        prescription_count = len(self.lexicon.scan(text).terms("prescription_cue"))
         
         # 剂量模式检测
         dosage_pattern = re.findall(r'\d+[克g]\s*[，,]', text)
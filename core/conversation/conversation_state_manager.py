@@ -13,6 +13,8 @@ from enum import Enum
 from dataclasses import dataclass, asdict
 import logging
 
+from core.database.connection import connect as db_connect
+
 logger = logging.getLogger(__name__)
 
 class ConversationStage(Enum):
@@ -114,7 +116,7 @@ class ConversationStateManager:
     
     def _init_database(self):
         """初始化数据库表"""
-        conn = sqlite3.connect(self.db_path)
+        conn = db_connect(self.db_path)
         cursor = conn.cursor()
         
         try:
@@ -211,7 +213,7 @@ class ConversationStateManager:
     
     def get_conversation_state(self, conversation_id: str) -> Optional[ConversationState]:
         """获取对话状态"""
-        conn = sqlite3.connect(self.db_path)
+        conn = db_connect(self.db_path)
         cursor = conn.cursor()
         
         try:
@@ -421,7 +423,7 @@ class ConversationStateManager:
         self._save_state(state)
         
         # 记录结束信息
-        conn = sqlite3.connect(self.db_path)
+        conn = db_connect(self.db_path)
         cursor = conn.cursor()
         
         try:
@@ -552,7 +554,7 @@ class ConversationStateManager:
     
     def _save_state(self, state: ConversationState) -> bool:
         """保存对话状态"""
-        conn = sqlite3.connect(self.db_path)
+        conn = db_connect(self.db_path)
         cursor = conn.cursor()
         
         try:
@@ -595,7 +597,7 @@ class ConversationStateManager:
                          to_stage: ConversationStage, reason: str, confidence: float,
                          turn_number: int) -> bool:
         """记录阶段变更日志"""
-        conn = sqlite3.connect(self.db_path)
+        conn = db_connect(self.db_path)
         cursor = conn.cursor()
         
         try:
@@ -648,7 +650,7 @@ class ConversationStateManager:
     
     def cleanup_expired_conversations(self, days_old: int = 30) -> int:
         """清理过期对话"""
-        conn = sqlite3.connect(self.db_path)
+        conn = db_connect(self.db_path)
         cursor = conn.cursor()
         
         try:
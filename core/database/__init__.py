@@ -5,6 +5,10 @@ Database Core Module
 
 from .connection import (
     db_manager,
+    get_pool,
+    get_pool_stats,
+    connect,
+    run_in_executor,
     get_db_connection,
     get_db_connection_context,
     db_transaction,
@@ -13,6 +17,10 @@ from .connection import (
 
 __all__ = [
     'db_manager',
+    'get_pool',
+    'get_pool_stats',
+    'connect',
+    'run_in_executor',
     'get_db_connection',
     'get_db_connection_context',
     'db_transaction',
@@ -6,19 +6,22 @@ Unified Database Connection Manager
 
 功能：
 1. 确保所有数据库连接启用外键约束
-2. 提供连接池管理
+2. 提供连接池管理（按数据库路径的进程内连接池，WAL + busy_timeout + mmap）
 3. 统一错误处理
 4. 性能监控
 
-Version: 1.0
+Version: 1.1
 Date: 2025-10-12
 """
 
+import asyncio
+import os
 import sqlite3
 import logging
+import threading
 from contextlib import contextmanager
-from typing import Optional
-from functools import wraps
+from typing import Any, Callable, Dict, List, Optional
+from functools import partial, wraps
 import time
 
 logger = logging.getLogger(__name__)
@@ -26,6 +29,282 @@ logger = logging.getLogger(__name__)
 # 数据库路径配置
 DEFAULT_DB_PATH = "/home/ute/tcm-ai/data/user_history.sqlite"
 
+# 连接池参数
+POOL_MAX_IDLE = 16                      # 每个数据库保留的空闲连接数
+POOL_BUSY_TIMEOUT_MS = 5000             # 写锁等待时间，避免 "database is locked"
+POOL_MMAP_SIZE = 256 * 1024 * 1024      # 256MB 内存映射读
+POOL_CACHED_STATEMENTS = 256            # 每个连接的预编译语句缓存
+
+
+class PooledConnection(sqlite3.Connection):
+    """
+    连接池中的SQLite连接
+
+    与 sqlite3.Connection 用法完全一致；close() 不会真正关闭连接，
+    而是回滚未提交事务、重置连接级设置后归还连接池，
+    因此旧代码中的 "connect → 使用 → close" 写法可以直接替换。
+    归还后再次调用 close()（旧代码 try/finally 中常见）不做任何操作。
+    """
+
+    _pool = None
+    _released = False
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # 借用期间注册的自定义函数/聚合/排序规则，归还时注销
+        self._registered: List[tuple] = []
+
+    def close(self):
+        if self._released:
+            return
+        pool = self._pool
+        if pool is None:
+            super().close()
+            return
+        pool.release(self)
+
+    def create_function(self, name, narg, func, *args, **kwargs):
+        super().create_function(name, narg, func, *args, **kwargs)
+        self._registered.append(("function", name, narg))
+
+    def create_aggregate(self, name, n_arg, aggregate_class):
+        super().create_aggregate(name, n_arg, aggregate_class)
+        self._registered.append(("aggregate", name, n_arg))
+
+    def create_collation(self, name, callable):
+        super().create_collation(name, callable)
+        self._registered.append(("collation", name, None))
+
+    def _reset_state(self):
+        """恢复 sqlite3.connect 的默认设置，借用方的修改不会带给下一个借用方"""
+        self.row_factory = None
+        self.text_factory = str
+        self.isolation_level = ""
+        registered, self._registered = self._registered, []
+        for kind, name, narg in registered:
+            if kind == "function":
+                sqlite3.Connection.create_function(self, name, narg, None)
+            elif kind == "aggregate":
+                sqlite3.Connection.create_aggregate(self, name, narg, None)
+            else:
+                sqlite3.Connection.create_collation(self, name, None)
+        self.set_authorizer(None)
+        self.set_progress_handler(None, 0)
+        self.set_trace_callback(None)
+
+    def _close_physical(self):
+        self._released = True
+        super().close()
+
+
+class SQLiteConnectionPool:
+    """
+    单个数据库文件的连接池
+
+    - 连接在借出期间由借用方独占（同一时刻只属于一个线程/协程），归还后可被复用
+    - 每个物理连接只在创建时设置一次 PRAGMA，并保留预编译语句缓存
+    - 检测到 fork 后丢弃继承来的连接，gunicorn 预加载时也不会跨进程共享
+    """
+
+    def __init__(self, db_path: str,
+                 max_idle: int = POOL_MAX_IDLE,
+                 busy_timeout_ms: int = POOL_BUSY_TIMEOUT_MS,
+                 mmap_size: int = POOL_MMAP_SIZE,
+                 cached_statements: int = POOL_CACHED_STATEMENTS):
+        self.db_path = db_path
+        self.max_idle = max_idle
+        self.busy_timeout_ms = busy_timeout_ms
+        self.mmap_size = mmap_size
+        self.cached_statements = cached_statements
+
+        self._idle: List[PooledConnection] = []
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._wal_enabled = False
+
+        self._created = 0
+        self._reused = 0
+        self._in_use = 0
+        self._discarded = 0
+
+    def _check_fork(self):
+        if os.getpid() != self._pid:
+            # fork 后的子进程不能复用父进程的连接，直接丢弃（不关闭，避免影响父进程）
+            self._idle = []
+            self._in_use = 0
+            self._pid = os.getpid()
+
+    def _create_connection(self) -> PooledConnection:
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.busy_timeout_ms / 1000,
+            check_same_thread=False,
+            cached_statements=self.cached_statements,
+            factory=PooledConnection
+        )
+        if not self._wal_enabled:
+            # journal_mode 持久化在数据库文件中，每个数据库设置一次即可
+            conn.execute("PRAGMA journal_mode = WAL")
+            self._wal_enabled = True
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+        conn.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+        conn.execute("PRAGMA cache_size = -16000")  # 16MB缓存
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn._foreign_keys = False
+        self._created += 1
+        return conn
+
+    def acquire(self, row_factory: Optional[Callable] = None,
+                foreign_keys: bool = False) -> PooledConnection:
+        """借出一个连接，使用完毕后调用 close() 归还"""
+        with self._lock:
+            self._check_fork()
+            conn = self._idle.pop() if self._idle else None
+            if conn is not None:
+                self._reused += 1
+            self._in_use += 1
+
+        if conn is None:
+            try:
+                conn = self._create_connection()
+            except Exception:
+                with self._lock:
+                    self._in_use -= 1
+                raise
+
+        conn._pool = self
+        conn._released = False
+        conn.row_factory = row_factory
+        if conn._foreign_keys != foreign_keys:
+            conn.execute(f"PRAGMA foreign_keys = {'ON' if foreign_keys else 'OFF'}")
+            conn._foreign_keys = foreign_keys
+        return conn
+
+    def release(self, conn: PooledConnection):
+        """归还连接：回滚未提交事务并重置连接级设置，空闲连接超出上限时真正关闭"""
+        if conn._released:
+            return
+        conn._released = True
+        conn._pool = None
+        reusable = True
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            conn._reset_state()
+        except sqlite3.Error:
+            reusable = False
+
+        with self._lock:
+            self._in_use = max(self._in_use - 1, 0)
+            if reusable and os.getpid() == self._pid and len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+            self._discarded += 1
+
+        try:
+            conn._close_physical()
+        except sqlite3.Error:
+            pass
+
+    @contextmanager
+    def connection(self, row_factory: Optional[Callable] = None, foreign_keys: bool = False):
+        """借用连接的上下文管理器，正常退出时提交，异常时回滚"""
+        conn = self.acquire(row_factory=row_factory, foreign_keys=foreign_keys)
+        try:
+            yield conn
+            if conn.in_transaction:
+                conn.commit()
+        except Exception:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def close_all(self):
+        """关闭所有空闲连接"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            try:
+                conn._close_physical()
+            except sqlite3.Error:
+                pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "db_path": self.db_path,
+                "idle_connections": len(self._idle),
+                "in_use_connections": self._in_use,
+                "created_connections": self._created,
+                "reused_connections": self._reused,
+                "discarded_connections": self._discarded,
+                "max_idle": self.max_idle,
+                "busy_timeout_ms": self.busy_timeout_ms,
+                "mmap_size": self.mmap_size,
+            }
+
+
+_pools: Dict[str, SQLiteConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path: str = DEFAULT_DB_PATH) -> SQLiteConnectionPool:
+    """获取（或创建）指定数据库路径的连接池"""
+    key = os.path.abspath(db_path)
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = SQLiteConnectionPool(key)
+                _pools[key] = pool
+    return pool
+
+
+def connect(db_path: str = DEFAULT_DB_PATH, row_factory: Optional[Callable] = None,
+            foreign_keys: bool = False) -> PooledConnection:
+    """
+    sqlite3.connect 的连接池替代
+
+    使用示例:
+    conn = connect(db_path, row_factory=sqlite3.Row)
+    try:
+        conn.execute("SELECT ...")
+    finally:
+        conn.close()  # 归还连接池
+    """
+    return get_pool(db_path).acquire(row_factory=row_factory, foreign_keys=foreign_keys)
+
+
+async def run_in_executor(func: Callable, *args, db_path: str = DEFAULT_DB_PATH,
+                          row_factory: Optional[Callable] = None, **kwargs) -> Any:
+    """
+    在线程池中执行数据库操作，避免阻塞事件循环
+
+    func 的第一个参数为借出的连接，正常返回时自动提交。
+
+    使用示例:
+    rows = await run_in_executor(lambda conn, uid: conn.execute(
+        "SELECT * FROM users WHERE id = ?", (uid,)).fetchall(), user_id)
+    """
+    def _call():
+        with get_pool(db_path).connection(row_factory=row_factory) as conn:
+            return func(conn, *args, **kwargs)
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, _call)
+
+
+def get_pool_stats() -> List[Dict[str, Any]]:
+    """所有连接池的统计信息"""
+    with _pools_lock:
+        pools = list(_pools.values())
+    return [pool.get_stats() for pool in pools]
+
+
 class DatabaseConnectionManager:
     """数据库连接管理器"""
 
@@ -38,19 +317,11 @@ class DatabaseConnectionManager:
         获取数据库连接
 
         重要：每个连接都会自动启用外键约束
+        连接来自进程内连接池（WAL、synchronous=NORMAL、busy_timeout、mmap），close() 即归还
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-
             # ⚠️ 关键：启用外键约束
-            conn.execute("PRAGMA foreign_keys = ON")
-
-            # 性能优化设置
-            conn.execute("PRAGMA journal_mode = WAL")  # Write-Ahead Logging
-            conn.execute("PRAGMA synchronous = NORMAL")  # 平衡性能和安全
-            conn.execute("PRAGMA cache_size = -64000")  # 64MB缓存
-            conn.execute("PRAGMA temp_store = MEMORY")  # 临时表存储在内存
+            conn = get_pool(self.db_path).acquire(row_factory=sqlite3.Row, foreign_keys=True)
 
             self._connection_count += 1
             logger.debug(f"数据库连接已创建 (总计: {self._connection_count})")
@@ -96,6 +367,7 @@ class DatabaseConnectionManager:
 
             stats = {
                 "foreign_keys_enabled": None,
+                "connection_pool": None,
                 "journal_mode": None,
                 "page_size": None,
                 "page_count": None,
@@ -130,7 +402,10 @@ class DatabaseConnectionManager:
             """)
             stats["table_count"] = cursor.fetchone()[0]
 
-            return stats
+        # 连接池统计
+        stats["connection_pool"] = get_pool(self.db_path).get_stats()
+
+        return stats
 
 # 全局数据库管理器实例
 db_manager = DatabaseConnectionManager()
@@ -250,7 +525,13 @@ def verify_database_integrity():
 # 导出主要接口
 __all__ = [
     'DatabaseConnectionManager',
+    'PooledConnection',
+    'SQLiteConnectionPool',
     'db_manager',
+    'get_pool',
+    'get_pool_stats',
+    'connect',
+    'run_in_executor',
     'get_db_connection',
     'get_db_connection_context',
     'db_transaction',
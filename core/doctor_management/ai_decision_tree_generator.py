@@ -17,12 +17,7 @@ from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 from dataclasses import dataclass, asdict
 from app.core.settings import AI_CONFIG
-
-try:
-    from dashscope import Generation
-    DASHSCOPE_AVAILABLE = True
-except ImportError:
-    DASHSCOPE_AVAILABLE = False
+from core.llm import LLMError, get_llm_gateway
 
 logger = logging.getLogger(__name__)
 
@@ -57,7 +52,7 @@ class AIDecisionTreeGenerator:
 
     def __init__(self):
         self.api_key = AI_CONFIG.get("dashscope_api_key", "")
-        if not DASHSCOPE_AVAILABLE or not self.api_key:
+        if not self.api_key:
             logger.warning("⚠️ Dashscope不可用，AI决策树生成功能将被禁用")
 
     async def analyze_and_generate(
@@ -120,7 +115,7 @@ class AIDecisionTreeGenerator:
             ]
         }
         """
-        if not DASHSCOPE_AVAILABLE or not self.api_key:
+        if not self.api_key:
             logger.error("Dashscope不可用")
             return None
 
@@ -186,28 +181,26 @@ class AIDecisionTreeGenerator:
 只返回JSON，不要其他内容。"""
 
         try:
-            from dashscope import MultiModalConversation
-            response = MultiModalConversation.call(
+            content = await get_llm_gateway().complete_text(
+                [{"role": "user", "content": prompt}],
                 model=AI_CONFIG.get('decision_tree_model', 'qwen3.5-omni-plus-2026-03-15'),
                 api_key=self.api_key,
-                messages=[{"role": "user", "content": [{"text": prompt}]}]
+                call_site="decision_tree_generator.analyze"
             )
 
-            if response.status_code == 200:
-                content = response.output.choices[0].message.content[0]["text"]
-                # 提取JSON
-                json_match = re.search(r'\{.*\}', content, re.DOTALL)
-                if json_match:
-                    result = json.loads(json_match.group())
-                    logger.info(f"🤖 AI分析成功: 提取到疾病={result.get('disease_name')}, {len(result.get('syndromes', []))}个证候分支")
-                    return result
-                else:
-                    logger.error(f"AI返回内容无法解析为JSON: {content[:200]}")
-                    return None
+            # 提取JSON
+            json_match = re.search(r'\{.*\}', content, re.DOTALL)
+            if json_match:
+                result = json.loads(json_match.group())
+                logger.info(f"🤖 AI分析成功: 提取到疾病={result.get('disease_name')}, {len(result.get('syndromes', []))}个证候分支")
+                return result
             else:
-                logger.error(f"AI调用失败: {response.status_code}")
+                logger.error(f"AI返回内容无法解析为JSON: {content[:200]}")
                 return None
 
+        except LLMError as e:
+            logger.error(f"AI调用失败: {e}")
+            return None
         except Exception as e:
             logger.error(f"AI分析失败: {e}")
             return None
@@ -105,6 +105,10 @@ class DoctorAuthManager:
             doctor_id = cursor.lastrowid
             conn.commit()
             
+            # 新注册医生默认在岗，需要进入推荐索引
+            from core.doctor_matching.doctor_index import get_doctor_specialty_index
+            get_doctor_specialty_index().notify_changed()
+            
             # 返回医生对象
             return Doctor(
                 id=doctor_id,
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+医生专科索引
+
+推荐医生原先每次都对 doctors 表做 specialties LIKE '%"内科"%' 的 OR 全表扫描，
+并逐行 json.loads(specialties/available_hours)；症状到专科则是对映射字典的双重子串循环。
+本模块在进程内维护预解析的医生列表：
+
+- 医生按 (评分, 问诊量) 降序排列，每个专科对应一个位图（第i位 = 排名第i的医生）
+- 专科筛选 = 位图按位或，排除医生 = 按位与非，取前K位即为 ORDER BY ... LIMIT K 的结果
+- 医生资料被修改后调用 notify_changed() 提升版本号，下次访问立即重建；
+  定期重建覆盖其他worker进程的写入与评分变化
+- 症状到专科的映射编译为一个 Aho-Corasick 自动机，每条症状单遍扫描
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from app.core.settings import PATHS
+from core.database.connection import connect as db_connect
+from core.text_matching import AhoCorasickAutomaton
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DoctorInfo:
+    """医生信息数据类"""
+    uuid: str
+    name: str
+    title: str
+    specialties: List[str]
+    average_rating: float
+    total_reviews: int
+    consultation_count: int
+    available_hours: Dict[str, Any]
+    introduction: str
+    avatar_url: str
+    commission_rate: float
+    is_available: bool
+
+
+# 扩展的症状到专科映射 - 支持更多专科和症状（症状文本包含词条即命中）
+SYMPTOM_SPECIALTY_MAPPING = {
+    # 内科相关
+    '失眠': ['内科', '神志病科'],
+    '焦虑': ['内科', '神志病科'],
+    '抑郁': ['内科', '神志病科'],
+    '头痛': ['内科', '脑病科'],
+    '头疼': ['内科', '脑病科'],
+    '眩晕': ['内科', '脑病科'],
+    '头晕': ['内科', '脑病科'],
+    '心悸': ['内科'],
+    '胸闷': ['内科'],
+    '乏力': ['内科'],
+    '发热': ['内科'],
+
+    # 脾胃病科
+    '胃痛': ['脾胃病科', '内科'],
+    '胃疼': ['脾胃病科', '内科'],
+    '胃炎': ['脾胃病科', '内科'],
+    '腹泻': ['脾胃病科', '内科'],
+    '便秘': ['脾胃病科', '内科'],
+    '食欲不振': ['脾胃病科', '内科'],
+    '消化不良': ['脾胃病科', '内科'],
+
+    # 肺病科
+    '咳嗽': ['肺病科', '内科'],
+    '哮喘': ['肺病科', '内科'],
+    '鼻炎': ['肺病科', '内科'],
+    '气喘': ['肺病科', '内科'],
+
+    # 妇科专业
+    '月经不调': ['妇科'],
+    '痛经': ['妇科'],
+    '白带异常': ['妇科'],
+    '不孕': ['妇科'],
+    '更年期': ['妇科', '内科'],
+    '妇科疾病': ['妇科'],
+    '妇科问题': ['妇科'],
+    '妇科': ['妇科'],
+    '女性疾病': ['妇科'],
+    '例假不准': ['妇科'],
+
+    # 儿科专业
+    '小儿发热': ['儿科'],
+    '小儿咳嗽': ['儿科'],
+    '小儿腹泻': ['儿科'],
+    '儿科疾病': ['儿科'],
+    '儿科': ['儿科'],
+    '小儿疾病': ['儿科'],
+    '孩子生病': ['儿科'],
+    '宝宝发烧': ['儿科'],
+
+    # 皮肤科
+    '湿疹': ['皮肤科', '内科'],
+    '痤疮': ['皮肤科', '内科'],
+    '皮肤病': ['皮肤科', '内科'],
+    '皮肤疾病': ['皮肤科', '内科'],
+    '青春痘': ['皮肤科', '内科'],
+
+    # 骨伤科
+    '腰痛': ['骨伤科', '内科'],
+    '关节痛': ['骨伤科', '内科'],
+    '颈椎病': ['骨伤科', '内科'],
+    '骨科疾病': ['骨伤科', '内科'],
+    '骨科': ['骨伤科', '内科'],
+    '筋骨疼痛': ['骨伤科', '内科'],
+    '膝盖痛': ['骨伤科', '内科'],
+
+    # 五官科/耳鼻喉科
+    '耳鸣': ['五官科', '内科'],
+    '听力下降': ['五官科', '内科'],
+    '鼻塞': ['肺病科', '五官科'],
+
+    # 肿瘤科
+    '肿瘤': ['肿瘤科', '内科'],
+    '癌症': ['肿瘤科', '内科']
+}
+
+
+class SymptomSpecialtyMatcher:
+    """症状到专科的预编译匹配器，构建后只读，可跨线程共享"""
+
+    def __init__(self, mapping: Optional[Dict[str, List[str]]] = None):
+        mapping = SYMPTOM_SPECIALTY_MAPPING if mapping is None else mapping
+        self._automaton = AhoCorasickAutomaton()
+        for keyword, specialties in mapping.items():
+            self._automaton.add(keyword, tuple(specialties))
+        self._automaton.build()
+
+    def match(self, symptoms: Iterable[str]) -> Set[str]:
+        """症状列表命中的全部专科"""
+        specialties = set()
+        for symptom in symptoms:
+            for _, _, _, values in self._automaton.iter_matches(symptom or ''):
+                specialties.update(values)
+        return specialties
+
+
+def _parse_json(value: Optional[str], default):
+    try:
+        parsed = json.loads(value) if value else default
+    except (TypeError, ValueError):
+        return default
+    return parsed if isinstance(parsed, type(default)) else default
+
+
+class DoctorSpecialtyIndex:
+    """进程级医生专科索引（仅包含 status = 'active' 的医生）"""
+
+    def __init__(self, db_path: Optional[str] = None, refresh_interval: int = 30):
+        self.db_path = db_path or str(PATHS["user_db"])
+        self.refresh_interval = refresh_interval
+
+        # 按 (评分, 问诊量) 降序排列的医生，位图的第i位对应 _doctors[i]
+        self._doctors: List[DoctorInfo] = []
+        self._positions: Dict[str, int] = {}
+        self._specialty_bits: Dict[str, int] = {}
+        self._all_bits = 0
+
+        self._version = 0
+        self._loaded_version = -1
+        self._last_refresh = 0.0
+        self._rebuilds = 0
+        self._lock = threading.RLock()
+
+    # ------------------------------------------------------------------
+    # 刷新
+    # ------------------------------------------------------------------
+
+    def notify_changed(self):
+        """医生资料、状态被修改后调用，下次访问时立即重建"""
+        with self._lock:
+            self._version += 1
+
+    def _ensure_fresh(self):
+        with self._lock:
+            if (self._loaded_version == self._version
+                    and time.time() - self._last_refresh < self.refresh_interval):
+                return
+            version = self._version
+            try:
+                self._rebuild()
+            except sqlite3.OperationalError as e:
+                # 表尚未创建等情况，视为没有医生
+                logger.warning(f"医生专科索引刷新失败: {e}")
+            self._loaded_version = version
+            self._last_refresh = time.time()
+
+    def _rebuild(self):
+        conn = db_connect(self.db_path, row_factory=sqlite3.Row)
+        try:
+            rows = conn.execute("""
+                SELECT d.id, d.name, d.speciality, d.specialties, d.introduction,
+                       d.average_rating, d.total_reviews, d.consultation_count, d.available_hours
+                FROM doctors d
+                WHERE d.status = 'active'
+                ORDER BY d.id
+            """).fetchall()
+        finally:
+            conn.close()
+
+        doctors = []
+        for row in rows:
+            doctors.append(DoctorInfo(
+                uuid=str(row['id']),
+                name=row['name'],
+                title=row['speciality'] or '医师',  # 使用专业作为title
+                specialties=_parse_json(row['specialties'], []),
+                average_rating=float(row['average_rating'] or 0),
+                total_reviews=int(row['total_reviews'] or 0),
+                consultation_count=int(row['consultation_count'] or 0),
+                available_hours=_parse_json(row['available_hours'], {}),
+                introduction=row['introduction'] or '',
+                avatar_url='',
+                commission_rate=0.30,  # 默认30%分成
+                is_available=True  # 简化处理，默认可用
+            ))
+        # 稳定排序：评分、问诊量相同时保持ID顺序
+        doctors.sort(key=lambda d: (d.average_rating, d.consultation_count), reverse=True)
+
+        specialty_bits: Dict[str, int] = {}
+        for position, doctor in enumerate(doctors):
+            bit = 1 << position
+            for specialty in set(doctor.specialties):
+                if isinstance(specialty, str):
+                    specialty_bits[specialty] = specialty_bits.get(specialty, 0) | bit
+
+        self._doctors = doctors
+        self._positions = {doctor.uuid: position for position, doctor in enumerate(doctors)}
+        self._specialty_bits = specialty_bits
+        self._all_bits = (1 << len(doctors)) - 1
+        self._rebuilds += 1
+        logger.info(f"🩺 医生专科索引已重建: {len(doctors)} 位医生, {len(specialty_bits)} 个专科")
+
+    # ------------------------------------------------------------------
+    # 查询
+    # ------------------------------------------------------------------
+
+    def query(self, specialties: Optional[Iterable[str]] = None,
+              exclude_ids: Optional[Iterable[Any]] = None, limit: int = 5) -> List[DoctorInfo]:
+        """
+        按专科筛选医生（任一专科命中即可），按评分、问诊量降序取前 limit 位
+
+        specialties 为空时不做专科筛选
+        """
+        self._ensure_fresh()
+        with self._lock:
+            doctors, positions = self._doctors, self._positions
+            if specialties:
+                mask = 0
+                for specialty in specialties:
+                    mask |= self._specialty_bits.get(specialty, 0)
+            else:
+                mask = self._all_bits
+            for doctor_id in exclude_ids or ():
+                position = positions.get(str(doctor_id))
+                if position is not None:
+                    mask &= ~(1 << position)
+
+        result = []
+        while mask and len(result) < limit:
+            lowest = mask & -mask
+            result.append(replace(doctors[lowest.bit_length() - 1]))
+            mask ^= lowest
+        return result
+
+    def get(self, doctor_id: Any) -> Optional[DoctorInfo]:
+        """按ID获取在岗医生"""
+        self._ensure_fresh()
+        with self._lock:
+            position = self._positions.get(str(doctor_id))
+            return replace(self._doctors[position]) if position is not None else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """索引状态"""
+        with self._lock:
+            return {
+                "doctors": len(self._doctors),
+                "specialties": len(self._specialty_bits),
+                "version": self._version,
+                "rebuilds": self._rebuilds,
+            }
+
+
+# 全局实例（按数据库路径）
+_index_instances: Dict[str, DoctorSpecialtyIndex] = {}
+_index_instances_lock = threading.Lock()
+
+
+def get_doctor_specialty_index(db_path: Optional[str] = None) -> DoctorSpecialtyIndex:
+    """获取医生专科索引单例"""
+    db_path = str(db_path or PATHS["user_db"])
+    with _index_instances_lock:
+        index = _index_instances.get(db_path)
+        if index is None:
+            index = DoctorSpecialtyIndex(db_path)
+            _index_instances[db_path] = index
+        return index
+
+
+_matcher: Optional[SymptomSpecialtyMatcher] = None
+_matcher_lock = threading.Lock()
+
+
+def get_symptom_specialty_matcher() -> SymptomSpecialtyMatcher:
+    """获取进程内共享的症状专科匹配器"""
+    global _matcher
+    if _matcher is None:
+        with _matcher_lock:
+            if _matcher is None:
+                _matcher = SymptomSpecialtyMatcher()
+    return _matcher
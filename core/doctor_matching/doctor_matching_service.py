@@ -7,30 +7,18 @@
 
 import json
 import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
 from typing import List, Dict, Optional, Any
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 import sqlite3
 from config.settings import PATHS
+from core.database.connection import connect as db_connect
+from .doctor_index import DoctorInfo, get_doctor_specialty_index, get_symptom_specialty_matcher
 
 logger = logging.getLogger(__name__)
 
-@dataclass
-class DoctorInfo:
-    """医生信息数据类"""
-    uuid: str
-    name: str
-    title: str
-    specialties: List[str]
-    average_rating: float
-    total_reviews: int
-    consultation_count: int
-    available_hours: Dict[str, Any]
-    introduction: str
-    avatar_url: str
-    commission_rate: float
-    is_available: bool
-
 @dataclass
 class MatchingCriteria:
     """医生匹配条件数据类"""
@@ -44,77 +32,47 @@ class MatchingCriteria:
     language_preference: str = "zh-CN"
     max_results: int = 5
 
+# 请求范围内的患者偏好缓存：patient_id -> 偏好（None 表示未设置）
+_preferences_cache: ContextVar[Optional[Dict[str, Optional[Dict]]]] = ContextVar(
+    "patient_preferences_cache", default=None
+)
+
+
+@contextmanager
+def matching_request_scope():
+    """
+    在一次请求内缓存患者偏好
+
+    嵌套使用时沿用外层缓存；离开最外层范围即丢弃，不跨请求保留。
+    """
+    if _preferences_cache.get() is not None:
+        yield
+        return
+    token = _preferences_cache.set({})
+    try:
+        yield
+    finally:
+        _preferences_cache.reset(token)
+
+
 class DoctorMatchingService:
     """医生匹配服务类"""
     
-    def __init__(self):
-        self.db_path = PATHS['user_db']
+    def __init__(self, db_path: str = None):
+        self.db_path = db_path or PATHS['user_db']
     
     def get_available_doctors(self, criteria: MatchingCriteria) -> List[DoctorInfo]:
         """获取可用医生列表"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                
-                # 构建查询条件
-                query_parts = [
-                    "SELECT d.id, d.name, d.speciality, d.specialties, d.introduction,",
-                    "       d.average_rating, d.total_reviews, d.consultation_count, d.available_hours",
-                    "FROM doctors d",
-                    "WHERE d.status = 'active'"
-                ]
-                
-                params = []
-                
-                # 排除不想要的医生
-                if criteria.avoid_doctor_ids:
-                    placeholders = ','.join(['?' for _ in criteria.avoid_doctor_ids])
-                    query_parts.append(f"AND d.id NOT IN ({placeholders})")
-                    params.extend(criteria.avoid_doctor_ids)
-                
-                # 专科筛选
-                if criteria.preferred_specialties:
-                    specialty_conditions = []
-                    for specialty in criteria.preferred_specialties:
-                        specialty_conditions.append("d.specialties LIKE ?")
-                        params.append(f'%"{specialty}"%')
-                    query_parts.append(f"AND ({' OR '.join(specialty_conditions)})")
-                
-                # 按评分和问诊量排序
-                query_parts.append("ORDER BY d.average_rating DESC, d.consultation_count DESC")
-                query_parts.append(f"LIMIT {criteria.max_results}")
-                
-                query = " ".join(query_parts)
-                cursor = conn.execute(query, params)
-                rows = cursor.fetchall()
-                
-                doctors = []
-                for row in rows:
-                    try:
-                        specialties = json.loads(row['specialties'] or '[]')
-                        available_hours = json.loads(row['available_hours'] or '{}')
-                    except json.JSONDecodeError:
-                        specialties = []
-                        available_hours = {}
-                    
-                    doctor = DoctorInfo(
-                        uuid=str(row['id']),
-                        name=row['name'],
-                        title=row['speciality'] or '医师',  # 使用专业作为title
-                        specialties=specialties,
-                        average_rating=float(row['average_rating'] or 0),
-                        total_reviews=int(row['total_reviews'] or 0),
-                        consultation_count=int(row['consultation_count'] or 0),
-                        available_hours=available_hours,
-                        introduction=row['introduction'] or '',
-                        avatar_url='',
-                        commission_rate=0.30,  # 默认30%分成
-                        is_available=True  # 简化处理，默认可用
-                    )
-                    doctors.append(doctor)
-                
-                logger.info(f"找到 {len(doctors)} 位可用医生")
-                return doctors
+            # 专科筛选、排除医生、按评分和问诊量排序均在内存索引上完成
+            doctors = get_doctor_specialty_index(self.db_path).query(
+                specialties=criteria.preferred_specialties,
+                exclude_ids=criteria.avoid_doctor_ids,
+                limit=criteria.max_results
+            )
+            
+            logger.info(f"找到 {len(doctors)} 位可用医生")
+            return doctors
                 
         except Exception as e:
             logger.error(f"获取可用医生失败: {e}")
@@ -123,52 +81,7 @@ class DoctorMatchingService:
     def get_doctor_by_id(self, doctor_id: str) -> Optional[DoctorInfo]:
         """根据ID获取特定医生信息"""
         try:
-            criteria = MatchingCriteria(
-                patient_id="", 
-                symptoms=[],
-                preferred_doctor_id=doctor_id,
-                max_results=1
-            )
-            
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                
-                query = """
-                SELECT d.id, d.name, d.speciality, d.specialties, d.introduction,
-                       d.average_rating, d.total_reviews, d.consultation_count, d.available_hours
-                FROM doctors d
-                WHERE d.id = ? AND d.status = 'active'
-                """
-                
-                cursor = conn.execute(query, (doctor_id,))
-                row = cursor.fetchone()
-                
-                if not row:
-                    return None
-                
-                try:
-                    specialties = json.loads(row['specialties'] or '[]')
-                    available_hours = json.loads(row['available_hours'] or '{}')
-                except json.JSONDecodeError:
-                    specialties = []
-                    available_hours = {}
-                
-                doctor = DoctorInfo(
-                    uuid=str(row['id']),
-                    name=row['name'],
-                    title=row['speciality'] or '医师',  # 使用专业作为title
-                    specialties=specialties,
-                    average_rating=float(row['average_rating'] or 0),
-                    total_reviews=int(row['total_reviews'] or 0),
-                    consultation_count=int(row['consultation_count'] or 0),
-                    available_hours=available_hours,
-                    introduction=row['introduction'] or '',
-                    avatar_url='',
-                    commission_rate=0.30,  # 默认30%分成
-                    is_available=True  # 简化处理，默认可用
-                )
-                
-                return doctor
+            return get_doctor_specialty_index(self.db_path).get(doctor_id)
                 
         except Exception as e:
             logger.error(f"获取医生信息失败 ({doctor_id}): {e}")
@@ -177,95 +90,13 @@ class DoctorMatchingService:
     def recommend_doctors_for_symptoms(self, symptoms: List[str], patient_id: str) -> List[DoctorInfo]:
         """根据症状智能推荐医生"""
         try:
-            # 扩展的症状到专科映射 - 支持更多专科和症状
-            symptom_specialty_mapping = {
-                # 内科相关
-                '失眠': ['内科', '神志病科'],
-                '焦虑': ['内科', '神志病科'],
-                '抑郁': ['内科', '神志病科'],
-                '头痛': ['内科', '脑病科'],
-                '头疼': ['内科', '脑病科'],
-                '眩晕': ['内科', '脑病科'],
-                '头晕': ['内科', '脑病科'],
-                '心悸': ['内科'],
-                '胸闷': ['内科'],
-                '乏力': ['内科'],
-                '发热': ['内科'],
-                
-                # 脾胃病科
-                '胃痛': ['脾胃病科', '内科'],
-                '胃疼': ['脾胃病科', '内科'],
-                '胃炎': ['脾胃病科', '内科'],
-                '腹泻': ['脾胃病科', '内科'],
-                '便秘': ['脾胃病科', '内科'],
-                '食欲不振': ['脾胃病科', '内科'],
-                '消化不良': ['脾胃病科', '内科'],
-                
-                # 肺病科
-                '咳嗽': ['肺病科', '内科'],
-                '哮喘': ['肺病科', '内科'],
-                '鼻炎': ['肺病科', '内科'],
-                '气喘': ['肺病科', '内科'],
-                
-                # 妇科专业
-                '月经不调': ['妇科'],
-                '痛经': ['妇科'],
-                '白带异常': ['妇科'],
-                '不孕': ['妇科'],
-                '更年期': ['妇科', '内科'],
-                '妇科疾病': ['妇科'],
-                '妇科问题': ['妇科'],
-                '妇科': ['妇科'],
-                '女性疾病': ['妇科'],
-                '例假不准': ['妇科'],
-                
-                # 儿科专业
-                '小儿发热': ['儿科'],
-                '小儿咳嗽': ['儿科'],
-                '小儿腹泻': ['儿科'],
-                '儿科疾病': ['儿科'],
-                '儿科': ['儿科'],
-                '小儿疾病': ['儿科'],
-                '孩子生病': ['儿科'],
-                '宝宝发烧': ['儿科'],
-                
-                # 皮肤科
-                '湿疹': ['皮肤科', '内科'],
-                '痤疮': ['皮肤科', '内科'],
-                '皮肤病': ['皮肤科', '内科'],
-                '皮肤疾病': ['皮肤科', '内科'],
-                '青春痘': ['皮肤科', '内科'],
-                
-                # 骨伤科
-                '腰痛': ['骨伤科', '内科'],
-                '关节痛': ['骨伤科', '内科'],
-                '颈椎病': ['骨伤科', '内科'],
-                '骨科疾病': ['骨伤科', '内科'],
-                '骨科': ['骨伤科', '内科'],
-                '筋骨疼痛': ['骨伤科', '内科'],
-                '膝盖痛': ['骨伤科', '内科'],
-                
-                # 五官科/耳鼻喉科
-                '耳鸣': ['五官科', '内科'],
-                '听力下降': ['五官科', '内科'],
-                '鼻塞': ['肺病科', '五官科'],
-                
-                # 肿瘤科
-                '肿瘤': ['肿瘤科', '内科'],
-                '癌症': ['肿瘤科', '内科']
-            }
-            
             logger.info(f"开始为症状 {symptoms} 匹配专科...")
             
             # 根据症状确定推荐专科
-            recommended_specialties = set()
-            for symptom in symptoms:
-                for key, specialties in symptom_specialty_mapping.items():
-                    if key in symptom:
-                        recommended_specialties.update(specialties)
+            recommended_specialties = get_symptom_specialty_matcher().match(symptoms)
             
             if not recommended_specialties:
-                recommended_specialties = ['内科']  # 默认推荐内科
+                recommended_specialties = {'内科'}  # 默认推荐内科
             
             # 获取患者历史偏好
             patient_preferences = self._get_patient_preferences(patient_id)
@@ -355,11 +186,20 @@ class DoctorMatchingService:
             return True  # 出错时默认可用
     
     def _get_patient_preferences(self, patient_id: str) -> Optional[Dict]:
-        """获取患者偏好设置"""
+        """获取患者偏好设置；处于 matching_request_scope 内时按患者缓存"""
+        cache = _preferences_cache.get()
+        if cache is not None and patient_id in cache:
+            return cache[patient_id]
+        preferences = self._load_patient_preferences(patient_id)
+        if cache is not None:
+            cache[patient_id] = preferences
+        return preferences
+    
+    def _load_patient_preferences(self, patient_id: str) -> Optional[Dict]:
+        """从数据库读取患者偏好"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                
+            conn = db_connect(str(self.db_path), row_factory=sqlite3.Row)
+            try:
                 row = conn.execute("""
                     SELECT preferred_specialties, preferred_doctor_id, avoid_doctor_ids,
                            preferred_consultation_time, gender_preference
@@ -367,20 +207,22 @@ class DoctorMatchingService:
                     WHERE patient_id = ?
                     ORDER BY updated_at DESC LIMIT 1
                 """, (patient_id,)).fetchone()
-                
-                if row:
-                    try:
-                        return {
-                            'preferred_specialties': json.loads(row['preferred_specialties'] or '[]'),
-                            'preferred_doctor_id': row['preferred_doctor_id'],
-                            'avoid_doctor_ids': json.loads(row['avoid_doctor_ids'] or '[]'),
-                            'preferred_consultation_time': row['preferred_consultation_time'],
-                            'gender_preference': row['gender_preference']
-                        }
-                    except json.JSONDecodeError:
-                        return None
-                
-                return None
+            finally:
+                conn.close()
+            
+            if row:
+                try:
+                    return {
+                        'preferred_specialties': json.loads(row['preferred_specialties'] or '[]'),
+                        'preferred_doctor_id': row['preferred_doctor_id'],
+                        'avoid_doctor_ids': json.loads(row['avoid_doctor_ids'] or '[]'),
+                        'preferred_consultation_time': row['preferred_consultation_time'],
+                        'gender_preference': row['gender_preference']
+                    }
+                except json.JSONDecodeError:
+                    return None
+            
+            return None
                 
         except Exception as e:
             logger.error(f"获取患者偏好失败: {e}")
@@ -433,6 +275,9 @@ class DoctorMatchingService:
                     ))
                 
                 conn.commit()
+                cache = _preferences_cache.get()
+                if cache is not None:
+                    cache.pop(patient_id, None)
                 logger.info(f"患者偏好保存成功: {patient_id}")
                 return True
                 
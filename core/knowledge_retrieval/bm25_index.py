@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+BM25倒排索引（关键词检索）
+
+keyword_search 原先把查询向量与整个TF-IDF矩阵做余弦相似度再全量argsort，
+每次查询的开销与语料规模线性相关。本模块按 jieba 分词结果建立倒排索引：
+
+- 倒排表以紧凑数组存储：term_offsets 划分 doc_ids / impacts 两个扁平数组，
+  impacts 为预先算好的 BM25 词项得分（idf × 饱和词频），查询时只需累加
+- 每个词项记录最大得分上界，查询按 MaxScore 提前终止：剩余词项上界之和
+  低于当前第k名分数后，不再引入新文档，只对已有候选补分
+- top-k 使用 argpartition 选取
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class BM25InvertedIndex:
+    """基于紧凑数组倒排表的BM25索引"""
+
+    def __init__(self, vocabulary: Dict[str, int], term_offsets: np.ndarray,
+                 doc_ids: np.ndarray, impacts: np.ndarray, max_impacts: np.ndarray,
+                 num_docs: int):
+        self.vocabulary = vocabulary
+        self.term_offsets = term_offsets
+        self.doc_ids = doc_ids
+        self.impacts = impacts
+        self.max_impacts = max_impacts
+        self.num_docs = num_docs
+
+    @classmethod
+    def build(cls, tokenized_docs: Iterable[Sequence[str]],
+              k1: float = 1.5, b: float = 0.75) -> "BM25InvertedIndex":
+        """从分词后的文档构建索引"""
+        vocabulary: Dict[str, int] = {}
+        term_docs: List[List[int]] = []
+        term_tfs: List[List[int]] = []
+        doc_lengths: List[int] = []
+
+        for doc_id, tokens in enumerate(tokenized_docs):
+            counts: Dict[int, int] = {}
+            for token in tokens:
+                term_id = vocabulary.get(token)
+                if term_id is None:
+                    term_id = len(vocabulary)
+                    vocabulary[token] = term_id
+                    term_docs.append([])
+                    term_tfs.append([])
+                counts[term_id] = counts.get(term_id, 0) + 1
+            for term_id, tf in counts.items():
+                term_docs[term_id].append(doc_id)
+                term_tfs[term_id].append(tf)
+            doc_lengths.append(len(tokens))
+
+        num_docs = len(doc_lengths)
+        lengths = np.asarray(doc_lengths, dtype=np.float32)
+        avg_length = float(lengths.mean()) if num_docs else 0.0
+        # 文档长度归一化项 k1 × (1 - b + b × dl / avgdl)
+        length_norm = k1 * (1 - b + b * lengths / avg_length) if avg_length else np.full(num_docs, k1, np.float32)
+
+        df = np.fromiter((len(docs) for docs in term_docs), dtype=np.int64, count=len(term_docs))
+        term_offsets = np.zeros(len(term_docs) + 1, dtype=np.int64)
+        np.cumsum(df, out=term_offsets[1:])
+
+        doc_ids = np.fromiter((d for docs in term_docs for d in docs), dtype=np.int32,
+                              count=int(term_offsets[-1]))
+        tfs = np.fromiter((tf for tfs in term_tfs for tf in tfs), dtype=np.float32,
+                          count=int(term_offsets[-1]))
+
+        idf = np.log(1 + (num_docs - df + 0.5) / (df + 0.5)).astype(np.float32)
+        posting_idf = np.repeat(idf, df)
+        impacts = (posting_idf * tfs * (k1 + 1) / (tfs + length_norm[doc_ids])).astype(np.float32)
+
+        max_impacts = np.zeros(len(term_docs), dtype=np.float32)
+        if len(impacts):
+            nonempty = df > 0
+            max_impacts[nonempty] = np.maximum.reduceat(impacts, term_offsets[:-1][nonempty])
+
+        return cls(vocabulary, term_offsets, doc_ids, impacts, max_impacts, num_docs)
+
+    def _postings(self, term_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        start, end = self.term_offsets[term_id], self.term_offsets[term_id + 1]
+        return self.doc_ids[start:end], self.impacts[start:end]
+
+    def search(self, query_tokens: Iterable[str], k: int = 10) -> List[Tuple[int, float]]:
+        """
+        检索得分最高的k个文档
+
+        Returns:
+            [(doc_id, bm25_score)]，按分数降序
+        """
+        weights: Dict[int, int] = {}
+        for token in query_tokens:
+            term_id = self.vocabulary.get(token)
+            if term_id is not None:
+                weights[term_id] = weights.get(term_id, 0) + 1
+        if not weights or k <= 0:
+            return []
+
+        # 按得分上界从高到低处理词项
+        terms = sorted(weights, key=lambda t: self.max_impacts[t] * weights[t], reverse=True)
+        upper_bounds = np.array([self.max_impacts[t] * weights[t] for t in terms], dtype=np.float32)
+        remaining_bounds = np.concatenate([np.cumsum(upper_bounds[::-1])[::-1][1:], [0.0]])
+
+        candidates = np.empty(0, dtype=np.int32)
+        scores = np.empty(0, dtype=np.float32)
+        threshold = 0.0
+
+        for position, term_id in enumerate(terms):
+            docs, impacts = self._postings(term_id)
+            impacts = impacts * weights[term_id]
+
+            if len(candidates) >= k and remaining_bounds[position] + upper_bounds[position] < threshold:
+                # MaxScore：未出现过的文档即使命中全部剩余词项也进不了top-k，只给已有候选补分
+                positions = np.searchsorted(docs, candidates)
+                positions[positions >= len(docs)] = 0
+                hit = docs[positions] == candidates if len(docs) else np.zeros(len(candidates), bool)
+                scores[hit] += impacts[positions[hit]]
+            else:
+                merged_docs = np.concatenate([candidates, docs])
+                merged_scores = np.concatenate([scores, impacts])
+                candidates, inverse = np.unique(merged_docs, return_inverse=True)
+                scores = np.bincount(inverse, weights=merged_scores).astype(np.float32)
+
+            if len(candidates) > k:
+                threshold = float(np.partition(scores, len(scores) - k)[len(scores) - k])
+                # 剪掉即使拿到剩余全部上界也追不上第k名的候选
+                keep = scores + remaining_bounds[position] >= threshold
+                candidates, scores = candidates[keep], scores[keep]
+
+        if len(candidates) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(candidates))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(int(candidates[i]), float(scores[i])) for i in top]
+
+    # ------------------------------------------------------------------
+    # 持久化（配合 index_artifacts 以 mmap 加载）
+    # ------------------------------------------------------------------
+
+    ARRAY_FILES = {
+        "term_offsets": "bm25_term_offsets.npy",
+        "doc_ids": "bm25_doc_ids.npy",
+        "impacts": "bm25_impacts.npy",
+        "max_impacts": "bm25_max_impacts.npy",
+    }
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        return {name: getattr(self, name) for name in self.ARRAY_FILES}
+
+    @classmethod
+    def from_arrays(cls, vocabulary: Dict[str, int], arrays: Dict[str, np.ndarray],
+                    num_docs: int) -> "BM25InvertedIndex":
+        return cls(vocabulary, arrays["term_offsets"], arrays["doc_ids"],
+                   arrays["impacts"], arrays["max_impacts"], num_docs)
+
+    def get_stats(self) -> Dict[str, Optional[float]]:
+        return {
+            "num_docs": self.num_docs,
+            "num_terms": len(self.vocabulary),
+            "num_postings": int(self.term_offsets[-1]) if len(self.term_offsets) else 0,
+        }
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+混合检索加成预计算
+
+hybrid_search 原先对每个候选文档逐一计算症状加成与疾病精确匹配加成，
+遍历全部疾病、同义词、症状词条并在整篇文档上做子串查找。
+本模块在建索引时一次性计算每个文档（及其来源标题）包含哪些词条，存为稀疏0/1矩阵；
+查询时用自动机单遍匹配查询中的词条，加成变为候选行与查询权重向量的点积。
+
+score() 的计算规则与原逐文档实现一致：
+- 症状加成：查询与文档同时包含的症状，各加 (权重-1)*0.1，上限0.3
+- 疾病加成：查询等于疾病名时标题命中加 权重*0.8、仅内容命中加 权重*0.6；
+  查询包含疾病名（至少3个字）时分别加 权重*0.5 / 权重*0.3；
+  查询等于同义词时标题（同义词或主疾病名）命中加 主权重*0.4、仅内容命中加 主权重*0.25；上限15.0
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from core.text_matching import AhoCorasickAutomaton
+
+
+class BonusTermIndex:
+    """疾病/同义词/症状词条的文档侧出现矩阵与查询侧权重"""
+
+    def __init__(self, disease_exact_weights: Dict[str, float],
+                 tcm_synonyms: Dict[str, List[str]],
+                 symptom_weights: Dict[str, float]):
+        terms: List[str] = []
+        columns: Dict[str, int] = {}
+
+        def column(term: str) -> int:
+            term = term.lower()
+            if term not in columns:
+                columns[term] = len(terms)
+                terms.append(term)
+            return columns[term]
+
+        # 规则1/2：疾病名精确匹配、包含匹配
+        self._disease_weights = {}
+        for disease, weight in disease_exact_weights.items():
+            self._disease_weights[column(disease)] = weight
+
+        # 规则3：同义词精确匹配，查询等于同义词时才生效，按同义词索引
+        self._synonym_rules: Dict[str, List[Tuple[int, int, float]]] = {}
+        for main_disease, synonyms in tcm_synonyms.items():
+            if main_disease not in disease_exact_weights:
+                continue
+            main_col = column(main_disease)
+            main_weight = disease_exact_weights[main_disease]
+            for synonym in synonyms:
+                syn_col = column(synonym)
+                self._synonym_rules.setdefault(synonym.lower(), []).append(
+                    (syn_col, main_col, main_weight)
+                )
+
+        # 症状权重加成
+        self._symptom_weights = {column(symptom): weight for symptom, weight in symptom_weights.items()}
+
+        self.terms = terms
+        self._columns = columns
+        self._automaton = AhoCorasickAutomaton()
+        for term, col in columns.items():
+            self._automaton.add(term, col)
+        self._automaton.build()
+
+        self.doc_terms: Optional[sparse.csr_matrix] = None
+        self.source_terms: Optional[sparse.csr_matrix] = None
+
+    # ------------------------------------------------------------------
+    # 文档侧
+    # ------------------------------------------------------------------
+
+    def _term_columns(self, text: str) -> List[int]:
+        return sorted({col for _, _, _, col in self._automaton.iter_matches(text)})
+
+    def _presence_matrix(self, texts: Sequence[str]) -> sparse.csr_matrix:
+        indptr = [0]
+        indices: List[int] = []
+        for text in texts:
+            indices.extend(self._term_columns(text))
+            indptr.append(len(indices))
+        return self._matrix_from_structure(np.asarray(indices, dtype=np.int32),
+                                           np.asarray(indptr, dtype=np.int64))
+
+    def _matrix_from_structure(self, indices: np.ndarray, indptr: np.ndarray) -> sparse.csr_matrix:
+        data = np.ones(len(indices), dtype=np.float32)
+        return sparse.csr_matrix((data, indices, indptr), shape=(len(indptr) - 1, len(self.terms)))
+
+    def build(self, documents: Sequence[str], metadata: Sequence[Dict]):
+        """扫描全部文档与来源标题，建立出现矩阵"""
+        self.doc_terms = self._presence_matrix([(doc or "").lower() for doc in documents])
+        self.source_terms = self._presence_matrix([
+            str((meta or {}).get('source', '') or '').lower() for meta in metadata
+        ])
+
+    def matrix_arrays(self) -> Dict[str, np.ndarray]:
+        """出现矩阵的结构数组（数据全为1，无需保存）"""
+        return {
+            "doc_indices": self.doc_terms.indices,
+            "doc_indptr": self.doc_terms.indptr,
+            "source_indices": self.source_terms.indices,
+            "source_indptr": self.source_terms.indptr,
+        }
+
+    def load_matrix_arrays(self, arrays: Dict[str, np.ndarray]):
+        self.doc_terms = self._matrix_from_structure(arrays["doc_indices"], arrays["doc_indptr"])
+        self.source_terms = self._matrix_from_structure(arrays["source_indices"], arrays["source_indptr"])
+
+    @property
+    def is_built(self) -> bool:
+        return self.doc_terms is not None
+
+    # ------------------------------------------------------------------
+    # 查询侧
+    # ------------------------------------------------------------------
+
+    def score(self, query: str, doc_indices: Sequence[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        计算候选文档的 (症状加成, 疾病精确匹配加成)
+        """
+        count = len(doc_indices)
+        if count == 0:
+            return np.zeros(0), np.zeros(0)
+
+        rows = np.asarray(doc_indices, dtype=np.int64)
+        doc_rows = self.doc_terms[rows]
+        source_rows = self.source_terms[rows]
+        # “标题不含但内容含”的elif分支
+        doc_only_rows = doc_rows - doc_rows.multiply(source_rows)
+
+        query_clean = query.strip().lower()
+        # 词条不含空白，去除首尾空白不影响包含关系
+        query_columns = self._term_columns(query_clean)
+
+        # 症状加成：查询与文档同时包含该症状
+        symptom_vector = np.zeros(len(self.terms), dtype=np.float32)
+        for col in query_columns:
+            weight = self._symptom_weights.get(col)
+            if weight is not None:
+                symptom_vector[col] = (weight - 1.0) * 0.1
+        symptom_bonus = np.minimum(doc_rows @ symptom_vector, 0.3)
+
+        title_vector = np.zeros(len(self.terms), dtype=np.float32)
+        content_vector = np.zeros(len(self.terms), dtype=np.float32)
+
+        # 1. 疾病名与查询完全相同
+        exact_col = self._columns.get(query_clean)
+        if exact_col is not None and exact_col in self._disease_weights:
+            weight = self._disease_weights[exact_col]
+            title_vector[exact_col] += weight * 0.8
+            content_vector[exact_col] += weight * 0.6
+
+        # 2. 查询包含疾病名（至少3个字）
+        for col in query_columns:
+            weight = self._disease_weights.get(col)
+            if weight is not None and len(self.terms[col]) >= 3:
+                title_vector[col] += weight * 0.5
+                content_vector[col] += weight * 0.3
+
+        disease_bonus = source_rows @ title_vector + doc_only_rows @ content_vector
+
+        # 3. 查询等于某个同义词
+        for syn_col, main_col, main_weight in self._synonym_rules.get(query_clean, ()):
+            in_title = np.maximum(
+                source_rows[:, syn_col].toarray().ravel(),
+                source_rows[:, main_col].toarray().ravel()
+            )
+            in_content = doc_rows[:, syn_col].toarray().ravel()
+            disease_bonus = disease_bonus + main_weight * (
+                0.4 * in_title + 0.25 * in_content * (1 - in_title)
+            )
+
+        return np.asarray(symptom_bonus, dtype=np.float64), np.minimum(
+            np.asarray(disease_bonus, dtype=np.float64), 15.0
+        )
@@ -9,11 +9,18 @@ import pickle
 from collections import defaultdict, Counter
 from typing import List, Dict, Tuple
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+
+from core.knowledge_retrieval.bm25_index import BM25InvertedIndex
+from core.knowledge_retrieval.bonus_scorer import BonusTermIndex
+from core.knowledge_retrieval.index_artifacts import load_artifacts, write_artifacts
+from core.knowledge_retrieval.near_duplicate import NearDuplicateIndex, minhash_signature, signature_matrix
 
 class EnhancedKnowledgeRetrieval:
-    def __init__(self, knowledge_db_path: str):
+    def __init__(self, knowledge_db_path: str, use_artifacts: bool = True):
         self.knowledge_db_path = knowledge_db_path
+        # 优先加载离线构建的索引产物（见 index_artifacts），避免每个worker启动时重新分词和拟合TF-IDF
+        self.use_artifacts = use_artifacts
+        self.artifact_dir = None
         self.faiss_index_file = os.path.join(knowledge_db_path, "knowledge.index")
         self.documents_file = os.path.join(knowledge_db_path, "documents.pkl")
         self.metadata_file = os.path.join(knowledge_db_path, "metadata.pkl")
@@ -24,6 +31,10 @@ class EnhancedKnowledgeRetrieval:
         self.metadata = []
         self.tfidf_vectorizer = None
         self.tfidf_matrix = None
+        self.bm25_index = None
+        # 文档字符集合的MinHash签名，供结果去重使用
+        self.minhash_signatures = None
+        self._bm25_stopwords = set(self._get_chinese_stopwords()) | set("，。、；：！？,.;:!?")
         
         # 疾病精确匹配权重字典 - 用于提升疾病名称查询精度
         self.disease_exact_weights = {
@@ -172,10 +183,25 @@ class EnhancedKnowledgeRetrieval:
             "腹泻": 1.1
         }
         
+        # 疾病/同义词/症状加成的预计算索引（文档侧出现矩阵 + 查询侧自动机）
+        self.bonus_index = BonusTermIndex(self.disease_exact_weights, self.tcm_synonyms, self.symptom_weights)
+
         self.load_knowledge_base()
         
     def load_knowledge_base(self):
         """加载知识库"""
+        fingerprint = None
+        if self.use_artifacts:
+            try:
+                artifacts = load_artifacts(self.knowledge_db_path)
+                fingerprint = artifacts["fingerprint"]
+                if artifacts["loaded"]:
+                    self._apply_artifacts(artifacts)
+                    return
+                print(f"检索索引产物不存在或与源文件指纹不符，重新构建: {fingerprint[:16]}")
+            except Exception as e:
+                print(f"Error loading index artifacts, rebuilding: {e}")
+
         try:
             if os.path.exists(self.faiss_index_file):
                 self.faiss_index = faiss.read_index(self.faiss_index_file)
@@ -188,9 +214,39 @@ class EnhancedKnowledgeRetrieval:
                 
             # 建立TF-IDF索引用于关键词检索
             self._build_tfidf_index()
+            self.bonus_index.build(self.documents, self.metadata)
+            self.minhash_signatures = signature_matrix(self.documents)
             
         except Exception as e:
             print(f"Error loading knowledge base: {e}")
+            return
+
+        if fingerprint:
+            # 回写产物，后续启动的worker直接mmap加载
+            try:
+                self.artifact_dir = write_artifacts(self, fingerprint)
+            except Exception as e:
+                print(f"Error writing index artifacts: {e}")
+
+    def _apply_artifacts(self, artifacts: Dict):
+        """使用mmap加载的产物替代pickle反序列化和TF-IDF重建"""
+        self.faiss_index = artifacts["faiss_index"]
+        self.documents = artifacts["documents"]
+        self.tfidf_vectorizer = artifacts["tfidf_vectorizer"]
+        self.tfidf_matrix = artifacts["tfidf_matrix"]
+        self.bm25_index = artifacts["bm25_index"]
+        self.minhash_signatures = artifacts.get("minhash_signatures")
+        self.artifact_dir = artifacts["directory"]
+
+        # 元数据体量小且结构不固定，仍直接读取源pickle
+        with open(self.metadata_file, 'rb') as f:
+            self.metadata = pickle.load(f)
+
+        # 加成词表随代码变化时，产物中的出现矩阵作废，按当前词表重新扫描
+        if artifacts.get("bonus_terms") == self.bonus_index.terms:
+            self.bonus_index.load_matrix_arrays(artifacts["bonus_arrays"])
+        else:
+            self.bonus_index.build(self.documents, self.metadata)
             
     def _build_tfidf_index(self):
         """建立TF-IDF索引"""
@@ -199,10 +255,12 @@ class EnhancedKnowledgeRetrieval:
             
         # 中文分词
         segmented_docs = []
+        tokenized_docs = []
         for doc in self.documents:
             # 使用jieba分词，保留中医专业词汇
-            words = jieba.cut(doc)
+            words = list(jieba.cut(doc))
             segmented_docs.append(" ".join(words))
+            tokenized_docs.append(self._filter_tokens(words))
             
         self.tfidf_vectorizer = TfidfVectorizer(
             max_features=5000,
@@ -210,6 +268,14 @@ class EnhancedKnowledgeRetrieval:
             stop_words=self._get_chinese_stopwords()
         )
         self.tfidf_matrix = self.tfidf_vectorizer.fit_transform(segmented_docs)
+
+        # 关键词检索使用BM25倒排索引，与TF-IDF共用同一次分词结果
+        self.bm25_index = BM25InvertedIndex.build(tokenized_docs)
+
+    def _filter_tokens(self, words) -> List[str]:
+        """去除空白和停用词，得到BM25词项"""
+        stopwords = self._bm25_stopwords
+        return [w for w in (word.strip() for word in words) if w and w not in stopwords]
         
     def _get_chinese_stopwords(self) -> List[str]:
         """中文停用词"""
@@ -274,7 +340,41 @@ class EnhancedKnowledgeRetrieval:
         return results
         
     def keyword_search(self, query: str, k: int = 10) -> List[Dict]:
-        """关键词检索（TF-IDF）"""
+        """关键词检索（BM25倒排索引；未建立索引或没有任何词项命中时回退TF-IDF）"""
+        if self.bm25_index is None:
+            return self._tfidf_keyword_search(query, k)
+
+        # 扩展查询并分词
+        expanded_query = self.expand_query(query)
+        query_tokens = self._filter_tokens(jieba.cut(expanded_query))
+
+        hits = self.bm25_index.search(query_tokens, k)
+        if not hits:
+            # 与原TF-IDF检索一致：没有命中时仍返回最接近的k条，交给混合检索和重排处理
+            return self._tfidf_keyword_search(query, k)
+
+        # BM25分数无上界，按本次查询最高分归一化到0-1，便于与语义分数融合
+        top_score = hits[0][1] or 1.0
+        return [
+            self._keyword_result(idx, score / top_score, bm25_score=score)
+            for idx, score in hits
+        ]
+
+    def _keyword_result(self, idx: int, score: float, **extra) -> Dict:
+        result = {
+            'document': self.documents[idx],
+            'metadata': self.metadata[idx],
+            'similarity_score': float(score),  # 统一字段名
+            'keyword_score': float(score),     # 保持兼容性
+            'source': self.metadata[idx].get('source', 'unknown'),
+            'index': idx,
+            'method': 'keyword'
+        }
+        result.update(extra)
+        return result
+
+    def _tfidf_keyword_search(self, query: str, k: int = 10) -> List[Dict]:
+        """关键词检索（TF-IDF全量相似度）"""
         if self.tfidf_matrix is None:
             return []
             
@@ -286,37 +386,25 @@ class EnhancedKnowledgeRetrieval:
         query_text = " ".join(words)
         query_vector = self.tfidf_vectorizer.transform([query_text])
         
-        # 计算相似度
-        similarities = cosine_similarity(query_vector, self.tfidf_matrix).flatten()
+        # 计算相似度：TF-IDF向量已做L2归一化，点积即余弦相似度，且不会复制（可能mmap的）文档矩阵
+        similarities = np.asarray((self.tfidf_matrix @ query_vector.T).todense()).ravel()
         
         # 获取top-k结果
-        top_indices = similarities.argsort()[-k:][::-1]
-        
-        results = []
-        for idx in top_indices:
-            if similarities[idx] > 0.001:  # 降低阈值确保更多结果
-                results.append({
-                    'document': self.documents[idx],
-                    'metadata': self.metadata[idx],
-                    'similarity_score': float(similarities[idx]),  # 统一字段名
-                    'keyword_score': float(similarities[idx]),     # 保持兼容性
-                    'source': self.metadata[idx].get('source', 'unknown'),
-                    'index': idx,
-                    'method': 'keyword'
-                })
+        k = min(k, len(similarities))
+        if k <= 0:
+            return []
+        top_indices = np.argpartition(-similarities, k - 1)[:k]
+        top_indices = top_indices[np.argsort(-similarities[top_indices])]
+        
+        results = [
+            self._keyword_result(idx, similarities[idx])
+            for idx in top_indices
+            if similarities[idx] > 0.001  # 降低阈值确保更多结果
+        ]
                 
         # 确保即使没有高分结果也返回最佳的几个
-        if len(results) == 0 and len(top_indices) > 0:
-            for idx in top_indices[:k]:
-                results.append({
-                    'document': self.documents[idx],
-                    'metadata': self.metadata[idx],
-                    'similarity_score': float(similarities[idx]),
-                    'keyword_score': float(similarities[idx]),
-                    'source': self.metadata[idx].get('source', 'unknown'),
-                    'index': idx,
-                    'method': 'keyword'
-                })
+        if len(results) == 0:
+            results = [self._keyword_result(idx, similarities[idx]) for idx in top_indices]
         
         return results
         
@@ -347,9 +435,14 @@ class EnhancedKnowledgeRetrieval:
                 result_map[idx]['metadata'] = result['metadata']
             result_map[idx]['keyword_score'] = result['keyword_score']
             
+        # 症状权重加成与疾病精确匹配加成：对全部候选一次性向量化计算
+        candidate_indices = list(result_map.keys())
+        symptom_bonuses, disease_exact_bonuses = self.bonus_index.score(query, candidate_indices)
+
         # 计算混合分数
         final_results = []
-        for idx, data in result_map.items():
+        for position, idx in enumerate(candidate_indices):
+            data = result_map[idx]
             semantic_score = data.get('semantic_score', 0.0)
             keyword_score = data.get('keyword_score', 0.0)
             
@@ -357,11 +450,8 @@ class EnhancedKnowledgeRetrieval:
             normalized_semantic = self._normalize_score(semantic_score, 'semantic')
             normalized_keyword = self._normalize_score(keyword_score, 'keyword')
             
-            # 计算症状权重加成
-            symptom_bonus = self._calculate_symptom_bonus(query, data['document'])
-            
-            # 计算疾病精确匹配加成
-            disease_exact_bonus = self._calculate_disease_exact_bonus(query, data['document'], data['metadata'])
+            symptom_bonus = float(symptom_bonuses[position])
+            disease_exact_bonus = float(disease_exact_bonuses[position])
             
             # 混合分数
             hybrid_score = (semantic_weight * normalized_semantic + 
@@ -369,6 +459,7 @@ class EnhancedKnowledgeRetrieval:
                           symptom_bonus + disease_exact_bonus)
             
             final_results.append({
+                'index': idx,
                 'document': data['document'],
                 'metadata': data['metadata'],
                 'hybrid_score': hybrid_score,
@@ -394,112 +485,36 @@ class EnhancedKnowledgeRetrieval:
             return score
         return score
         
-    def _calculate_symptom_bonus(self, query: str, document: str) -> float:
-        """计算症状权重加成"""
-        bonus = 0.0
-        query_lower = query.lower()
-        doc_lower = document.lower()
-        
-        for symptom, weight in self.symptom_weights.items():
-            if symptom in query_lower and symptom in doc_lower:
-                bonus += (weight - 1.0) * 0.1  # 转换为0.1以内的加成
-                
-        return min(bonus, 0.3)  # 最大加成0.3
-    
-    def _calculate_disease_exact_bonus(self, query: str, document: str, metadata: Dict) -> float:
-        """计算疾病精确匹配加成 - 核心功能"""
-        bonus = 0.0
-        query_clean = query.strip().lower()
-        doc_lower = document.lower()
-        source = metadata.get('source', '').lower()
-        
-        # 1. 直接疾病名匹配 - 最高优先级
-        for disease_name, weight in self.disease_exact_weights.items():
-            disease_lower = disease_name.lower()
-            
-            # 精确匹配查询
-            if disease_lower == query_clean:
-                # 文档标题匹配
-                if disease_lower in source:
-                    bonus += weight * 0.8  # 超高权重：标题精确匹配
-                    print(f"🎯 疾病精确匹配(标题): {disease_name} -> 权重:{weight * 0.8:.1f}")
-                # 文档内容匹配
-                elif disease_lower in doc_lower:
-                    bonus += weight * 0.6  # 高权重：内容精确匹配
-                    print(f"🎯 疾病精确匹配(内容): {disease_name} -> 权重:{weight * 0.6:.1f}")
-                    
-        # 2. 疾病名包含匹配 - 次优先级
-        for disease_name, weight in self.disease_exact_weights.items():
-            disease_lower = disease_name.lower()
-            
-            # 查询包含疾病名
-            if disease_lower in query_clean and len(disease_lower) >= 3:
-                if disease_lower in source:
-                    bonus += weight * 0.5  # 中高权重：标题部分匹配
-                elif disease_lower in doc_lower:
-                    bonus += weight * 0.3  # 中等权重：内容部分匹配
-                    
-        # 3. 同义词精确匹配 - 第三优先级
-        for main_disease, synonyms in self.tcm_synonyms.items():
-            if main_disease in self.disease_exact_weights:
-                main_weight = self.disease_exact_weights[main_disease]
-                
-                for synonym in synonyms:
-                    synonym_lower = synonym.lower()
-                    
-                    # 同义词精确匹配
-                    if synonym_lower == query_clean:
-                        if synonym_lower in source or main_disease.lower() in source:
-                            bonus += main_weight * 0.4  # 同义词标题匹配
-                        elif synonym_lower in doc_lower:
-                            bonus += main_weight * 0.25  # 同义词内容匹配
-                            
-        # 4. 限制最大加成，避免分数爆炸
-        return min(bonus, 15.0)  # 最大加成15.0
-        
     def _remove_duplicates(self, results: List[Dict], threshold: float = 0.85) -> List[Dict]:
-        """去除重复和高度相似的结果"""
+        """
+        去除重复和高度相似的结果
+
+        用MinHash签名的LSH分桶查找近重复项，避免与全部已保留结果两两比较。
+        """
         if len(results) <= 1:
             return results
-            
-        filtered_results = [results[0]]  # 保留第一个结果
-        
-        for current in results[1:]:
-            is_duplicate = False
-            current_doc = current['document']
-            
-            for existing in filtered_results:
-                existing_doc = existing['document']
-                
-                # 计算文档相似度
-                similarity = self._calculate_document_similarity(current_doc, existing_doc)
-                
-                if similarity > threshold:
-                    is_duplicate = True
-                    # 如果当前结果分数更高，替换现有结果
-                    if current['hybrid_score'] > existing['hybrid_score']:
-                        filtered_results.remove(existing)
-                        filtered_results.append(current)
-                    break
-                    
-            if not is_duplicate:
+
+        filtered_results = []
+        dedup_index = NearDuplicateIndex(threshold)
+
+        for current in results:
+            signature = self._result_signature(current)
+            duplicate_slot = dedup_index.find(signature)
+
+            if duplicate_slot is None:
+                dedup_index.add(len(filtered_results), signature)
                 filtered_results.append(current)
-                
+            elif current['hybrid_score'] > filtered_results[duplicate_slot]['hybrid_score']:
+                # 当前结果分数更高，替换现有结果
+                dedup_index.add(duplicate_slot, signature)
+                filtered_results[duplicate_slot] = current
+
         return filtered_results
-        
-    def _calculate_document_similarity(self, doc1: str, doc2: str) -> float:
-        """计算两个文档的相似度"""
-        # 简单的字符串相似度计算
-        if len(doc1) == 0 or len(doc2) == 0:
-            return 0.0
-            
-        # 计算字符重叠度
-        set1 = set(doc1)
-        set2 = set(doc2)
-        intersection = len(set1.intersection(set2))
-        union = len(set1.union(set2))
-        
-        if union == 0:
-            return 0.0
-            
-        return intersection / union
\ No newline at end of file
+
+    def _result_signature(self, result: Dict):
+        """取结果文档的MinHash签名：优先使用建索引时预计算的签名"""
+        idx = result.get('index')
+        signatures = self.minhash_signatures
+        if idx is not None and signatures is not None and 0 <= idx < len(signatures):
+            return np.asarray(signatures[idx])
+        return minhash_signature(result['document'])
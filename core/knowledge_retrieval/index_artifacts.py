@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+知识库检索索引产物（离线构建 + mmap 加载）
+
+EnhancedKnowledgeRetrieval 原先在每个进程启动时反序列化全部文档、对全库做 jieba 分词
+并重新拟合 TfidfVectorizer，多worker部署时这份开销按worker数成倍支付。
+本模块把这些结果离线构建为带版本的产物目录：
+
+    <knowledge_db>/artifacts/v<格式版本>-<源文件指纹前16位>/
+        manifest.json            构建参数、源文件指纹、文档数
+        knowledge.index          FAISS索引
+        tfidf_vocabulary.json    TF-IDF词表
+        tfidf_idf.npy            IDF向量
+        tfidf_data.npy / tfidf_indices.npy / tfidf_indptr.npy   CSR矩阵分量
+        bm25_vocabulary.json / bm25_*.npy                      BM25倒排索引
+        bonus_terms.json / bonus_*.npy                         加成词条出现矩阵
+        minhash_signatures.npy   文档MinHash签名（近重复去重）
+        documents.bin            UTF-8拼接的文档内容
+        documents_offsets.npy    文档字节偏移（n+1项）
+
+运行时以 IO_FLAG_MMAP 读取FAISS索引、以 np.load(mmap_mode='r') 读取数组，
+各worker共享同一份页缓存；源 pickle 内容变化后指纹不匹配，自动回退为重新构建。
+
+构建命令：
+    python -m core.knowledge_retrieval.index_artifacts [--knowledge-db PATH] [--force]
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import mmap
+import os
+import shutil
+import tempfile
+from collections.abc import Sequence
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from core.knowledge_retrieval.bm25_index import BM25InvertedIndex
+
+logger = logging.getLogger(__name__)
+
+# 产物格式变化（文件布局、TF-IDF参数）时递增，旧产物自动失效
+ARTIFACT_FORMAT_VERSION = 4
+
+SOURCE_FILES = ("knowledge.index", "documents.pkl", "metadata.pkl")
+ARTIFACTS_DIRNAME = "artifacts"
+MANIFEST_FILE = "manifest.json"
+
+
+def compute_source_fingerprint(knowledge_db_path: str) -> str:
+    """计算源文件（FAISS索引与文档/元数据pickle）的内容指纹"""
+    digest = hashlib.sha256()
+    digest.update(f"format:{ARTIFACT_FORMAT_VERSION}".encode("utf-8"))
+    for name in SOURCE_FILES:
+        path = os.path.join(knowledge_db_path, name)
+        digest.update(name.encode("utf-8"))
+        if not os.path.exists(path):
+            digest.update(b"<missing>")
+            continue
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def artifact_dir_for(knowledge_db_path: str, fingerprint: str) -> str:
+    """产物目录路径"""
+    return os.path.join(
+        knowledge_db_path, ARTIFACTS_DIRNAME,
+        f"v{ARTIFACT_FORMAT_VERSION}-{fingerprint[:16]}"
+    )
+
+
+class MappedDocuments(Sequence):
+    """按偏移量从 mmap 的扁平文件中按需解码文档，行为与文档列表一致"""
+
+    def __init__(self, data_path: str, offsets_path: str):
+        self._offsets = np.load(offsets_path, mmap_mode="r")
+        self._file = open(data_path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        # 空文件无法mmap
+        self._buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        index = int(index)
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("document index out of range")
+        start, end = int(self._offsets[index]), int(self._offsets[index + 1])
+        return self._buffer[start:end].decode("utf-8")
+
+
+def _write_documents(directory: str, documents: List[str]):
+    offsets = np.zeros(len(documents) + 1, dtype=np.int64)
+    with open(os.path.join(directory, "documents.bin"), "wb") as f:
+        position = 0
+        for i, doc in enumerate(documents):
+            encoded = (doc or "").encode("utf-8")
+            f.write(encoded)
+            position += len(encoded)
+            offsets[i + 1] = position
+    np.save(os.path.join(directory, "documents_offsets.npy"), offsets)
+
+
+def write_artifacts(retrieval, fingerprint: str) -> Optional[str]:
+    """
+    把已构建好的检索状态写为产物目录
+
+    先写入临时目录再原子重命名，多个worker同时写入时只保留先完成的一份。
+    """
+    import faiss
+
+    if retrieval.tfidf_matrix is None or retrieval.tfidf_vectorizer is None:
+        return None
+
+    target = artifact_dir_for(retrieval.knowledge_db_path, fingerprint)
+    if os.path.exists(os.path.join(target, MANIFEST_FILE)):
+        return target
+
+    parent = os.path.dirname(target)
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=".build-", dir=parent)
+    try:
+        if retrieval.faiss_index is not None:
+            faiss.write_index(retrieval.faiss_index, os.path.join(staging, "knowledge.index"))
+
+        vectorizer = retrieval.tfidf_vectorizer
+        vocabulary = {term: int(idx) for term, idx in vectorizer.vocabulary_.items()}
+        with open(os.path.join(staging, "tfidf_vocabulary.json"), "w", encoding="utf-8") as f:
+            json.dump(vocabulary, f, ensure_ascii=False)
+        np.save(os.path.join(staging, "tfidf_idf.npy"), np.asarray(vectorizer.idf_, dtype=np.float64))
+
+        matrix = retrieval.tfidf_matrix.tocsr()
+        # 分量单独存为未压缩的 .npy，.npz 归档无法被 mmap
+        np.save(os.path.join(staging, "tfidf_data.npy"), matrix.data)
+        np.save(os.path.join(staging, "tfidf_indices.npy"), matrix.indices)
+        np.save(os.path.join(staging, "tfidf_indptr.npy"), matrix.indptr)
+
+        bm25_index = getattr(retrieval, "bm25_index", None)
+        if bm25_index is not None:
+            with open(os.path.join(staging, "bm25_vocabulary.json"), "w", encoding="utf-8") as f:
+                json.dump(bm25_index.vocabulary, f, ensure_ascii=False)
+            for name, array in bm25_index.arrays().items():
+                np.save(os.path.join(staging, bm25_index.ARRAY_FILES[name]), array)
+
+        bonus_index = getattr(retrieval, "bonus_index", None)
+        has_bonus = bonus_index is not None and bonus_index.is_built
+        if has_bonus:
+            with open(os.path.join(staging, "bonus_terms.json"), "w", encoding="utf-8") as f:
+                json.dump(bonus_index.terms, f, ensure_ascii=False)
+            for name, array in bonus_index.matrix_arrays().items():
+                np.save(os.path.join(staging, f"bonus_{name}.npy"), array)
+
+        signatures = getattr(retrieval, "minhash_signatures", None)
+        if signatures is not None:
+            np.save(os.path.join(staging, "minhash_signatures.npy"), np.asarray(signatures))
+
+        _write_documents(staging, list(retrieval.documents))
+
+        manifest = {
+            "format_version": ARTIFACT_FORMAT_VERSION,
+            "source_fingerprint": fingerprint,
+            "document_count": len(retrieval.documents),
+            "has_faiss_index": retrieval.faiss_index is not None,
+            "has_bm25_index": bm25_index is not None,
+            "has_bonus_index": has_bonus,
+            "has_minhash": signatures is not None,
+            "tfidf_shape": list(matrix.shape),
+            "tfidf_params": {
+                "ngram_range": list(vectorizer.ngram_range),
+                "stop_words": list(vectorizer.stop_words or []),
+            },
+        }
+        # manifest 最后写入，作为产物完整的标志
+        with open(os.path.join(staging, MANIFEST_FILE), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+        try:
+            os.rename(staging, target)
+        except OSError:
+            # 其他进程已完成同一指纹的构建
+            shutil.rmtree(staging, ignore_errors=True)
+        logger.info(f"📦 检索索引产物已写入: {target}")
+        return target
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+
+def load_artifacts(knowledge_db_path: str) -> Dict[str, Any]:
+    """
+    加载与当前源文件指纹匹配的产物
+
+    Returns:
+        总是包含 fingerprint 与 loaded；loaded 为 True 时另含
+        faiss_index、documents、tfidf_vectorizer、tfidf_matrix、bm25_index、
+        bonus_terms、bonus_arrays、minhash_signatures、directory
+    """
+    import faiss
+    from scipy import sparse
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    fingerprint = compute_source_fingerprint(knowledge_db_path)
+    directory = artifact_dir_for(knowledge_db_path, fingerprint)
+    manifest_path = os.path.join(directory, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        return {"fingerprint": fingerprint, "loaded": False}
+
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    if (manifest.get("source_fingerprint") != fingerprint
+            or manifest.get("format_version") != ARTIFACT_FORMAT_VERSION):
+        return {"fingerprint": fingerprint, "loaded": False}
+
+    faiss_index = None
+    index_path = os.path.join(directory, "knowledge.index")
+    if manifest.get("has_faiss_index") and os.path.exists(index_path):
+        try:
+            faiss_index = faiss.read_index(index_path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+        except RuntimeError:
+            # 部分索引类型不支持mmap，退回普通读取
+            faiss_index = faiss.read_index(index_path)
+
+    with open(os.path.join(directory, "tfidf_vocabulary.json"), "r", encoding="utf-8") as f:
+        vocabulary = json.load(f)
+    params = manifest.get("tfidf_params", {})
+    vectorizer = TfidfVectorizer(
+        vocabulary=vocabulary,
+        ngram_range=tuple(params.get("ngram_range", (1, 2))),
+        stop_words=params.get("stop_words") or None
+    )
+    vectorizer.idf_ = np.load(os.path.join(directory, "tfidf_idf.npy"))
+
+    matrix = sparse.csr_matrix(
+        (
+            np.load(os.path.join(directory, "tfidf_data.npy"), mmap_mode="r"),
+            np.load(os.path.join(directory, "tfidf_indices.npy"), mmap_mode="r"),
+            np.load(os.path.join(directory, "tfidf_indptr.npy"), mmap_mode="r"),
+        ),
+        shape=tuple(manifest["tfidf_shape"]),
+        copy=False
+    )
+
+    bm25_index = None
+    if manifest.get("has_bm25_index"):
+        with open(os.path.join(directory, "bm25_vocabulary.json"), "r", encoding="utf-8") as f:
+            bm25_vocabulary = json.load(f)
+        bm25_index = BM25InvertedIndex.from_arrays(
+            bm25_vocabulary,
+            {
+                name: np.load(os.path.join(directory, filename), mmap_mode="r")
+                for name, filename in BM25InvertedIndex.ARRAY_FILES.items()
+            },
+            manifest["document_count"]
+        )
+
+    bonus_terms, bonus_arrays = None, None
+    if manifest.get("has_bonus_index"):
+        with open(os.path.join(directory, "bonus_terms.json"), "r", encoding="utf-8") as f:
+            bonus_terms = json.load(f)
+        bonus_arrays = {
+            name: np.load(os.path.join(directory, f"bonus_{name}.npy"), mmap_mode="r")
+            for name in ("doc_indices", "doc_indptr", "source_indices", "source_indptr")
+        }
+
+    minhash_signatures = None
+    if manifest.get("has_minhash"):
+        minhash_signatures = np.load(os.path.join(directory, "minhash_signatures.npy"), mmap_mode="r")
+
+    documents = MappedDocuments(
+        os.path.join(directory, "documents.bin"),
+        os.path.join(directory, "documents_offsets.npy")
+    )
+
+    return {
+        "fingerprint": fingerprint,
+        "loaded": True,
+        "directory": directory,
+        "faiss_index": faiss_index,
+        "documents": documents,
+        "tfidf_vectorizer": vectorizer,
+        "tfidf_matrix": matrix,
+        "bm25_index": bm25_index,
+        "bonus_terms": bonus_terms,
+        "bonus_arrays": bonus_arrays,
+        "minhash_signatures": minhash_signatures,
+    }
+
+
+def prune_artifacts(knowledge_db_path: str, keep_fingerprint: str) -> int:
+    """删除与当前指纹不符的旧产物目录"""
+    root = os.path.join(knowledge_db_path, ARTIFACTS_DIRNAME)
+    keep = os.path.basename(artifact_dir_for(knowledge_db_path, keep_fingerprint))
+    removed = 0
+    if not os.path.isdir(root):
+        return removed
+    for name in os.listdir(root):
+        if name != keep:
+            shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+            removed += 1
+    return removed
+
+
+def build_artifacts(knowledge_db_path: str, force: bool = False, prune: bool = True) -> Optional[str]:
+    """离线构建产物目录，返回产物路径"""
+    from core.knowledge_retrieval.enhanced_retrieval import EnhancedKnowledgeRetrieval
+
+    fingerprint = compute_source_fingerprint(knowledge_db_path)
+    target = artifact_dir_for(knowledge_db_path, fingerprint)
+    if force and os.path.exists(target):
+        shutil.rmtree(target)
+
+    retrieval = EnhancedKnowledgeRetrieval(knowledge_db_path, use_artifacts=False)
+    path = write_artifacts(retrieval, fingerprint)
+    if path and prune:
+        removed = prune_artifacts(knowledge_db_path, fingerprint)
+        if removed:
+            logger.info(f"🧹 已清理 {removed} 个旧版本产物")
+    return path
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from app.core.settings import PATHS
+
+    parser = argparse.ArgumentParser(description="构建知识库检索索引产物")
+    parser.add_argument("--knowledge-db", default=str(PATHS["knowledge_db"]),
+                        help="知识库目录（包含 knowledge.index / documents.pkl / metadata.pkl）")
+    parser.add_argument("--force", action="store_true", help="即使产物已存在也重新构建")
+    parser.add_argument("--keep-old", action="store_true", help="保留旧版本产物目录")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    path = build_artifacts(args.knowledge_db, force=args.force, prune=not args.keep_old)
+    if not path:
+        logger.error("知识库为空或加载失败，未生成产物")
+        return 1
+    print(path)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
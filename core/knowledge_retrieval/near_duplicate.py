@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+近重复文本检测（MinHash + LSH）
+
+混合检索去重原先对每个结果与所有已保留结果两两比较字符集合的Jaccard相似度，
+每次比较都要重新构造 set(doc)。本模块为每个分块预先计算字符集合的 MinHash 签名，
+签名按 band 分桶建立 LSH 索引：
+
+- 签名在建索引时计算并随检索产物保存，查询时只做整数比较
+- 只有落入同一桶的候选才估算相似度，整体近似 O(n)
+- 同一签名也用于 TCMDocumentProcessor 在入库时跳过近乎相同的分块
+
+相似度定义为两段文本字符集合的Jaccard相似度 |A∩B| / |A∪B|，任一文本为空时为0；
+estimate_similarity 由签名估计该值。
+"""
+
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+NUM_PERMUTATIONS = 64
+NUM_BANDS = 16
+_ROWS_PER_BAND = NUM_PERMUTATIONS // NUM_BANDS
+
+# 固定种子：签名需要跨进程、跨构建可比
+_PRIME = np.uint64(4294967291)  # 小于2^32的最大素数
+_rng = np.random.default_rng(20240601)
+_HASH_A = _rng.integers(1, 2 ** 32 - 1, size=NUM_PERMUTATIONS, dtype=np.uint64)
+_HASH_B = _rng.integers(0, 2 ** 32 - 1, size=NUM_PERMUTATIONS, dtype=np.uint64)
+
+# 空文本的签名，不与任何文本视为重复
+EMPTY_SIGNATURE = np.full(NUM_PERMUTATIONS, np.iinfo(np.uint32).max, dtype=np.uint32)
+
+
+def minhash_signature(text: str) -> np.ndarray:
+    """计算文本字符集合的MinHash签名"""
+    if not text:
+        return EMPTY_SIGNATURE.copy()
+    codes = np.fromiter((ord(char) for char in set(text)), dtype=np.uint64)
+    # 码点 < 2^21、系数 < 2^32，乘积不会溢出 uint64
+    hashed = (np.outer(codes, _HASH_A) + _HASH_B) % _PRIME
+    return hashed.min(axis=0).astype(np.uint32)
+
+
+def signature_matrix(texts: Iterable[str]) -> np.ndarray:
+    """批量计算签名，返回 (n, NUM_PERMUTATIONS) 的 uint32 矩阵"""
+    signatures = [minhash_signature(text) for text in texts]
+    if not signatures:
+        return np.zeros((0, NUM_PERMUTATIONS), dtype=np.uint32)
+    return np.vstack(signatures)
+
+
+def estimate_similarity(signature1: np.ndarray, signature2: np.ndarray) -> float:
+    """由签名估计Jaccard相似度"""
+    if is_empty_signature(signature1) or is_empty_signature(signature2):
+        return 0.0
+    return float(np.count_nonzero(signature1 == signature2)) / NUM_PERMUTATIONS
+
+
+def is_empty_signature(signature: np.ndarray) -> bool:
+    return bool(np.array_equal(signature, EMPTY_SIGNATURE))
+
+
+class NearDuplicateIndex:
+    """基于LSH分桶的近重复索引"""
+
+    def __init__(self, threshold: float = 0.85):
+        self.threshold = threshold
+        self._buckets: Dict[Tuple[int, bytes], List[Hashable]] = {}
+        self._signatures: Dict[Hashable, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    @staticmethod
+    def _band_keys(signature: np.ndarray):
+        for band in range(NUM_BANDS):
+            start = band * _ROWS_PER_BAND
+            yield band, signature[start:start + _ROWS_PER_BAND].tobytes()
+
+    def find(self, signature: np.ndarray) -> Optional[Hashable]:
+        """返回与签名近重复的已有条目键（相似度最高者），没有则返回 None"""
+        if is_empty_signature(signature):
+            return None
+        best_key, best_similarity = None, self.threshold
+        seen = set()
+        for band_key in self._band_keys(signature):
+            for key in self._buckets.get(band_key, ()):
+                if key in seen:
+                    continue
+                seen.add(key)
+                similarity = estimate_similarity(signature, self._signatures[key])
+                if similarity > best_similarity:
+                    best_key, best_similarity = key, similarity
+        return best_key
+
+    def add(self, key: Hashable, signature: np.ndarray):
+        """加入条目；同键重复加入时以新签名为准"""
+        if key in self._signatures:
+            self.remove(key)
+        self._signatures[key] = signature
+        if is_empty_signature(signature):
+            return
+        for band_key in self._band_keys(signature):
+            self._buckets.setdefault(band_key, []).append(key)
+
+    def remove(self, key: Hashable):
+        signature = self._signatures.pop(key, None)
+        if signature is None or is_empty_signature(signature):
+            return
+        for band_key in self._band_keys(signature):
+            bucket = self._buckets.get(band_key)
+            if bucket and key in bucket:
+                bucket.remove(key)
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+中医标准术语字典
+
+决策树文本解析原先对每个疾病、症状、处方、药材名各打开一次 user_history.sqlite，
+执行 WHERE name = ? OR alias LIKE '%名称%'（全表扫描）。本模块在进程内维护
+四张 tcm_*_standard 表的只读副本：
+
+- 名称索引：名称 -> 行，一次字典访问
+- 别名索引：各行别名按表内顺序以分隔符拼接为一个字符串，子串查找一次完成，
+  命中位置二分换算为行；名称与别名同时命中时取表内靠前的行，与原SQL的返回一致
+  （名称不含 _ 或 % 时；原SQL把这两个字符当作 LIKE 通配符，这里按字面匹配，
+  如 "麻_" 不再命中别名 "麻黄"）
+- resolve_many(kind, names) 一次解析一整组名称，结果按名称缓存到下次重载
+- 标准库被修改后调用 notify_changed() 提升版本号，下次访问立即重载；
+  定期重载覆盖迁移脚本等其他进程的写入
+"""
+
+import bisect
+import logging
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from core.database.connection import connect as db_connect
+
+logger = logging.getLogger(__name__)
+
+# 类别 -> (表名, 返回字段, 是否按别名匹配)
+STANDARD_TABLES: Dict[str, Tuple[str, Tuple[str, ...], bool]] = {
+    "disease": ("tcm_diseases_standard", ("id", "name", "category", "description"), True),
+    "symptom": ("tcm_symptoms_standard", ("id", "name", "category"), False),
+    "prescription": (
+        "tcm_prescriptions_standard",
+        ("id", "name", "source", "category", "composition", "effects", "indications"),
+        True,
+    ),
+    "herb": ("tcm_herbs_standard", ("id", "name", "effects"), True),
+}
+
+# SQLite 的 LIKE 只对ASCII字母不区分大小写
+_ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+_ALIAS_SEPARATOR = "\x00"
+# 每张表缓存的解析结果上限（名称来自医生录入的文本）
+_MAX_CACHED_NAMES = 10000
+
+
+class _TermTable:
+    """单张标准表的名称索引与别名索引"""
+
+    __slots__ = ("rows", "names", "alias_text", "alias_offsets", "alias_rows", "resolved")
+
+    def __init__(self, rows: List[Dict[str, Any]], aliases: List[Optional[str]]):
+        self.rows = rows
+        # 名称唯一；若有重复保留表内靠前的行
+        self.names: Dict[str, int] = {}
+        for position, row in enumerate(rows):
+            self.names.setdefault(row["name"], position)
+
+        # 别名拼接：alias_offsets[i] 为第i段在 alias_text 中的起点，对应 rows[alias_rows[i]]
+        parts, self.alias_offsets, self.alias_rows = [], [], []
+        offset = 0
+        for position, alias in enumerate(aliases):
+            if alias is None:
+                continue
+            alias = alias.translate(_ASCII_LOWER)
+            parts.append(alias)
+            self.alias_offsets.append(offset)
+            self.alias_rows.append(position)
+            offset += len(alias) + 1
+        self.alias_text = _ALIAS_SEPARATOR.join(parts)
+        self.resolved: Dict[str, Optional[int]] = {}
+
+    def find(self, name: str, match_alias: bool) -> Optional[int]:
+        if name in self.resolved:
+            return self.resolved[name]
+        if len(self.resolved) >= _MAX_CACHED_NAMES:
+            self.resolved.clear()
+        position = self.names.get(name)
+        if match_alias and self.alias_rows:
+            alias_position = self._find_alias(name.translate(_ASCII_LOWER))
+            if alias_position is not None and (position is None or alias_position < position):
+                position = alias_position
+        self.resolved[name] = position
+        return position
+
+    def _find_alias(self, needle: str) -> Optional[int]:
+        """
+        第一个包含 needle 的别名所在行（名称中不含分隔符，命中不会跨段）
+
+        按字面查找：_ 与 % 只匹配自身，不像原 LIKE 那样作为通配符
+        """
+        found = self.alias_text.find(needle)
+        if found < 0:
+            return None
+        return self.alias_rows[bisect.bisect_right(self.alias_offsets, found) - 1]
+
+
+class StandardTerminology:
+    """进程级标准术语字典"""
+
+    def __init__(self, db_path: str, refresh_interval: int = 300):
+        self.db_path = db_path
+        self.refresh_interval = refresh_interval
+
+        self._tables: Dict[str, _TermTable] = {}
+
+        self._version = 0
+        self._loaded_version = -1
+        self._last_refresh = 0.0
+        self._loads = 0
+        self._lock = threading.RLock()
+
+    # ------------------------------------------------------------------
+    # 刷新
+    # ------------------------------------------------------------------
+
+    def notify_changed(self):
+        """标准库被修改后调用，下次访问时立即重载"""
+        with self._lock:
+            self._version += 1
+
+    def _ensure_fresh(self):
+        with self._lock:
+            if (self._loaded_version == self._version
+                    and time.time() - self._last_refresh < self.refresh_interval):
+                return
+            version = self._version
+            self._load()
+            self._loaded_version = version
+            self._last_refresh = time.time()
+
+    def _load(self):
+        tables = {}
+        try:
+            conn = db_connect(self.db_path, row_factory=sqlite3.Row)
+        except sqlite3.Error as e:
+            logger.warning(f"标准术语字典加载失败: {e}")
+            conn = None
+        try:
+            for kind, (table, columns, match_alias) in STANDARD_TABLES.items():
+                rows, aliases = [], []
+                if conn is not None:
+                    try:
+                        # 按 rowid 顺序加载，与原 SQL 全表扫描时的返回顺序一致
+                        select = ", ".join(columns) + (", alias" if match_alias else "")
+                        for row in conn.execute(f"SELECT {select} FROM {table} ORDER BY rowid"):
+                            rows.append({column: row[column] for column in columns})
+                            aliases.append(row["alias"] if match_alias else None)
+                    except sqlite3.OperationalError as e:
+                        # 表尚未创建等情况，视为空表
+                        logger.warning(f"标准术语表 {table} 加载失败: {e}")
+                        rows, aliases = [], []
+                tables[kind] = _TermTable(rows, aliases)
+        finally:
+            if conn is not None:
+                conn.close()
+
+        self._tables = tables
+        self._loads += 1
+        logger.info("📖 标准术语字典已加载: " + ", ".join(f"{kind} {len(t.rows)}" for kind, t in tables.items()))
+
+    # ------------------------------------------------------------------
+    # 查询
+    # ------------------------------------------------------------------
+
+    def resolve(self, kind: str, name: str) -> Optional[Dict[str, Any]]:
+        """解析单个名称，未收录时返回 None"""
+        return self.resolve_many(kind, [name])[name]
+
+    def resolve_many(self, kind: str, names: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        一次解析一组名称：{名称: 标准库记录或 None}
+
+        疾病、处方、药材按 名称相等 或 别名包含名称 匹配（字面包含，_ 与 % 不是通配符），
+        症状只按名称匹配；返回的记录是副本，可自由修改
+        """
+        if kind not in STANDARD_TABLES:
+            raise ValueError(f"未知的标准术语类别: {kind}")
+        match_alias = STANDARD_TABLES[kind][2]
+        self._ensure_fresh()
+        with self._lock:
+            table = self._tables[kind]
+            positions = {name: table.find(name, match_alias) for name in names}
+        return {
+            name: dict(table.rows[position]) if position is not None else None
+            for name, position in positions.items()
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """字典状态"""
+        with self._lock:
+            return {
+                "terms": {kind: len(table.rows) for kind, table in self._tables.items()},
+                "cached_names": sum(len(table.resolved) for table in self._tables.values()),
+                "version": self._version,
+                "loads": self._loads,
+            }
+
+
+# 全局实例（按数据库路径）
+_terminology_instances: Dict[str, StandardTerminology] = {}
+_terminology_instances_lock = threading.Lock()
+
+
+def get_standard_terminology(db_path: str) -> StandardTerminology:
+    """获取标准术语字典单例"""
+    db_path = str(db_path)
+    with _terminology_instances_lock:
+        terminology = _terminology_instances.get(db_path)
+        if terminology is None:
+            terminology = StandardTerminology(db_path)
+            _terminology_instances[db_path] = terminology
+        return terminology
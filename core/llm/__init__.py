@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+大模型调用网关模块
+"""
+
+from .llm_gateway import (
+    DashScopeHTTPBackend,
+    DashScopeSDKBackend,
+    FakeLLMBackend,
+    LLMChunk,
+    LLMError,
+    LLMGateway,
+    LLMResult,
+    LLMTimeoutError,
+    get_llm_gateway
+)
+from .embedding_service import (
+    DashScopeEmbeddingBackend,
+    EmbeddingService,
+    EmbeddingStore,
+    HashingEmbeddingBackend,
+    get_embedding_service
+)
+
+__all__ = [
+    'DashScopeEmbeddingBackend',
+    'DashScopeHTTPBackend',
+    'DashScopeSDKBackend',
+    'EmbeddingService',
+    'EmbeddingStore',
+    'FakeLLMBackend',
+    'HashingEmbeddingBackend',
+    'LLMChunk',
+    'LLMError',
+    'LLMGateway',
+    'LLMResult',
+    'LLMTimeoutError',
+    'get_embedding_service',
+    'get_llm_gateway'
+]
@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文本向量化服务
+患者主诉高度重复（"失眠多梦"、"头痛"），同一文本不应反复调用向量化接口：
+- 两级缓存：进程内LRU + SQLite持久化（float32向量二进制存储），键为 (模型:文本类型, 标准化文本) 的哈希
+- 合批：同一事件循环中几毫秒内的并发请求去重后合并为一次批量接口调用
+- 后端可插拔：DashScope 向量接口，或本地确定性哈希向量（离线测试用）
+"""
+
+import asyncio
+import functools
+import hashlib
+import logging
+import math
+import re
+import threading
+import time
+import unicodedata
+import weakref
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from app.core.settings import AI_CONFIG, PATHS
+from core.database.connection import connect as db_connect
+
+try:
+    from dashscope import TextEmbedding
+    DASHSCOPE_AVAILABLE = True
+except ImportError:
+    DASHSCOPE_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+Vector = List[float]
+
+# 标准化时去除的空白和常见中英文标点
+_NORMALIZE_PATTERN = re.compile(r"[\s，。、；：！？,.;:!?\"'“”‘’（）()【】\[\]]+")
+
+
+def normalize_embedding_text(text: str) -> str:
+    """标准化文本：全半角统一、去除空白和标点、统一小写"""
+    return _NORMALIZE_PATTERN.sub("", unicodedata.normalize("NFKC", text or "")).lower()
+
+
+def make_embedding_key(namespace: str, text: str) -> str:
+    """生成内容寻址的缓存键；namespace 为 "模型:文本类型" """
+    combined = f"{namespace}\x1f{normalize_embedding_text(text)}"
+    return hashlib.sha256(combined.encode("utf-8")).hexdigest()
+
+
+# ============ 后端 ============
+
+class DashScopeEmbeddingBackend:
+    """DashScope 向量接口后端：同步SDK放到专用的有界线程池"""
+
+    # text-embedding-v3/v4 单次请求最多10条文本
+    max_batch_size = 10
+
+    def __init__(self, api_key: str = None, max_workers: int = 4):
+        self.api_key = api_key if api_key is not None else AI_CONFIG.get("dashscope_api_key", "")
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="embedding")
+
+    async def embed(self, model: str, texts: List[str], text_type: str) -> List[Vector]:
+        if not DASHSCOPE_AVAILABLE:
+            raise RuntimeError("dashscope 未安装")
+        call = functools.partial(
+            TextEmbedding.call, model=model, input=texts, text_type=text_type,
+            **({"api_key": self.api_key} if self.api_key else {})
+        )
+        resp = await asyncio.get_running_loop().run_in_executor(self._executor, call)
+        if resp.status_code != 200:
+            raise RuntimeError(f"DashScope Embedding API Error: {getattr(resp, 'message', 'Unknown')}")
+        embeddings = sorted(resp.output["embeddings"], key=lambda item: item.get("text_index", 0))
+        return [item["embedding"] for item in embeddings]
+
+
+class HashingEmbeddingBackend:
+    """
+    本地确定性向量：字符一元/二元组哈希到固定维度后L2归一化
+
+    相同文本总是得到相同向量，字面相近的文本余弦相似度较高；不调用任何外部接口，
+    用于离线测试与无密钥的本地开发。
+    """
+
+    max_batch_size = 64
+
+    def __init__(self, dimension: int = 256):
+        self.dimension = dimension
+        self.calls: List[List[str]] = []
+
+    def vector(self, text: str) -> Vector:
+        values = [0.0] * self.dimension
+        grams = list(text) + [text[i:i + 2] for i in range(len(text) - 1)]
+        for gram in grams:
+            digest = hashlib.md5(gram.encode("utf-8")).digest()
+            index = int.from_bytes(digest[:4], "little") % self.dimension
+            values[index] += 1.0 if digest[4] & 1 else -1.0
+        norm = math.sqrt(sum(v * v for v in values)) or 1.0
+        return [v / norm for v in values]
+
+    async def embed(self, model: str, texts: List[str], text_type: str) -> List[Vector]:
+        self.calls.append(list(texts))
+        return [self.vector(text) for text in texts]
+
+
+def _create_backend(name: str):
+    if name == "hashing":
+        return HashingEmbeddingBackend()
+    return DashScopeEmbeddingBackend()
+
+
+# ============ 持久化缓存 ============
+
+class EmbeddingStore:
+    """向量缓存：进程内LRU在前，SQLite持久层在后"""
+
+    def __init__(self, db_path: Optional[str] = None, memory_entries: int = None):
+        self.db_path = db_path or str(PATHS["cache_db"])
+        self.memory_entries = memory_entries or AI_CONFIG.get("embedding_memory_entries", 4096)
+        self._memory: "OrderedDict[str, Vector]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._init_database()
+
+    def _init_database(self):
+        conn = db_connect(self.db_path)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS embedding_cache (
+                cache_key TEXT PRIMARY KEY,
+                namespace TEXT NOT NULL,
+                dimension INTEGER NOT NULL,
+                vector BLOB NOT NULL,
+                created_at REAL NOT NULL
+            )
+        """)
+        conn.commit()
+        conn.close()
+
+    def get_memory(self, keys: Iterable[str]) -> Dict[str, Vector]:
+        """只查内存层"""
+        found = {}
+        with self._lock:
+            for key in keys:
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = vector
+        return found
+
+    def get_persistent(self, keys: Sequence[str]) -> Dict[str, Vector]:
+        """查SQLite层，命中的条目回填内存层"""
+        if not keys:
+            return {}
+        found = {}
+        conn = db_connect(self.db_path)
+        try:
+            placeholders = ",".join("?" * len(keys))
+            rows = conn.execute(
+                f"SELECT cache_key, vector FROM embedding_cache WHERE cache_key IN ({placeholders})",
+                list(keys)
+            ).fetchall()
+        finally:
+            conn.close()
+        for key, blob in rows:
+            found[key] = array("f", blob).tolist()
+        self._remember(found)
+        return found
+
+    def put(self, namespace: str, vectors: Dict[str, Vector]):
+        """写入两级缓存"""
+        if not vectors:
+            return
+        self._remember(vectors)
+        now = time.time()
+        conn = db_connect(self.db_path)
+        try:
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO embedding_cache (cache_key, namespace, dimension, vector, created_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                [(key, namespace, len(vector), array("f", vector).tobytes(), now) for key, vector in vectors.items()]
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _remember(self, vectors: Dict[str, Vector]):
+        with self._lock:
+            for key, vector in vectors.items():
+                self._memory[key] = vector
+                self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def clear_memory(self):
+        with self._lock:
+            self._memory.clear()
+
+    def memory_size(self) -> int:
+        with self._lock:
+            return len(self._memory)
+
+
+# ============ 合批 ============
+
+@dataclass
+class _PendingBatch:
+    """等待合并发送的请求：标准化键 → (原文本, 等待结果的future)"""
+    texts: Dict[str, str] = field(default_factory=dict)
+    futures: Dict[str, asyncio.Future] = field(default_factory=dict)
+    flush_handle: Optional[asyncio.TimerHandle] = None
+
+
+class EmbeddingBatcher:
+    """
+    向量化请求合批器（单个事件循环内使用）
+
+    请求先进入待发送批次，等待 window 时间或批次达到后端上限后一次性发送；
+    同一批次内相同文本只发送一次。
+    """
+
+    def __init__(self, backend, model: str, text_type: str, window_seconds: float, max_batch_size: int):
+        self.backend = backend
+        self.model = model
+        self.text_type = text_type
+        self.window_seconds = window_seconds
+        self.max_batch_size = max(1, min(max_batch_size, getattr(backend, "max_batch_size", max_batch_size)))
+        self.batches_sent = 0
+        self.texts_sent = 0
+        self._pending = _PendingBatch()
+        self._in_flight: set = set()
+
+    def submit(self, key: str, text: str) -> asyncio.Future:
+        """提交一条文本，返回其向量的future"""
+        loop = asyncio.get_running_loop()
+        pending = self._pending
+        future = pending.futures.get(key)
+        if future is not None:
+            return future
+
+        future = loop.create_future()
+        pending.texts[key] = text
+        pending.futures[key] = future
+        if len(pending.texts) >= self.max_batch_size:
+            self._flush()
+        elif pending.flush_handle is None:
+            pending.flush_handle = loop.call_later(self.window_seconds, self._flush)
+        return future
+
+    def _flush(self):
+        pending, self._pending = self._pending, _PendingBatch()
+        if pending.flush_handle is not None:
+            pending.flush_handle.cancel()
+        if pending.texts:
+            task = asyncio.ensure_future(self._send(pending))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    async def _send(self, pending: _PendingBatch):
+        keys = list(pending.texts)
+        self.batches_sent += 1
+        self.texts_sent += len(keys)
+        try:
+            vectors = await self.backend.embed(self.model, [pending.texts[key] for key in keys], self.text_type)
+            if len(vectors) != len(keys):
+                raise RuntimeError(f"向量数量不匹配: 请求{len(keys)}条，返回{len(vectors)}条")
+        except Exception as e:
+            for future in pending.futures.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for key, vector in zip(keys, vectors):
+            future = pending.futures[key]
+            if not future.done():
+                future.set_result(vector)
+
+
+# ============ 服务 ============
+
+class EmbeddingService:
+    """带两级缓存与合批的文本向量化服务"""
+
+    def __init__(
+        self,
+        backend=None,
+        model: str = None,
+        store: Optional[EmbeddingStore] = None,
+        batch_window_ms: int = None,
+        max_batch_size: int = None
+    ):
+        self.backend = backend if backend is not None else _create_backend(AI_CONFIG.get("embedding_backend", "dashscope"))
+        self.model = model or AI_CONFIG.get("embedding_model", "text-embedding-v4")
+        self.store = store if store is not None else EmbeddingStore()
+        window_ms = batch_window_ms if batch_window_ms is not None else AI_CONFIG.get("embedding_batch_window_ms", 5)
+        self.batch_window_seconds = max(0, window_ms) / 1000
+        self.max_batch_size = max_batch_size or AI_CONFIG.get("embedding_max_batch_size", 10)
+
+        self.memory_hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+        self._batchers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, EmbeddingBatcher]]" = weakref.WeakKeyDictionary()
+
+    def _batcher(self, text_type: str) -> EmbeddingBatcher:
+        loop = asyncio.get_running_loop()
+        batchers = self._batchers.setdefault(loop, {})
+        batcher = batchers.get(text_type)
+        if batcher is None:
+            batcher = batchers[text_type] = EmbeddingBatcher(
+                self.backend, self.model, text_type, self.batch_window_seconds, self.max_batch_size
+            )
+        return batcher
+
+    async def embed(self, texts: Sequence[str], text_type: str = "query") -> List[Vector]:
+        """
+        返回与 texts 一一对应的向量
+
+        先查内存LRU，再查SQLite，剩余文本经合批器调用后端并写回两级缓存。
+        后端失败时抛出异常。
+        """
+        if not texts:
+            return []
+        namespace = f"{self.model}:{text_type}"
+        keys = [make_embedding_key(namespace, text) for text in texts]
+        unique_keys = list(dict.fromkeys(keys))
+
+        found = self.store.get_memory(unique_keys)
+        memory_hits = len(found)
+        missing = [key for key in unique_keys if key not in found]
+        if missing:
+            found.update(await asyncio.to_thread(self.store.get_persistent, missing))
+        persistent_hits = len(found) - memory_hits
+
+        missing = [key for key in unique_keys if key not in found]
+        if missing:
+            text_by_key = dict(zip(keys, texts))
+            batcher = self._batcher(text_type)
+            futures = [batcher.submit(key, text_by_key[key]) for key in missing]
+            # future 由同批次的所有调用方共享：本调用被取消时不能连带取消其他调用方的结果
+            vectors = await asyncio.gather(*(asyncio.shield(future) for future in futures))
+            computed = dict(zip(missing, vectors))
+            found.update(computed)
+            await asyncio.to_thread(self.store.put, namespace, computed)
+
+        with self._stats_lock:
+            self.memory_hits += memory_hits
+            self.persistent_hits += persistent_hits
+            self.misses += len(missing)
+        return [found[key] for key in keys]
+
+    def get_stats(self) -> Dict[str, object]:
+        batchers = [b for per_loop in list(self._batchers.values()) for b in per_loop.values()]
+        with self._stats_lock:
+            lookups = self.memory_hits + self.persistent_hits + self.misses
+            return {
+                "backend": type(self.backend).__name__,
+                "model": self.model,
+                "memory_hits": self.memory_hits,
+                "persistent_hits": self.persistent_hits,
+                "misses": self.misses,
+                "hit_rate": round((lookups - self.misses) / lookups, 4) if lookups else 0.0,
+                "memory_entries": self.store.memory_size(),
+                "batches_sent": sum(b.batches_sent for b in batchers),
+                "texts_sent": sum(b.texts_sent for b in batchers)
+            }
+
+
+# 全局实例（按模型）
+_embedding_services: Dict[str, EmbeddingService] = {}
+_embedding_service_lock = threading.Lock()
+
+
+def get_embedding_service(model: str = None) -> EmbeddingService:
+    """获取全局向量化服务；向量须与既有索引同模型时由调用方显式传入 model"""
+    model = model or AI_CONFIG.get("embedding_model", "text-embedding-v4")
+    with _embedding_service_lock:
+        service = _embedding_services.get(model)
+        if service is None:
+            service = _embedding_services[model] = EmbeddingService(model=model)
+        return service
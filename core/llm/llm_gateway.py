@@ -0,0 +1,682 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+大模型调用统一网关
+所有大模型文本调用都经过 LLMGateway：
+- 后端可插拔：异步HTTP连接池（httpx）、DashScope SDK（专用有界线程池）、本地假后端（测试用）
+- 每个模型独立的并发上限，超时覆盖排队与请求两段时间
+- 相同的在途请求（模型+消息+参数一致）合并为一次上游调用，全部调用方放弃后取消上游请求
+- 流式调用逐段返回增量文本，同样受模型并发上限与超时约束
+- 按调用点统计次数、错误、超时、合并数、延迟、首字延迟与token用量
+"""
+
+import asyncio
+import functools
+import hashlib
+import json
+import logging
+import threading
+import time
+import weakref
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Iterable, List, Optional, Union
+
+from app.core.settings import AI_CONFIG
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+try:
+    from dashscope import MultiModalConversation
+    DASHSCOPE_AVAILABLE = True
+except ImportError:
+    DASHSCOPE_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+GENERATION_PATH = "/services/aigc/multimodal-generation/generation"
+DEFAULT_TIMEOUT_SECONDS = 40.0
+LATENCY_SAMPLE_SIZE = 256
+
+Messages = List[Dict[str, Any]]
+
+
+class LLMError(Exception):
+    """大模型调用失败（接口返回错误或响应无法解析）"""
+
+
+class LLMTimeoutError(LLMError, asyncio.TimeoutError):
+    """大模型调用超时（含排队时间）；同时是 asyncio.TimeoutError，兼容原有超时分支"""
+
+
+@dataclass
+class LLMResult:
+    """一次大模型调用的结果"""
+    text: str
+    model: str
+    input_tokens: int = 0
+    output_tokens: int = 0
+    latency_ms: float = 0.0
+    coalesced: bool = False  # 是否复用了其他调用方的在途请求
+
+
+@dataclass
+class LLMChunk:
+    """流式调用中后端产出的一段增量文本；用量通常只在最后一段给出"""
+    text: str
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+
+def normalize_messages(messages: Iterable[Dict[str, Any]]) -> Messages:
+    """将 {"role", "content": str} 转为多模态消息格式 {"role", "content": [{"text": ...}]}"""
+    normalized = []
+    for message in messages:
+        content = message["content"]
+        if isinstance(content, str):
+            content = [{"text": content}]
+        normalized.append({"role": message["role"], "content": content})
+    return normalized
+
+
+def _extract_text(content: Any) -> str:
+    """多模态响应的 content 可能是字符串或分段列表"""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return ""
+
+
+def _parse_concurrency_overrides(entries: Iterable[str]) -> Dict[str, int]:
+    overrides = {}
+    for entry in entries:
+        model, _, limit = entry.partition("=")
+        try:
+            overrides[model.strip()] = max(1, int(limit))
+        except ValueError:
+            logger.warning(f"忽略无效的模型并发配置: {entry}")
+    return overrides
+
+
+# ============ 后端 ============
+
+class DashScopeHTTPBackend:
+    """DashScope 多模态生成接口的异步HTTP后端，每个事件循环一个复用连接池的客户端"""
+
+    def __init__(self, base_url: str = None, max_connections: int = None):
+        if not HTTPX_AVAILABLE:
+            raise LLMError("httpx 未安装，无法使用HTTP后端")
+        self.url = (base_url or AI_CONFIG.get("llm_base_url", "https://dashscope.aliyuncs.com/api/v1")).rstrip("/") + GENERATION_PATH
+        self.max_connections = max_connections or AI_CONFIG.get("llm_max_connections", 32)
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+
+    def _client(self):
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections
+                )
+            )
+            self._clients[loop] = client
+        return client
+
+    async def generate(self, model: str, messages: Messages, parameters: Dict[str, Any],
+                       api_key: str, timeout: float) -> LLMResult:
+        if not api_key:
+            raise LLMError("DASHSCOPE_API_KEY未设置")
+        body = {"model": model, "input": {"messages": messages}, "parameters": parameters}
+        try:
+            response = await self._client().post(
+                self.url,
+                json=body,
+                headers={"Authorization": f"Bearer {api_key}"},
+                timeout=timeout
+            )
+        except httpx.TimeoutException as e:
+            raise LLMTimeoutError(f"LLM请求超时: {e}") from e
+        except httpx.HTTPError as e:
+            raise LLMError(f"LLM请求失败: {e}") from e
+
+        try:
+            data = response.json()
+        except ValueError:
+            raise LLMError(f"LLM响应无法解析 (HTTP {response.status_code})")
+        if response.status_code != 200:
+            raise LLMError(f"{data.get('code', response.status_code)}: {data.get('message', 'Unknown')}")
+
+        chunk = self._parse_chunk(data)
+        return LLMResult(
+            text=chunk.text,
+            model=model,
+            input_tokens=chunk.input_tokens,
+            output_tokens=chunk.output_tokens
+        )
+
+    async def stream(self, model: str, messages: Messages, parameters: Dict[str, Any],
+                     api_key: str, timeout: float) -> AsyncIterator[LLMChunk]:
+        """SSE流式调用，incremental_output 使每个事件只携带新增文本"""
+        if not api_key:
+            raise LLMError("DASHSCOPE_API_KEY未设置")
+        body = {
+            "model": model,
+            "input": {"messages": messages},
+            "parameters": {**parameters, "incremental_output": True}
+        }
+        headers = {"Authorization": f"Bearer {api_key}", "X-DashScope-SSE": "enable"}
+        try:
+            async with self._client().stream("POST", self.url, json=body, headers=headers, timeout=timeout) as response:
+                if response.status_code != 200:
+                    await response.aread()
+                    raise LLMError(f"LLM流式请求失败 (HTTP {response.status_code}): {response.text[:200]}")
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    try:
+                        data = json.loads(line[5:])
+                    except ValueError:
+                        continue
+                    if data.get("code"):
+                        raise LLMError(f"{data.get('code')}: {data.get('message', 'Unknown')}")
+                    yield self._parse_chunk(data)
+        except httpx.TimeoutException as e:
+            raise LLMTimeoutError(f"LLM请求超时: {e}") from e
+        except httpx.HTTPError as e:
+            raise LLMError(f"LLM请求失败: {e}") from e
+
+    @staticmethod
+    def _parse_chunk(data: Dict[str, Any]) -> LLMChunk:
+        choices = (data.get("output") or {}).get("choices") or []
+        if not choices:
+            raise LLMError("LLM响应缺少 choices")
+        usage = data.get("usage") or {}
+        return LLMChunk(
+            text=_extract_text(choices[0].get("message", {}).get("content")),
+            input_tokens=int(usage.get("input_tokens") or 0),
+            output_tokens=int(usage.get("output_tokens") or 0)
+        )
+
+    async def aclose(self):
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+
+class DashScopeSDKBackend:
+    """DashScope SDK 后端：同步SDK放到专用的有界线程池，不占用默认线程池"""
+
+    def __init__(self, max_workers: int = None):
+        self.max_workers = max_workers or AI_CONFIG.get("llm_max_connections", 32)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="llm-gateway")
+
+    async def generate(self, model: str, messages: Messages, parameters: Dict[str, Any],
+                       api_key: str, timeout: float) -> LLMResult:
+        if not DASHSCOPE_AVAILABLE:
+            raise LLMError("dashscope 未安装")
+        kwargs = dict(parameters)
+        if api_key:
+            kwargs["api_key"] = api_key
+        call = functools.partial(MultiModalConversation.call, model=model, messages=messages, **kwargs)
+        response = await asyncio.get_running_loop().run_in_executor(self._executor, call)
+
+        if response.status_code != 200 or not response.output or not response.output.choices:
+            raise LLMError(f"{getattr(response, 'code', response.status_code)}: {getattr(response, 'message', 'Unknown')}")
+        chunk = self._parse_chunk(response)
+        return LLMResult(
+            text=chunk.text,
+            model=model,
+            input_tokens=chunk.input_tokens,
+            output_tokens=chunk.output_tokens
+        )
+
+    async def stream(self, model: str, messages: Messages, parameters: Dict[str, Any],
+                     api_key: str, timeout: float) -> AsyncIterator[LLMChunk]:
+        """SDK的流式生成器在专用线程中迭代，增量结果经队列交回事件循环"""
+        if not DASHSCOPE_AVAILABLE:
+            raise LLMError("dashscope 未安装")
+        kwargs = dict(parameters, stream=True, incremental_output=True)
+        if api_key:
+            kwargs["api_key"] = api_key
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        stopped = threading.Event()
+        done = object()
+
+        def produce():
+            try:
+                for response in MultiModalConversation.call(model=model, messages=messages, **kwargs):
+                    if stopped.is_set():
+                        return
+                    loop.call_soon_threadsafe(queue.put_nowait, response)
+            except Exception as e:
+                loop.call_soon_threadsafe(queue.put_nowait, e)
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, done)
+
+        loop.run_in_executor(self._executor, produce)
+        try:
+            while True:
+                item = await queue.get()
+                if item is done:
+                    return
+                if isinstance(item, Exception):
+                    raise LLMError(str(item)) from item
+                if item.status_code != 200 or not item.output or not item.output.choices:
+                    raise LLMError(f"{getattr(item, 'code', item.status_code)}: {getattr(item, 'message', 'Unknown')}")
+                yield self._parse_chunk(item)
+        finally:
+            # 调用方提前结束时让生产线程尽快退出
+            stopped.set()
+
+    @staticmethod
+    def _parse_chunk(response) -> LLMChunk:
+        usage = getattr(response, "usage", None) or {}
+        return LLMChunk(
+            text=_extract_text(response.output.choices[0].message.content),
+            input_tokens=int(usage.get("input_tokens") or 0),
+            output_tokens=int(usage.get("output_tokens") or 0)
+        )
+
+    async def aclose(self):
+        self._executor.shutdown(wait=False)
+
+
+Responder = Callable[[str, Messages, Dict[str, Any]], Union[str, Awaitable[str]]]
+
+
+class FakeLLMBackend:
+    """本地假后端：按 responder 生成回复，记录每次上游调用，用于测试与无密钥的本地开发"""
+
+    def __init__(self, responder: Optional[Responder] = None, delay: float = 0.0, chunk_size: int = 8):
+        self.responder = responder
+        self.delay = delay
+        self.chunk_size = max(1, chunk_size)
+        self.calls: List[Dict[str, Any]] = []
+
+    async def _respond(self, model: str, messages: Messages, parameters: Dict[str, Any]) -> str:
+        self.calls.append({"model": model, "messages": messages, "parameters": parameters})
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.responder is not None:
+            text = self.responder(model, messages, parameters)
+            if asyncio.iscoroutine(text):
+                text = await text
+            return text
+        return _extract_text(messages[-1]["content"]) if messages else ""
+
+    async def generate(self, model: str, messages: Messages, parameters: Dict[str, Any],
+                       api_key: str, timeout: float) -> LLMResult:
+        text = await self._respond(model, messages, parameters)
+        prompt_length = sum(len(_extract_text(m["content"])) for m in messages)
+        return LLMResult(text=text, model=model, input_tokens=prompt_length, output_tokens=len(text))
+
+    async def stream(self, model: str, messages: Messages, parameters: Dict[str, Any],
+                     api_key: str, timeout: float) -> AsyncIterator[LLMChunk]:
+        """按 chunk_size 切分回复逐段产出，用量放在最后一段"""
+        text = await self._respond(model, messages, parameters)
+        pieces = [text[i:i + self.chunk_size] for i in range(0, len(text), self.chunk_size)] or [""]
+        prompt_length = sum(len(_extract_text(m["content"])) for m in messages)
+        for index, piece in enumerate(pieces):
+            if index == len(pieces) - 1:
+                yield LLMChunk(text=piece, input_tokens=prompt_length, output_tokens=len(text))
+            else:
+                yield LLMChunk(text=piece)
+                await asyncio.sleep(0)
+
+    async def aclose(self):
+        pass
+
+
+def _create_backend(name: str):
+    """按配置创建后端；auto 优先HTTP连接池，缺少 httpx 时退回SDK"""
+    if name == "fake":
+        return FakeLLMBackend()
+    if name == "sdk" or (name == "auto" and not HTTPX_AVAILABLE):
+        return DashScopeSDKBackend()
+    return DashScopeHTTPBackend()
+
+
+# ============ 网关 ============
+
+class _CallSiteMetrics:
+    """单个调用点的累计指标"""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.coalesced = 0
+        self.streams = 0
+        self.first_tokens = 0
+        self.total_first_token_ms = 0.0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.total_latency_ms = 0.0
+        self.max_latency_ms = 0.0
+        self.latencies: Deque[float] = deque(maxlen=LATENCY_SAMPLE_SIZE)
+
+    def snapshot(self) -> Dict[str, Any]:
+        ordered = sorted(self.latencies)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] if ordered else 0.0
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "coalesced": self.coalesced,
+            "streams": self.streams,
+            "avg_first_token_ms": round(self.total_first_token_ms / self.first_tokens, 2) if self.first_tokens else 0.0,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "avg_latency_ms": round(self.total_latency_ms / self.calls, 2) if self.calls else 0.0,
+            "p95_latency_ms": round(p95, 2),
+            "max_latency_ms": round(self.max_latency_ms, 2)
+        }
+
+
+class _LoopState:
+    """事件循环内的并发控制状态：信号量与在途请求只能在所属事件循环中使用"""
+
+    def __init__(self):
+        self.semaphores: Dict[str, asyncio.Semaphore] = {}
+        self.in_flight: Dict[str, asyncio.Task] = {}
+        # 在途请求 -> 仍在等待它的调用方数量
+        self.waiters: Dict[asyncio.Task, int] = {}
+
+
+class LLMGateway:
+    """大模型调用统一网关"""
+
+    def __init__(
+        self,
+        backend=None,
+        default_model: str = None,
+        default_timeout: float = None,
+        model_concurrency: int = None,
+        concurrency_overrides: Dict[str, int] = None,
+        api_key: str = None
+    ):
+        self._backend = backend if backend is not None else _create_backend(AI_CONFIG.get("llm_backend", "auto"))
+        self.default_model = default_model or AI_CONFIG.get("main_model", "qwen3.6-plus")
+        self.default_timeout = float(default_timeout or AI_CONFIG.get("model_timeout") or DEFAULT_TIMEOUT_SECONDS)
+        self.model_concurrency = max(1, model_concurrency or AI_CONFIG.get("llm_model_concurrency", 8))
+        self.concurrency_overrides = dict(
+            concurrency_overrides if concurrency_overrides is not None
+            else _parse_concurrency_overrides(AI_CONFIG.get("llm_model_concurrency_overrides", []))
+        )
+        self.api_key = api_key if api_key is not None else AI_CONFIG.get("dashscope_api_key", "")
+
+        self._lock = threading.Lock()
+        self._loop_states: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState]" = weakref.WeakKeyDictionary()
+        self._metrics: Dict[str, _CallSiteMetrics] = {}
+
+    # ---------- 后端切换 ----------
+
+    @property
+    def backend(self):
+        return self._backend
+
+    def set_backend(self, backend):
+        """替换后端（例如本地开发使用 FakeLLMBackend）"""
+        self._backend = backend
+
+    @contextmanager
+    def use_backend(self, backend):
+        """临时替换后端，退出时恢复"""
+        previous = self._backend
+        self._backend = backend
+        try:
+            yield backend
+        finally:
+            self._backend = previous
+
+    # ---------- 调用 ----------
+
+    def concurrency_limit(self, model: str) -> int:
+        return self.concurrency_overrides.get(model, self.model_concurrency)
+
+    def _loop_state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            state = self._loop_states.get(loop)
+            if state is None:
+                state = self._loop_states[loop] = _LoopState()
+            return state
+
+    @staticmethod
+    def _flight_key(model: str, messages: Messages, parameters: Dict[str, Any], api_key: str) -> str:
+        payload = json.dumps([model, messages, parameters, api_key], ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def complete(
+        self,
+        messages: Iterable[Dict[str, Any]],
+        *,
+        model: str = None,
+        call_site: str = "default",
+        timeout: float = None,
+        api_key: str = None,
+        **parameters
+    ) -> LLMResult:
+        """
+        调用大模型并返回 LLMResult
+
+        messages 的 content 可以是字符串或多模态分段列表；其余关键字参数（temperature、
+        enable_thinking 等）原样作为模型参数传给后端。超时包含排队等待并发名额的时间，
+        超时抛出 LLMTimeoutError，其他失败抛出 LLMError。
+        """
+        model = model or self.default_model
+        timeout = float(timeout or self.default_timeout)
+        api_key = api_key or self.api_key
+        payload = normalize_messages(messages)
+        state = self._loop_state()
+        key = self._flight_key(model, payload, parameters, api_key)
+
+        started = time.perf_counter()
+        task = state.in_flight.get(key)
+        coalesced = task is not None
+        if task is None:
+            task = asyncio.ensure_future(
+                self._invoke(state, model, payload, parameters, api_key, timeout)
+            )
+            state.in_flight[key] = task
+            task.add_done_callback(functools.partial(self._finish_flight, state, key))
+
+        state.waiters[task] = state.waiters.get(task, 0) + 1
+        try:
+            # shield：某个调用方被取消（如客户端断开）不影响共享同一请求的其他调用方；
+            # 最后一个调用方放弃（取消或超时）时才取消上游请求，释放并发名额
+            result = await asyncio.wait_for(asyncio.shield(task), timeout)
+        except asyncio.TimeoutError as e:
+            self._record(call_site, started, coalesced=coalesced, timed_out=True)
+            if isinstance(e, LLMTimeoutError):
+                raise
+            raise LLMTimeoutError(f"LLM调用超时 ({timeout:g}秒)") from e
+        except LLMError:
+            self._record(call_site, started, coalesced=coalesced, failed=True)
+            raise
+        except Exception as e:
+            self._record(call_site, started, coalesced=coalesced, failed=True)
+            raise LLMError(str(e)) from e
+        finally:
+            self._release_waiter(state, task)
+
+        latency_ms = self._record(call_site, started, coalesced=coalesced, result=None if coalesced else result)
+        return replace(result, latency_ms=latency_ms, coalesced=coalesced)
+
+    async def complete_text(self, messages: Iterable[Dict[str, Any]], **kwargs) -> str:
+        """complete 的便捷形式，只返回文本"""
+        return (await self.complete(messages, **kwargs)).text
+
+    async def stream(
+        self,
+        messages: Iterable[Dict[str, Any]],
+        *,
+        model: str = None,
+        call_site: str = "default",
+        timeout: float = None,
+        api_key: str = None,
+        **parameters
+    ) -> AsyncIterator[str]:
+        """
+        流式调用大模型，逐段产出增量文本
+
+        与 complete 共用模型并发名额；timeout 覆盖排队到最后一段的全部时间。
+        流式调用不做在途合并，每个调用方独占一次上游请求。
+        """
+        model = model or self.default_model
+        timeout = float(timeout or self.default_timeout)
+        api_key = api_key or self.api_key
+        payload = normalize_messages(messages)
+        semaphore = self._semaphore(self._loop_state(), model)
+
+        started = time.perf_counter()
+        deadline = time.monotonic() + timeout
+        first_token_ms = None
+        usage = LLMResult(text="", model=model)
+        chunks = None
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout)
+            try:
+                chunks = self._backend.stream(model, payload, parameters, api_key, timeout)
+                while True:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise asyncio.TimeoutError()
+                    try:
+                        chunk = await asyncio.wait_for(chunks.__anext__(), remaining)
+                    except StopAsyncIteration:
+                        break
+                    usage.input_tokens = chunk.input_tokens or usage.input_tokens
+                    usage.output_tokens = chunk.output_tokens or usage.output_tokens
+                    if chunk.text:
+                        if first_token_ms is None:
+                            first_token_ms = (time.perf_counter() - started) * 1000
+                        yield chunk.text
+            finally:
+                semaphore.release()
+                if chunks is not None:
+                    await chunks.aclose()
+        except asyncio.TimeoutError as e:
+            self._record(call_site, started, timed_out=True, streamed=True, first_token_ms=first_token_ms)
+            if isinstance(e, LLMTimeoutError):
+                raise
+            raise LLMTimeoutError(f"LLM流式调用超时 ({timeout:g}秒)") from e
+        except LLMError:
+            self._record(call_site, started, failed=True, streamed=True, first_token_ms=first_token_ms)
+            raise
+        except Exception as e:
+            self._record(call_site, started, failed=True, streamed=True, first_token_ms=first_token_ms)
+            raise LLMError(str(e)) from e
+
+        self._record(call_site, started, result=usage, streamed=True, first_token_ms=first_token_ms)
+
+    def _semaphore(self, state: _LoopState, model: str) -> asyncio.Semaphore:
+        semaphore = state.semaphores.get(model)
+        if semaphore is None:
+            semaphore = state.semaphores[model] = asyncio.Semaphore(self.concurrency_limit(model))
+        return semaphore
+
+    async def _invoke(self, state: _LoopState, model: str, messages: Messages,
+                      parameters: Dict[str, Any], api_key: str, timeout: float) -> LLMResult:
+        """占用模型并发名额后调用后端；整体受 timeout 约束，超时会真正取消上游请求"""
+        semaphore = self._semaphore(state, model)
+        deadline = time.monotonic() + timeout
+
+        async def run():
+            async with semaphore:
+                remaining = max(0.001, deadline - time.monotonic())
+                return await self._backend.generate(model, messages, parameters, api_key, remaining)
+
+        return await asyncio.wait_for(run(), timeout)
+
+    @staticmethod
+    def _release_waiter(state: _LoopState, task: asyncio.Task):
+        remaining = state.waiters.get(task, 1) - 1
+        if remaining > 0:
+            state.waiters[task] = remaining
+            return
+        state.waiters.pop(task, None)
+        if not task.done():
+            task.cancel()
+
+    @staticmethod
+    def _finish_flight(state: _LoopState, key: str, task: asyncio.Task):
+        if state.in_flight.get(key) is task:
+            del state.in_flight[key]
+        # 所有调用方都已放弃时，避免 "exception was never retrieved" 告警
+        if not task.cancelled():
+            task.exception()
+
+    # ---------- 指标 ----------
+
+    def _record(self, call_site: str, started: float, coalesced: bool = False, timed_out: bool = False,
+                failed: bool = False, result: Optional[LLMResult] = None, streamed: bool = False,
+                first_token_ms: Optional[float] = None) -> float:
+        """记录一次调用（合并的调用不重复计token），返回该调用方的耗时"""
+        latency_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            metrics = self._metrics.get(call_site)
+            if metrics is None:
+                metrics = self._metrics[call_site] = _CallSiteMetrics()
+            metrics.calls += 1
+            metrics.total_latency_ms += latency_ms
+            metrics.max_latency_ms = max(metrics.max_latency_ms, latency_ms)
+            metrics.latencies.append(latency_ms)
+            if coalesced:
+                metrics.coalesced += 1
+            if streamed:
+                metrics.streams += 1
+            if first_token_ms is not None:
+                metrics.first_tokens += 1
+                metrics.total_first_token_ms += first_token_ms
+            if timed_out:
+                metrics.timeouts += 1
+            elif failed:
+                metrics.errors += 1
+            if result is not None:
+                metrics.input_tokens += result.input_tokens
+                metrics.output_tokens += result.output_tokens
+        return latency_ms
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """按调用点汇总的调用指标"""
+        with self._lock:
+            call_sites = {name: metrics.snapshot() for name, metrics in sorted(self._metrics.items())}
+        return {
+            "backend": type(self._backend).__name__,
+            "default_model": self.default_model,
+            "model_concurrency": self.model_concurrency,
+            "concurrency_overrides": dict(self.concurrency_overrides),
+            "call_sites": call_sites
+        }
+
+    def reset_metrics(self):
+        with self._lock:
+            self._metrics.clear()
+
+    async def aclose(self):
+        """关闭当前事件循环上的后端连接"""
+        await self._backend.aclose()
+
+
+_llm_gateway: Optional[LLMGateway] = None
+_llm_gateway_lock = threading.Lock()
+
+
+def get_llm_gateway() -> LLMGateway:
+    """获取全局大模型网关"""
+    global _llm_gateway
+    if _llm_gateway is None:
+        with _llm_gateway_lock:
+            if _llm_gateway is None:
+                _llm_gateway = LLMGateway()
+    return _llm_gateway
@@ -16,14 +16,7 @@ from typing import Dict, List, Any, Optional
 from dataclasses import dataclass, asdict
 from datetime import datetime
 from app.core.settings import AI_CONFIG
-
-try:
-    from dashscope import Generation
-    import dashscope
-    DASHSCOPE_AVAILABLE = True
-except ImportError:
-    DASHSCOPE_AVAILABLE = False
-    logging.warning("dashscope not available, AI features will be limited")
+from core.llm import LLMError, get_llm_gateway
 
 logger = logging.getLogger(__name__)
 
@@ -61,13 +54,12 @@ class AIMindMapGenerator:
     def __init__(self):
         """初始化生成器"""
         self.api_key = AI_CONFIG.get("dashscope_api_key", "")
-        if self.api_key and DASHSCOPE_AVAILABLE:
-            dashscope.api_key = self.api_key
+        if self.api_key:
             logger.info("✅ AI思维导图生成器初始化成功")
         else:
-            logger.warning("⚠️ DASHSCOPE_API_KEY未设置或dashscope不可用")
+            logger.warning("⚠️ DASHSCOPE_API_KEY未设置")
 
-    def generate_mindmap(
+    async def generate_mindmap(
         self,
         topic: str,
         description: str,
@@ -97,8 +89,8 @@ class AIMindMapGenerator:
             )
 
             # 调用AI生成
-            if self.api_key and DASHSCOPE_AVAILABLE:
-                ai_response = self._call_qwen_api(prompt)
+            if self.api_key:
+                ai_response = await self._call_qwen_api(prompt)
                 nodes_data = self._parse_ai_response(ai_response)
             else:
                 # 降级方案：使用模板生成
@@ -173,30 +165,25 @@ class AIMindMapGenerator:
 
         return prompt
 
-    def _call_qwen_api(self, prompt: str) -> str:
-        """调用千问API"""
+    async def _call_qwen_api(self, prompt: str) -> str:
+        """调用千问API（经由统一大模型网关）"""
         try:
-            from dashscope import MultiModalConversation
-            response = MultiModalConversation.call(
-                model=AI_CONFIG.get('main_model', 'qwen3.5-omni-plus-2026-03-15'),
-                messages=[
-                    {'role': 'system', 'content': [{'text': '你是一个专业的思维导图生成助手，擅长将复杂主题结构化为清晰的层级关系。'}]},
-                    {'role': 'user', 'content': [{'text': prompt}]}
+            content = await get_llm_gateway().complete_text(
+                [
+                    {'role': 'system', 'content': '你是一个专业的思维导图生成助手，擅长将复杂主题结构化为清晰的层级关系。'},
+                    {'role': 'user', 'content': prompt}
                 ],
+                model=AI_CONFIG.get('main_model', 'qwen3.5-omni-plus-2026-03-15'),
+                api_key=self.api_key,
+                call_site="mindmap.generate",
                 temperature=0.7
             )
+            logger.info(f"✅ AI响应成功，长度: {len(content)}")
+            return content
 
-            if response.status_code == 200:
-                content = response.output.choices[0].message.content[0]["text"]
-                logger.info(f"✅ AI响应成功，长度: {len(content)}")
-                return content
-            else:
-                logger.error(f"❌ AI调用失败: {response.message}")
-                raise Exception(f"AI API调用失败: {response.message}")
-
-        except Exception as e:
-            logger.error(f"❌ 调用千问API异常: {str(e)}")
-            raise
+        except LLMError as e:
+            logger.error(f"❌ AI调用失败: {str(e)}")
+            raise Exception(f"AI API调用失败: {str(e)}")
 
     def _parse_ai_response(self, ai_response: str) -> List[Dict[str, Any]]:
         """解析AI响应的JSON数据"""
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+处方药材提取引擎（Aho–Corasick 多模式匹配）
+
+药材提取原先有四套实现：PrescriptionParser._extract_herbs、
+IntegratedPrescriptionParser._extract_herbs_from_line、
+IntelligentPrescriptionAnalyzer._extract_chinese_herbs 以及 api/main.py 的
+extract_herbs_from_prescription / extract_herbs_from_table，
+每一套都对每行文本依次尝试多条正则，再拿候选名去药名集合里校验。
+
+本模块用药材注册表中的全部已知药名、别名与炮制品名（见 herb_registry）构建一个自动机，
+每行只扫描一遍得到药名位置，随后在药名结尾处锚定匹配剂量与单位：
+
+    桔梗（净）10(克)*7帖   ->  HerbMention(name="桔梗", dosage="10", unit="克")
+    若咽痛加射干 9g        ->  HerbMention(name="射干", dosage="9", unit="g")
+
+词表之外的药名（如 羚羊角粉）仍可识别：紧挨在“数字+重量单位”前面的2~8个汉字视为未登记药名，
+canonical 为 None，由各解析器按自己的规则决定是否接受。
+"""
+
+import re
+import threading
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Tuple
+
+from core.prescription.herb_registry import get_herb_registry
+from core.text_matching import AhoCorasickAutomaton
+
+# 药名与剂量之间允许出现的内容：空白、冒号、表格竖线、XML标签、短括注（（净）、(饮片)、(先煎)）
+_GAP = re.compile(r'(?:[\s:：|]|<[^<>\d]{1,8}>|[（(][^（()）\d]{0,6}[）)])*')
+
+_NUMBER = r'\d+(?:\.\d+)?(?:\s*[-~～]\s*\d+(?:\.\d+)?)?'
+_CHINESE_NUMBER = r'[一二三四五六七八九十百半]+'
+_UNIT = r'g|G|克|钱|两|斤|毫升|ml|mL|ML|片|枚|个|粒|丸|支|颗'
+
+# 剂量：数字（可为范围）或中文数字，单位可写成 10(克) 的形式
+_DOSE = re.compile(
+    rf'(?P<number>{_NUMBER})\s*(?:[（(](?P<bracket_unit>克|g)[）)]|(?P<unit>{_UNIT}))?'
+    rf'|(?P<chinese>{_CHINESE_NUMBER})\s*(?P<chinese_unit>{_UNIT})'
+)
+
+# 未登记药名：2~8个汉字 + 间隔 + 带重量单位的数字剂量
+_UNKNOWN = re.compile(
+    rf'(?P<name>[一-鿿]{{2,8}})(?P<gap>{_GAP.pattern})'
+    rf'(?P<number>{_NUMBER})\s*(?:[（(](?P<bracket_unit>克|g)[）)]|(?P<unit>g|G|克|钱|两))'
+)
+
+# 行内没有任何数字（含中文数字）时不可能出现带剂量的药材
+_ANY_NUMBER = re.compile(r'[\d一二三四五六七八九十百半]')
+
+# 带重量单位的数字剂量；全部已被已知药名占用时无需再找未登记药名
+_WEIGHT_DOSE = re.compile(rf'(?:{_NUMBER})\s*(?:[（(](?:克|g)[）)]|g|G|克|钱|两)')
+
+WEIGHT_UNITS = frozenset({"g", "G", "克", "钱", "两", "斤"})
+
+_CHINESE_DIGITS = {'一': 1, '二': 2, '三': 3, '四': 4, '五': 5, '六': 6, '七': 7, '八': 8, '九': 9}
+
+
+def chinese_number_to_float(text: str) -> Optional[float]:
+    """中文数字（一百以内及“半”）转为数值，无法解析时返回 None"""
+    if text == "半":
+        return 0.5
+    if not text or any(c not in _CHINESE_DIGITS and c not in "十百" for c in text):
+        return None
+    if "百" in text:
+        head, _, rest = text.partition("百")
+        hundreds = _CHINESE_DIGITS.get(head, 1 if not head else 0) * 100
+        return float(hundreds + (chinese_number_to_float(rest.lstrip("零")) or 0)) if hundreds else None
+    if "十" in text:
+        head, _, tail = text.partition("十")
+        tens = _CHINESE_DIGITS.get(head, 0) if head else 1
+        units = _CHINESE_DIGITS.get(tail, 0) if tail else 0
+        return float(tens * 10 + units)
+    return float(_CHINESE_DIGITS[text]) if len(text) == 1 else None
+
+
+@dataclass
+class HerbMention:
+    """文本中的一次药材出现"""
+    name: str                   # 原文写法（含炮制前缀）
+    canonical: Optional[str]    # 标准药名；词表之外的药名为 None
+    dosage: Optional[str]       # 原文剂量（"10"、"15-30"、"三"），没有剂量时为 None
+    unit: Optional[str]         # 原文单位（"g"、"克"、"片"…）
+    start: int                  # 药名在行内的起止位置
+    end: int
+    gap: str                    # 药名与剂量之间的内容（如 "（净）"、" "）
+    line: str
+    line_number: int
+
+    @property
+    def is_known(self) -> bool:
+        return self.canonical is not None
+
+    @property
+    def has_arabic_dosage(self) -> bool:
+        return bool(self.dosage) and self.dosage[0].isdigit()
+
+    def dosage_value(self) -> Optional[float]:
+        """剂量数值；范围取下限"""
+        if not self.dosage:
+            return None
+        if self.has_arabic_dosage:
+            return float(re.split(r'\s*[-~～]\s*', self.dosage)[0])
+        return chinese_number_to_float(self.dosage)
+
+
+class HerbExtractor:
+    """基于自动机的药材提取器，实例只读，可跨线程共享"""
+
+    def __init__(self, registry=None):
+        registry = registry or get_herb_registry()
+        self.registry = registry
+        self._automaton = AhoCorasickAutomaton()
+        for name in registry.known_names:
+            self._automaton.add(name, name)
+        for variant, canonical in registry.variant_names.items():
+            self._automaton.add(variant, canonical)
+        self._automaton.build()
+
+    def find_names(self, text: str) -> List[Tuple[int, int, str, str]]:
+        """文本中的已知药名（最长不重叠匹配）：[(start, end, 原文写法, 标准药名)]"""
+        return self._automaton.find_longest(text)
+
+    def _dose_after(self, line: str, position: int):
+        gap = _GAP.match(line, position)
+        dose = _DOSE.match(line, gap.end())
+        if dose is None:
+            return gap, None
+        return gap, dose
+
+    def mentions_in_line(self, line: str, line_number: int = 1,
+                         require_dosage: bool = False) -> List[HerbMention]:
+        """单行内的全部药材出现，按位置排序；require_dosage 时只返回带剂量的出现"""
+        if require_dosage and not _ANY_NUMBER.search(line):
+            return []
+        mentions: List[HerbMention] = []
+        consumed: List[Tuple[int, int]] = []
+
+        for start, end, name, canonical in self.find_names(line):
+            gap, dose = self._dose_after(line, end)
+            if dose is None and require_dosage:
+                continue
+            dosage = unit = None
+            if dose is not None:
+                if dose.group("number"):
+                    dosage = dose.group("number")
+                    unit = dose.group("bracket_unit") or dose.group("unit")
+                else:
+                    dosage, unit = dose.group("chinese"), dose.group("chinese_unit")
+                consumed.append((dose.start(), dose.end()))
+            mentions.append(HerbMention(
+                name=name, canonical=canonical, dosage=dosage, unit=unit, start=start, end=end,
+                gap=line[end:gap.end()] if dosage else "", line=line, line_number=line_number
+            ))
+
+        # 词表之外的药名：剂量未被已知药名占用时，取其前面紧挨的汉字串
+        consumed_starts = {start for start, _ in consumed}
+        if all(dose.start() in consumed_starts for dose in _WEIGHT_DOSE.finditer(line)):
+            mentions.sort(key=lambda m: m.start)
+            return mentions
+        for match in _UNKNOWN.finditer(line):
+            number_start = match.start("number")
+            if any(start <= number_start < end for start, end in consumed):
+                continue
+            start, end = match.span("name")
+            # 去掉被该药名覆盖的无剂量已知药名（如 羚羊角粉 中的 羚羊角）
+            mentions = [m for m in mentions if m.dosage or not (start <= m.start and m.end <= end)]
+            mentions.append(HerbMention(
+                name=match.group("name"), canonical=None, dosage=match.group("number"),
+                unit=match.group("bracket_unit") or match.group("unit"), start=start, end=end,
+                gap=match.group("gap"), line=line, line_number=line_number
+            ))
+
+        mentions.sort(key=lambda m: m.start)
+        return mentions
+
+    def iter_mentions(self, text: str, require_dosage: bool = False) -> Iterator[HerbMention]:
+        """逐行扫描整段文本"""
+        for line_number, line in enumerate(text.split('\n'), 1):
+            if line.strip():
+                yield from self.mentions_in_line(line, line_number, require_dosage)
+
+    def scan(self, text: str, require_dosage: bool = False) -> List[HerbMention]:
+        return list(self.iter_mentions(text, require_dosage))
+
+
+_extractor: Optional[HerbExtractor] = None
+_extractor_lock = threading.Lock()
+
+
+def get_herb_extractor() -> HerbExtractor:
+    """获取进程内共享的药材提取器"""
+    global _extractor
+    if _extractor is None:
+        with _extractor_lock:
+            if _extractor is None:
+                _extractor = HerbExtractor()
+    return _extractor
+
+
+# ----------------------------------------------------------------------
+# api/main.py 使用的 (药名, 剂量) 提取
+# ----------------------------------------------------------------------
+
+_SKIP_LINE_PATTERNS = re.compile(r'^【.*】$|^\*\*.*\*\*$|^##.*$|用法|煎服|制法|功效|注意|服法', re.IGNORECASE)
+_NON_HERB_WORDS = frozenset({'用法', '注意', '功效', '制法'})
+_TABLE_INDICATORS = ('药物', '剂量', '|', '---')
+_TABLE_SKIP_WORDS = ('药物', '---', '功效')
+_TABLE_NON_HERB_WORDS = frozenset({'药物', '剂量', '功效', '说明'})
+
+
+def extract_herb_dosage_pairs(prescription_text: str) -> List[Tuple[str, str]]:
+    """从处方文本中提取 (药名, 剂量) - 支持表格格式"""
+    table_herbs = extract_table_herb_dosage_pairs(prescription_text)
+    if table_herbs:
+        return table_herbs
+
+    herbs: List[Tuple[str, str]] = []
+    for line in prescription_text.split('\n'):
+        line = line.strip()
+        # 跳过明显的标题行和用法行
+        if not line or _SKIP_LINE_PATTERNS.search(line):
+            continue
+        for mention in get_herb_extractor().mentions_in_line(line, require_dosage=True):
+            if not mention.has_arabic_dosage or mention.unit not in ("g", "G", "克"):
+                continue
+            pair = (mention.name, mention.dosage)
+            if len(mention.name) >= 2 and mention.name not in _NON_HERB_WORDS and pair not in herbs:
+                herbs.append(pair)
+    return herbs
+
+
+def extract_table_herb_dosage_pairs(text: str) -> List[Tuple[str, str]]:
+    """从markdown表格中提取 (药名, 剂量)"""
+    if not any(indicator in text for indicator in _TABLE_INDICATORS):
+        return []
+
+    herbs: List[Tuple[str, str]] = []
+    for line in text.split('\n'):
+        line = line.strip()
+        # 只处理表格数据行，跳过表头和分隔线
+        if '|' not in line or any(word in line for word in _TABLE_SKIP_WORDS):
+            continue
+        for mention in get_herb_extractor().mentions_in_line(line, require_dosage=True):
+            # 表格中剂量必须与药名处在相邻单元格
+            if not mention.has_arabic_dosage or '|' not in mention.gap or mention.unit not in (None, "g"):
+                continue
+            pair = (mention.name, mention.dosage)
+            if len(mention.name) >= 2 and mention.name not in _TABLE_NON_HERB_WORDS and pair not in herbs:
+                herbs.append(pair)
+    return herbs
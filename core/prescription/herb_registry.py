@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+中药材知识注册表（进程内唯一、只读）
+
+药材数据原先分散在三处：TCMFormulaAnalyzer._load_herb_database 中约8000行的字面量字典
+（每次 TCMFormulaAnalyzer() 都重新构建一遍）、ChineseMedicineDatabase 派生写出的
+/opt/tcm/unified_herb_database.json、以及各解析器自带的药名集合。
+本模块以 data/unified_herb_database.json 为唯一数据源，每个进程只加载一次：
+
+- 每味药材为 __slots__ 的不可变记录，功效/角色/常用剂量均为元组
+- COMMON_HERB_NAMES 收录数据库之外的常用药名，只参与识别（known_names），没有记录
+- 别名索引（生地→生地黄 等）与炮制品索引（炙/制/酒/盐/炒… + 药名 → 药名）在加载时预先展开，
+  查询均为一次字典访问
+- formula_view / unified_view 以只读映射提供旧的两种字典格式，兼容原有 .get(name, {}) 用法
+
+用法：
+    registry = get_herb_registry()
+    record = registry.lookup("炙甘草")   # -> 甘草 的记录
+"""
+
+import json
+import logging
+import threading
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Callable, Dict, FrozenSet, Iterable, Iterator, Optional, Tuple
+
+from config.settings import PATHS
+
+logger = logging.getLogger(__name__)
+
+# 炮制前缀：炮制品在数据库中没有单独条目时，归到去掉前缀后的药材
+PROCESSING_PREFIXES = ("炙", "制", "酒", "盐", "炒", "蜜", "醋", "姜", "生", "熟", "煅", "焦")
+
+# 处方中常见的简称/别名；目标药材不在数据库中的条目加载时忽略
+HERB_ALIASES = {
+    "生地": "生地黄",
+    "熟地": "熟地黄",
+    "银花": "金银花",
+    "双花": "金银花",
+    "枸杞": "枸杞子",
+    "川断": "续断",
+    "苏叶": "紫苏叶",
+    "云苓": "茯苓",
+    "首乌": "何首乌",
+    "元胡": "延胡索",
+    "玄胡": "延胡索",
+    "枣仁": "酸枣仁",
+    "薏米": "薏苡仁",
+    "苡仁": "薏苡仁",
+    "杭芍": "白芍",
+    "公英": "蒲公英",
+    "二花": "金银花",
+    "法半夏": "半夏",
+    "清半夏": "半夏",
+    "红枣": "大枣",
+    "桂圆": "龙眼肉",
+    "苦杏仁": "杏仁",
+}
+
+# 数据库之外的常用药名（无性味功效记录，只用于识别）
+COMMON_HERB_NAMES = frozenset({
+    # OCR实测识别的药材
+    "扯根菜", "甜叶菊", "罗汉果", "胖大海", "木蝴蝶", "天葵子", "粳米", "茯神", "乌梅", "车前草",
+
+    # 解表药
+    "麻黄", "桂枝", "紫苏叶", "防风", "荆芥", "薄荷", "牛蒡子", "蝉蜕", "桑叶", "菊花",
+    "柴胡", "升麻", "葛根", "白芷", "辛夷", "苍耳子", "藿香", "佩兰", "香薷",
+    
+    # 清热药
+    "石膏", "知母", "天花粉", "芦根", "竹叶", "栀子", "黄芩", "黄连", "黄柏", "龙胆草",
+    "苦参", "白鲜皮", "金银花", "连翘", "板蓝根", "大青叶", "蒲公英", "紫花地丁",
+    "鱼腥草", "白头翁", "马齿苋", "射干", "山豆根", "马勃", "青黛", "大黄", "芒硝",
+    "番泻叶", "芦荟", "牡丹皮", "赤芍", "紫草", "玄参", "生地黄", "牛黄", "羚羊角",
+    
+    # 泻下药
+    "大黄", "芒硝", "番泻叶", "芦荟", "火麻仁", "郁李仁", "松子仁", "甘遂", "京大戟",
+    "芫花", "商陆", "牵牛子", "巴豆",
+    
+    # 祛风湿药
+    "独活", "羌活", "防己", "木瓜", "蚕沙", "伸筋草", "路路通", "桑寄生", "五加皮",
+    "威灵仙", "秦艽", "防风", "豨莶草", "络石藤", "雷公藤", "青风藤", "海风藤",
+    
+    # 化湿药
+    "苍术", "厚朴", "广藿香", "佩兰", "白豆蔻", "砂仁", "草豆蔻", "草果",
+    
+    # 利水渗湿药
+    "茯苓", "猪苓", "泽泻", "薏苡仁", "车前子", "滑石", "通草", "木通", "瞿麦",
+    "萹蓄", "地肤子", "海金沙", "石韦", "萆薢", "茵陈", "金钱草", "虎杖",
+    
+    # 温里药
+    "附子", "肉桂", "干姜", "吴茱萸", "细辛", "丁香", "小茴香", "八角茴香", "花椒",
+    "荜茇", "高良姜", "胡椒", "白胡椒",
+    
+    # 理气药
+    "陈皮", "青皮", "枳实", "枳壳", "木香", "沉香", "檀香", "川楝子", "乌药",
+    "荔枝核", "香附", "佛手", "香橼", "玫瑰花", "绿萼梅", "薤白", "大腹皮",
+    "刀豆", "柿蒂", "甘松", "九香虫",
+    
+    # 消食药
+    "山楂", "神曲", "麦芽", "谷芽", "莱菔子", "鸡内金", "隔山撬", "阿魏",
+    
+    # 驱虫药
+    "使君子", "苦楝皮", "槟榔", "南瓜子", "鹤草芽", "雷丸", "榧子",
+    
+    # 止血药
+    "大蓟", "小蓟", "地榆", "白茅根", "槐花", "侧柏叶", "白及", "仙鹤草",
+    "茜草", "蒲黄", "五灵脂", "花蕊石", "降香", "血余炭", "棕榈炭", "藕节",
+    "艾叶", "灶心土",
+    
+    # 活血化瘀药
+    "川芎", "延胡索", "郁金", "姜黄", "乳香", "没药", "五灵脂", "蒲黄", "红花",
+    "桃仁", "益母草", "泽兰", "丹参", "虎杖", "鸡血藤", "牛膝", "川牛膝",
+    "王不留行", "穿山甲", "水蛭", "虻虫", "土鳖虫", "马钱子", "自然铜",
+    "苏木", "月季花", "凌霄花", "刘寄奴", "骨碎补", "血竭", "儿茶", "三七",
+    
+    # 化痰止咳平喘药
+    "半夏", "陈皮", "茯苓", "甘草", "桔梗", "川贝母", "浙贝母", "瓜蒌", "竹茹",
+    "竹沥", "天竺黄", "前胡", "白前", "桑白皮", "葶苈子", "杏仁", "紫菀", "款冬花",
+    "百部", "紫苏子", "白芥子", "莱菔子", "海藻", "昆布", "海蛤壳", "瓦楞子",
+    "海浮石", "浮海石", "礞石", "白附子", "天南星", "禹白附", "山慈菇", "半边莲",
+    "白花蛇舌草", "猫爪草",
+    
+    # 安神药
+    "朱砂", "磁石", "龙骨", "牡蛎", "琥珀", "酸枣仁", "柏子仁", "远志", "合欢皮",
+    "夜交藤", "灵芝", "珍珠", "珍珠母",
+    
+    # 平肝息风药
+    "石决明", "珍珠母", "牡蛎", "代赭石", "刺蒺藜", "罗布麻叶", "天麻", "钩藤",
+    "地龙", "全蝎", "蜈蚣", "白僵蚕", "羚羊角", "牛黄",
+    
+    # 开窍药
+    "麝香", "冰片", "樟脑", "苏合香", "石菖蒲", "远志",
+    
+    # 补虚药
+    # 补气药
+    "人参", "西洋参", "党参", "太子参", "黄芪", "白术", "山药", "扁豆", "甘草",
+    "大枣", "刺五加", "绞股蓝", "红景天", "沙棘",
+    
+    # 补阳药
+    "鹿茸", "紫河车", "冬虫夏草", "蛤蚧", "核桃仁", "韭菜子", "菟丝子", "淫羊藿",
+    "仙茅", "巴戟天", "肉苁蓉", "锁阳", "补骨脂", "益智仁", "覆盆子", "五味子",
+    "沙苑子", "海马", "海龙", "杜仲", "续断", "狗脊", "鹿角胶", "鹿角霜",
+    
+    # 补血药
+    "当归", "熟地黄", "白芍", "阿胶", "何首乌", "龙眼肉", "桑椹", "黑芝麻",
+    
+    # 补阴药
+    "北沙参", "南沙参", "百合", "麦冬", "天冬", "石斛", "玉竹", "黄精", "枸杞子",
+    "墨旱莲", "女贞子", "桑椹", "黑芝麻", "龟板", "鳖甲", "牡蛎",
+    
+    # 收涩药
+    "五味子", "乌梅", "五倍子", "罂粟壳", "肉豆蔻", "赤石脂", "禹余粮", "桑螵蛸",
+    "海螵蛸", "莲子", "芡实", "山茱萸", "覆盆子", "金樱子", "椿皮", "石榴皮",
+    "诃子", "肉桂", "鸡内金",
+    
+    # 涌吐药
+    "常山", "瓜蒂", "胆矾", "藜芦",
+    
+    # 杀虫燥湿止痒药
+    "硫黄", "雄黄", "白矾", "蛇床子", "土荆皮", "花椒", "蜂房", "鹤虱",
+    
+    # 拔毒消肿敛疮药
+    "升药", "轻粉", "红粉", "铅丹", "炉甘石",
+})
+
+
+class HerbRecord:
+    """单味药材（不可变）"""
+
+    __slots__ = ("name", "category", "nature", "meridian", "functions", "typical_roles", "typical_dosage")
+
+    def __init__(self, name: str, category: str, nature: str, meridian: str,
+                 functions: Tuple[str, ...], typical_roles: Tuple[str, ...],
+                 typical_dosage: Tuple[float, ...]):
+        for slot, value in zip(self.__slots__, (name, category, nature, meridian,
+                                                functions, typical_roles, typical_dosage)):
+            object.__setattr__(self, slot, value)
+
+    def __setattr__(self, key, value):
+        raise AttributeError("HerbRecord is immutable")
+
+    def __repr__(self) -> str:
+        return f"HerbRecord({self.name!r}, {self.category!r})"
+
+    @classmethod
+    def from_dict(cls, name: str, data: Dict) -> "HerbRecord":
+        return cls(
+            name=name,
+            category=data.get("category", "其他"),
+            nature=data.get("nature", "未知"),
+            meridian=data.get("meridian", "未知"),
+            functions=tuple(data.get("functions", ())),
+            typical_roles=tuple(data.get("typical_roles", ())),
+            typical_dosage=tuple(data.get("typical_dosage", (6, 12))),
+        )
+
+    def to_unified_dict(self) -> Dict:
+        """unified_herb_database.json 的条目格式（ChineseMedicineDatabase 使用）"""
+        return {
+            "category": self.category,
+            "nature": self.nature,
+            "meridian": self.meridian,
+            "functions": list(self.functions),
+            "typical_roles": list(self.typical_roles),
+            "typical_dosage": list(self.typical_dosage),
+        }
+
+    def to_formula_dict(self) -> Dict:
+        """君臣佐使分析使用的条目格式（性味归经放在 properties 下）"""
+        return {
+            "properties": {"性味": self.nature, "归经": self.meridian},
+            "functions": list(self.functions),
+            "typical_roles": list(self.typical_roles),
+            "typical_dosage": list(self.typical_dosage),
+            "category": self.category,
+        }
+
+
+class HerbDictView(Mapping):
+    """以旧字典格式只读访问注册表；每次取值返回新字典，调用方修改不会影响共享数据"""
+
+    def __init__(self, records: Mapping, convert: Callable[[HerbRecord], Dict]):
+        self._records = records
+        self._convert = convert
+
+    def __getitem__(self, name: str) -> Dict:
+        return self._convert(self._records[name])
+
+    def __contains__(self, name) -> bool:
+        return name in self._records
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._records)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+
+class HerbRegistry:
+    """只读药材注册表"""
+
+    def __init__(self, records: Dict[str, HerbRecord], aliases: Optional[Dict[str, str]] = None,
+                 extra_names: Iterable[str] = ()):
+        self._records = MappingProxyType(dict(records))
+        self._names = frozenset(self._records)
+        self._known_names = self._names | frozenset(extra_names)
+
+        # 变体名 -> 标准名：显式别名优先，其次为“炮制前缀 + 药名/别名”
+        variants: Dict[str, str] = {}
+        for alias, target in (aliases or {}).items():
+            if target in self._known_names and alias not in self._known_names:
+                variants[alias] = target
+        for prefix in PROCESSING_PREFIXES:
+            for base in self._known_names:
+                processed = prefix + base
+                if processed not in self._known_names:
+                    variants.setdefault(processed, base)
+            for alias, target in list(variants.items()):
+                if alias[0] not in PROCESSING_PREFIXES:
+                    variants.setdefault(prefix + alias, target)
+        self._variants = MappingProxyType(variants)
+
+        self.formula_view = HerbDictView(self._records, HerbRecord.to_formula_dict)
+        self.unified_view = HerbDictView(self._records, HerbRecord.to_unified_dict)
+
+    @classmethod
+    def from_json(cls, path, aliases: Optional[Dict[str, str]] = None) -> "HerbRegistry":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        records = {name: HerbRecord.from_dict(name, entry) for name, entry in data.items()}
+        return cls(records, HERB_ALIASES if aliases is None else aliases, COMMON_HERB_NAMES)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, name) -> bool:
+        return name in self._records
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._records)
+
+    @property
+    def names(self) -> FrozenSet[str]:
+        """数据库中的标准药名"""
+        return self._names
+
+    @property
+    def known_names(self) -> FrozenSet[str]:
+        """可识别的标准药名：数据库药名与 COMMON_HERB_NAMES 的并集"""
+        return self._known_names
+
+    @property
+    def variant_names(self) -> Mapping:
+        """别名与炮制品名 -> 标准药名"""
+        return self._variants
+
+    def get(self, name: str) -> Optional[HerbRecord]:
+        """按标准药名精确查找"""
+        return self._records.get(name)
+
+    def resolve(self, name: str) -> Optional[str]:
+        """把药名（可含别名、炮制前缀）解析为标准药名，无法识别时返回 None"""
+        if not name:
+            return None
+        name = name.strip()
+        if name in self._known_names:
+            return name
+        return self._variants.get(name)
+
+    def lookup(self, name: str) -> Optional[HerbRecord]:
+        """按任意写法查找药材记录"""
+        canonical = self.resolve(name)
+        if not canonical:
+            return None
+        record = self._records.get(canonical)
+        if record is None and canonical[0] in PROCESSING_PREFIXES:
+            # 常用药名表中的炮制品（如 生甘草）没有单独记录，取原药材记录
+            return self._records.get(self.resolve(canonical[1:]) or "")
+        return record
+
+    def processing_prefix(self, name: str) -> Optional[str]:
+        """炮制品名的炮制前缀（如 炙甘草 -> 炙），非炮制品返回 None"""
+        target = self._variants.get(name) if name else None
+        if target and name[0] in PROCESSING_PREFIXES and self.resolve(name[1:]) == target:
+            return name[0]
+        return None
+
+
+_registry: Optional[HerbRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_herb_registry() -> HerbRegistry:
+    """获取进程内共享的药材注册表（首次调用时加载）"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = HerbRegistry.from_json(PATHS["herb_database"])
+                logger.info(f"药材注册表已加载: {len(_registry)}种药材, {len(_registry.variant_names)}个别名/炮制品名")
+    return _registry
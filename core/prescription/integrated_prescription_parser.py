@@ -19,6 +19,9 @@ except ImportError:
     fuzzy_extractor_available = False
     print("警告: 模糊药材提取器不可用")
 
+from core.prescription.herb_extraction import get_herb_extractor
+from core.prescription.herb_registry import get_herb_registry
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -44,20 +47,10 @@ class IntegratedPrescriptionParser:
             self.fuzzy_extractor = None
             logger.warning("模糊药材提取器不可用")
         
-        # 扩展的中药名称库
-        self.known_herbs = {
-            # OCR实测识别的药材
-            "桔梗", "荆芥", "百部", "甘草", "陈皮", "百合", "茯苓", "浙贝母", 
-            "蝉蜕", "炒莱菔子", "炒紫苏子", "姜半夏", "扯根菜", "甜叶菊",
-            
-            # 常用中药补充
-            "当归", "白芍", "川芎", "熟地", "人参", "黄芪", "白术", "党参",
-            "麦冬", "五味子", "枸杞子", "菊花", "金银花", "连翘", "黄芩", 
-            "黄连", "黄柏", "板蓝根", "大青叶", "蒲公英", "车前草", "半夏",
-            "生姜", "大枣", "桂枝", "柴胡", "麻黄", "杏仁", "石膏", "芍药",
-            "丹参", "三七", "天麻", "决明子", "罗汉果", "胖大海", "山药",
-            "枸杞", "红枣", "桂圆", "莲子", "百合", "银耳", "薏米", "红豆"
-        }
+        # 中药名称库：共享药材注册表中的全部已知药名（含原OCR实测药材）
+        self.registry = get_herb_registry()
+        self.known_herbs = self.registry.known_names
+        self.extractor = get_herb_extractor()
         
         # 文档类型检测关键词
         self.billing_keywords = {
@@ -238,9 +231,9 @@ class IntegratedPrescriptionParser:
             return None
         
         # 检查是否是已知药材
-        for herb in self.known_herbs:
-            if herb in line_clean:
-                return herb
+        names = self.extractor.find_names(line_clean)
+        if names:
+            return names[0][2]
         
         # 使用模糊匹配
         if self.fuzzy_extractor:
@@ -329,66 +322,48 @@ class IntegratedPrescriptionParser:
         return herbs
     
     def _extract_herbs_from_line(self, line: str, line_num: int) -> List[ExtractedHerb]:
-        """从单行提取药材"""
+        """从单行提取药材（共享药材提取引擎，单遍扫描）"""
         
         results = []
         
-        # 针对OCR费用单格式的精确模式
-        patterns = [
-            {
-                "name": "ocr_billing_format",
-                "pattern": r'^([^\s\(（]+)（净）\([^)]*\)\s*(\d+(?:\.\d+)?)\([克g]\)\*\d+帖\s+[\d.]+$',
-                "priority": 1.0
-            },
-            {
-                "name": "ocr_simple_format", 
-                "pattern": r'([^\s\(（]+)（净）.*?(\d+(?:\.\d+)?)[克g]',
-                "priority": 0.9
-            },
-            {
-                "name": "standard_prescription",
-                "pattern": r'([一-龯\u4e00-\u9fff]{2,6})\s+(\d+(?:\.\d+)?)\s*[克g]',
-                "priority": 0.8
-            },
-            {
-                "name": "loose_match",
-                "pattern": r'([一-龯\u4e00-\u9fff]{2,6})[^一-龯\u4e00-\u9fff]*?(\d+(?:\.\d+)?)',
-                "priority": 0.6
-            }
-        ]
-        
-        for pattern_info in patterns:
-            matches = re.findall(pattern_info["pattern"], line)
+        for mention in self.extractor.mentions_in_line(line, line_num, require_dosage=True):
+            if not mention.has_arabic_dosage:
+                continue
+            herb_name = mention.name
             
-            for match in matches:
-                if len(match) >= 2:
-                    herb_name = match[0].strip()
-                    dosage_str = match[1].strip()
-                    
-                    # 验证药材有效性
-                    if self._is_valid_herb(herb_name, line):
-                        try:
-                            dosage = float(dosage_str)
-                            if 0.5 <= dosage <= 100:  # 合理剂量范围
-                                confidence = self._calculate_confidence(
-                                    herb_name, dosage, line, pattern_info["priority"]
-                                )
-                                
-                                if confidence >= 0.3:
-                                    results.append(ExtractedHerb(
-                                        name=herb_name,
-                                        dosage=dosage,
-                                        unit="g",
-                                        confidence=confidence,
-                                        source_line=line,
-                                        line_number=line_num,
-                                        extraction_method=pattern_info["name"]
-                                    ))
-                        except ValueError:
-                            continue
+            # 验证药材有效性
+            if not self._is_valid_herb(herb_name, line):
+                continue
+            
+            dosage = mention.dosage_value()
+            if not 0.5 <= dosage <= 100:  # 合理剂量范围
+                continue
+            
+            method, priority = self._classify_line_format(mention)
+            confidence = self._calculate_confidence(herb_name, dosage, line, priority)
+            if confidence >= 0.3:
+                results.append(ExtractedHerb(
+                    name=herb_name,
+                    dosage=dosage,
+                    unit="g",
+                    confidence=confidence,
+                    source_line=line,
+                    line_number=line_num,
+                    extraction_method=method
+                ))
         
         return results
     
+    def _classify_line_format(self, mention) -> Tuple[str, float]:
+        """按药名与剂量之间的写法区分格式，返回 (格式名, 优先级)"""
+        if "（净）" in mention.gap:
+            if mention.unit == "克" and "帖" in mention.line:
+                return "ocr_billing_format", 1.0
+            return "ocr_simple_format", 0.9
+        if mention.unit in ("克", "g") and mention.gap.strip() == "" and mention.gap:
+            return "standard_prescription", 0.8
+        return "loose_match", 0.6
+    
     def _is_valid_herb(self, name: str, context: str) -> bool:
         """验证是否为有效药材名称"""
         
@@ -400,8 +375,8 @@ class IntegratedPrescriptionParser:
         if not all('\u4e00' <= c <= '\u9fff' for c in name):
             return False
         
-        # 在已知药材库中
-        if name in self.known_herbs:
+        # 在已知药材库中（含别名与炮制品名）
+        if self.registry.resolve(name):
             return True
         
         # 检查去炮制后的名称
@@ -421,7 +396,7 @@ class IntegratedPrescriptionParser:
             confidence += 0.4
         else:
             clean_name = re.sub(r'^[生熟炙蒸炒制醋酒盐蜜]+', '', name)
-            if clean_name in self.known_herbs:
+            if clean_name in self.known_herbs or self.registry.resolve(name):
                 confidence += 0.3
         
         # 剂量合理性
@@ -6,10 +6,14 @@
 
 import re
 import json
-from typing import Dict, List, Tuple, Optional, Any, Set
+from collections import ChainMap
+from typing import Dict, List, Mapping, Tuple, Optional, Any, Set
 from dataclasses import dataclass
 import logging
 
+from core.prescription.herb_extraction import get_herb_extractor
+from core.prescription.herb_registry import get_herb_registry
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -56,56 +60,17 @@ class ChineseMedicineDatabase:
             "六君子汤": ["人参", "白术", "茯苓", "甘草", "陈皮", "半夏"]
         }
         
-    def _load_unified_herb_database(self) -> Dict:
-        """加载统一的中药数据库"""
-        import json
-        import os
-        
-        # 首先尝试加载统一数据库文件
-        unified_db_path = "/opt/tcm/unified_herb_database.json"
-        if os.path.exists(unified_db_path):
-            try:
-                with open(unified_db_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception as e:
-                logger.warning(f"加载统一数据库失败: {e}")
-        
-        # 如果文件不存在，从tcm_formula_analyzer中动态加载
+    def _load_unified_herb_database(self) -> Mapping:
+        """
+        加载统一的中药数据库
+
+        底层为进程内共享的只读药材注册表；外层 ChainMap 承接本实例的补充条目
+        （见 IntelligentPrescriptionAnalyzer._extend_herb_database），写入不会影响注册表。
+        """
         try:
-            import sys
-            sys.path.append('/home/ute/tcm-ai')
-            from core.prescription.tcm_formula_analyzer import TCMFormulaAnalyzer
-            
-            analyzer = TCMFormulaAnalyzer()
-            herb_db = analyzer.herb_database
-            
-            # 转换格式以保持兼容性
-            unified_db = {}
-            for herb_name, herb_info in herb_db.items():
-                properties = herb_info.get('properties', {})
-                nature = properties.get('性味', '未知')
-                meridian = properties.get('归经', '未知')
-                functions = herb_info.get('functions', [])
-                category = herb_info.get('category', '其他')
-                
-                unified_db[herb_name] = {
-                    'category': category,
-                    'nature': nature,
-                    'meridian': meridian, 
-                    'functions': functions,
-                    'typical_roles': herb_info.get('typical_roles', []),
-                    'typical_dosage': herb_info.get('typical_dosage', [6, 12])
-                }
-            
-            # 保存统一数据库文件供下次使用
-            with open(unified_db_path, 'w', encoding='utf-8') as f:
-                json.dump(unified_db, f, ensure_ascii=False, indent=2)
-            
-            logger.info(f"成功加载并保存统一药材数据库: {len(unified_db)}种药材")
-            return unified_db
-            
+            return ChainMap({}, get_herb_registry().unified_view)
         except Exception as e:
-            logger.error(f"动态加载药材数据库失败: {e}")
+            logger.error(f"加载药材注册表失败: {e}")
             # 返回基础数据库作为后备
             return self._get_fallback_database()
     
@@ -127,6 +92,15 @@ class ChineseMedicineDatabase:
 class IntelligentPrescriptionAnalyzer:
     """智能处方分析器 - 基于中医临床思维"""
     
+    # 明显不是药材的词汇（煎服说明、加减说明中的字样）
+    NON_HERB_BLACKLIST = (
+        "小火煎煮", "大火煮沸", "后下", "先煎", "包煎", "另煎", "冲服",
+        "可加", "若", "如", "若见", "若有", "可用", "煎制", "服用",
+        "浸泡", "煎煮", "药材", "所有", "清水", "分钟", "时间", "方法",
+        "若痰多", "若咽痛", "若怕冷", "若烦躁", "明显", "黏稠", "不安",
+        "先用", "煮沸后", "最后", "即在"
+    )
+    
     def __init__(self):
         self.herb_db = ChineseMedicineDatabase()
         
@@ -177,80 +151,43 @@ class IntelligentPrescriptionAnalyzer:
             }
     
     def _extract_chinese_herbs(self, text: str) -> List[ChineseHerb]:
-        """提取中药信息"""
+        """提取中药信息（共享药材提取引擎，每行单遍扫描）"""
         herbs = []
-        lines = text.split('\n')
+        extractor = get_herb_extractor()
         
-        for line in lines:
+        for line_number, line in enumerate(text.split('\n'), 1):
             line = line.strip()
             if not line or len(line) < 3:
                 continue
             
-            # 多种中药识别模式（修复版 - 移除危险的宽松模式）
-            patterns = [
-                # 模式1: 药名（规格）剂量*帖数 价格
-                r'([一-龯]{2,8})(?:\（[^）]*\）)?\s*(?:\([^)]*\))?\s*(\d+(?:\.\d+)?)\s*(?:\([克g]\))?\s*(?:\*\s*\d+[帖剂]?)?',
-                # 模式2: 标准格式 药名 剂量单位
-                r'([一-龯]{2,8})\s+(\d+(?:\.\d+)?)\s*([克g钱两])',
-                # 模式3: 简单格式
-                r'([一-龯]{2,8})\s*[:：]\s*(\d+(?:\.\d+)?)',
-                # 模式4: 中文数字格式
-                r'([一-龯]{2,8})\s*([一二三四五六七八九十百]+)\s*[克钱两g]',
-                # 模式5: 表格格式
-                r'([一-龯]{2,8})\s*(?:\（[^）]*\）)?\s+(\d+(?:\.\d+)?)\s*g\s+\d+帖',
-                # 模式6: 带序号格式
-                r'\d+\.\s*([一-龯]{2,8})\s*(?:\([^)]*\))?\s*(\d+(?:\.\d+)?)\s*g',
-                # 模式7: 逗号分隔格式
-                r'([一-龯]{2,8})\s*(\d+(?:\.\d+)?)\s*g\s*[,，]',
-                # 模式8: 安全的克重匹配（必须有克/g标识）
-                r'([一-龯]{2,8})\s*(?:\（[^）]*\）)?\s*(\d+(?:\.\d+)?)\s*[克g]',
-                # 🚨 已删除模式9：危险的宽松匹配 - 会把"小火煎煮 20"当成药材
-            ]
-            
-            for pattern in patterns:
-                matches = re.findall(pattern, line)
-                for match in matches:
-                    if len(match) >= 2:
-                        herb_name = match[0].strip()
-                        dosage_str = match[1].strip()
-                        
-                        # 🚨 关键修复：黑名单过滤，排除明显不是药材的词汇
-                        non_herb_blacklist = [
-                            "小火煎煮", "大火煮沸", "后下", "先煎", "包煎", "另煎", "冲服", 
-                            "可加", "若", "如", "若见", "若有", "可用", "煎制", "服用",
-                            "浸泡", "煎煮", "药材", "所有", "清水", "分钟", "时间", "方法",
-                            "若痰多", "若咽痛", "若怕冷", "若烦躁", "明显", "黏稠", "不安",
-                            "先用", "煮沸后", "最后", "即在"
-                        ]
-                        
-                        # 如果是黑名单词汇，跳过
-                        if any(blacklisted in herb_name for blacklisted in non_herb_blacklist):
-                            continue
-                        
-                        # 验证是否为中药
-                        confidence = self._calculate_herb_recognition_confidence(herb_name, line, dosage_str)
-                        
-                        if confidence > 0.2:  # 基础筛选（降低阈值）
-                            try:
-                                # 处理中文数字转换
-                                if re.match(r'[一二三四五六七八九十百]+', dosage_str):
-                                    dosage = self._chinese_number_to_float(dosage_str)
-                                else:
-                                    dosage = float(dosage_str)
-                                
-                                herb = ChineseHerb(
-                                    name=herb_name,
-                                    dosage=dosage,
-                                    unit="g",
-                                    raw_text=line,
-                                    category=self._get_herb_category(herb_name),
-                                    properties=self._get_herb_properties(herb_name),
-                                    functions=self._get_herb_functions(herb_name),
-                                    confidence=confidence
-                                )
-                                herbs.append(herb)
-                            except (ValueError, TypeError):
-                                continue
+            for mention in extractor.mentions_in_line(line, line_number, require_dosage=True):
+                herb_name = mention.name
+                
+                # 🚨 关键修复：黑名单过滤，排除明显不是药材的词汇
+                if any(blacklisted in herb_name for blacklisted in self.NON_HERB_BLACKLIST):
+                    continue
+                
+                if mention.has_arabic_dosage:
+                    # 范围剂量（如 15-30）取下限
+                    dosage_str = re.split(r'\s*[-~～]\s*', mention.dosage)[0]
+                    dosage = float(dosage_str)
+                else:
+                    dosage_str = mention.dosage
+                    dosage = self._chinese_number_to_float(dosage_str)
+                
+                # 验证是否为中药
+                confidence = self._calculate_herb_recognition_confidence(herb_name, line, dosage_str)
+                if confidence > 0.2:  # 基础筛选（降低阈值）
+                    herbs.append(ChineseHerb(
+                        name=herb_name,
+                        dosage=dosage,
+                        unit="g",
+                        raw_text=line,
+                        category=self._get_herb_category(herb_name),
+                        properties=self._get_herb_properties(herb_name),
+                        functions=self._get_herb_functions(herb_name),
+                        confidence=confidence
+                    ))
         
         return self._deduplicate_and_rank_herbs(herbs)
     
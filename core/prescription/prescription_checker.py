@@ -6,12 +6,23 @@
 
 import re
 import json
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Dict, List, Tuple, Optional, Any, Sequence
 from dataclasses import dataclass, asdict
 from datetime import datetime
 import sqlite3
 from pathlib import Path
 
+from core.prescription.herb_extraction import get_herb_extractor
+from core.prescription.herb_registry import get_herb_registry
+from core.prescription.safety_rules import (
+    INCOMPATIBILITY_RULES,
+    POPULATION_CONTRAINDICATIONS,
+    TOXIC_HERBS,
+    SafetyReport,
+    ToxicFinding,
+    get_safety_rule_index
+)
+
 @dataclass
 class Herb:
     """中药信息结构"""
@@ -37,111 +48,14 @@ class PrescriptionParser:
     """处方解析引擎"""
     
     def __init__(self):
-        # 中药名称词典 - 常用500种中药
-        self.herb_names = {
-            # 解表药
-            "麻黄", "桂枝", "紫苏叶", "防风", "荆芥", "薄荷", "牛蒡子", "蝉蜕", "桑叶", "菊花",
-            "柴胡", "升麻", "葛根", "白芷", "辛夷", "苍耳子", "藿香", "佩兰", "香薷",
-            
-            # 清热药
-            "石膏", "知母", "天花粉", "芦根", "竹叶", "栀子", "黄芩", "黄连", "黄柏", "龙胆草",
-            "苦参", "白鲜皮", "金银花", "连翘", "板蓝根", "大青叶", "蒲公英", "紫花地丁",
-            "鱼腥草", "白头翁", "马齿苋", "射干", "山豆根", "马勃", "青黛", "大黄", "芒硝",
-            "番泻叶", "芦荟", "牡丹皮", "赤芍", "紫草", "玄参", "生地黄", "牛黄", "羚羊角",
-            
-            # 泻下药
-            "大黄", "芒硝", "番泻叶", "芦荟", "火麻仁", "郁李仁", "松子仁", "甘遂", "京大戟",
-            "芫花", "商陆", "牵牛子", "巴豆",
-            
-            # 祛风湿药
-            "独活", "羌活", "防己", "木瓜", "蚕沙", "伸筋草", "路路通", "桑寄生", "五加皮",
-            "威灵仙", "秦艽", "防风", "豨莶草", "络石藤", "雷公藤", "青风藤", "海风藤",
-            
-            # 化湿药
-            "苍术", "厚朴", "广藿香", "佩兰", "白豆蔻", "砂仁", "草豆蔻", "草果",
-            
-            # 利水渗湿药
-            "茯苓", "猪苓", "泽泻", "薏苡仁", "车前子", "滑石", "通草", "木通", "瞿麦",
-            "萹蓄", "地肤子", "海金沙", "石韦", "萆薢", "茵陈", "金钱草", "虎杖",
-            
-            # 温里药
-            "附子", "肉桂", "干姜", "吴茱萸", "细辛", "丁香", "小茴香", "八角茴香", "花椒",
-            "荜茇", "高良姜", "胡椒", "白胡椒",
-            
-            # 理气药
-            "陈皮", "青皮", "枳实", "枳壳", "木香", "沉香", "檀香", "川楝子", "乌药",
-            "荔枝核", "香附", "佛手", "香橼", "玫瑰花", "绿萼梅", "薤白", "大腹皮",
-            "刀豆", "柿蒂", "甘松", "九香虫",
-            
-            # 消食药
-            "山楂", "神曲", "麦芽", "谷芽", "莱菔子", "鸡内金", "隔山撬", "阿魏",
-            
-            # 驱虫药
-            "使君子", "苦楝皮", "槟榔", "南瓜子", "鹤草芽", "雷丸", "榧子",
-            
-            # 止血药
-            "大蓟", "小蓟", "地榆", "白茅根", "槐花", "侧柏叶", "白及", "仙鹤草",
-            "茜草", "蒲黄", "五灵脂", "花蕊石", "降香", "血余炭", "棕榈炭", "藕节",
-            "艾叶", "灶心土",
-            
-            # 活血化瘀药
-            "川芎", "延胡索", "郁金", "姜黄", "乳香", "没药", "五灵脂", "蒲黄", "红花",
-            "桃仁", "益母草", "泽兰", "丹参", "虎杖", "鸡血藤", "牛膝", "川牛膝",
-            "王不留行", "穿山甲", "水蛭", "虻虫", "土鳖虫", "马钱子", "自然铜",
-            "苏木", "月季花", "凌霄花", "刘寄奴", "骨碎补", "血竭", "儿茶", "三七",
-            
-            # 化痰止咳平喘药
-            "半夏", "陈皮", "茯苓", "甘草", "桔梗", "川贝母", "浙贝母", "瓜蒌", "竹茹",
-            "竹沥", "天竺黄", "前胡", "白前", "桑白皮", "葶苈子", "杏仁", "紫菀", "款冬花",
-            "百部", "紫苏子", "白芥子", "莱菔子", "海藻", "昆布", "海蛤壳", "瓦楞子",
-            "海浮石", "浮海石", "礞石", "白附子", "天南星", "禹白附", "山慈菇", "半边莲",
-            "白花蛇舌草", "猫爪草",
-            
-            # 安神药
-            "朱砂", "磁石", "龙骨", "牡蛎", "琥珀", "酸枣仁", "柏子仁", "远志", "合欢皮",
-            "夜交藤", "灵芝", "珍珠", "珍珠母",
-            
-            # 平肝息风药
-            "石决明", "珍珠母", "牡蛎", "代赭石", "刺蒺藜", "罗布麻叶", "天麻", "钩藤",
-            "地龙", "全蝎", "蜈蚣", "白僵蚕", "羚羊角", "牛黄",
-            
-            # 开窍药
-            "麝香", "冰片", "樟脑", "苏合香", "石菖蒲", "远志",
-            
-            # 补虚药
-            # 补气药
-            "人参", "西洋参", "党参", "太子参", "黄芪", "白术", "山药", "扁豆", "甘草",
-            "大枣", "刺五加", "绞股蓝", "红景天", "沙棘",
-            
-            # 补阳药
-            "鹿茸", "紫河车", "冬虫夏草", "蛤蚧", "核桃仁", "韭菜子", "菟丝子", "淫羊藿",
-            "仙茅", "巴戟天", "肉苁蓉", "锁阳", "补骨脂", "益智仁", "覆盆子", "五味子",
-            "沙苑子", "海马", "海龙", "杜仲", "续断", "狗脊", "鹿角胶", "鹿角霜",
-            
-            # 补血药
-            "当归", "熟地黄", "白芍", "阿胶", "何首乌", "龙眼肉", "桑椹", "黑芝麻",
-            
-            # 补阴药
-            "北沙参", "南沙参", "百合", "麦冬", "天冬", "石斛", "玉竹", "黄精", "枸杞子",
-            "墨旱莲", "女贞子", "桑椹", "黑芝麻", "龟板", "鳖甲", "牡蛎",
-            
-            # 收涩药
-            "五味子", "乌梅", "五倍子", "罂粟壳", "肉豆蔻", "赤石脂", "禹余粮", "桑螵蛸",
-            "海螵蛸", "莲子", "芡实", "山茱萸", "覆盆子", "金樱子", "椿皮", "石榴皮",
-            "诃子", "肉桂", "鸡内金",
-            
-            # 涌吐药
-            "常山", "瓜蒂", "胆矾", "藜芦",
-            
-            # 杀虫燥湿止痒药
-            "硫黄", "雄黄", "白矾", "蛇床子", "土荆皮", "花椒", "蜂房", "鹤虱",
-            
-            # 拔毒消肿敛疮药
-            "升药", "轻粉", "红粉", "铅丹", "炉甘石",
-        }
+        # 中药名称词典：注册表中的全部已知药名（模块级只读集合，各实例共享）
+        self.herb_names = get_herb_registry().known_names
         
         # 单位标准化
         self.dosage_units = ["g", "克", "钱", "两", "斤", "ml", "毫升", "片", "粒", "丸"]
+        # 药物行可接受的单位（与原正则 [a-zA-Z克钱两斤毫升]+ 一致）
+        self._dosage_unit_set = frozenset({"g", "G", "ml", "mL", "ML", "克", "钱", "两", "斤", "毫升"})
+        self._resolved_names: Dict[str, Optional[Tuple[str, Optional[str]]]] = {}
         
         # 剂型和煎服方法
         self.preparation_methods = [
@@ -198,57 +112,52 @@ class PrescriptionParser:
         return text.strip()
     
     def _extract_herbs(self, text: str) -> List[Herb]:
-        """提取药物列表"""
+        """提取药物列表（共享药材提取引擎，单遍扫描）"""
         herbs = []
         seen_herbs = set()  # 用于去重
         
-        # 多种处方格式匹配模式
-        patterns = [
-            # 格式1: 药名 剂量单位 (如: 麻黄 10g, 桂枝15g)
-            r'([^\s\d,，\n]+)\s*(\d+(?:\.\d+)?(?:-\d+(?:\.\d+)?)?)\s*([a-zA-Z克钱两斤毫升]+)',
-            # 格式2: 药名(炮制) 剂量单位 (如: 生地黄(蒸) 12g)
-            r'([^\s\d,，\n]+(?:\([^)]+\))?)\s*(\d+(?:\.\d+)?(?:-\d+(?:\.\d+)?)?)\s*([a-zA-Z克钱两斤毫升]+)',
-            # 格式3: XML格式中的药物
-            r'<药物>([^<]+)</药物>.*?<剂量>([^<]+)</剂量>',
-        ]
-        
-        # 按行分割文本，避免跨行匹配
-        lines = text.split('\n')
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
+        for mention in get_herb_extractor().iter_mentions(text, require_dosage=True):
+            # 需要阿拉伯数字剂量和剂量单位
+            if not mention.has_arabic_dosage or mention.unit not in self._dosage_unit_set:
                 continue
-                
-            for pattern in patterns:
-                matches = re.findall(pattern, line)
-                for match in matches:
-                    if len(match) >= 3:
-                        name = match[0].strip()
-                        dosage = match[1].strip()
-                        unit = match[2].strip()
-                        
-                        # 验证是否为已知中药
-                        herb_base_name = self._get_herb_base_name(name)
-                        if herb_base_name in self.herb_names or self._is_valid_herb_name(name):
-                            # 检查是否有炮制方法
-                            preparation = self._extract_preparation_from_name(name)
-                            clean_name = self._clean_herb_name(name)
-                            
-                            # 去重：如果同一药物已存在，跳过
-                            herb_key = f"{clean_name}_{dosage}_{unit}"
-                            if herb_key not in seen_herbs:
-                                seen_herbs.add(herb_key)
-                                herbs.append(Herb(
-                                    name=clean_name,
-                                    dosage=dosage,
-                                    unit=self._normalize_unit(unit),
-                                    preparation=preparation
-                                ))
-                break  # 找到匹配后跳出pattern循环，避免重复匹配
+            
+            # 药名后的半角括注（如 石膏(先煎)）按原格式并入药名，作为炮制/煎法信息
+            name = mention.name
+            if '(' in mention.gap:
+                name += ''.join(re.findall(r'\([^)]*\)', mention.gap))
+            resolved = self._resolve_herb_name(name)
+            if resolved is None:
+                continue
+            clean_name, preparation = resolved
+            
+            # 去重：如果同一药物已存在，跳过
+            dosage = mention.dosage.replace(' ', '')
+            herb_key = f"{clean_name}_{dosage}_{mention.unit}"
+            if herb_key not in seen_herbs:
+                seen_herbs.add(herb_key)
+                herbs.append(Herb(
+                    name=clean_name,
+                    dosage=dosage,
+                    unit=self._normalize_unit(mention.unit),
+                    preparation=preparation
+                ))
         
         return herbs
     
+    def _resolve_herb_name(self, name: str) -> Optional[Tuple[str, Optional[str]]]:
+        """药名 -> (清理后的药名, 炮制方法)，不是中药时返回 None；结果按药名缓存"""
+        if name in self._resolved_names:
+            return self._resolved_names[name]
+        resolved = None
+        # 验证是否为已知中药
+        herb_base_name = self._get_herb_base_name(name)
+        if herb_base_name in self.herb_names or self._is_valid_herb_name(name):
+            # 检查是否有炮制方法
+            resolved = (self._clean_herb_name(name), self._extract_preparation_from_name(name))
+        if len(self._resolved_names) < 4096:
+            self._resolved_names[name] = resolved
+        return resolved
+    
     def _get_herb_base_name(self, name: str) -> str:
         """获取药物基础名称，去除炮制等修饰词"""
         # 移除常见的炮制前缀
@@ -282,7 +191,7 @@ class PrescriptionParser:
         """从药名中提取炮制方法"""
         preparations = ["生", "熟", "炙", "蒸", "炒", "制", "醋", "酒", "盐", "蜜"]
         for prep in preparations:
-            if name.startswith(prep):
+            if name.startswith(prep) and self._has_preparation_prefix(name):
                 return prep
         
         # 检查括号内的炮制方法
@@ -292,10 +201,15 @@ class PrescriptionParser:
         
         return None
     
+    def _has_preparation_prefix(self, name: str) -> bool:
+        """首字是否为炮制前缀：生姜这类去掉首字后不再是药名的，首字属于药名本身"""
+        base = re.sub(r'\([^)]*\)', '', name).strip()
+        return not (base in self.herb_names and base[1:] not in self.herb_names)
+    
     def _clean_herb_name(self, name: str) -> str:
         """清理药物名称"""
         # 移除炮制前缀
-        cleaned = re.sub(r'^(生|熟|炙|蒸|炒|制|醋|酒|盐|蜜)', '', name)
+        cleaned = re.sub(r'^(生|熟|炙|蒸|炒|制|醋|酒|盐|蜜)', '', name) if self._has_preparation_prefix(name) else name
         # 移除括号内容
         cleaned = re.sub(r'\([^)]*\)', '', cleaned)
         return cleaned.strip()
@@ -387,53 +301,46 @@ class PrescriptionSafetyChecker:
     """处方安全性检查"""
     
     def __init__(self):
-        # 配伍禁忌 - 十八反十九畏
-        self.incompatible_combinations = {
-            "甘草": ["大戟", "京大戟", "芫花", "甘遂"],
-            "乌头": ["贝母", "瓜蒌", "半夏", "白蔹", "白及"],
-            "藜芦": ["人参", "沙参", "丹参", "玄参", "细辛", "芍药"],
-            "硫黄": ["朴硝"],
-            "水银": ["砒霜"],
-            "狼毒": ["密陀僧"],
-            "巴豆": ["牵牛"],
-            "丁香": ["郁金"],
-            "牙硝": ["三棱"],
-            "川乌": ["犀角"],
-            "草乌": ["犀角"],
-            "肉桂": ["赤石脂"]
-        }
+        # 规则数据与预编译索引见 safety_rules，这里保留原有属性供调用方读取
+        self.rule_index = get_safety_rule_index()
+        
+        # 配伍禁忌 - 十八反十九畏（主药 -> 相反/相畏之药）
+        self.incompatible_combinations = {}
+        for _, primary, opposed in INCOMPATIBILITY_RULES:
+            for herb in primary:
+                self.incompatible_combinations.setdefault(herb, []).extend(opposed)
         
         # 有毒药物及其安全剂量
-        self.toxic_herbs = {
-            "附子": {"max_daily": "15g", "warning": "需要炮制后使用，先煎30-60分钟"},
-            "川乌": {"max_daily": "6g", "warning": "必须炮制，先煎60分钟以上"},
-            "草乌": {"max_daily": "6g", "warning": "必须炮制，先煎60分钟以上"},
-            "半夏": {"max_daily": "9g", "warning": "生半夏有毒，须用制半夏"},
-            "天南星": {"max_daily": "6g", "warning": "生品有毒，须炮制后使用"},
-            "马钱子": {"max_daily": "0.6g", "warning": "极毒，严格控制用量"},
-            "朱砂": {"max_daily": "1g", "warning": "含汞，不宜久服"},
-            "雄黄": {"max_daily": "1g", "warning": "含砷，外用为主"},
-            "巴豆": {"max_daily": "0.1g", "warning": "峻下药，用量极小"},
-            "甘遂": {"max_daily": "1.5g", "warning": "峻下药，醋制后用"}
-        }
+        self.toxic_herbs = {name: dict(info) for name, info in TOXIC_HERBS.items()}
         
         # 特殊人群用药禁忌
         self.contraindications = {
-            "孕妇禁用": [
-                "巴豆", "牵牛子", "大戟", "京大戟", "芫花", "甘遂", "商陆", "三棱", "莪术",
-                "水蛭", "虻虫", "川牛膝", "怀牛膝", "桃仁", "红花", "当归尾", "川芎",
-                "附子", "肉桂", "干姜", "吴茱萸", "艾叶", "麝香", "丁香", "降香", "沉香"
-            ],
-            "儿童慎用": [
-                "朱砂", "雄黄", "轻粉", "密陀僧", "马钱子", "蟾酥", "斑蝥", "红粉"
-            ],
-            "老人慎用": [
-                "大黄", "芒硝", "甘遂", "大戟", "芫花", "商陆", "牵牛子", "巴豆"
-            ]
+            category: sorted(herbs) for category, herbs in POPULATION_CONTRAINDICATIONS.items()
         }
     
-    def check_prescription_safety(self, prescription: Prescription) -> Dict[str, Any]:
-        """全面检查处方安全性"""
+    def check_prescription_safety(self, prescription: Prescription,
+                                  populations: Sequence[str] = ()) -> Dict[str, Any]:
+        """
+        全面检查处方安全性
+        
+        populations: 需要考虑的特殊人群（孕妇/儿童/老人）
+        """
+        return self._build_results(
+            prescription, self.rule_index.check(prescription.herbs, populations)
+        )
+    
+    def check_many(self, prescriptions: Sequence[Prescription],
+                   populations: Sequence[str] = ()) -> List[Dict[str, Any]]:
+        """批量检查处方安全性（医生审核队列）"""
+        reports = self.rule_index.check_many(
+            (prescription.herbs for prescription in prescriptions), populations
+        )
+        return [
+            self._build_results(prescription, report)
+            for prescription, report in zip(prescriptions, reports)
+        ]
+    
+    def _build_results(self, prescription: Prescription, report: SafetyReport) -> Dict[str, Any]:
         results = {
             "is_safe": True,
             "warnings": [],
@@ -441,28 +348,32 @@ class PrescriptionSafetyChecker:
             "suggestions": []
         }
         
-        herb_names = [herb.name for herb in prescription.herbs]
-        
-        # 1. 检查配伍禁忌
-        incompatible_pairs = self._check_incompatible_combinations(herb_names)
-        if incompatible_pairs:
+        # 1. 配伍禁忌
+        if report.incompatible_pairs:
             results["is_safe"] = False
             results["errors"].extend([
-                f"配伍禁忌：{pair[0]} 与 {pair[1]} 不能同用" 
-                for pair in incompatible_pairs
+                f"配伍禁忌：{pair.herb1} 与 {pair.herb2} 不能同用" 
+                for pair in report.incompatible_pairs
             ])
         
-        # 2. 检查有毒药物用量
-        toxic_warnings = self._check_toxic_herbs(prescription.herbs)
-        if toxic_warnings:
-            results["warnings"].extend(toxic_warnings)
+        # 2. 有毒药物用量
+        results["warnings"].extend(self._format_toxic_findings(report.toxic_findings))
+        
+        # 3. 特殊人群禁忌
+        for category, herbs in report.population_hits.items():
+            message = f"{category}：{'、'.join(herbs)}"
+            if category.endswith("禁用"):
+                results["is_safe"] = False
+                results["errors"].append(message)
+            else:
+                results["warnings"].append(message)
         
-        # 3. 检查总体用药合理性
+        # 4. 检查总体用药合理性
         dosage_warnings = self._check_dosage_reasonableness(prescription.herbs)
         if dosage_warnings:
             results["warnings"].extend(dosage_warnings)
         
-        # 4. 检查药物数量合理性
+        # 5. 检查药物数量合理性
         herb_count_warning = self._check_herb_count(prescription.herbs)
         if herb_count_warning:
             results["warnings"].append(herb_count_warning)
@@ -471,38 +382,26 @@ class PrescriptionSafetyChecker:
     
     def _check_incompatible_combinations(self, herb_names: List[str]) -> List[Tuple[str, str]]:
         """检查配伍禁忌"""
-        incompatible_pairs = []
-        
-        for herb1 in herb_names:
-            if herb1 in self.incompatible_combinations:
-                for herb2 in herb_names:
-                    if herb2 in self.incompatible_combinations[herb1]:
-                        incompatible_pairs.append((herb1, herb2))
-        
-        return incompatible_pairs
+        return [(pair.herb1, pair.herb2) for pair in self.rule_index.incompatible_pairs(herb_names)]
     
     def _check_toxic_herbs(self, herbs: List[Herb]) -> List[str]:
         """检查有毒药物及用量"""
+        findings = [self.rule_index.toxic_finding(herb.name, herb.dosage) for herb in herbs]
+        return self._format_toxic_findings([finding for finding in findings if finding])
+    
+    @staticmethod
+    def _format_toxic_findings(findings: List[ToxicFinding]) -> List[str]:
         warnings = []
-        
-        for herb in herbs:
-            if herb.name in self.toxic_herbs:
-                toxic_info = self.toxic_herbs[herb.name]
-                max_dose = float(toxic_info["max_daily"].replace('g', ''))
-                
-                # 解析当前用量
-                try:
-                    current_dose = self._parse_dosage(herb.dosage)
-                    if current_dose > max_dose:
-                        warnings.append(
-                            f"{herb.name} 用量 {herb.dosage} 超过安全剂量 {toxic_info['max_daily']}，"
-                            f"警告：{toxic_info['warning']}"
-                        )
-                    else:
-                        warnings.append(f"{herb.name}: {toxic_info['warning']}")
-                except:
-                    warnings.append(f"{herb.name}: 请确认用量，{toxic_info['warning']}")
-        
+        for finding in findings:
+            if finding.exceeded is None:
+                warnings.append(f"{finding.herb}: 请确认用量，{finding.warning}")
+            elif finding.exceeded:
+                warnings.append(
+                    f"{finding.herb} 用量 {finding.dosage} 超过安全剂量 {finding.max_daily}，"
+                    f"警告：{finding.warning}"
+                )
+            else:
+                warnings.append(f"{finding.herb}: {finding.warning}")
         return warnings
     
     def _parse_dosage(self, dosage_str: str) -> float:
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+处方安全规则索引（十八反/十九畏、有毒药材剂量上限、特殊人群禁忌）
+
+配伍禁忌原先在 PrescriptionSafetyChecker._check_incompatible_combinations 中两两比较药名，
+有毒药材每次检查都重新解析 "15g" 这类上限字符串，MedicalSafetyProcessor 又另存一份
+不完整的十八反数据。本模块在进程内只构建一次规则索引：
+
+- 每条配伍禁忌规则占一位：药名 -> (主药位掩码, 相反/相畏药位掩码)。
+  整张处方把两类掩码分别按位或，二者相与即为命中的规则，一遍即可完成检查
+- 有毒药材的日剂量上限预先解析为数值
+- 特殊人群禁忌为药名集合，按集合交集判断
+- 药名先经药材注册表归一（别名、炮制品），炙甘草 与 甘草 同样受"甘草反甘遂"约束
+
+用法：
+    index = get_safety_rule_index()
+    report = index.check([("甘草", "6g"), ("甘遂", "1g")], populations=["孕妇"])
+    reports = index.check_many(prescriptions)
+"""
+
+import logging
+import re
+import threading
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 配伍禁忌：(类型, 主药, 相反/相畏之药)
+INCOMPATIBILITY_RULES: Tuple[Tuple[str, Tuple[str, ...], Tuple[str, ...]], ...] = (
+    # 十八反
+    ("十八反", ("甘草",), ("甘遂", "大戟", "京大戟", "红大戟", "海藻", "芫花")),
+    ("十八反", ("乌头", "川乌", "草乌", "附子"),
+     ("半夏", "瓜蒌", "瓜蒌皮", "瓜蒌子", "天花粉", "贝母", "川贝母", "浙贝母", "白蔹", "白及")),
+    ("十八反", ("藜芦",),
+     ("人参", "沙参", "北沙参", "南沙参", "丹参", "玄参", "苦参", "细辛", "芍药", "白芍", "赤芍")),
+    # 十九畏
+    ("十九畏", ("硫黄",), ("朴硝", "芒硝")),
+    ("十九畏", ("水银",), ("砒霜",)),
+    ("十九畏", ("狼毒",), ("密陀僧",)),
+    ("十九畏", ("巴豆",), ("牵牛", "牵牛子")),
+    ("十九畏", ("丁香",), ("郁金",)),
+    ("十九畏", ("川乌", "草乌"), ("犀角",)),
+    ("十九畏", ("牙硝",), ("三棱",)),
+    ("十九畏", ("肉桂", "官桂"), ("赤石脂",)),
+    ("十九畏", ("人参",), ("五灵脂",)),
+)
+
+# 有毒药物及其日剂量上限
+TOXIC_HERBS: Mapping[str, Mapping[str, str]] = MappingProxyType({
+    "附子": {"max_daily": "15g", "warning": "需要炮制后使用，先煎30-60分钟"},
+    "川乌": {"max_daily": "6g", "warning": "必须炮制，先煎60分钟以上"},
+    "草乌": {"max_daily": "6g", "warning": "必须炮制，先煎60分钟以上"},
+    "半夏": {"max_daily": "9g", "warning": "生半夏有毒，须用制半夏"},
+    "天南星": {"max_daily": "6g", "warning": "生品有毒，须炮制后使用"},
+    "马钱子": {"max_daily": "0.6g", "warning": "极毒，严格控制用量"},
+    "朱砂": {"max_daily": "1g", "warning": "含汞，不宜久服"},
+    "雄黄": {"max_daily": "1g", "warning": "含砷，外用为主"},
+    "巴豆": {"max_daily": "0.1g", "warning": "峻下药，用量极小"},
+    "甘遂": {"max_daily": "1.5g", "warning": "峻下药，醋制后用"},
+})
+
+# 特殊人群用药禁忌
+POPULATION_CONTRAINDICATIONS: Mapping[str, FrozenSet[str]] = MappingProxyType({
+    "孕妇禁用": frozenset({
+        "巴豆", "牵牛子", "大戟", "京大戟", "芫花", "甘遂", "商陆", "三棱", "莪术",
+        "水蛭", "虻虫", "川牛膝", "怀牛膝", "牛膝", "桃仁", "红花", "当归尾", "川芎",
+        "附子", "川乌", "草乌", "肉桂", "干姜", "吴茱萸", "艾叶", "麝香", "丁香", "降香", "沉香",
+        "斑蝥", "蜈蚣", "干漆", "薏苡仁", "王不留行",
+    }),
+    "孕妇慎用": frozenset({
+        "当归尾", "川芎", "桃仁", "红花", "牛膝", "薏苡仁", "厚朴", "枳壳", "大黄", "芒硝",
+    }),
+    "儿童慎用": frozenset({
+        "朱砂", "雄黄", "轻粉", "密陀僧", "马钱子", "蟾酥", "斑蝥", "红粉",
+    }),
+    "老人慎用": frozenset({
+        "大黄", "芒硝", "甘遂", "大戟", "芫花", "商陆", "牵牛子", "巴豆",
+    }),
+})
+
+# 人群 -> 需要检查的禁忌类别（禁用在前）
+POPULATION_CATEGORIES: Mapping[str, Tuple[str, ...]] = MappingProxyType({
+    "孕妇": ("孕妇禁用", "孕妇慎用"),
+    "儿童": ("儿童慎用",),
+    "老人": ("老人慎用",),
+})
+
+_PROCESSING_PREFIXES = ("炙", "制", "酒", "盐", "炒", "蜜", "醋", "姜", "生", "熟", "煅", "焦")
+_BRACKETS = re.compile(r'[（(][^（()）]*[）)]')
+_NUMBER = re.compile(r'\d+(?:\.\d+)?')
+_MAX_CACHED_NAMES = 4096
+
+
+def parse_dose_grams(dosage) -> Optional[float]:
+    """剂量（数值或 "6g"、"6-10g" 这类字符串）转为克数，范围取上限；无法解析返回 None"""
+    if isinstance(dosage, (int, float)):
+        return float(dosage)
+    numbers = _NUMBER.findall(str(dosage or ""))
+    return float(numbers[-1]) if numbers else None
+
+
+@dataclass(frozen=True)
+class IncompatiblePair:
+    """一对配伍禁忌（药名为处方原文写法，herb1 为主药）"""
+    herb1: str
+    herb2: str
+    rule_type: str      # 十八反 / 十九畏
+    rule_herb: str      # 规则中的主药（如 乌头）
+    opposed_herb: str   # 规则中的相反/相畏之药
+
+    @property
+    def description(self) -> str:
+        verb = "反" if self.rule_type == "十八反" else "畏"
+        return f"{self.rule_herb}{verb}{self.opposed_herb}，禁忌配伍"
+
+
+@dataclass(frozen=True)
+class ToxicFinding:
+    """有毒药材的检查结果；exceeded 为 None 表示用量无法解析"""
+    herb: str
+    dosage: str
+    max_daily: str
+    max_daily_grams: float
+    warning: str
+    exceeded: Optional[bool]
+
+
+@dataclass
+class SafetyReport:
+    """单张处方的规则检查结果"""
+    incompatible_pairs: List[IncompatiblePair] = field(default_factory=list)
+    toxic_findings: List[ToxicFinding] = field(default_factory=list)
+    population_hits: Dict[str, List[str]] = field(default_factory=dict)  # 禁忌类别 -> 药名
+
+    @property
+    def has_incompatibility(self) -> bool:
+        return bool(self.incompatible_pairs)
+
+
+@dataclass(frozen=True)
+class _HerbRules:
+    """单个药名在索引中的全部规则信息"""
+    canonical_names: FrozenSet[str]
+    primary_mask: int
+    opposed_mask: int
+    toxic_name: Optional[str]
+
+
+class SafetyRuleIndex:
+    """预编译的处方安全规则索引，构建后只读，可跨线程共享"""
+
+    def __init__(self, rules=INCOMPATIBILITY_RULES, toxic_herbs=TOXIC_HERBS,
+                 populations=POPULATION_CONTRAINDICATIONS, registry=None):
+        self.rules = tuple(rules)
+        self.populations = populations
+        self._registry = registry
+
+        self._primary_bits: Dict[str, int] = {}
+        self._opposed_bits: Dict[str, int] = {}
+        for bit, (_, primary, opposed) in enumerate(self.rules):
+            for name in primary:
+                self._primary_bits[name] = self._primary_bits.get(name, 0) | (1 << bit)
+            for name in opposed:
+                self._opposed_bits[name] = self._opposed_bits.get(name, 0) | (1 << bit)
+
+        # 上限字符串只在这里解析一次
+        self.toxic_herbs = {
+            name: (info["max_daily"], parse_dose_grams(info["max_daily"]), info["warning"])
+            for name, info in toxic_herbs.items()
+        }
+        self._rule_names = frozenset(self._primary_bits) | frozenset(self._opposed_bits) | frozenset(self.toxic_herbs)
+        self._rule_names |= frozenset().union(*populations.values()) if populations else frozenset()
+        self._herb_cache: Dict[str, _HerbRules] = {}
+
+    # ------------------------------------------------------------------
+    # 药名归一
+    # ------------------------------------------------------------------
+
+    def _resolve(self, name: str) -> Optional[str]:
+        if self._registry is None:
+            try:
+                from core.prescription.herb_registry import get_herb_registry
+                self._registry = get_herb_registry()
+            except Exception as e:
+                logger.warning(f"药材注册表不可用，安全规则按原药名匹配: {e}")
+                self._registry = False
+        return self._registry.resolve(name) if self._registry else None
+
+    def canonical_names(self, name: str) -> FrozenSet[str]:
+        """药名在规则表中对应的名称（原名、标准名、去炮制前缀名），不涉及任何规则时为空"""
+        return self._herb_rules(name).canonical_names
+
+    def _herb_rules(self, name: str) -> _HerbRules:
+        cached = self._herb_cache.get(name)
+        if cached is not None:
+            return cached
+
+        base = _BRACKETS.sub('', name or '').strip()
+        candidates = [base]
+        resolved = self._resolve(base)
+        if resolved:
+            candidates.append(resolved)
+        for candidate in list(candidates):
+            if len(candidate) > 2 and candidate[0] in _PROCESSING_PREFIXES:
+                candidates.append(candidate[1:])
+                resolved = self._resolve(candidate[1:])
+                if resolved:
+                    candidates.append(resolved)
+
+        names = frozenset(candidate for candidate in candidates if candidate in self._rule_names)
+        rules = _HerbRules(
+            canonical_names=names,
+            primary_mask=self._mask(names, self._primary_bits),
+            opposed_mask=self._mask(names, self._opposed_bits),
+            toxic_name=self._toxic_name(base),
+        )
+        if len(self._herb_cache) < _MAX_CACHED_NAMES:
+            self._herb_cache[name] = rules
+        return rules
+
+    def _toxic_name(self, base: str) -> Optional[str]:
+        """
+        剂量上限按处方写法匹配，不经注册表归一：法半夏、姜半夏等炮制品
+        毒性与用量不同于生品，不能套用生品上限；只把“生”前缀视为同一药材
+        """
+        if base in self.toxic_herbs:
+            return base
+        if len(base) > 2 and base[0] == "生" and base[1:] in self.toxic_herbs:
+            return base[1:]
+        return None
+
+    @staticmethod
+    def _mask(names: Iterable[str], bits: Mapping[str, int]) -> int:
+        mask = 0
+        for name in names:
+            mask |= bits.get(name, 0)
+        return mask
+
+    # ------------------------------------------------------------------
+    # 检查
+    # ------------------------------------------------------------------
+
+    def incompatible_pairs(self, herb_names: Sequence[str]) -> List[IncompatiblePair]:
+        """处方中的全部配伍禁忌，按主药在处方中的顺序"""
+        entries = [(name, self._herb_rules(name)) for name in herb_names]
+        primary_union = opposed_union = 0
+        for _, rules in entries:
+            primary_union |= rules.primary_mask
+            opposed_union |= rules.opposed_mask
+        conflicts = primary_union & opposed_union
+        if not conflicts:
+            return []
+
+        pairs: List[IncompatiblePair] = []
+        seen = set()
+        for name1, rules1 in entries:
+            hit_bits = rules1.primary_mask & conflicts
+            if not hit_bits:
+                continue
+            for name2, rules2 in entries:
+                shared = hit_bits & rules2.opposed_mask
+                if not shared or (name1, name2) in seen:
+                    continue
+                seen.add((name1, name2))
+                bit = (shared & -shared).bit_length() - 1
+                rule_type, primary, opposed = self.rules[bit]
+                pairs.append(IncompatiblePair(
+                    herb1=name1, herb2=name2, rule_type=rule_type,
+                    rule_herb=next((n for n in primary if n in rules1.canonical_names), primary[0]),
+                    opposed_herb=next((n for n in opposed if n in rules2.canonical_names), opposed[0]),
+                ))
+        return pairs
+
+    def pair_interaction(self, herb1: str, herb2: str) -> Optional[IncompatiblePair]:
+        """两味药之间的配伍禁忌（不分先后），没有则返回 None"""
+        pairs = self.incompatible_pairs([herb1, herb2])
+        return pairs[0] if pairs else None
+
+    def toxic_finding(self, name: str, dosage) -> Optional[ToxicFinding]:
+        toxic_name = self._herb_rules(name).toxic_name
+        if toxic_name is None:
+            return None
+        max_daily, max_grams, warning = self.toxic_herbs[toxic_name]
+        dose = parse_dose_grams(dosage)
+        return ToxicFinding(
+            herb=name, dosage=str(dosage), max_daily=max_daily, max_daily_grams=max_grams,
+            warning=warning, exceeded=None if dose is None else dose > max_grams,
+        )
+
+    def population_hits(self, herb_names: Sequence[str], categories: Iterable[str]) -> Dict[str, List[str]]:
+        """特殊人群禁忌类别 -> 处方中命中的药名（原文写法）"""
+        hits: Dict[str, List[str]] = {}
+        categories = [category for category in categories if category in self.populations]
+        if not categories:
+            return hits
+        for name in herb_names:
+            names = self._herb_rules(name).canonical_names
+            for category in categories:
+                if names & self.populations[category]:
+                    hits.setdefault(category, []).append(name)
+        return hits
+
+    def check(self, herbs: Sequence, populations: Iterable[str] = ()) -> SafetyReport:
+        """
+        检查一张处方
+
+        herbs 为 (药名, 剂量) 序列，或带 name/dosage 属性的对象（如 Herb）；
+        populations 为人群（孕妇/儿童/老人）或禁忌类别名（如 "孕妇禁用"）。
+        """
+        items = [_name_and_dosage(herb) for herb in herbs]
+        names = [name for name, _ in items]
+
+        report = SafetyReport(incompatible_pairs=self.incompatible_pairs(names))
+        for name, dosage in items:
+            finding = self.toxic_finding(name, dosage)
+            if finding is not None:
+                report.toxic_findings.append(finding)
+
+        categories: List[str] = []
+        for population in populations:
+            for category in POPULATION_CATEGORIES.get(population, (population,)):
+                if category not in categories:
+                    categories.append(category)
+        report.population_hits = self.population_hits(names, categories)
+        return report
+
+    def check_many(self, prescriptions: Iterable[Sequence], populations: Iterable[str] = ()) -> List[SafetyReport]:
+        """批量检查（医生审核队列），药名归一结果在批次间共享"""
+        populations = list(populations)
+        return [self.check(herbs, populations) for herbs in prescriptions]
+
+
+def _name_and_dosage(herb) -> Tuple[str, object]:
+    if isinstance(herb, (tuple, list)):
+        return herb[0], herb[1] if len(herb) > 1 else None
+    if isinstance(herb, dict):
+        return herb.get("name", ""), herb.get("dosage")
+    return herb.name, getattr(herb, "dosage", None)
+
+
+_index: Optional[SafetyRuleIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_safety_rule_index() -> SafetyRuleIndex:
+    """获取进程内共享的安全规则索引"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = SafetyRuleIndex()
+    return _index
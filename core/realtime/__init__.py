@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+多设备实时同步模块
+"""
+
+from .sync_backplane import (
+    LocalBackplane,
+    SQLiteBackplane,
+    SyncBackplane,
+    create_sync_backplane,
+    get_sync_backplane
+)
+from .connection_hub import (
+    ConnectionHub,
+    DeviceChannel,
+    coalesce_key
+)
+
+__all__ = [
+    'ConnectionHub',
+    'DeviceChannel',
+    'LocalBackplane',
+    'SQLiteBackplane',
+    'SyncBackplane',
+    'coalesce_key',
+    'create_sync_backplane',
+    'get_sync_backplane'
+]
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+本worker持有的多设备同步连接
+- 设备、连接、用户之间的双向索引，按连接反查设备为O(1)
+- 每个设备一个发送通道：广播只序列化一次并入队，由通道任务批量发送，
+  慢设备不会拖慢同一用户的其他设备；积压期间同一会话的状态快照只保留最新一条
+- 广播经消息总线发布，其他worker上的同一用户设备同样能收到
+"""
+
+import asyncio
+import json
+import logging
+from collections import OrderedDict
+from itertools import count
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Set
+
+from app.core.settings import API_CONFIG
+from .sync_backplane import SyncBackplane, get_sync_backplane
+
+logger = logging.getLogger(__name__)
+
+# 状态快照类消息：积压时只需发送最新一条。值为组成合并键的 data 字段
+COALESCED_MESSAGE_TYPES = {
+    "state_sync": ("conversation_id",),
+    "doctor_sync": (),
+    "latest_state": (),
+}
+
+
+def coalesce_key(message: Dict[str, Any]) -> Optional[tuple]:
+    """可合并消息的合并键；其余消息返回 None，逐条发送"""
+    message_type = message.get("type")
+    fields = COALESCED_MESSAGE_TYPES.get(message_type)
+    if fields is None:
+        return None
+    data = message.get("data") or {}
+    return (message_type,) + tuple(data.get(name) for name in fields)
+
+
+class DeviceChannel:
+    """单个设备的发送通道：消息入队后由独立任务按批发送，每帧仍是一个JSON对象"""
+
+    def __init__(self, device_id: str, send: Callable[[str], Awaitable[Any]],
+                 is_open: Optional[Callable[[], bool]] = None, max_pending: int = 256,
+                 on_failure: Optional[Callable[["DeviceChannel"], Any]] = None):
+        self.device_id = device_id
+        self.max_pending = max_pending
+        self._send = send
+        self._is_open = is_open
+        self._on_failure = on_failure
+        self._pending: "OrderedDict[Hashable, str]" = OrderedDict()
+        self._sequence = count()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.closed = False
+
+        self.sent = 0
+        self.batches = 0
+        self.coalesced = 0
+        self.dropped = 0
+
+    def enqueue(self, text: str, key: Optional[Hashable] = None) -> bool:
+        """入队；同合并键的旧消息被替换。积压超过上限时丢弃最早的消息"""
+        if self.closed:
+            return False
+        if key is None:
+            key = next(self._sequence)
+        elif key in self._pending:
+            del self._pending[key]
+            self.coalesced += 1
+        self._pending[key] = text
+        if len(self._pending) > self.max_pending:
+            self._pending.popitem(last=False)
+            self.dropped += 1
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        self._wakeup.set()
+        return True
+
+    async def _run(self):
+        try:
+            while not self.closed:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                while self._pending and not self.closed:
+                    batch = list(self._pending.values())
+                    self._pending.clear()
+                    self.batches += 1
+                    for text in batch:
+                        if self._is_open is not None and not self._is_open():
+                            raise ConnectionError("连接已关闭")
+                        await self._send(text)
+                        self.sent += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"设备 {self.device_id} 发送失败，断开连接: {e}")
+            self.closed = True
+            self._pending.clear()
+            if self._on_failure is not None:
+                self._on_failure(self)
+
+    def close(self):
+        self.closed = True
+        self._pending.clear()
+        if self._task is not None and not self._task.done() and self._task is not asyncio.current_task():
+            self._task.cancel()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+
+class ConnectionHub:
+    """本worker的设备连接表与广播入口"""
+
+    def __init__(self, backplane: Optional[SyncBackplane] = None, max_pending: int = None):
+        self.max_pending = max_pending or API_CONFIG.get("sync_channel_max_pending", 256)
+        # 设备连接映射: device_id -> websocket
+        self.device_connections: Dict[str, Any] = {}
+        # 连接反查设备: id(websocket) -> device_id（Starlette 的 WebSocket 不可哈希）
+        self.websocket_devices: Dict[int, str] = {}
+        # 设备所属用户: device_id -> user_id
+        self.device_users: Dict[str, str] = {}
+        # 用户设备映射: user_id -> {device_ids}
+        self.user_devices: Dict[str, Set[str]] = {}
+        # 设备发送通道: device_id -> DeviceChannel
+        self.channels: Dict[str, DeviceChannel] = {}
+
+        self.backplane = backplane or get_sync_backplane()
+        self.backplane.bind(self.deliver_local)
+
+    @property
+    def active_connections(self) -> Dict[str, list]:
+        """用户连接映射: user_id -> [websockets]（兼容旧接口）"""
+        return {
+            user_id: [self.device_connections[device_id] for device_id in devices]
+            for user_id, devices in self.user_devices.items()
+        }
+
+    def register(self, websocket, user_id: str, device_id: str,
+                 is_open: Optional[Callable[[], bool]] = None) -> DeviceChannel:
+        """登记设备连接；同一设备重连时替换旧连接"""
+        if device_id in self.device_connections:
+            self.unregister(self.device_users[device_id], device_id)
+
+        channel = DeviceChannel(
+            device_id, websocket.send_text, is_open=is_open, max_pending=self.max_pending,
+            on_failure=lambda _channel: self.unregister(user_id, device_id, websocket)
+        )
+        self.device_connections[device_id] = websocket
+        self.websocket_devices[id(websocket)] = device_id
+        self.device_users[device_id] = user_id
+        self.channels[device_id] = channel
+
+        devices = self.user_devices.setdefault(user_id, set())
+        if not devices:
+            self.backplane.subscribe(user_id)
+        devices.add(device_id)
+        return channel
+
+    def unregister(self, user_id: str, device_id: str, websocket=None) -> bool:
+        """注销设备连接；websocket 不是该设备的当前连接时（已被重连替换）不做处理"""
+        current = self.device_connections.get(device_id)
+        if current is None or (websocket is not None and current is not websocket):
+            return False
+
+        del self.device_connections[device_id]
+        self.websocket_devices.pop(id(current), None)
+        user_id = self.device_users.pop(device_id, user_id)
+        channel = self.channels.pop(device_id, None)
+        if channel is not None:
+            channel.close()
+
+        devices = self.user_devices.get(user_id)
+        if devices is not None:
+            devices.discard(device_id)
+            if not devices:
+                del self.user_devices[user_id]
+                self.backplane.unsubscribe(user_id)
+        return True
+
+    def get_device_id_by_websocket(self, websocket) -> Optional[str]:
+        """根据websocket获取设备ID"""
+        return self.websocket_devices.get(id(websocket))
+
+    async def broadcast(self, user_id: str, message: Dict[str, Any], exclude_device: str = None) -> int:
+        """发布给用户在所有worker上的设备，返回本worker投递的设备数"""
+        return await self.backplane.publish(user_id, message, exclude_device)
+
+    async def deliver_local(self, user_id: str, message: Dict[str, Any], exclude_device: str = None) -> int:
+        """投递给本worker持有的该用户设备：只序列化一次"""
+        devices = self.user_devices.get(user_id)
+        if not devices:
+            return 0
+        text = json.dumps(message, ensure_ascii=False)
+        key = coalesce_key(message)
+        delivered = 0
+        for device_id in devices:
+            if exclude_device and device_id == exclude_device:
+                continue
+            if self.channels[device_id].enqueue(text, key):
+                delivered += 1
+        return delivered
+
+    def send_to_websocket(self, websocket, message: Dict[str, Any]) -> bool:
+        """经设备通道发送个人消息，保证与广播消息的先后顺序；未登记的连接返回 False"""
+        device_id = self.get_device_id_by_websocket(websocket)
+        channel = self.channels.get(device_id) if device_id else None
+        if channel is None:
+            return False
+        return channel.enqueue(json.dumps(message, ensure_ascii=False), coalesce_key(message))
+
+    def get_user_connection_count(self, user_id: str) -> int:
+        """获取用户在本worker连接的设备数量"""
+        return len(self.user_devices.get(user_id, ()))
+
+    def get_all_connection_stats(self) -> dict:
+        """获取所有连接统计"""
+        channels = list(self.channels.values())
+        return {
+            "total_users": len(self.user_devices),
+            "total_devices": len(self.device_connections),
+            "user_connections": {
+                user_id: len(devices)
+                for user_id, devices in self.user_devices.items()
+            },
+            "channels": {
+                "pending": sum(channel.pending for channel in channels),
+                "sent": sum(channel.sent for channel in channels),
+                "batches": sum(channel.batches for channel in channels),
+                "coalesced": sum(channel.coalesced for channel in channels),
+                "dropped": sum(channel.dropped for channel in channels),
+            },
+            "backplane": self.backplane.get_stats(),
+        }
+
+    async def close(self):
+        """关闭所有发送通道并注销总线订阅"""
+        for channel in list(self.channels.values()):
+            channel.close()
+        await self.backplane.close()
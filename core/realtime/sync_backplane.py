@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+多设备同步的跨worker消息总线
+gunicorn 多worker部署时，同一用户的手机与电脑可能连到不同worker，
+只在本进程内广播会漏掉其他worker上的设备：
+- LocalBackplane：单进程直接投递（单worker部署、测试）
+- SQLiteBackplane：同机多worker通过SQLite通知表交换消息
+  各worker在 sync_subscriptions 中登记自己持有连接的用户；
+  发布时先投递本地连接，仅当其他worker持有该用户时才写入 sync_events；
+  有待发布事件时后台任务立即写出（交换进行中到达的事件合并到下一批），
+  空闲时按轮询间隔批量读取属于本worker用户的新事件。
+  跨worker延迟约为接收方的轮询等待（平均半个间隔）加一次交换耗时
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from app.core.settings import API_CONFIG, PATHS
+from core.database.connection import connect as db_connect
+
+logger = logging.getLogger(__name__)
+
+# (user_id, message, exclude_device) -> 本worker实际投递的设备数
+DeliverCallback = Callable[[str, Dict[str, Any], Optional[str]], Awaitable[int]]
+
+
+async def _discard(user_id: str, message: Dict[str, Any], exclude_device: Optional[str] = None) -> int:
+    return 0
+
+
+class SyncBackplane:
+    """消息总线接口：bind 设置本地投递回调，subscribe/unsubscribe 登记本worker持有的用户"""
+
+    name = "base"
+
+    def __init__(self):
+        self._deliver: DeliverCallback = _discard
+
+    def bind(self, deliver: DeliverCallback):
+        self._deliver = deliver
+
+    def subscribe(self, user_id: str):
+        pass
+
+    def unsubscribe(self, user_id: str):
+        pass
+
+    async def publish(self, user_id: str, message: Dict[str, Any], exclude_device: Optional[str] = None) -> int:
+        """发布给用户的所有设备，返回本worker投递的设备数"""
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"backplane": self.name}
+
+
+class LocalBackplane(SyncBackplane):
+    """进程内总线：直接投递本地连接"""
+
+    name = "local"
+
+    async def publish(self, user_id: str, message: Dict[str, Any], exclude_device: Optional[str] = None) -> int:
+        return await self._deliver(user_id, message, exclude_device)
+
+
+class SQLiteBackplane(SyncBackplane):
+    """同机多worker的SQLite通知总线"""
+
+    name = "sqlite"
+
+    def __init__(self, db_path: Optional[str] = None, worker_id: Optional[str] = None,
+                 poll_interval: float = None, retention_seconds: float = None,
+                 heartbeat_interval: float = 2.0, worker_timeout: float = 15.0):
+        super().__init__()
+        self.db_path = db_path or str(PATHS["sync_bus_db"])
+        # worker_id 在后台任务启动时生成：模块导入可能早于 fork
+        self.worker_id = worker_id
+        self.poll_interval = poll_interval if poll_interval is not None else API_CONFIG.get("sync_poll_interval_ms", 50) / 1000
+        self.retention_seconds = retention_seconds if retention_seconds is not None else API_CONFIG.get("sync_event_retention_seconds", 60)
+        self.heartbeat_interval = heartbeat_interval
+        self.worker_timeout = worker_timeout
+
+        self._subscribed: Set[str] = set()
+        # 待写入的订阅变更：user_id -> True订阅 / False退订
+        self._subscription_changes: Dict[str, bool] = {}
+        self._outbox: List[Tuple[str, str, Optional[str], float]] = []
+        self._last_event_id: Optional[int] = None
+        self._last_heartbeat = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._exchange_lock: Optional[asyncio.Lock] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._closed = False
+
+        self.events_published = 0
+        self.events_received = 0
+        self.exchanges = 0
+
+        self._init_database()
+
+    def _init_database(self):
+        conn = db_connect(self.db_path)
+        try:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS sync_workers (
+                    worker_id TEXT PRIMARY KEY,
+                    heartbeat_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS sync_subscriptions (
+                    user_id TEXT NOT NULL,
+                    worker_id TEXT NOT NULL,
+                    PRIMARY KEY (user_id, worker_id)
+                );
+                CREATE INDEX IF NOT EXISTS idx_sync_subscriptions_worker ON sync_subscriptions(worker_id);
+                CREATE TABLE IF NOT EXISTS sync_events (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id TEXT NOT NULL,
+                    origin TEXT NOT NULL,
+                    exclude_device TEXT,
+                    payload TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_sync_events_created ON sync_events(created_at);
+            """)
+            conn.commit()
+        finally:
+            conn.close()
+
+    # ---------- 订阅与发布（事件循环内调用） ----------
+
+    def subscribe(self, user_id: str):
+        """本worker开始持有该用户的连接"""
+        self._subscribed.add(user_id)
+        self._subscription_changes[user_id] = True
+        self._ensure_started()
+
+    def unsubscribe(self, user_id: str):
+        """本worker已没有该用户的连接"""
+        self._subscribed.discard(user_id)
+        self._subscription_changes[user_id] = False
+
+    async def publish(self, user_id: str, message: Dict[str, Any], exclude_device: Optional[str] = None) -> int:
+        # 本地连接立即投递，其他worker的设备在下一轮交换时收到
+        delivered = await self._deliver(user_id, message, exclude_device)
+        self._outbox.append((user_id, json.dumps(message, ensure_ascii=False), exclude_device, time.time()))
+        self._ensure_started()
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return delivered
+
+    def _ensure_started(self):
+        if self._closed or (self._task is not None and not self._task.done()):
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self.worker_id is None:
+            self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._task = loop.create_task(self._run())
+
+    async def _run(self):
+        logger.info(f"🔌 实时同步总线已启动: {self.worker_id}")
+        self._wakeup = asyncio.Event()
+        while not self._closed:
+            self._wakeup.clear()
+            await self.exchange()
+            # 等到下一次轮询；交换期间已有新的待发布事件时立即开始下一轮
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def exchange(self) -> int:
+        """一轮交换：写出订阅变更与待发布事件，读取并投递其他worker发来的事件"""
+        if self._exchange_lock is None:
+            self._exchange_lock = asyncio.Lock()
+        async with self._exchange_lock:
+            return await self._exchange()
+
+    async def _exchange(self) -> int:
+        outbox, self._outbox = self._outbox, []
+        changes, self._subscription_changes = self._subscription_changes, {}
+        now = time.time()
+        if not (outbox or changes or self._subscribed or now - self._last_heartbeat >= self.heartbeat_interval):
+            return 0
+        try:
+            events = await asyncio.to_thread(self._exchange_sync, outbox, changes, frozenset(self._subscribed), now)
+        except Exception as e:
+            logger.error(f"实时同步总线交换失败: {e}")
+            # 订阅变更必须写入，否则其他worker不会转发；事件丢弃（客户端可通过 request_latest_state 补齐）
+            for user_id, subscribed in changes.items():
+                self._subscription_changes.setdefault(user_id, subscribed)
+            return 0
+
+        self.exchanges += 1
+        delivered = 0
+        for user_id, exclude_device, payload in events:
+            if user_id not in self._subscribed:
+                continue
+            try:
+                delivered += await self._deliver(user_id, json.loads(payload), exclude_device)
+            except Exception as e:
+                logger.error(f"实时同步事件投递失败: {e}")
+        return delivered
+
+    # ---------- 数据库交换（线程池中执行） ----------
+
+    def _exchange_sync(self, outbox, changes: Dict[str, bool], local_users: frozenset, now: float):
+        conn = db_connect(self.db_path)
+        try:
+            if self._last_event_id is None:
+                self._last_event_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM sync_events").fetchone()[0]
+
+            if changes:
+                conn.executemany(
+                    "INSERT OR IGNORE INTO sync_subscriptions (user_id, worker_id) VALUES (?, ?)",
+                    [(user_id, self.worker_id) for user_id, subscribed in changes.items() if subscribed]
+                )
+                conn.executemany(
+                    "DELETE FROM sync_subscriptions WHERE user_id = ? AND worker_id = ?",
+                    [(user_id, self.worker_id) for user_id, subscribed in changes.items() if not subscribed]
+                )
+
+            if outbox:
+                # 只有其他worker持有该用户时才落表
+                before = conn.total_changes
+                conn.executemany(
+                    """
+                    INSERT INTO sync_events (user_id, origin, exclude_device, payload, created_at)
+                    SELECT ?, ?, ?, ?, ?
+                    WHERE EXISTS (SELECT 1 FROM sync_subscriptions WHERE user_id = ? AND worker_id != ?)
+                    """,
+                    [(user_id, self.worker_id, exclude_device, payload, created_at, user_id, self.worker_id)
+                     for user_id, payload, exclude_device, created_at in outbox]
+                )
+                self.events_published += conn.total_changes - before
+
+            if now - self._last_heartbeat >= self.heartbeat_interval:
+                self._heartbeat(conn, now, local_users)
+            conn.commit()
+
+            if not local_users:
+                self._last_event_id = conn.execute(
+                    "SELECT COALESCE(MAX(id), ?) FROM sync_events", (self._last_event_id,)).fetchone()[0]
+                return []
+
+            high = conn.execute("SELECT COALESCE(MAX(id), ?) FROM sync_events", (self._last_event_id,)).fetchone()[0]
+            rows = conn.execute(
+                """
+                SELECT e.user_id, e.exclude_device, e.payload
+                FROM sync_events e
+                JOIN sync_subscriptions s ON s.user_id = e.user_id AND s.worker_id = ?
+                WHERE e.id > ? AND e.id <= ? AND e.origin != ?
+                ORDER BY e.id
+                """,
+                (self.worker_id, self._last_event_id, high, self.worker_id)
+            ).fetchall()
+            self._last_event_id = high
+            self.events_received += len(rows)
+            return rows
+        finally:
+            conn.close()
+
+    def _heartbeat(self, conn, now: float, local_users: frozenset = frozenset()):
+        """
+        登记存活，清理失联worker的订阅与过期事件
+
+        本worker若因心跳超时（如事件循环长时间阻塞）已被其他worker清理，
+        其订阅行随之被删除，这里重新登记本worker持有的全部用户。
+        """
+        stale = now - self.worker_timeout
+        # 条件更新取得写锁：判断是否失效与续期在同一事务内完成，其间不会被其他worker清理
+        renewed = conn.execute(
+            "UPDATE sync_workers SET heartbeat_at = ? WHERE worker_id = ? AND heartbeat_at >= ?",
+            (now, self.worker_id, stale)
+        ).rowcount
+        if not renewed:
+            conn.execute("INSERT OR REPLACE INTO sync_workers (worker_id, heartbeat_at) VALUES (?, ?)",
+                         (self.worker_id, now))
+            # 首次心跳前订阅已随变更写入，无需重新登记
+            if local_users and self._last_heartbeat:
+                conn.executemany(
+                    "INSERT OR IGNORE INTO sync_subscriptions (user_id, worker_id) VALUES (?, ?)",
+                    [(user_id, self.worker_id) for user_id in local_users]
+                )
+                logger.warning(f"⚠️ 实时同步worker {self.worker_id} 心跳已失效，重新登记 {len(local_users)} 个用户的订阅")
+        conn.execute(
+            "DELETE FROM sync_subscriptions WHERE worker_id IN (SELECT worker_id FROM sync_workers WHERE heartbeat_at < ?)",
+            (stale,)
+        )
+        conn.execute("DELETE FROM sync_workers WHERE heartbeat_at < ?", (stale,))
+        conn.execute("DELETE FROM sync_events WHERE created_at < ?", (now - self.retention_seconds,))
+        self._last_heartbeat = now
+
+    async def close(self):
+        """停止后台任务，写出剩余事件并注销本worker的订阅"""
+        if self._closed:
+            return
+        self._closed = True
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+        if self.worker_id is None:
+            return
+        outbox, self._outbox = self._outbox, []
+        changes, self._subscription_changes = self._subscription_changes, {}
+        self._subscribed.clear()
+
+        def _shutdown():
+            self._exchange_sync(outbox, changes, frozenset(), time.time())
+            conn = db_connect(self.db_path)
+            try:
+                conn.execute("DELETE FROM sync_subscriptions WHERE worker_id = ?", (self.worker_id,))
+                conn.execute("DELETE FROM sync_workers WHERE worker_id = ?", (self.worker_id,))
+                conn.commit()
+            finally:
+                conn.close()
+
+        try:
+            await asyncio.to_thread(_shutdown)
+        except Exception as e:
+            logger.warning(f"实时同步总线注销失败: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "backplane": self.name,
+            "worker_id": self.worker_id,
+            "subscribed_users": len(self._subscribed),
+            "pending_events": len(self._outbox),
+            "events_published": self.events_published,
+            "events_received": self.events_received,
+            "exchanges": self.exchanges,
+            "poll_interval_ms": int(self.poll_interval * 1000),
+        }
+
+
+def create_sync_backplane(name: str = None) -> SyncBackplane:
+    name = (name or API_CONFIG.get("sync_backplane", "sqlite")).lower()
+    if name == "local":
+        return LocalBackplane()
+    if name == "sqlite":
+        return SQLiteBackplane()
+    raise ValueError(f"未知的实时同步总线: {name}")
+
+
+_sync_backplane: Optional[SyncBackplane] = None
+_sync_backplane_lock = threading.Lock()
+
+
+def get_sync_backplane() -> SyncBackplane:
+    """获取全局实时同步总线"""
+    global _sync_backplane
+    if _sync_backplane is None:
+        with _sync_backplane_lock:
+            if _sync_backplane is None:
+                _sync_backplane = create_sync_backplane()
+    return _sync_backplane
@@ -3,19 +3,33 @@
 """
 安全监控和审计日志系统
 实时监控系统安全状态，生成安全报告
+
+API访问日志不在请求路径上写库：log_api_access 只把记录放入有界内存队列并更新滚动聚合，
+后台线程每 N 毫秒或每 M 条用一次 executemany 批量写入 api_access_log，
+队列满时丢弃并计数；_analyze_api_anomalies 读取最近一小时的内存聚合，不再扫描日志表。
 """
 
 import json
 import sqlite3
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
-from collections import defaultdict
+from collections import defaultdict, deque
 import logging
 from enum import Enum
 
+from core.database.connection import connect as db_connect
+
 logger = logging.getLogger(__name__)
 
+# API访问日志批量写入参数
+ACCESS_LOG_QUEUE_SIZE = 10000          # 内存队列上限，超出后丢弃并计数
+ACCESS_LOG_BATCH_SIZE = 200            # 攒够多少条立即写入
+ACCESS_LOG_FLUSH_INTERVAL_MS = 500     # 最长写入间隔
+ACCESS_STATS_WINDOW_MINUTES = 60       # 滚动聚合窗口
+
 class AlertLevel(Enum):
     """告警级别"""
     INFO = "info"
@@ -51,6 +65,261 @@ class SystemMetrics:
     error_rate_1h: float
     avg_response_time_ms: float
 
+class RollingApiStats:
+    """
+    最近一段时间的API访问聚合（按分钟分桶）
+
+    每个桶记录各IP的调用数与错误数、总调用数、错误数与响应时间之和；
+    查询时合并窗口内的桶。仅统计本进程的访问。
+    """
+
+    def __init__(self, window_minutes: int = ACCESS_STATS_WINDOW_MINUTES):
+        self.window_minutes = window_minutes
+        # (分钟序号, {ip: [calls, errors]}, [calls, errors, response_time_sum])
+        self._buckets: deque = deque()
+        self._lock = threading.Lock()
+
+    def _bucket(self, minute: int):
+        if not self._buckets or self._buckets[-1][0] != minute:
+            self._buckets.append((minute, defaultdict(lambda: [0, 0]), [0, 0, 0.0]))
+            self._expire(minute)
+        return self._buckets[-1]
+
+    def _expire(self, minute: int):
+        while self._buckets and self._buckets[0][0] <= minute - self.window_minutes:
+            self._buckets.popleft()
+
+    def record(self, ip_address: str, status_code: int, response_time_ms: float, now: Optional[float] = None):
+        minute = int((time.time() if now is None else now) // 60)
+        is_error = 1 if status_code >= 400 else 0
+        with self._lock:
+            _, per_ip, totals = self._bucket(minute)
+            counters = per_ip[ip_address]
+            counters[0] += 1
+            counters[1] += is_error
+            totals[0] += 1
+            totals[1] += is_error
+            totals[2] += response_time_ms or 0.0
+
+    def per_ip(self, now: Optional[float] = None) -> Dict[str, Tuple[int, int]]:
+        """窗口内各IP的 (调用数, 错误数)"""
+        merged: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+        with self._lock:
+            self._expire(int((time.time() if now is None else now) // 60))
+            for _, per_ip, _ in self._buckets:
+                for ip_address, (calls, errors) in per_ip.items():
+                    merged[ip_address][0] += calls
+                    merged[ip_address][1] += errors
+        return {ip_address: (calls, errors) for ip_address, (calls, errors) in merged.items()}
+
+    def totals(self, now: Optional[float] = None) -> Dict[str, float]:
+        """窗口内的总调用数、错误率、平均响应时间"""
+        calls = errors = 0
+        response_time = 0.0
+        with self._lock:
+            self._expire(int((time.time() if now is None else now) // 60))
+            for _, _, (bucket_calls, bucket_errors, bucket_time) in self._buckets:
+                calls += bucket_calls
+                errors += bucket_errors
+                response_time += bucket_time
+        return {
+            "api_calls": calls,
+            "error_rate": errors / calls if calls else 0.0,
+            "avg_response_time_ms": response_time / calls if calls else 0.0,
+        }
+
+
+def _mask_token(token: Optional[str]) -> Optional[str]:
+    """日志中只保留会话token前缀"""
+    return token[:10] + "..." if token else token
+
+
+def _session_unexpired(expires_at: Optional[str], now: datetime) -> bool:
+    if not expires_at:
+        return True
+    try:
+        return datetime.fromisoformat(expires_at) > now
+    except (TypeError, ValueError):
+        return True
+
+
+class ApiAccessLogWriter:
+    """
+    API访问日志的后台批量写入器
+
+    - enqueue() 只做内存操作，队列满时丢弃新记录并计入 dropped
+    - 后台线程攒够 batch_size 条或距上次写入超过 flush_interval_ms 时写一批
+    - 未带 user_id 的记录按 session_token 在写入前批量补全，日志表只保存token前缀
+    - close() 停止线程并写完剩余记录（应用关闭时调用）
+    """
+
+    _INSERT_SQL = """
+        INSERT INTO api_access_log
+        (timestamp, ip_address, user_agent, method, endpoint, status_code,
+         response_time_ms, user_id, session_token)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
+    def __init__(self, db_path: str,
+                 max_queue_size: int = ACCESS_LOG_QUEUE_SIZE,
+                 batch_size: int = ACCESS_LOG_BATCH_SIZE,
+                 flush_interval_ms: int = ACCESS_LOG_FLUSH_INTERVAL_MS):
+        self.db_path = db_path
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000.0
+
+        self._queue: deque = deque()
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+
+        self.stats = {
+            "enqueued": 0,
+            "written": 0,
+            "dropped": 0,
+            "batches": 0,
+            "write_errors": 0,
+        }
+
+    def enqueue(self, record: tuple) -> bool:
+        """record 字段顺序同 api_access_log 插入列；返回是否入队"""
+        with self._condition:
+            if self._closed or len(self._queue) >= self.max_queue_size:
+                self.stats["dropped"] += 1
+                return False
+            self._queue.append(record)
+            self.stats["enqueued"] += 1
+            if len(self._queue) >= self.batch_size:
+                self._condition.notify()
+        self._ensure_thread()
+        return True
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._condition:
+            if self._closed or (self._thread is not None and self._thread.is_alive()):
+                return
+            self._thread = threading.Thread(target=self._run, name="api-access-log-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if len(self._queue) < self.batch_size and not self._closed:
+                    self._condition.wait(self.flush_interval)
+                if self._closed and not self._queue:
+                    return
+            self.flush()
+
+    def flush(self) -> int:
+        """写入当前队列中的全部记录，返回写入条数"""
+        written = 0
+        with self._write_lock:
+            while True:
+                with self._condition:
+                    batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+                if not batch:
+                    return written
+                written += self._write_batch(batch)
+
+    def _write_batch(self, batch: List[tuple]) -> int:
+        conn = None
+        try:
+            conn = db_connect(self.db_path)
+            batch = self._resolve_sessions(conn, batch)
+            conn.executemany(self._INSERT_SQL, batch)
+            conn.commit()
+            with self._condition:
+                self.stats["written"] += len(batch)
+                self.stats["batches"] += 1
+            return len(batch)
+        except Exception as e:
+            # 写入失败不影响API运行，这一批计入丢弃
+            logger.warning(f"⚠️ API访问日志批量写入失败({len(batch)}条): {e}")
+            with self._condition:
+                self.stats["write_errors"] += 1
+                self.stats["dropped"] += len(batch)
+            return 0
+        finally:
+            if conn is not None:
+                conn.close()
+
+    @staticmethod
+    def _resolve_sessions(conn, batch: List[tuple]) -> List[tuple]:
+        """
+        补全用户并脱敏 session_token
+
+        user_id 为空而带 token 的记录依次在 user_sessions（RBAC）、unified_sessions（统一认证）
+        中查找未过期的会话；都找不到的记为 anonymous，并按原中间件的做法记录
+        INVALID_TOKEN_ACCESS 安全事件。写入日志表的 token 只保留前缀。
+        """
+        tokens = {record[8] for record in batch if record[7] is None and record[8]}
+        users: Dict[str, str] = {}
+        if tokens:
+            now = datetime.now()
+            token_list = list(tokens)
+            for sql in (
+                "SELECT session_token, user_id, expires_at FROM user_sessions "
+                "WHERE is_active = 1 AND session_token IN ({})",
+                "SELECT session_id, user_id, expires_at FROM unified_sessions "
+                "WHERE session_status = 'active' AND session_id IN ({})",
+            ):
+                pending = [token for token in token_list if token not in users]
+                for start in range(0, len(pending), 500):
+                    chunk = pending[start:start + 500]
+                    try:
+                        rows = conn.execute(sql.format(",".join("?" * len(chunk))), chunk).fetchall()
+                    except sqlite3.Error as e:
+                        logger.debug(f"API访问日志用户补全失败: {e}")
+                        break
+                    for token, user_id, expires_at in rows:
+                        if _session_unexpired(expires_at, now):
+                            users[token] = user_id
+
+        records, invalid_events = [], []
+        for record in batch:
+            user_id, token = record[7], record[8]
+            if user_id is None:
+                user_id = users.get(token, "anonymous")
+                if token and token not in users:
+                    invalid_events.append((
+                        "INVALID_TOKEN_ACCESS", None, record[1], record[2], record[0],
+                        json.dumps({"token": _mask_token(token)}), "MEDIUM"
+                    ))
+            records.append(record[:7] + (user_id, _mask_token(token)))
+
+        if invalid_events:
+            try:
+                conn.executemany("""
+                    INSERT INTO security_events
+                    (event_type, user_id, ip_address, user_agent, timestamp, details, risk_level)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, invalid_events)
+            except sqlite3.Error as e:
+                logger.debug(f"无效token安全事件写入失败: {e}")
+        return records
+
+    def close(self, timeout: float = 5.0):
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+        self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._condition:
+            stats = dict(self.stats)
+            stats["queued"] = len(self._queue)
+        stats["max_queue_size"] = self.max_queue_size
+        stats["batch_size"] = self.batch_size
+        stats["flush_interval_ms"] = int(self.flush_interval * 1000)
+        return stats
+
+
 class SecurityMonitor:
     """安全监控器"""
     
@@ -59,6 +328,10 @@ class SecurityMonitor:
         self.active_alerts: Dict[str, SecurityAlert] = {}
         self._init_monitoring_tables()
         
+        # API访问日志：后台批量写库 + 内存滚动聚合
+        self.access_log_writer = ApiAccessLogWriter(db_path)
+        self.api_stats = RollingApiStats()
+        
         # 告警规则配置
         self.alert_rules = {
             "failed_login_threshold": 5,        # 1小时内失败登录次数
@@ -226,25 +499,13 @@ class SecurityMonitor:
         return alerts
     
     def _analyze_api_anomalies(self) -> List[SecurityAlert]:
-        """分析API访问异常"""
+        """分析API访问异常（读取最近1小时的内存聚合）"""
         alerts = []
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        since = (datetime.now() - timedelta(hours=1)).isoformat()
-        
-        # 查询API调用频率异常
-        cursor.execute("""
-            SELECT ip_address, COUNT(*) as api_calls,
-                   COUNT(CASE WHEN status_code >= 400 THEN 1 END) as error_calls
-            FROM api_access_log
-            WHERE timestamp > ?
-            GROUP BY ip_address
-            HAVING COUNT(*) >= ?
-        """, (since, self.alert_rules["api_rate_limit"]))
         
-        for row in cursor.fetchall():
-            ip_address, api_calls, error_calls = row
+        # API调用频率异常
+        for ip_address, (api_calls, error_calls) in self.api_stats.per_ip().items():
+            if api_calls < self.alert_rules["api_rate_limit"]:
+                continue
             error_rate = error_calls / api_calls if api_calls > 0 else 0
             
             # 高频率访问告警
@@ -283,7 +544,6 @@ class SecurityMonitor:
                 )
                 alerts.append(alert)
         
-        conn.close()
         return alerts
     
     def _analyze_session_anomalies(self) -> List[SecurityAlert]:
@@ -427,30 +687,36 @@ class SecurityMonitor:
     def log_api_access(self, ip_address: str, user_agent: str, method: str,
                       endpoint: str, status_code: int, response_time_ms: float,
                       user_id: Optional[str] = None, session_token: Optional[str] = None):
-        """记录API访问日志"""
+        """
+        记录API访问日志
+        
+        只做内存操作（入队 + 更新滚动聚合），写库由后台线程批量完成；
+        user_id 为空时按 session_token 在写入前补全，无法补全记为 anonymous
+        并记录 INVALID_TOKEN_ACCESS 安全事件。
+        """
         try:
-            # 🔑 修复：添加超时和错误处理，避免数据库锁定影响API性能
-            conn = sqlite3.connect(self.db_path, timeout=1.0)  # 1秒超时
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                INSERT INTO api_access_log
-                (timestamp, ip_address, user_agent, method, endpoint, status_code,
-                 response_time_ms, user_id, session_token)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+            self.api_stats.record(ip_address, status_code, response_time_ms)
+            self.access_log_writer.enqueue((
                 datetime.now().isoformat(), ip_address, user_agent, method,
                 endpoint, status_code, response_time_ms, user_id, session_token
             ))
-            
-            conn.commit()
-            conn.close()
-        except sqlite3.OperationalError as e:
-            # 数据库锁定时静默失败，不影响API正常运行
-            print(f"⚠️ API访问日志记录失败: {e}")
         except Exception as e:
-            # 其他错误也不影响API
-            print(f"⚠️ 安全监控记录失败: {e}")
+            # 日志记录失败不影响API
+            logger.warning(f"⚠️ 安全监控记录失败: {e}")
+    
+    def flush_access_log(self) -> int:
+        """立即写入队列中的API访问日志"""
+        return self.access_log_writer.flush()
+    
+    def get_access_log_stats(self) -> Dict[str, Any]:
+        """访问日志队列统计（入队、写入、丢弃、批次）与最近1小时聚合"""
+        stats = self.access_log_writer.get_stats()
+        stats["last_hour"] = self.api_stats.totals()
+        return stats
+    
+    def shutdown(self):
+        """停止后台写入并写完剩余日志"""
+        self.access_log_writer.close()
     
     def get_security_dashboard_data(self) -> Dict[str, Any]:
         """获取安全仪表板数据"""
@@ -8,22 +8,38 @@
 2. 统一会话管理 (基于unified_sessions)
 3. 统一权限控制 (基于user_roles_new)
 4. 向下兼容 (支持旧系统token)
+
+会话验证几乎发生在每个已认证请求上。验证结果按token在进程内短期缓存（默认30秒），
+登出、角色变更、密码修改、账户禁用时显式失效；last_activity_at 不再每次请求都写库，
+而是每个token每分钟至多记录一次，由后台线程在单个事务中批量写入。
+失效同时写入共享的 session_cache_revocations 表，各worker在缓存命中时至多每秒读取一次
+新增记录并剔除对应缓存，因此登出、禁用在其他worker上最迟约1秒后生效。
 """
 
 import sqlite3
 import hashlib
 import secrets
 import logging
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List, Set
-from dataclasses import dataclass
+from typing import Dict, Any, Optional, List, Set, Tuple
+from dataclasses import dataclass, replace
 from enum import Enum
 
 from fastapi import Request, HTTPException
 from pydantic import BaseModel
 
+from core.database.connection import connect as db_connect
+
 logger = logging.getLogger(__name__)
 
+# 会话缓存与活动时间写入参数
+SESSION_CACHE_TTL_SECONDS = 30          # 会话验证结果缓存时间
+SESSION_CACHE_MAX_ENTRIES = 10000       # 缓存token数上限
+ACTIVITY_FLUSH_INTERVAL_SECONDS = 60    # 每个token的 last_activity_at 至多每分钟写一次
+REVOCATION_CHECK_INTERVAL_SECONDS = 1   # 缓存命中时至多每秒检查一次其他worker写入的失效记录
+
 
 # ============================================
 # 数据模型定义
@@ -90,15 +106,52 @@ class LoginResponse(BaseModel):
 class UnifiedAuthService:
     """统一认证服务"""
 
-    def __init__(self, db_path: str = "/home/ute/tcm-ai/data/user_history.sqlite"):
+    def __init__(self, db_path: str = "/home/ute/tcm-ai/data/user_history.sqlite",
+                 session_cache_ttl: float = SESSION_CACHE_TTL_SECONDS,
+                 activity_flush_interval: float = ACTIVITY_FLUSH_INTERVAL_SECONDS,
+                 revocation_check_interval: float = REVOCATION_CHECK_INTERVAL_SECONDS):
         self.db_path = db_path
+        self.session_cache_ttl = session_cache_ttl
+        self.activity_flush_interval = activity_flush_interval
+        self.revocation_check_interval = revocation_check_interval
+
+        # token -> (缓存截止时间(monotonic), UserSession)；user_id -> tokens，用于按用户失效
+        self._session_cache: Dict[str, Tuple[float, UserSession]] = {}
+        self._user_tokens: Dict[str, Set[str]] = {}
+        self._cache_lock = threading.Lock()
+
+        # 跨worker失效记录：已读取到的最大记录id与下次检查时间(monotonic)
+        self._revocation_cursor = 0
+        self._next_revocation_check = 0.0
+        self._revocation_table_ready = False
+        self._revocation_lock = threading.Lock()
+
+        # 待写入的活动时间：token -> ISO时间；token -> 最近一次记录的monotonic时间
+        self._pending_activity: Dict[str, str] = {}
+        self._activity_marks: Dict[str, float] = {}
+        self._activity_lock = threading.Lock()
+        self._flush_thread: Optional[threading.Thread] = None
+        self._flush_stop = threading.Event()
+
+        # 认证开销统计，见 get_stats()
+        self._stats = {
+            'verify_calls': 0,
+            'cache_hits': 0,
+            'cache_misses': 0,
+            'verify_seconds': 0.0,
+            'activity_flushes': 0,
+            'activity_rows_written': 0,
+            'invalidations': 0,
+            'remote_invalidations': 0,
+        }
+        self._stats_lock = threading.Lock()
+
         logger.info("🔐 统一认证服务初始化...")
 
     def _get_connection(self):
         """获取数据库连接"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        # 连接池借出，close() 即归还
+        return db_connect(self.db_path, row_factory=sqlite3.Row)
 
     # ============================================
     # 登录认证
@@ -384,10 +437,47 @@ class UnifiedAuthService:
         Returns:
             UserSession对象 或 None (会话无效)
         """
+        started = time.perf_counter()
+        hit = False
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
+            user_session = self._get_cached_session(session_token)
+            hit = user_session is not None
+            if user_session is None:
+                user_session = self._load_session(session_token)
+                if user_session is None:
+                    return None
+                self._cache_session(user_session)
+
+            # 更新最后活动时间（去抖后由后台批量写入）
+            self._record_activity(session_token)
+
+            # 返回副本，调用方修改不影响缓存
+            return replace(
+                user_session,
+                last_activity=datetime.now(),
+                roles=list(user_session.roles),
+                device_info=dict(user_session.device_info),
+                profile=dict(user_session.profile),
+                permissions=set(user_session.permissions)
+            )
 
+        except Exception as e:
+            logger.error(f"❌ 会话验证失败: {e}", exc_info=True)
+            return None
+
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._stats_lock:
+                self._stats['verify_calls'] += 1
+                self._stats['cache_hits' if hit else 'cache_misses'] += 1
+                self._stats['verify_seconds'] += elapsed
+
+    def _load_session(self, session_token: str) -> Optional[UserSession]:
+        """从数据库加载会话（会话、用户、角色、角色专属信息）"""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        try:
             # 1. 查询会话
             cursor.execute("""
                 SELECT s.*, u.*
@@ -401,60 +491,287 @@ class UnifiedAuthService:
 
             row = cursor.fetchone()
             if not row:
-                conn.close()
                 return None
 
             session_data = dict(row)
+        finally:
+            conn.close()
 
-            # 2. 获取用户角色
-            roles = self._get_user_roles(session_data['user_id'])
-            if not roles:
-                conn.close()
+        # 2. 获取用户角色
+        roles = self._get_user_roles(session_data['user_id'])
+        if not roles:
+            return None
+
+        # 3. 加载角色专属信息
+        profile = self._load_role_profile(session_data['user_id'], roles)
+
+        # 4. 构建UserSession对象
+        primary_role = next(
+            (r['role_name'] for r in roles if r.get('is_primary')),
+            roles[0]['role_name'] if roles else 'ANONYMOUS'
+        )
+
+        user_session = UserSession(
+            session_id=session_token,
+            user_id=session_data['user_id'],
+            username=session_data['username'],
+            display_name=session_data['display_name'],
+            roles=[r['role_name'] for r in roles],
+            primary_role=primary_role,
+            created_at=datetime.fromisoformat(session_data['created_at']),
+            expires_at=datetime.fromisoformat(session_data['expires_at']),
+            last_activity=datetime.now(),
+            ip_address=session_data['ip_address'],
+            user_agent=session_data['user_agent'],
+            device_info={},
+            profile=profile,
+            permissions=set(),
+            is_active=True,
+            session_status=session_data['session_status']
+        )
+
+        logger.debug(f"✅ 会话验证成功: user={session_data['username']}, roles={user_session.roles}")
+        return user_session
+
+    # ============================================
+    # 会话缓存
+    # ============================================
+
+    def _get_cached_session(self, session_token: str) -> Optional[UserSession]:
+        if self.session_cache_ttl <= 0:
+            return None
+        self._sync_revocations()
+        with self._cache_lock:
+            entry = self._session_cache.get(session_token)
+            if entry is None:
                 return None
+            deadline, user_session = entry
+            if time.monotonic() >= deadline:
+                self._drop_cached_token(session_token)
+                return None
+            return user_session
 
-            # 3. 加载角色专属信息
-            profile = self._load_role_profile(session_data['user_id'], roles)
+    def _cache_session(self, user_session: UserSession):
+        if self.session_cache_ttl <= 0:
+            return
+        now = time.monotonic()
+        # 不超过会话本身的过期时间
+        remaining = (user_session.expires_at - datetime.now()).total_seconds()
+        deadline = now + max(0.0, min(self.session_cache_ttl, remaining))
+
+        with self._cache_lock:
+            if len(self._session_cache) >= SESSION_CACHE_MAX_ENTRIES:
+                for token in [t for t, (d, _) in self._session_cache.items() if d <= now]:
+                    self._drop_cached_token(token)
+                while len(self._session_cache) >= SESSION_CACHE_MAX_ENTRIES:
+                    self._drop_cached_token(next(iter(self._session_cache)))
+            self._session_cache[user_session.session_id] = (deadline, user_session)
+            self._user_tokens.setdefault(user_session.user_id, set()).add(user_session.session_id)
+
+    def _drop_cached_token(self, session_token: str):
+        """调用方需持有 _cache_lock"""
+        entry = self._session_cache.pop(session_token, None)
+        if entry is None:
+            return
+        user_id = entry[1].user_id
+        tokens = self._user_tokens.get(user_id)
+        if tokens is not None:
+            tokens.discard(session_token)
+            if not tokens:
+                del self._user_tokens[user_id]
+
+    def invalidate_session(self, session_token: str):
+        """使单个会话的缓存失效（登出、会话撤销时调用，需在数据库变更提交之后）"""
+        with self._cache_lock:
+            self._drop_cached_token(session_token)
+        self._publish_revocation(session_id=session_token)
+        with self._stats_lock:
+            self._stats['invalidations'] += 1
+
+    def invalidate_user(self, user_id: str):
+        """使用户全部会话的缓存失效（角色变更、密码修改、账户状态变更时调用，需在数据库变更提交之后）"""
+        with self._cache_lock:
+            self._drop_user_tokens(user_id)
+        self._publish_revocation(user_id=user_id)
+        with self._stats_lock:
+            self._stats['invalidations'] += 1
+
+    def _drop_user_tokens(self, user_id: str):
+        """调用方需持有 _cache_lock"""
+        for token in list(self._user_tokens.get(user_id, ())):
+            self._drop_cached_token(token)
 
-            # 4. 更新最后活动时间
-            cursor.execute("""
-                UPDATE unified_sessions
-                SET last_activity_at = ?
-                WHERE session_id = ?
-            """, (datetime.now().isoformat(), session_token))
+    # ============================================
+    # 跨worker失效
+    # ============================================
+
+    def _ensure_revocation_table(self, conn):
+        if self._revocation_table_ready:
+            return
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS session_cache_revocations (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id TEXT,
+                user_id TEXT,
+                revoked_at REAL NOT NULL
+            )
+        """)
+        self._revocation_table_ready = True
+
+    def _publish_revocation(self, session_id: Optional[str] = None, user_id: Optional[str] = None):
+        """写入失效记录供其他worker读取；超过缓存TTL的旧记录已无意义，顺带清理"""
+        if self.session_cache_ttl <= 0:
+            return
+        now = time.time()
+        conn = self._get_connection()
+        try:
+            self._ensure_revocation_table(conn)
+            conn.execute(
+                "INSERT INTO session_cache_revocations (session_id, user_id, revoked_at) VALUES (?, ?, ?)",
+                (session_id, user_id, now)
+            )
+            conn.execute(
+                "DELETE FROM session_cache_revocations WHERE revoked_at < ?",
+                (now - 2 * self.session_cache_ttl,)
+            )
             conn.commit()
+        except Exception as e:
+            logger.warning(f"会话失效记录写入失败，其他worker将在缓存到期后失效: {e}")
+        finally:
             conn.close()
 
-            # 5. 构建UserSession对象
-            primary_role = next(
-                (r['role_name'] for r in roles if r.get('is_primary')),
-                roles[0]['role_name'] if roles else 'ANONYMOUS'
-            )
+    def _sync_revocations(self):
+        """读取其他worker写入的失效记录并剔除本地缓存，同一时间只有一个线程查询"""
+        now = time.monotonic()
+        if now < self._next_revocation_check:
+            return
+        if not self._revocation_lock.acquire(blocking=False):
+            return
+        try:
+            if now < self._next_revocation_check:
+                return
+            self._next_revocation_check = now + self.revocation_check_interval
 
-            user_session = UserSession(
-                session_id=session_token,
-                user_id=session_data['user_id'],
-                username=session_data['username'],
-                display_name=session_data['display_name'],
-                roles=[r['role_name'] for r in roles],
-                primary_role=primary_role,
-                created_at=datetime.fromisoformat(session_data['created_at']),
-                expires_at=datetime.fromisoformat(session_data['expires_at']),
-                last_activity=datetime.now(),
-                ip_address=session_data['ip_address'],
-                user_agent=session_data['user_agent'],
-                device_info={},
-                profile=profile,
-                permissions=set(),
-                is_active=True,
-                session_status=session_data['session_status']
+            conn = self._get_connection()
+            try:
+                self._ensure_revocation_table(conn)
+                # 表中只保留最近两个TTL内的记录，首次检查全部读取也很便宜
+                rows = conn.execute(
+                    "SELECT id, session_id, user_id FROM session_cache_revocations WHERE id > ? ORDER BY id",
+                    (self._revocation_cursor,)
+                ).fetchall()
+                if rows:
+                    self._revocation_cursor = rows[-1]['id']
+            finally:
+                conn.close()
+        except Exception as e:
+            logger.warning(f"读取会话失效记录失败: {e}")
+            return
+        finally:
+            self._revocation_lock.release()
+
+        if not rows:
+            return
+        with self._cache_lock:
+            for row in rows:
+                if row['session_id']:
+                    self._drop_cached_token(row['session_id'])
+                if row['user_id']:
+                    self._drop_user_tokens(row['user_id'])
+        with self._stats_lock:
+            self._stats['remote_invalidations'] += len(rows)
+
+    def clear_session_cache(self):
+        """清空会话缓存"""
+        with self._cache_lock:
+            self._session_cache.clear()
+            self._user_tokens.clear()
+
+    # ============================================
+    # 活动时间批量写入
+    # ============================================
+
+    def _record_activity(self, session_token: str):
+        """记录会话活动；同一token在刷新间隔内只记录一次"""
+        now = time.monotonic()
+        with self._activity_lock:
+            last = self._activity_marks.get(session_token)
+            if last is not None and now - last < self.activity_flush_interval:
+                return
+            self._activity_marks[session_token] = now
+            self._pending_activity[session_token] = datetime.now().isoformat()
+        self._ensure_flush_thread()
+
+    def _ensure_flush_thread(self):
+        if self._flush_thread is not None and self._flush_thread.is_alive():
+            return
+        with self._activity_lock:
+            if self._flush_thread is not None and self._flush_thread.is_alive():
+                return
+            self._flush_stop.clear()
+            self._flush_thread = threading.Thread(
+                target=self._flush_loop, name="unified-auth-activity", daemon=True
             )
+            self._flush_thread.start()
 
-            logger.debug(f"✅ 会话验证成功: user={session_data['username']}, roles={user_session.roles}")
-            return user_session
+    def _flush_loop(self):
+        while not self._flush_stop.wait(self.activity_flush_interval):
+            self.flush_activity()
+
+    def flush_activity(self) -> int:
+        """把待写入的 last_activity_at 在一个事务内写入数据库，返回写入条数"""
+        with self._activity_lock:
+            pending = self._pending_activity
+            self._pending_activity = {}
+            # 清理早已超过刷新间隔的标记，避免长期运行时无限增长
+            cutoff = time.monotonic() - self.activity_flush_interval
+            self._activity_marks = {t: m for t, m in self._activity_marks.items() if m > cutoff}
+
+        if not pending:
+            return 0
 
+        conn = self._get_connection()
+        try:
+            conn.executemany("""
+                UPDATE unified_sessions
+                SET last_activity_at = ?
+                WHERE session_id = ?
+                AND session_status = 'active'
+            """, [(activity_at, token) for token, activity_at in pending.items()])
+            conn.commit()
         except Exception as e:
-            logger.error(f"❌ 会话验证失败: {e}", exc_info=True)
-            return None
+            logger.warning(f"会话活动时间批量写入失败: {e}")
+            return 0
+        finally:
+            conn.close()
+
+        with self._stats_lock:
+            self._stats['activity_flushes'] += 1
+            self._stats['activity_rows_written'] += len(pending)
+        return len(pending)
+
+    def shutdown(self):
+        """停止后台写入线程并写入剩余活动时间（应用关闭时调用）"""
+        self._flush_stop.set()
+        if self._flush_thread is not None:
+            self._flush_thread.join(timeout=5)
+        self.flush_activity()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """会话缓存与认证开销统计"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        with self._cache_lock:
+            stats['cached_sessions'] = len(self._session_cache)
+        with self._activity_lock:
+            stats['pending_activity'] = len(self._pending_activity)
+        calls = stats['verify_calls']
+        stats['avg_verify_ms'] = round(stats['verify_seconds'] * 1000 / calls, 3) if calls else 0.0
+        stats['cache_hit_rate'] = round(stats['cache_hits'] / calls, 3) if calls else 0.0
+        stats['session_cache_ttl'] = self.session_cache_ttl
+        stats['activity_flush_interval'] = self.activity_flush_interval
+        stats['revocation_check_interval'] = self.revocation_check_interval
+        return stats
 
     # ============================================
     # 登出
@@ -462,6 +779,10 @@ class UnifiedAuthService:
 
     async def logout(self, session_token: str) -> bool:
         """登出"""
+        with self._activity_lock:
+            self._pending_activity.pop(session_token, None)
+            self._activity_marks.pop(session_token, None)
+
         try:
             conn = self._get_connection()
             cursor = conn.cursor()
@@ -476,11 +797,15 @@ class UnifiedAuthService:
             conn.commit()
             conn.close()
 
+            # 会话状态提交后再失效缓存，避免其他worker在提交前重新加载到活跃会话
+            self.invalidate_session(session_token)
+
             logger.info(f"✅ 登出成功: session={session_token[:16]}...")
             return True
 
         except Exception as e:
             logger.error(f"❌ 登出失败: {e}")
+            self.invalidate_session(session_token)
             return False
 
 
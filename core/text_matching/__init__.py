@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""
+文本多模式匹配模块
+"""
+
+from .aho_corasick import AhoCorasickAutomaton
+from .symptom_lexicon import (
+    LexiconHit,
+    LexiconScan,
+    SymptomLexicon,
+    get_symptom_lexicon,
+    lexicon_request_scope
+)
+
+__all__ = [
+    'AhoCorasickAutomaton',
+    'LexiconHit',
+    'LexiconScan',
+    'SymptomLexicon',
+    'get_symptom_lexicon',
+    'lexicon_request_scope'
+]
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Aho–Corasick 多模式匹配自动机
+
+检索加成、药材提取、症状识别等场景都需要在一段文本中查找成百上千个词条，
+逐词条 `term in text` 的开销与词条数成正比。自动机对全部词条只构建一次，
+之后每段文本单遍扫描即可得到所有（含重叠、互相包含的）命中。
+
+纯Python实现，无第三方依赖。
+"""
+
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+
+class AhoCorasickAutomaton:
+    """
+    多模式匹配自动机
+
+    用法：
+        automaton = AhoCorasickAutomaton()
+        automaton.add("高血压", value)
+        automaton.build()
+        for start, end, pattern, value in automaton.iter_matches(text): ...
+    """
+
+    __slots__ = ("_goto", "_fail", "_outputs", "_patterns", "_built")
+
+    def __init__(self, patterns: Optional[Iterable[str]] = None):
+        # 状态0为根；_goto[state] 为 字符 -> 下一状态
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # 每个状态的输出：(模式长度, 模式, 值)，已合并失败链上的输出
+        self._outputs: List[List[Tuple[int, str, Any]]] = [[]]
+        self._patterns: Dict[str, Any] = {}
+        self._built = False
+        if patterns is not None:
+            for pattern in patterns:
+                self.add(pattern)
+            self.build()
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def __contains__(self, pattern: str) -> bool:
+        return pattern in self._patterns
+
+    def add(self, pattern: str, value: Any = None):
+        """添加模式；同一模式重复添加时以最后一次的值为准"""
+        if not pattern:
+            return
+        if self._built:
+            raise RuntimeError("automaton already built")
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            state = next_state
+        self._outputs[state] = [(len(pattern), pattern, value)]
+        self._patterns[pattern] = value
+
+    def build(self) -> "AhoCorasickAutomaton":
+        """计算失败指针（BFS），完成后不可再添加模式"""
+        queue = deque()
+        for state in self._goto[0].values():
+            self._fail[state] = 0
+            queue.append(state)
+
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                if self._outputs[self._fail[next_state]]:
+                    self._outputs[next_state] = self._outputs[next_state] + self._outputs[self._fail[next_state]]
+
+        self._built = True
+        return self
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, str, Any]]:
+        """
+        扫描文本，产出所有命中 (start, end, pattern, value)
+
+        同一结束位置上较长的模式先产出。
+        """
+        if not self._built:
+            self.build()
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if outputs[state]:
+                end = index + 1
+                for length, pattern, value in outputs[state]:
+                    yield end - length, end, pattern, value
+
+    def find_all(self, text: str) -> Set[str]:
+        """文本中出现过的全部模式"""
+        return {pattern for _, _, pattern, _ in self.iter_matches(text)}
+
+    def find_longest(self, text: str) -> List[Tuple[int, int, str, Any]]:
+        """
+        从左到右的最长不重叠匹配
+
+        适用于词条互相包含的场景（如"炙甘草"与"甘草"），只保留较长的那个。
+        """
+        matches = sorted(self.iter_matches(text), key=lambda m: (m[0], -(m[1] - m[0])))
+        result = []
+        cursor = 0
+        for match in matches:
+            if match[0] >= cursor:
+                result.append(match)
+                cursor = match[1]
+        return result
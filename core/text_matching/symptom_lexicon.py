@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+症状词表匹配服务
+
+问诊每轮对话要对同一条消息反复做 `for kw in keywords: if kw in text` 扫描：
+ConversationAnalyzer（症状、结束语、紧急情况、处方提示词）、DecisionTreeMatcher
+（症状、证候关键词、疾病别名）、PersonalizedLearningSystem、UnifiedConsultationService
+各有一份词表。本模块把这些词表按类别合并进一个 Aho–Corasick 自动机，
+一段文本只扫描一遍即得到全部类别的命中；各调用方仍按自己的类别取结果，语义不变。
+
+扫描结果在请求范围内按消息缓存（见 lexicon_request_scope），
+同一请求里多个组件分析同一条消息时只扫描一次。
+"""
+
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from .aho_corasick import AhoCorasickAutomaton
+
+# ----------------------------------------------------------------------
+# 词表（类别 -> 词条）
+# ----------------------------------------------------------------------
+
+# ConversationAnalyzer 症状关键词
+SYMPTOM_KEYWORDS = (
+    '头痛', '头晕', '头胀', '偏头痛', '头重',
+    '失眠', '多梦', '易醒', '入睡困难', '睡眠浅',
+    '胃痛', '胃胀', '胃酸', '消化不良', '恶心', '呕吐',
+    '便秘', '腹泻', '大便干', '大便稀', '腹胀', '腹痛',
+    '咳嗽', '咳痰', '气喘', '胸闷', '气短',
+    '乏力', '疲劳', '精神差', '倦怠', '无力',
+    '心慌', '心悸', '胸痛', '心跳快',
+    '腰痛', '腰酸', '腿软', '膝盖痛', '关节痛',
+    '月经不调', '痛经', '白带异常', '性功能减退',
+    '眼干', '眼涩', '视力模糊', '耳鸣', '听力下降',
+    '口干', '口苦', '口臭', '牙痛', '咽喉痛',
+    '皮肤干燥', '皮疹', '瘙痒', '湿疹',
+)
+
+# 明确的结束表达（单独成句的客套话如"谢谢"、"好的"容易误判，不收录）
+END_NATURAL_PHRASES = (
+    '谢谢医生', '谢谢大夫', '多谢了', '感谢医生', '明白了谢谢',
+    '先这样吧', '就这样吧', '够了', '可以了', '不用了',
+    '再见', '拜拜', '就到这里', '问诊结束', '暂时不问了',
+)
+
+END_SATISFIED_PHRASES = (
+    '很满意', '非常满意', '满意的', '很有帮助', '非常有用',
+    '清楚了谢谢', '明白了谢谢', '知道怎么做了',
+)
+
+EMERGENCY_KEYWORDS = (
+    '剧痛', '剧烈疼痛', '无法忍受', '痛得厉害',
+    '呼吸困难', '喘不过气', '胸痛厉害', '心慌严重',
+    '昏迷', '意识不清', '抽搐', '痉挛',
+    '大出血', '出血不止', '吐血', '大量便血',  # 只有"大量便血"才是紧急情况
+    '高热', '发烧很厉害', '烧得很高',
+    '急诊', '需要急救', '送医院', '叫救护车',
+)
+
+# AI回复中的处方提示词
+PRESCRIPTION_CUES = (
+    '处方', '方剂', '药方', '中药', '汤剂',
+    '君药', '臣药', '佐药', '使药',
+    '克', 'g', '煎服', '水煎', '用法',
+    '每日', '每天', '早晚', '饭前', '饭后',
+)
+
+# DecisionTreeMatcher.extract_symptoms_from_text
+TREE_SYMPTOM_KEYWORDS = (
+    "头痛", "头疼", "发热", "发烧", "咳嗽", "失眠", "多梦",
+    "胃痛", "腹痛", "腹泻", "便秘", "心悸", "心慌", "乏力",
+    "食欲不振", "恶心", "呕吐", "胸闷", "气短", "眩晕",
+    "耳鸣", "怕冷", "怕热", "出汗", "盗汗", "口干", "口苦",
+    "咽痛", "鼻塞", "流涕", "腰痛", "膝痛", "关节痛",
+)
+
+# 决策树证候描述与患者描述的关键症状词（降级匹配、候选预筛）
+SYNDROME_KEYWORDS = (
+    "发热", "恶寒", "恶风", "头痛", "咳嗽", "咽痛", "鼻塞",
+    "口渴", "汗出", "胃痛", "腹痛", "便秘", "腹泻", "失眠",
+    "心悸", "气短", "乏力", "舌红", "舌淡", "苔黄", "苔白",
+    "脉浮", "脉沉", "脉数", "脉迟",
+)
+
+# PersonalizedLearningSystem 症状词典
+LEARNING_SYMPTOM_KEYWORDS = (
+    "头痛", "头晕", "发热", "咳嗽", "胸闷", "心悸", "失眠", "多梦",
+    "便秘", "腹泻", "恶心", "呕吐", "食欲", "乏力", "疲劳", "出汗",
+    "口干", "口苦", "舌苔", "脉象", "腰痛", "关节痛", "水肿",
+    "月经", "白带", "小便", "大便", "咽痛", "鼻塞", "流涕",
+)
+
+# UnifiedConsultationService 问诊摘要症状词
+SUMMARY_SYMPTOM_KEYWORDS = (
+    "头痛", "头晕", "胃痛", "腹痛", "咳嗽", "失眠", "便秘", "腹泻",
+    "乏力", "心慌", "胸闷", "恶心", "呕吐", "发热", "口干", "盗汗",
+)
+
+# 疾病名 -> 别名（顺序即同位置命中时的优先级）
+DISEASE_ALIASES: Mapping[str, Tuple[str, ...]] = {
+    "感冒": ("感冒", "风寒感冒", "风热感冒", "外感", "伤风", "时行感冒"),
+    "咳嗽": ("咳嗽", "咳", "干咳", "痰多咳嗽", "咳痰"),
+    "失眠": ("失眠", "不寐", "睡眠障碍", "入睡困难", "多梦"),
+    "胃痛": ("胃痛", "胃脘痛", "脘痛", "胃胀", "脾胃不和"),
+    "头痛": ("头痛", "头疼", "偏头痛", "巅顶痛"),
+    "腹泻": ("腹泻", "泄泻", "大便溏薄", "便溏"),
+    "便秘": ("便秘", "大便秘结", "大便难"),
+    "心悸": ("心悸", "心慌", "怔忡"),
+    "眩晕": ("眩晕", "头晕", "晕"),
+    "腰痛": ("腰痛", "腰酸", "腰部疼痛"),
+}
+
+DEFAULT_CATEGORIES: Mapping[str, Sequence[str]] = {
+    "symptom": SYMPTOM_KEYWORDS,
+    "end_natural": END_NATURAL_PHRASES,
+    "end_satisfied": END_SATISFIED_PHRASES,
+    "emergency": EMERGENCY_KEYWORDS,
+    "prescription_cue": PRESCRIPTION_CUES,
+    "tree_symptom": TREE_SYMPTOM_KEYWORDS,
+    "syndrome_keyword": SYNDROME_KEYWORDS,
+    "learning_symptom": LEARNING_SYMPTOM_KEYWORDS,
+    "summary_symptom": SUMMARY_SYMPTOM_KEYWORDS,
+}
+
+
+@dataclass(frozen=True)
+class LexiconHit:
+    """一次词条命中"""
+    start: int
+    end: int
+    term: str
+    category: str
+    label: Optional[str] = None  # 疾病别名命中时为所属疾病名
+
+
+class LexiconScan:
+    """一段文本的全部命中（按出现位置排序，同位置长词在前），只读"""
+
+    __slots__ = ("text", "hits", "_by_category")
+
+    def __init__(self, text: str, hits: List[LexiconHit]):
+        self.text = text
+        self.hits = tuple(hits)
+        by_category: Dict[str, List[LexiconHit]] = {}
+        for hit in self.hits:
+            by_category.setdefault(hit.category, []).append(hit)
+        self._by_category = by_category
+
+    def hits_in(self, category: str) -> List[LexiconHit]:
+        return self._by_category.get(category, [])
+
+    def has(self, category: str) -> bool:
+        return category in self._by_category
+
+    def first(self, category: str) -> Optional[LexiconHit]:
+        hits = self._by_category.get(category)
+        return hits[0] if hits else None
+
+    def terms(self, category: str) -> List[str]:
+        """类别内命中的不同词条，按首次出现顺序"""
+        return list(dict.fromkeys(hit.term for hit in self.hits_in(category)))
+
+
+
+class SymptomLexicon:
+    """按类别标注的词表自动机，构建后只读，可跨线程共享"""
+
+    def __init__(self, categories: Optional[Mapping[str, Iterable[str]]] = None,
+                 disease_aliases: Optional[Mapping[str, Iterable[str]]] = None):
+        categories = DEFAULT_CATEGORIES if categories is None else categories
+        disease_aliases = DISEASE_ALIASES if disease_aliases is None else disease_aliases
+
+        tags: Dict[str, List[Tuple[str, Optional[str]]]] = {}
+        for category, terms in categories.items():
+            for term in terms:
+                tags.setdefault(term, []).append((category, None))
+        for disease, aliases in disease_aliases.items():
+            for alias in aliases:
+                tags.setdefault(alias, []).append(("disease_alias", disease))
+
+        self.categories = frozenset(categories) | {"disease_alias"}
+        self.disease_order = {disease: index for index, disease in enumerate(disease_aliases)}
+        # (疾病, 别名) -> 别名在该疾病别名表中的序号
+        self._alias_rank = {
+            (disease, alias): rank
+            for disease, aliases in disease_aliases.items()
+            for rank, alias in enumerate(aliases)
+        }
+        self._automaton = AhoCorasickAutomaton()
+        for term, term_tags in tags.items():
+            self._automaton.add(term, tuple(term_tags))
+        self._automaton.build()
+
+    def disease_positions(self, scan: LexiconScan) -> Dict[str, int]:
+        """
+        各疾病的命中位置：按别名表顺序第一个出现在文本中的别名，取其首次出现位置
+
+        与逐个别名 `alias in text` 命中即跳出、再取 text.find(alias) 的结果一致；
+        位置不一定是该疾病任一别名的最早出现位置。
+        """
+        best: Dict[str, Tuple[int, int]] = {}
+        for hit in scan.hits_in("disease_alias"):
+            rank = self._alias_rank[(hit.label, hit.term)]
+            current = best.get(hit.label)
+            # 命中按位置排序，同一别名先到者即首次出现位置
+            if current is None or rank < current[0]:
+                best[hit.label] = (rank, hit.start)
+        return {disease: position for disease, (_, position) in best.items()}
+
+    def _scan_uncached(self, text: str) -> LexiconScan:
+        hits = [
+            LexiconHit(start, end, term, category, label)
+            for start, end, term, term_tags in self._automaton.iter_matches(text)
+            for category, label in term_tags
+        ]
+        hits.sort(key=lambda hit: (hit.start, hit.start - hit.end))
+        return LexiconScan(text, hits)
+
+    def scan(self, text: str) -> LexiconScan:
+        """扫描文本；处于 lexicon_request_scope 内时按消息缓存"""
+        if not text:
+            return LexiconScan("", [])
+        cache = _request_cache.get()
+        if cache is None:
+            return self._scan_uncached(text)
+        result = cache.get(text)
+        if result is None:
+            result = self._scan_uncached(text)
+            if len(cache) < _MAX_CACHED_MESSAGES:
+                cache[text] = result
+        return result
+
+
+# 请求范围内的扫描缓存：消息文本 -> LexiconScan
+_request_cache: ContextVar[Optional[Dict[str, LexiconScan]]] = ContextVar("symptom_lexicon_cache", default=None)
+_MAX_CACHED_MESSAGES = 1024
+
+
+@contextmanager
+def lexicon_request_scope():
+    """
+    在一次请求内缓存扫描结果
+
+    嵌套使用时沿用外层缓存；离开最外层范围即丢弃，不跨请求保留用户消息。
+    """
+    if _request_cache.get() is not None:
+        yield
+        return
+    token = _request_cache.set({})
+    try:
+        yield
+    finally:
+        _request_cache.reset(token)
+
+
+_lexicon: Optional[SymptomLexicon] = None
+_lexicon_lock = threading.Lock()
+
+
+def get_symptom_lexicon() -> SymptomLexicon:
+    """获取进程内共享的症状词表"""
+    global _lexicon
+    if _lexicon is None:
+        with _lexicon_lock:
+            if _lexicon is None:
+                _lexicon = SymptomLexicon()
+    return _lexicon
@@ -636,6 +636,10 @@ class UnifiedAccountManager:
             
             conn.commit()
             
+            # 同一张会话表，统一认证服务的会话缓存需同步失效
+            from core.security.unified_auth_service import unified_auth_service
+            unified_auth_service.invalidate_session(session_id)
+            
             # 记录注销事件
             if session_row:
                 self._log_security_event(
@@ -21,6 +21,8 @@ from datetime import datetime
 from typing import Dict, List, Optional, Tuple, Any
 from pathlib import Path
 
+from core.knowledge_retrieval.standard_terminology import StandardTerminology, get_standard_terminology
+
 
 class DecisionTreeDataService:
     """决策树数据转换和同步服务"""
@@ -33,6 +35,11 @@ class DecisionTreeDataService:
         """
         self.db_path = db_path
 
+    @property
+    def terminology(self) -> StandardTerminology:
+        """标准术语字典（四张 tcm_*_standard 表的进程内副本）"""
+        return get_standard_terminology(self.db_path)
+
     def _get_db_connection(self) -> sqlite3.Connection:
         """获取数据库连接"""
         conn = sqlite3.connect(self.db_path)
@@ -671,6 +678,7 @@ class DecisionTreeDataService:
         # 按顿号、逗号或空格分割
         parts = re.split(r'[、，,\s]+', symptoms_text)
 
+        parsed = []
         for part in parts:
             part = part.strip()
             if not part:
@@ -680,9 +688,13 @@ class DecisionTreeDataService:
             severity_match = re.search(r'[（(](.+?)[）)]', part)
             severity = severity_match.group(1) if severity_match else "中"
             symptom_name = re.sub(r'[（(].+?[）)]', '', part).strip()
+            parsed.append((symptom_name, severity))
+
+        # 从标准库一次查询全部症状
+        standard = self._resolve_from_standard("symptom", [name for name, _ in parsed])
 
-            # 从标准库查询症状
-            symptom_info = self._get_symptom_from_standard(symptom_name)
+        for symptom_name, severity in parsed:
+            symptom_info = standard.get(symptom_name)
 
             if symptom_info:
                 symptoms.append({
@@ -732,6 +744,7 @@ class DecisionTreeDataService:
         # 按顿号、加号或空格分割
         parts = re.split(r'[、+\s]+', formula_text)
 
+        parsed = []
         for part in parts:
             part = part.strip()
             if not part:
@@ -756,8 +769,13 @@ class DecisionTreeDataService:
                 unit = "克"
                 herb_name = part_without_role
 
-            # 从标准库查询药材
-            herb_info = self._get_herb_from_standard(herb_name)
+            parsed.append((herb_name, dosage, unit, role))
+
+        # 从标准库一次查询全部药材
+        standard = self._resolve_from_standard("herb", [herb_name for herb_name, *_ in parsed])
+
+        for herb_name, dosage, unit, role in parsed:
+            herb_info = standard.get(herb_name)
 
             composition.append({
                 "herb_id": herb_info["id"] if herb_info else f"herb_{uuid.uuid4().hex[:8]}",
@@ -813,66 +831,25 @@ class DecisionTreeDataService:
     # 数据库标准库查询
     # ============================================
 
-    def _get_disease_from_standard(self, disease_name: str) -> Optional[Dict[str, Any]]:
-        """从标准库查询疾病"""
+    def _resolve_from_standard(self, kind: str, names: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """从标准库一次解析一组名称，查询失败时视为均未收录"""
         try:
-            conn = self._get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT id, name, category, description
-                FROM tcm_diseases_standard
-                WHERE name = ? OR alias LIKE ?
-            """, (disease_name, f'%{disease_name}%'))
-            row = cursor.fetchone()
-            conn.close()
-            return dict(row) if row else None
+            return self.terminology.resolve_many(kind, names)
         except Exception:
-            return None
+            return {}
+
+    def _get_disease_from_standard(self, disease_name: str) -> Optional[Dict[str, Any]]:
+        """从标准库查询疾病（名称或别名）"""
+        return self._resolve_from_standard("disease", [disease_name]).get(disease_name)
 
     def _get_symptom_from_standard(self, symptom_name: str) -> Optional[Dict[str, Any]]:
         """从标准库查询症状"""
-        try:
-            conn = self._get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT id, name, category
-                FROM tcm_symptoms_standard
-                WHERE name = ?
-            """, (symptom_name,))
-            row = cursor.fetchone()
-            conn.close()
-            return dict(row) if row else None
-        except Exception:
-            return None
+        return self._resolve_from_standard("symptom", [symptom_name]).get(symptom_name)
 
     def _get_prescription_from_standard(self, prescription_name: str) -> Optional[Dict[str, Any]]:
-        """从标准库查询处方"""
-        try:
-            conn = self._get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT id, name, source, category, composition, effects, indications
-                FROM tcm_prescriptions_standard
-                WHERE name = ? OR alias LIKE ?
-            """, (prescription_name, f'%{prescription_name}%'))
-            row = cursor.fetchone()
-            conn.close()
-            return dict(row) if row else None
-        except Exception:
-            return None
+        """从标准库查询处方（名称或别名）"""
+        return self._resolve_from_standard("prescription", [prescription_name]).get(prescription_name)
 
     def _get_herb_from_standard(self, herb_name: str) -> Optional[Dict[str, Any]]:
-        """从标准库查询中药"""
-        try:
-            conn = self._get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT id, name, effects
-                FROM tcm_herbs_standard
-                WHERE name = ? OR alias LIKE ?
-            """, (herb_name, f'%{herb_name}%'))
-            row = cursor.fetchone()
-            conn.close()
-            return dict(row) if row else None
-        except Exception:
-            return None
+        """从标准库查询中药（名称或别名）"""
+        return self._resolve_from_standard("herb", [herb_name]).get(herb_name)
@@ -18,6 +18,7 @@ import sys
 sys.path.append('/home/ute/tcm-ai')
 from core.prescription.prescription_checker import Prescription, PrescriptionParser, PrescriptionSafetyChecker
 from core.knowledge_retrieval.tcm_knowledge_graph import TCMKnowledgeGraph
+from core.llm import get_llm_gateway
 
 # AI配置导入
 try:
@@ -2110,118 +2111,112 @@ class FamousDoctorLearningSystem:
             print(f"⚠️ 诊疗流程分析失败: {e}")
         
         try:
-            response = await asyncio.to_thread(
-                dashscope.MultiModalConversation.call,
+            content = await get_llm_gateway().complete_text(
+                [{"role": "user", "content": prompt}],
                 model=self.ai_model,
-                messages=[{"role": "user", "content": [{"text": prompt}]}]
+                call_site="doctor_learning.generate_decision_paths"
             )
-
-            if response.status_code == 200:
-                content = response.output.choices[0].message.content[0]["text"]
-                print(f"🔍 AI原始响应内容: {content}")
-                
-                # 解析JSON响应 - 增强容错版
+            print(f"🔍 AI原始响应内容: {content}")
+            
+            # 解析JSON响应 - 增强容错版
+            try:
+                # 首先尝试直接解析
+                ai_result = json.loads(content)
+                paths = ai_result.get("paths", [])
+                print(f"🔍 JSON解析成功，得到{len(paths)}条路径")
+            except json.JSONDecodeError as e:
+                print(f"❌ 直接JSON解析失败: {e}")
+                print(f"🔍 错误位置: 行{e.lineno}, 列{e.colno}, 字符{e.pos}")
+                print(f"🔍 错误附近内容: ...{content[max(0, e.pos-20):e.pos+20]}...")
+
+                # 如果失败，尝试提取JSON部分 - 支持markdown代码块
+                import re
+
+                # 🔧 第一步：清理常见的JSON格式错误
+                cleaned_content = content
+                # 移除注释
+                cleaned_content = re.sub(r'//.*?\n', '\n', cleaned_content)
+                cleaned_content = re.sub(r'/\*.*?\*/', '', cleaned_content, flags=re.DOTALL)
+                # 修复尾部逗号
+                cleaned_content = re.sub(r',(\s*[}\]])', r'\1', cleaned_content)
+                # 修复缺失的逗号（在}或]后面应该有逗号但没有的情况）
+                cleaned_content = re.sub(r'([}\]])(\s*)([{"\[])', r'\1,\2\3', cleaned_content)
+
+                # 尝试用清理后的内容解析
                 try:
-                    # 首先尝试直接解析
-                    ai_result = json.loads(content)
+                    ai_result = json.loads(cleaned_content)
                     paths = ai_result.get("paths", [])
-                    print(f"🔍 JSON解析成功，得到{len(paths)}条路径")
-                except json.JSONDecodeError as e:
-                    print(f"❌ 直接JSON解析失败: {e}")
-                    print(f"🔍 错误位置: 行{e.lineno}, 列{e.colno}, 字符{e.pos}")
-                    print(f"🔍 错误附近内容: ...{content[max(0, e.pos-20):e.pos+20]}...")
-
-                    # 如果失败，尝试提取JSON部分 - 支持markdown代码块
-                    import re
-
-                    # 🔧 第一步：清理常见的JSON格式错误
-                    cleaned_content = content
-                    # 移除注释
-                    cleaned_content = re.sub(r'//.*?\n', '\n', cleaned_content)
-                    cleaned_content = re.sub(r'/\*.*?\*/', '', cleaned_content, flags=re.DOTALL)
-                    # 修复尾部逗号
-                    cleaned_content = re.sub(r',(\s*[}\]])', r'\1', cleaned_content)
-                    # 修复缺失的逗号（在}或]后面应该有逗号但没有的情况）
-                    cleaned_content = re.sub(r'([}\]])(\s*)([{"\[])', r'\1,\2\3', cleaned_content)
-
-                    # 尝试用清理后的内容解析
-                    try:
-                        ai_result = json.loads(cleaned_content)
-                        paths = ai_result.get("paths", [])
-                        print(f"🔍 清理后JSON解析成功，得到{len(paths)}条路径")
-                    except json.JSONDecodeError:
-                        # 更精准的JSON提取模式
-                        json_patterns = [
-                            r'```json\s*(\{[\s\S]*?\})\s*```',  # markdown代码块
-                            r'```\s*(\{[\s\S]*?\})\s*```',      # 无语言标识的代码块
-                            r'(\{[\s\S]*?\})(?=\s*###|补充|建议|注意|$)',    # JSON后跟其他内容
-                            r'(\{(?:[^{}]|\{[^}]*\})*\})'       # 平衡括号匹配
-                        ]
-
-                        json_content = None
-                        for pattern in json_patterns:
-                            json_match = re.search(pattern, cleaned_content)
-                            if json_match:
-                                # 安全地访问捕获组
-                                try:
-                                    json_content = json_match.group(1)
-                                    print(f"🔍 使用模式提取到JSON内容")
-                                    break
-                                except IndexError:
-                                    json_content = json_match.group(0)
-                                    print(f"🔍 使用模式提取到JSON内容（fallback）")
-                                    break
-
-                        if json_content:
-                            # 再次清理提取的JSON
-                            json_content = re.sub(r',(\s*[}\]])', r'\1', json_content)
-                            json_content = re.sub(r'([}\]])(\s*)([{"\[])', r'\1,\2\3', json_content)
+                    print(f"🔍 清理后JSON解析成功，得到{len(paths)}条路径")
+                except json.JSONDecodeError:
+                    # 更精准的JSON提取模式
+                    json_patterns = [
+                        r'```json\s*(\{[\s\S]*?\})\s*```',  # markdown代码块
+                        r'```\s*(\{[\s\S]*?\})\s*```',      # 无语言标识的代码块
+                        r'(\{[\s\S]*?\})(?=\s*###|补充|建议|注意|$)',    # JSON后跟其他内容
+                        r'(\{(?:[^{}]|\{[^}]*\})*\})'       # 平衡括号匹配
+                    ]
 
+                    json_content = None
+                    for pattern in json_patterns:
+                        json_match = re.search(pattern, cleaned_content)
+                        if json_match:
+                            # 安全地访问捕获组
                             try:
-                                ai_result = json.loads(json_content)
-                                paths = ai_result.get("paths", [])
-                                print(f"🔍 从混合内容中提取JSON成功，得到{len(paths)}条路径")
-                            except json.JSONDecodeError as e2:
-                                print(f"⚠️ JSON提取也失败: {e2}")
-                                print(f"提取的内容前500字符: {json_content[:500]}")
-                                # 🔧 容错：不抛出异常，返回空路径
-                                print(f"⚠️ 使用空路径作为备用方案")
-                                paths = []
-                                ai_result = {"paths": paths}
-                        else:
-                            print(f"⚠️ 无法找到JSON内容")
-                            print(f"原始响应前500字符: {content[:500]}")
+                                json_content = json_match.group(1)
+                                print(f"🔍 使用模式提取到JSON内容")
+                                break
+                            except IndexError:
+                                json_content = json_match.group(0)
+                                print(f"🔍 使用模式提取到JSON内容（fallback）")
+                                break
+
+                    if json_content:
+                        # 再次清理提取的JSON
+                        json_content = re.sub(r',(\s*[}\]])', r'\1', json_content)
+                        json_content = re.sub(r'([}\]])(\s*)([{"\[])', r'\1,\2\3', json_content)
+
+                        try:
+                            ai_result = json.loads(json_content)
+                            paths = ai_result.get("paths", [])
+                            print(f"🔍 从混合内容中提取JSON成功，得到{len(paths)}条路径")
+                        except json.JSONDecodeError as e2:
+                            print(f"⚠️ JSON提取也失败: {e2}")
+                            print(f"提取的内容前500字符: {json_content[:500]}")
                             # 🔧 容错：不抛出异常，返回空路径
                             print(f"⚠️ 使用空路径作为备用方案")
                             paths = []
                             ai_result = {"paths": paths}
+                    else:
+                        print(f"⚠️ 无法找到JSON内容")
+                        print(f"原始响应前500字符: {content[:500]}")
+                        # 🔧 容错：不抛出异常，返回空路径
+                        print(f"⚠️ 使用空路径作为备用方案")
+                        paths = []
+                        ai_result = {"paths": paths}
+            
+            # 验证和清理AI返回的数据
+            cleaned_paths = []
+            for path in paths:
+                # 修复AI返回的步骤类型
+                fixed_path = self._fix_ai_path_types(path, disease_name)
                 
-                # 验证和清理AI返回的数据
-                cleaned_paths = []
-                for path in paths:
-                    # 修复AI返回的步骤类型
-                    fixed_path = self._fix_ai_path_types(path, disease_name)
-                    
-                    # 清理验证性语言 - 加强版
-                    cleaned_path = self._clean_verification_language(fixed_path)
-                    
-                    # 自动补充缺失的字段
-                    if "keywords" not in cleaned_path:
-                        cleaned_path["keywords"] = [disease_name]
-                    
-                    if self._validate_ai_path(cleaned_path, disease_name):
-                        cleaned_paths.append(cleaned_path)
+                # 清理验证性语言 - 加强版
+                cleaned_path = self._clean_verification_language(fixed_path)
                 
-                if cleaned_paths:
-                    print(f"✅ AI成功生成 {len(cleaned_paths)} 条决策路径")
-                    return cleaned_paths
-                else:
-                    # 🔧 如果AI返回的路径为空或验证失败，生成一个基本的备用路径
-                    print(f"⚠️ AI返回的路径为空或验证失败，生成基本备用路径")
-                    return self._generate_basic_fallback_path(disease_name, thinking_process)
-                    
+                # 自动补充缺失的字段
+                if "keywords" not in cleaned_path:
+                    cleaned_path["keywords"] = [disease_name]
+                
+                if self._validate_ai_path(cleaned_path, disease_name):
+                    cleaned_paths.append(cleaned_path)
+            
+            if cleaned_paths:
+                print(f"✅ AI成功生成 {len(cleaned_paths)} 条决策路径")
+                return cleaned_paths
             else:
-                raise Exception(f"AI调用失败: {response.message}")
+                # 🔧 如果AI返回的路径为空或验证失败，生成一个基本的备用路径
+                print(f"⚠️ AI返回的路径为空或验证失败，生成基本备用路径")
+                return self._generate_basic_fallback_path(disease_name, thinking_process)
                 
         except Exception as e:
             print(f"❌ AI生成失败: {e}")
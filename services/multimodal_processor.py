@@ -20,6 +20,7 @@ from dashscope.api_entities.dashscope_response import DashScopeAPIResponse
 import sys
 sys.path.append('/home/ute/tcm-ai')
 from core.prescription.tcm_formula_analyzer import analyze_formula_with_ai
+from core.prescription.herb_registry import get_herb_registry
 from config.settings import AI_CONFIG
 
 # 配置日志
@@ -536,9 +537,7 @@ class MultiModalPrescriptionProcessor:
     
     def _enhance_herb_info(self, herbs: List[Dict]) -> List[Dict]:
         """增强药材信息，添加功效描述"""
-        from core.prescription.tcm_formula_analyzer import TCMFormulaAnalyzer
-        
-        analyzer = TCMFormulaAnalyzer()
+        herb_database = get_herb_registry().formula_view
         enhanced_herbs = []
         
         for herb in herbs:
@@ -549,7 +548,7 @@ class MultiModalPrescriptionProcessor:
             clean_name = self._clean_herb_name(herb_name)
             
             # 从数据库获取功效信息
-            herb_data = analyzer.herb_database.get(clean_name, {})
+            herb_data = herb_database.get(clean_name, {})
             functions = herb_data.get('functions', [])
             
             # 调试日志
@@ -574,13 +573,11 @@ class MultiModalPrescriptionProcessor:
     
     def _clean_herb_name(self, herb_name: str) -> str:
         """清理药材名称，移除炮制前缀，保留核心药材名"""
-        from core.prescription.tcm_formula_analyzer import TCMFormulaAnalyzer
-        
+        registry = get_herb_registry()
         original_name = herb_name.strip()
         
         # 首先检查原名称是否直接在数据库中存在
-        analyzer = TCMFormulaAnalyzer()
-        if original_name in analyzer.herb_database:
+        if original_name in registry:
             return original_name
         
         # 特殊情况处理 - 优先处理
@@ -611,7 +608,7 @@ class MultiModalPrescriptionProcessor:
         
         if original_name in special_mappings:
             mapped_name = special_mappings[original_name]
-            if mapped_name in analyzer.herb_database:
+            if mapped_name in registry:
                 return mapped_name
         
         # 移除常见炮制前缀 - 更保守的策略
@@ -626,7 +623,7 @@ class MultiModalPrescriptionProcessor:
                 potential_clean = clean_name[len(prefix):]
                 
                 # 检查清理后的名称是否在数据库中存在
-                if len(potential_clean) >= 2 and potential_clean in analyzer.herb_database:
+                if len(potential_clean) >= 2 and potential_clean in registry:
                     clean_name = potential_clean
                     break
                 
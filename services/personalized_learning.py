@@ -3,6 +3,8 @@
 import os
 import json
 import sqlite3
+import threading
+import time
 import numpy as np
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional
@@ -10,6 +12,8 @@ from dataclasses import dataclass, asdict
 from collections import defaultdict, Counter
 import logging
 
+from core.text_matching.symptom_lexicon import get_symptom_lexicon
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -45,10 +49,224 @@ class LearningInsight:
     sample_size: int
     last_updated: datetime
 
+class SymptomDoctorModel:
+    """
+    症状×医生学习统计的内存模型
+
+    - success_rate / total_cases 为 症状×医生 的稠密矩阵，doctor_stats 为每位医生的
+      (总会话数, 评分总和, 好评数, 差评数)
+    - 反馈就地增量更新矩阵，同时累积待写回的增量；写回时按增量合并到数据库，
+      多个worker进程各自写回也不会互相覆盖
+    - 非线程安全，由 PersonalizedLearningSystem 加锁访问
+    """
+
+    # 样本量达到该值时权重为1.0
+    FULL_WEIGHT_CASES = 20
+
+    def __init__(self, symptom_capacity: int = 64, doctor_capacity: int = 16):
+        self.symptoms: List[str] = []
+        self.doctors: List[str] = []
+        self._symptom_ids: Dict[str, int] = {}
+        self._doctor_ids: Dict[str, int] = {}
+
+        self.success_rate = np.zeros((symptom_capacity, doctor_capacity), dtype=np.float64)
+        self.total_cases = np.zeros((symptom_capacity, doctor_capacity), dtype=np.int64)
+        self.doctor_stats = np.zeros((doctor_capacity, 4), dtype=np.int64)
+        # 医生是否已有表现统计（doctor_performance 中有对应行）
+        self.has_stats = np.zeros(doctor_capacity, dtype=bool)
+
+        # 待写回的增量：(症状序号, 医生序号) -> [病例数, 成功数]；医生序号 -> 统计增量
+        self.pending_matches: Dict[Tuple[int, int], List[int]] = {}
+        self.pending_stats: Dict[int, np.ndarray] = {}
+
+    # ---------- 索引 ----------
+
+    def _symptom_id(self, symptom: str) -> int:
+        index = self._symptom_ids.get(symptom)
+        if index is None:
+            index = len(self.symptoms)
+            if index == self.success_rate.shape[0]:
+                self._grow(rows=index * 2)
+            self.symptoms.append(symptom)
+            self._symptom_ids[symptom] = index
+        return index
+
+    def _doctor_id(self, doctor_name: str) -> int:
+        index = self._doctor_ids.get(doctor_name)
+        if index is None:
+            index = len(self.doctors)
+            if index == self.success_rate.shape[1]:
+                self._grow(columns=index * 2)
+            self.doctors.append(doctor_name)
+            self._doctor_ids[doctor_name] = index
+        return index
+
+    def _grow(self, rows: int = None, columns: int = None):
+        """容量翻倍扩展，已有数据保持原位"""
+        old_rows, old_columns = self.success_rate.shape
+        rows, columns = rows or old_rows, columns or old_columns
+        for name in ("success_rate", "total_cases"):
+            old = getattr(self, name)
+            new = np.zeros((rows, columns), dtype=old.dtype)
+            new[:old_rows, :old_columns] = old
+            setattr(self, name, new)
+        if columns != old_columns:
+            stats = np.zeros((columns, 4), dtype=np.int64)
+            stats[:old_columns] = self.doctor_stats
+            self.doctor_stats = stats
+            has_stats = np.zeros(columns, dtype=bool)
+            has_stats[:old_columns] = self.has_stats
+            self.has_stats = has_stats
+
+    # ---------- 加载与更新 ----------
+
+    def load(self, match_rows, performance_rows):
+        """从 symptom_doctor_match / doctor_performance 的全部行重建"""
+        for symptom, doctor_name, success_rate, total_cases in match_rows:
+            s, d = self._symptom_id(symptom), self._doctor_id(doctor_name)
+            self.success_rate[s, d] = success_rate
+            self.total_cases[s, d] = total_cases
+        for doctor_name, total_sessions, rating_sum, positive, negative in performance_rows:
+            d = self._doctor_id(doctor_name)
+            self.doctor_stats[d] = (total_sessions or 0, rating_sum or 0, positive or 0, negative or 0)
+            self.has_stats[d] = True
+
+    def apply_performance(self, doctor_name: str, rating: int):
+        """一条反馈计入医生表现统计"""
+        d = self._doctor_id(doctor_name)
+        delta = np.array([1, rating, 1 if rating >= 4 else 0, 1 if rating <= 2 else 0], dtype=np.int64)
+        self.doctor_stats[d] += delta
+        self.has_stats[d] = True
+        pending = self.pending_stats.get(d)
+        self.pending_stats[d] = delta if pending is None else pending + delta
+
+    def apply_match(self, symptoms: List[str], doctor_name: str, is_success: int):
+        """一条反馈计入各症状与该医生的成功率（增量平均）"""
+        d = self._doctor_id(doctor_name)
+        for symptom in symptoms:
+            s = self._symptom_id(symptom)
+            total_cases = self.total_cases[s, d]
+            self.success_rate[s, d] = (self.success_rate[s, d] * total_cases + is_success) / (total_cases + 1)
+            self.total_cases[s, d] = total_cases + 1
+            pending = self.pending_matches.setdefault((s, d), [0, 0])
+            pending[0] += 1
+            pending[1] += is_success
+
+    def take_pending(self):
+        """取出待写回的增量（按名称），并清空"""
+        matches = [
+            (self.symptoms[s], self.doctors[d], cases, successes)
+            for (s, d), (cases, successes) in self.pending_matches.items()
+        ]
+        stats = [(self.doctors[d], *(int(v) for v in delta)) for d, delta in self.pending_stats.items()]
+        self.pending_matches, self.pending_stats = {}, {}
+        return matches, stats
+
+    def restore_pending(self, matches, stats):
+        """写回失败时放回增量，下次重试"""
+        for symptom, doctor_name, cases, successes in matches:
+            pending = self.pending_matches.setdefault((self._symptom_ids[symptom], self._doctor_ids[doctor_name]), [0, 0])
+            pending[0] += cases
+            pending[1] += successes
+        for doctor_name, *delta in stats:
+            d = self._doctor_ids[doctor_name]
+            delta = np.array(delta, dtype=np.int64)
+            pending = self.pending_stats.get(d)
+            self.pending_stats[d] = delta if pending is None else pending + delta
+
+    @property
+    def pending_count(self) -> int:
+        return len(self.pending_matches) + len(self.pending_stats)
+
+    # ---------- 查询 ----------
+
+    def recommend(self, symptoms: List[str], min_cases: int,
+                  available_doctors: Optional[List[str]] = None) -> Optional[Tuple[str, float]]:
+        """
+        对查询症状对应的行做一次 gather，按医生求加权成功率的平均值
+
+        只统计病例数不少于 min_cases 的组合；没有任何可用组合时返回 None
+        """
+        rows = [self._symptom_ids[symptom] for symptom in symptoms if symptom in self._symptom_ids]
+        doctor_count = len(self.doctors)
+        if not rows or not doctor_count:
+            return None
+
+        rates = self.success_rate[rows, :doctor_count]
+        cases = self.total_cases[rows, :doctor_count]
+        eligible = cases >= min_cases
+        if available_doctors:
+            allowed = np.zeros(doctor_count, dtype=bool)
+            for doctor_name in available_doctors:
+                d = self._doctor_ids.get(doctor_name)
+                if d is not None:
+                    allowed[d] = True
+            eligible &= allowed
+
+        # 加权评分：成功率 * 样本量权重
+        weights = np.minimum(cases / self.FULL_WEIGHT_CASES, 1.0)
+        scores = np.where(eligible, rates * (0.7 + 0.3 * weights), 0.0)
+        counts = eligible.sum(axis=0)
+        if not counts.any():
+            return None
+
+        means = np.full(doctor_count, -np.inf)
+        np.divide(scores.sum(axis=0), counts, out=means, where=counts > 0)
+        best = int(np.argmax(means))
+        return self.doctors[best], float(means[best])
+
+    def performance(self, doctor_name: str) -> Optional[Tuple[int, int, int, int]]:
+        """(总会话数, 评分总和, 好评数, 差评数)，没有统计时返回 None"""
+        d = self._doctor_ids.get(doctor_name)
+        if d is None or not self.has_stats[d]:
+            return None
+        return tuple(int(v) for v in self.doctor_stats[d])
+
+    def doctor_symptoms(self, doctor_name: str, min_cases: int, min_rate: float = None,
+                        below_rate: float = None, descending: bool = True, limit: int = 5) -> List[str]:
+        """该医生满足成功率条件的症状，按成功率排序"""
+        d = self._doctor_ids.get(doctor_name)
+        if d is None:
+            return []
+        count = len(self.symptoms)
+        rates = self.success_rate[:count, d]
+        mask = self.total_cases[:count, d] >= min_cases
+        if min_rate is not None:
+            mask &= rates >= min_rate
+        if below_rate is not None:
+            mask &= rates < below_rate
+        rows = np.flatnonzero(mask)
+        order = np.argsort(-rates[rows] if descending else rates[rows], kind="stable")
+        return [self.symptoms[s] for s in rows[order][:limit]]
+
+    def matches(self, min_cases: int, min_rate: float = None, below_rate: float = None,
+                best_first: bool = True, limit: int = 10) -> List[Tuple[str, str, float, int]]:
+        """
+        满足条件的 (症状, 医生, 成功率, 病例数)
+
+        best_first 时按成功率降序，否则升序；成功率相同按病例数降序
+        """
+        rates = self.success_rate[:len(self.symptoms), :len(self.doctors)]
+        cases = self.total_cases[:len(self.symptoms), :len(self.doctors)]
+        mask = cases >= min_cases
+        if min_rate is not None:
+            mask &= rates >= min_rate
+        if below_rate is not None:
+            mask &= rates < below_rate
+        rows, columns = np.nonzero(mask)
+        selected_rates, selected_cases = rates[rows, columns], cases[rows, columns]
+        order = np.lexsort((-selected_cases, -selected_rates if best_first else selected_rates))[:limit]
+        return [
+            (self.symptoms[rows[i]], self.doctors[columns[i]], float(selected_rates[i]), int(selected_cases[i]))
+            for i in order
+        ]
+
+
 class PersonalizedLearningSystem:
     """个性化学习系统"""
     
-    def __init__(self, db_path: str = "/home/tcm-app/learning_db.sqlite"):
+    def __init__(self, db_path: str = "/home/tcm-app/learning_db.sqlite",
+                 flush_interval: float = 10.0, reload_interval: float = 300.0, max_pending: int = 200):
         self.db_path = db_path
         self.init_database()
         
@@ -57,10 +275,14 @@ class PersonalizedLearningSystem:
         self.rating_threshold = 3.5  # 好评阈值
         self.confidence_threshold = 0.7  # 置信度阈值
         
-        # 症状-医生适配度缓存
-        self.symptom_doctor_cache = {}
-        self.cache_expiry = timedelta(hours=24)
-        self.last_cache_update = None
+        # 症状-医生统计的内存模型：反馈就地更新，定期写回；定期重载以合并其他进程的写入
+        self.flush_interval = flush_interval
+        self.reload_interval = reload_interval
+        self.max_pending = max_pending
+        self._model: Optional[SymptomDoctorModel] = None
+        self._model_lock = threading.RLock()
+        self._last_flush = time.time()
+        self._last_reload = 0.0
         
     def init_database(self):
         """初始化数据库"""
@@ -152,8 +374,10 @@ class PersonalizedLearningSystem:
             conn.close()
             
             # 触发学习更新
-            self._update_doctor_performance(feedback)
-            self._update_symptom_doctor_matching(feedback)
+            with self._model_lock:
+                self._update_doctor_performance(feedback)
+                self._update_symptom_doctor_matching(feedback)
+                self._maybe_flush()
             
             logger.info(f"Recorded feedback for session {feedback.session_id}")
             
@@ -161,104 +385,121 @@ class PersonalizedLearningSystem:
             logger.error(f"Failed to record feedback: {e}")
             
     def _update_doctor_performance(self, feedback: UserFeedback):
-        """更新医生表现统计"""
+        """更新医生表现统计（内存模型，随下次写回落库）"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # 更新或插入医生表现数据
-            cursor.execute('''
-                INSERT OR REPLACE INTO doctor_performance 
-                (doctor_name, total_sessions, total_rating_sum, positive_feedback_count, negative_feedback_count, last_updated)
-                VALUES (
-                    ?,
-                    COALESCE((SELECT total_sessions FROM doctor_performance WHERE doctor_name = ?), 0) + 1,
-                    COALESCE((SELECT total_rating_sum FROM doctor_performance WHERE doctor_name = ?), 0) + ?,
-                    COALESCE((SELECT positive_feedback_count FROM doctor_performance WHERE doctor_name = ?), 0) + ?,
-                    COALESCE((SELECT negative_feedback_count FROM doctor_performance WHERE doctor_name = ?), 0) + ?,
-                    ?
-                )
-            ''', (
-                feedback.selected_doctor,
-                feedback.selected_doctor,
-                feedback.selected_doctor,
-                feedback.user_rating,
-                feedback.selected_doctor,
-                1 if feedback.user_rating >= 4 else 0,
-                feedback.selected_doctor,
-                1 if feedback.user_rating <= 2 else 0,
-                datetime.now().isoformat()
-            ))
-            
-            conn.commit()
-            conn.close()
-            
+            self._get_model().apply_performance(feedback.selected_doctor, feedback.user_rating)
         except Exception as e:
             logger.error(f"Failed to update doctor performance: {e}")
             
     def _update_symptom_doctor_matching(self, feedback: UserFeedback):
-        """更新症状-医生匹配度"""
+        """更新症状-医生匹配度（内存模型，随下次写回落库）"""
         try:
             # 从用户查询中提取症状关键词
             symptoms = self._extract_symptoms(feedback.user_query)
             if not symptoms:
                 return
                 
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            for symptom in symptoms:
-                # 计算成功率（评分>=4算成功）
-                is_success = 1 if feedback.user_rating >= 4 else 0
-                
-                # 更新症状-医生匹配数据
-                cursor.execute('''
-                    SELECT total_cases, success_rate FROM symptom_doctor_match 
-                    WHERE symptom = ? AND doctor_name = ?
-                ''', (symptom, feedback.selected_doctor))
-                
-                result = cursor.fetchone()
-                if result:
-                    total_cases, old_success_rate = result
-                    new_total_cases = total_cases + 1
-                    new_success_rate = (old_success_rate * total_cases + is_success) / new_total_cases
-                    
-                    cursor.execute('''
-                        UPDATE symptom_doctor_match 
-                        SET success_rate = ?, total_cases = ?, last_updated = ?
-                        WHERE symptom = ? AND doctor_name = ?
-                    ''', (new_success_rate, new_total_cases, datetime.now().isoformat(), symptom, feedback.selected_doctor))
-                else:
-                    cursor.execute('''
-                        INSERT INTO symptom_doctor_match 
-                        (symptom, doctor_name, success_rate, total_cases, last_updated)
-                        VALUES (?, ?, ?, 1, ?)
-                    ''', (symptom, feedback.selected_doctor, float(is_success), datetime.now().isoformat()))
-            
-            conn.commit()
-            conn.close()
+            # 计算成功率（评分>=4算成功）
+            is_success = 1 if feedback.user_rating >= 4 else 0
+            self._get_model().apply_match(symptoms, feedback.selected_doctor, is_success)
             
         except Exception as e:
             logger.error(f"Failed to update symptom-doctor matching: {e}")
             
-    def _extract_symptoms(self, query: str) -> List[str]:
-        """从查询中提取症状关键词"""
-        # 中医常见症状词典
-        symptom_keywords = [
-            "头痛", "头晕", "发热", "咳嗽", "胸闷", "心悸", "失眠", "多梦",
-            "便秘", "腹泻", "恶心", "呕吐", "食欲", "乏力", "疲劳", "出汗",
-            "口干", "口苦", "舌苔", "脉象", "腰痛", "关节痛", "水肿",
-            "月经", "白带", "小便", "大便", "咽痛", "鼻塞", "流涕"
-        ]
-        
-        found_symptoms = []
-        query_lower = query.lower()
-        
-        for symptom in symptom_keywords:
-            if symptom in query_lower:
-                found_symptoms.append(symptom)
+    def _get_model(self) -> SymptomDoctorModel:
+        """获取内存模型；首次访问或到达重载间隔时先写回增量再从数据库重建"""
+        with self._model_lock:
+            if self._model is not None and time.time() - self._last_reload < self.reload_interval:
+                return self._model
+            if self._model is not None and not self.flush():
+                # 写回失败时继续使用现有模型，避免丢失尚未落库的增量
+                return self._model
                 
-        return found_symptoms
+            model = SymptomDoctorModel()
+            try:
+                conn = sqlite3.connect(self.db_path)
+                try:
+                    model.load(
+                        conn.execute('''
+                            SELECT symptom, doctor_name, success_rate, total_cases FROM symptom_doctor_match
+                        ''').fetchall(),
+                        conn.execute('''
+                            SELECT doctor_name, total_sessions, total_rating_sum,
+                                   positive_feedback_count, negative_feedback_count
+                            FROM doctor_performance
+                        ''').fetchall()
+                    )
+                finally:
+                    conn.close()
+            except Exception as e:
+                logger.error(f"Failed to load learning statistics: {e}")
+                if self._model is not None:
+                    return self._model
+            self._model = model
+            self._last_reload = time.time()
+            return model
+            
+    def _maybe_flush(self):
+        """到达写回间隔或增量过多时写回"""
+        model = self._model
+        if model is None or not model.pending_count:
+            return
+        if model.pending_count >= self.max_pending or time.time() - self._last_flush >= self.flush_interval:
+            self.flush()
+            
+    def flush(self) -> bool:
+        """
+        将内存模型中尚未落库的增量写回数据库
+
+        按增量合并（病例数相加、成功率按病例数加权），其他进程写入的统计不会被覆盖。
+        写回失败时增量保留到下次重试，返回 False
+        """
+        with self._model_lock:
+            self._last_flush = time.time()
+            if self._model is None or not self._model.pending_count:
+                return True
+            matches, stats = self._model.take_pending()
+            now = datetime.now().isoformat()
+            try:
+                conn = sqlite3.connect(self.db_path)
+                try:
+                    with conn:
+                        conn.executemany('''
+                            INSERT INTO symptom_doctor_match
+                            (symptom, doctor_name, success_rate, total_cases, last_updated)
+                            VALUES (?, ?, ?, ?, ?)
+                            ON CONFLICT(symptom, doctor_name) DO UPDATE SET
+                                success_rate = (success_rate * total_cases + excluded.success_rate * excluded.total_cases)
+                                               / (total_cases + excluded.total_cases),
+                                total_cases = total_cases + excluded.total_cases,
+                                last_updated = excluded.last_updated
+                        ''', [
+                            (symptom, doctor_name, successes / cases, cases, now)
+                            for symptom, doctor_name, cases, successes in matches
+                        ])
+                        conn.executemany('''
+                            INSERT INTO doctor_performance
+                            (doctor_name, total_sessions, total_rating_sum, positive_feedback_count,
+                             negative_feedback_count, last_updated)
+                            VALUES (?, ?, ?, ?, ?, ?)
+                            ON CONFLICT(doctor_name) DO UPDATE SET
+                                total_sessions = total_sessions + excluded.total_sessions,
+                                total_rating_sum = total_rating_sum + excluded.total_rating_sum,
+                                positive_feedback_count = positive_feedback_count + excluded.positive_feedback_count,
+                                negative_feedback_count = negative_feedback_count + excluded.negative_feedback_count,
+                                last_updated = excluded.last_updated
+                        ''', [(*row, now) for row in stats])
+                finally:
+                    conn.close()
+            except Exception as e:
+                self._model.restore_pending(matches, stats)
+                logger.error(f"Failed to flush learning statistics: {e}")
+                return False
+            return True
+            
+    def _extract_symptoms(self, query: str) -> List[str]:
+        """从查询中提取症状关键词（中医常见症状词典，见 symptom_lexicon）"""
+        return get_symptom_lexicon().scan(query.lower()).terms("learning_symptom")
         
     def recommend_doctor(self, user_query: str, available_doctors: List[str] = None) -> Tuple[str, float]:
         """基于学习数据推荐医生"""
@@ -268,44 +509,14 @@ class PersonalizedLearningSystem:
                 # 如果没有识别到症状，返回默认推荐
                 return "zhang_zhongjing", 0.5
                 
-            # 更新缓存
-            self._update_symptom_cache()
-            
-            doctor_scores = defaultdict(list)
-            
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            for symptom in symptoms:
-                cursor.execute('''
-                    SELECT doctor_name, success_rate, total_cases 
-                    FROM symptom_doctor_match 
-                    WHERE symptom = ? AND total_cases >= ?
-                    ORDER BY success_rate DESC
-                ''', (symptom, self.min_feedback_for_learning))
-                
-                results = cursor.fetchall()
-                for doctor_name, success_rate, total_cases in results:
-                    if not available_doctors or doctor_name in available_doctors:
-                        # 加权评分：成功率 * 样本量权重
-                        weight = min(total_cases / 20, 1.0)  # 样本量权重，最大1.0
-                        weighted_score = success_rate * (0.7 + 0.3 * weight)
-                        doctor_scores[doctor_name].append(weighted_score)
-            
-            conn.close()
-            
-            if not doctor_scores:
+            with self._model_lock:
+                recommendation = self._get_model().recommend(
+                    symptoms, self.min_feedback_for_learning, available_doctors
+                )
+            if recommendation is None:
                 return "zhang_zhongjing", 0.5
                 
-            # 计算每个医生的平均分数
-            final_scores = {}
-            for doctor, scores in doctor_scores.items():
-                final_scores[doctor] = np.mean(scores)
-                
-            # 返回得分最高的医生
-            best_doctor = max(final_scores, key=final_scores.get)
-            confidence = final_scores[best_doctor]
-            
+            best_doctor, confidence = recommendation
             logger.info(f"Recommended doctor: {best_doctor} with confidence: {confidence:.3f}")
             return best_doctor, confidence
             
@@ -313,82 +524,26 @@ class PersonalizedLearningSystem:
             logger.error(f"Failed to recommend doctor: {e}")
             return "zhang_zhongjing", 0.5
             
-    def _update_symptom_cache(self):
-        """更新症状-医生缓存"""
-        if (self.last_cache_update and 
-            datetime.now() - self.last_cache_update < self.cache_expiry):
-            return
-            
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT symptom, doctor_name, success_rate, total_cases 
-                FROM symptom_doctor_match 
-                WHERE total_cases >= ?
-            ''', (self.min_feedback_for_learning,))
-            
-            self.symptom_doctor_cache = {}
-            for symptom, doctor_name, success_rate, total_cases in cursor.fetchall():
-                if symptom not in self.symptom_doctor_cache:
-                    self.symptom_doctor_cache[symptom] = []
-                self.symptom_doctor_cache[symptom].append({
-                    'doctor': doctor_name,
-                    'success_rate': success_rate,
-                    'total_cases': total_cases
-                })
-            
-            # 按成功率排序
-            for symptom in self.symptom_doctor_cache:
-                self.symptom_doctor_cache[symptom].sort(
-                    key=lambda x: x['success_rate'], reverse=True
-                )
-            
-            self.last_cache_update = datetime.now()
-            conn.close()
-            
-        except Exception as e:
-            logger.error(f"Failed to update symptom cache: {e}")
-            
     def get_doctor_performance(self, doctor_name: str) -> Optional[DoctorPerformance]:
         """获取医生表现统计"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT total_sessions, total_rating_sum, positive_feedback_count, negative_feedback_count
-                FROM doctor_performance 
-                WHERE doctor_name = ?
-            ''', (doctor_name,))
-            
-            result = cursor.fetchone()
-            if not result:
-                return None
+            with self._model_lock:
+                model = self._get_model()
+                performance = model.performance(doctor_name)
+                if not performance:
+                    return None
+                    
+                total_sessions, total_rating_sum, positive_count, negative_count = performance
+                average_rating = total_rating_sum / total_sessions if total_sessions > 0 else 0
                 
-            total_sessions, total_rating_sum, positive_count, negative_count = result
-            average_rating = total_rating_sum / total_sessions if total_sessions > 0 else 0
-            
-            # 获取擅长的症状
-            cursor.execute('''
-                SELECT symptom, success_rate FROM symptom_doctor_match 
-                WHERE doctor_name = ? AND success_rate >= ? AND total_cases >= ?
-                ORDER BY success_rate DESC LIMIT 5
-            ''', (doctor_name, 0.7, self.min_feedback_for_learning))
-            
-            preferred_symptoms = [row[0] for row in cursor.fetchall()]
-            
-            # 获取需要改进的领域
-            cursor.execute('''
-                SELECT symptom, success_rate FROM symptom_doctor_match 
-                WHERE doctor_name = ? AND success_rate < ? AND total_cases >= ?
-                ORDER BY success_rate ASC LIMIT 3
-            ''', (doctor_name, 0.5, self.min_feedback_for_learning))
-            
-            improvement_areas = [row[0] for row in cursor.fetchall()]
-            
-            conn.close()
+                # 擅长的症状
+                preferred_symptoms = model.doctor_symptoms(
+                    doctor_name, self.min_feedback_for_learning, min_rate=0.7, limit=5
+                )
+                # 需要改进的领域
+                improvement_areas = model.doctor_symptoms(
+                    doctor_name, self.min_feedback_for_learning, below_rate=0.5, descending=False, limit=3
+                )
             
             return DoctorPerformance(
                 doctor_name=doctor_name,
@@ -409,19 +564,15 @@ class PersonalizedLearningSystem:
         insights = []
         
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # 洞察1：最佳症状-医生匹配
-            cursor.execute('''
-                SELECT symptom, doctor_name, success_rate, total_cases
-                FROM symptom_doctor_match 
-                WHERE success_rate >= ? AND total_cases >= ?
-                ORDER BY success_rate DESC, total_cases DESC
-                LIMIT 10
-            ''', (0.8, self.min_feedback_for_learning * 2))
+            with self._model_lock:
+                model = self._get_model()
+                # 洞察1：最佳症状-医生匹配
+                best_matches = model.matches(self.min_feedback_for_learning * 2, min_rate=0.8, limit=10)
+                # 洞察2：需要关注的低表现组合
+                poor_matches = model.matches(
+                    self.min_feedback_for_learning, below_rate=0.4, best_first=False, limit=5
+                )
             
-            best_matches = cursor.fetchall()
             if best_matches:
                 insights.append(LearningInsight(
                     insight_type="best_symptom_doctor_matches",
@@ -432,16 +583,6 @@ class PersonalizedLearningSystem:
                     last_updated=datetime.now()
                 ))
             
-            # 洞察2：需要关注的低表现组合
-            cursor.execute('''
-                SELECT symptom, doctor_name, success_rate, total_cases
-                FROM symptom_doctor_match 
-                WHERE success_rate < ? AND total_cases >= ?
-                ORDER BY success_rate ASC, total_cases DESC
-                LIMIT 5
-            ''', (0.4, self.min_feedback_for_learning))
-            
-            poor_matches = cursor.fetchall()
             if poor_matches:
                 insights.append(LearningInsight(
                     insight_type="poor_symptom_doctor_matches",
@@ -452,8 +593,6 @@ class PersonalizedLearningSystem:
                     last_updated=datetime.now()
                 ))
             
-            conn.close()
-            
         except Exception as e:
             logger.error(f"Failed to generate learning insights: {e}")
             
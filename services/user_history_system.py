@@ -14,6 +14,8 @@ from datetime import datetime, timedelta
 from typing import Optional, Dict, List, Any
 import logging
 
+from core.conversation.consultation_turn_store import ROLE_PATIENT, fetch_turns
+
 # 配置日志
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -1099,13 +1101,25 @@ class UserHistorySystem:
             # 🔑 修复：优先从 consultations 表获取 conversation_log
             try:
                 cursor.execute("""
-                    SELECT conversation_log FROM consultations
+                    SELECT conversation_log, uuid FROM consultations
                     WHERE uuid = ? OR uuid = ?
                     ORDER BY created_at DESC LIMIT 1
                 """, (conversation_id, session_row[0]))
 
                 consult_row = cursor.fetchone()
-                if consult_row and consult_row[0]:
+                turns = fetch_turns(cursor, consult_row[1]) if consult_row else []
+                if turns:
+                    # 按轮次追加存储的对话，转换为 [{type, content, timestamp}] 消息列表
+                    conversation_detail['conversation_messages'] = [
+                        {
+                            'type': 'user' if turn['role'] == ROLE_PATIENT else 'ai',
+                            'content': turn['content'],
+                            'timestamp': turn['ts']
+                        }
+                        for turn in turns
+                    ]
+                    logger.info(f"从consultation_turns表加载了 {len(turns)} 条消息")
+                elif consult_row and consult_row[0]:
                     conversation_log = consult_row[0]
                     # 解析conversation_log（可能是JSON字符串或已解析的列表）
                     if isinstance(conversation_log, str):
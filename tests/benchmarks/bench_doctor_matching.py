@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+医生推荐基准：原有的 specialties LIKE 全表扫描 vs 内存专科位图索引
+
+在 user_history 数据库副本上（默认取 data/ 下的备份库，可追加合成医生放大表规模），
+对一组症状、患者偏好和专科筛选条件分别调用新旧 recommend_doctors_for_symptoms /
+get_available_doctors，逐条比对返回的医生ID顺序并报告平均耗时。
+
+旧实现取自引入 doctor_index.py 之前的提交（git show）。
+评分与问诊量完全相同的医生在SQLite中的先后没有定义，比对时按 (评分, 问诊量) 分组比较；
+旧实现在"症状未命中任何专科且患者设有偏好专科"时抛错返回空列表，这类请求单独计数。
+任何不一致都会以非零状态退出。
+
+用法：
+    python tests/benchmarks/bench_doctor_matching.py [--extra-doctors 2000] [--rounds 5] [--db PATH]
+"""
+
+import argparse
+import glob
+import json
+import logging
+import os
+import random
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+import types
+from itertools import groupby
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
+
+from core.doctor_matching.doctor_index import SYMPTOM_SPECIALTY_MAPPING, get_symptom_specialty_matcher
+from core.doctor_matching.doctor_matching_service import (
+    DoctorMatchingService, MatchingCriteria, matching_request_scope
+)
+
+SERVICE_PATH = "core/doctor_matching/doctor_matching_service.py"
+
+SYMPTOM_CASES = [
+    ["失眠多梦", "心悸"], ["胃痛", "食欲不振"], ["小儿发热", "咳嗽"], ["月经不调", "痛经"],
+    ["腰痛", "膝盖痛"], ["湿疹反复"], ["耳鸣", "鼻塞"], ["无明显不适"], ["头晕乏力"], ["癌症术后调理"],
+]
+SPECIALTY_CASES = [None, ["内科"], ["妇科", "儿科"], ["骨伤科"], ["不存在的专科"]]
+
+
+def _baseline_revision() -> str:
+    """引入 doctor_index.py 的提交的父提交"""
+    added = subprocess.check_output(
+        ["git", "log", "--diff-filter=A", "--format=%H", "--", "core/doctor_matching/doctor_index.py"],
+        cwd=PROJECT_ROOT,
+    ).decode().split()
+    return f"{added[-1]}^" if added else "HEAD"
+
+
+def _load_legacy_service(revision: str, db_path: str):
+    source = subprocess.check_output(["git", "show", f"{revision}:{SERVICE_PATH}"], cwd=PROJECT_ROOT).decode("utf-8")
+    module = types.ModuleType("legacy_doctor_matching_service")
+    exec(compile(source, SERVICE_PATH, "exec"), module.__dict__)
+    service = module.DoctorMatchingService()
+    service.db_path = db_path
+    return service, module.MatchingCriteria
+
+
+def _default_db() -> str:
+    candidates = [os.path.join(PROJECT_ROOT, "data", "user_history.sqlite")]
+    candidates += sorted(glob.glob(os.path.join(PROJECT_ROOT, "data", "user_history*.sqlite")))
+    for path in candidates:
+        if os.path.exists(path):
+            conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+            try:
+                if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'doctors'").fetchone():
+                    return path
+            finally:
+                conn.close()
+    raise SystemExit("未找到包含 doctors 表的 user_history 数据库，请用 --db 指定")
+
+
+def _add_synthetic_doctors(db_path: str, count: int, patients: int):
+    """追加合成医生与患者偏好；(评分, 问诊量) 各不相同，排序结果唯一"""
+    rng = random.Random(11)
+    specialties = sorted({s for values in SYMPTOM_SPECIALTY_MAPPING.values() for s in values} | {"针灸科", "推拿科"})
+    conn = sqlite3.connect(db_path)
+    start = conn.execute("SELECT COALESCE(MAX(id), 0) FROM doctors").fetchone()[0] + 1
+    rows = []
+    for offset in range(count):
+        doctor_id = start + offset
+        rows.append((
+            doctor_id, f"合成医生{doctor_id}", f"LIC-BENCH-{doctor_id}", rng.choice(specialties),
+            json.dumps(rng.sample(specialties, rng.randint(1, 3)), ensure_ascii=False),
+            round(rng.uniform(3.0, 5.0), 2), offset * 7 + 1, json.dumps({"mon": ["09:00-12:00"]}),
+            "active" if rng.random() > 0.1 else "inactive",
+        ))
+    conn.executemany("""
+        INSERT INTO doctors (id, name, license_no, speciality, specialties, average_rating, consultation_count,
+                             available_hours, status)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, rows)
+    conn.executemany("""
+        INSERT INTO doctor_selection_preferences (uuid, patient_id, preferred_specialties, avoid_doctor_ids)
+        VALUES (?, ?, ?, ?)
+    """, [
+        (f"pref-bench-{p}", f"bench-patient-{p}", json.dumps(rng.sample(specialties, 1), ensure_ascii=False),
+         json.dumps([str(rng.randrange(start, start + count))]))
+        for p in range(patients)
+    ])
+    conn.commit()
+    conn.close()
+
+
+def _ranked_groups(doctors):
+    """[(评分, 问诊量, {医生ID})]，消除同分医生的未定义先后"""
+    keyed = [((doctor.average_rating, doctor.consultation_count), doctor.uuid) for doctor in doctors]
+    return [(key, sorted(uuid for _, uuid in group)) for key, group in groupby(keyed, key=lambda item: item[0])]
+
+
+def _comparable(doctors):
+    groups = _ranked_groups(doctors)
+    # 最后一组可能被 LIMIT 截断，同分时只比较数量
+    return [group if index < len(groups) - 1 else (group[0], len(group[1])) for index, group in enumerate(groups)]
+
+
+def _best_time(call, rounds: int, repeats: int = 5) -> float:
+    call()  # 预热
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            call()
+        best = min(best, time.perf_counter() - start)
+    return best / rounds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="医生推荐基准")
+    parser.add_argument("--db", default=None, help="user_history 数据库（会复制到临时目录，不修改原库）")
+    parser.add_argument("--extra-doctors", type=int, default=2000, help="追加的合成医生数")
+    parser.add_argument("--patients", type=int, default=20, help="追加的带偏好的合成患者数")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--baseline-rev", default=None)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, "user_history.sqlite")
+        shutil.copyfile(args.db or _default_db(), db_path)
+        if args.extra_doctors:
+            _add_synthetic_doctors(db_path, args.extra_doctors, args.patients)
+
+        revision = args.baseline_rev or _baseline_revision()
+        legacy, LegacyCriteria = _load_legacy_service(revision, db_path)
+        service = DoctorMatchingService(db_path=db_path)
+
+        conn = sqlite3.connect(db_path)
+        doctor_count = conn.execute("SELECT COUNT(*) FROM doctors").fetchone()[0]
+        patients = [row[0] for row in conn.execute(
+            "SELECT DISTINCT patient_id FROM doctor_selection_preferences ORDER BY patient_id").fetchall()]
+        conn.close()
+        patients = (patients or [])[:args.patients] + ["bench-no-preferences"]
+
+        mismatches = fixed = 0
+        matcher = get_symptom_specialty_matcher()
+        for patient_id in patients:
+            preferences = service._get_patient_preferences(patient_id) or {}
+            for symptoms in SYMPTOM_CASES:
+                old = legacy.recommend_doctors_for_symptoms(symptoms, patient_id)
+                with matching_request_scope():
+                    new = service.recommend_doctors_for_symptoms(symptoms, patient_id)
+                if not old and not matcher.match(symptoms) and preferences.get('preferred_specialties'):
+                    # 旧实现：未命中症状时默认专科是list，合并偏好专科时 list.update 抛错，返回空列表
+                    fixed += 1
+                    continue
+                if _comparable(old) != _comparable(new):
+                    mismatches += 1
+                    print(f"  不一致：recommend {patient_id} {symptoms}")
+        for specialties in SPECIALTY_CASES:
+            for limit in (5, 10, 50):
+                old = legacy.get_available_doctors(LegacyCriteria("p", [], preferred_specialties=specialties, max_results=limit))
+                new = service.get_available_doctors(MatchingCriteria("p", [], preferred_specialties=specialties, max_results=limit))
+                if _comparable(old) != _comparable(new):
+                    mismatches += 1
+                    print(f"  不一致：available {specialties} limit={limit}")
+
+        def run_legacy():
+            for patient_id in patients:
+                for symptoms in SYMPTOM_CASES:
+                    legacy.recommend_doctors_for_symptoms(symptoms, patient_id)
+
+        def run_indexed():
+            for patient_id in patients:
+                for symptoms in SYMPTOM_CASES:
+                    with matching_request_scope():
+                        service.recommend_doctors_for_symptoms(symptoms, patient_id)
+
+        requests = len(patients) * len(SYMPTOM_CASES)
+        legacy_cost = _best_time(run_legacy, args.rounds) / requests
+        indexed_cost = _best_time(run_indexed, args.rounds) / requests
+
+    print(f"医生 {doctor_count} 位，推荐请求 {requests} 个（{len(patients)} 位患者 x {len(SYMPTOM_CASES)} 组症状），旧实现 {revision[:12]}")
+    print(f"  recommend_doctors_for_symptoms  legacy={legacy_cost * 1e6:>8.0f}µs/次  "
+          f"indexed={indexed_cost * 1e6:>8.0f}µs/次  x{legacy_cost / indexed_cost:.1f}")
+    if fixed:
+        print(f"  旧实现因默认专科合并偏好出错而返回空列表的请求 {fixed} 个（新实现正常推荐，不计入比对）")
+    if mismatches:
+        print(f"推荐结果不一致 {mismatches} 处")
+        sys.exit(1)
+    print("全部推荐结果与旧实现一致")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+处方药材提取吞吐基准：各解析器原有的逐行多正则实现 vs 共享 Aho–Corasick 提取引擎
+
+对 tests/fixtures/prescription_corpus.json 中的语料反复提取，报告每个入口的
+处方/秒，以及新旧实现输出不一致的语料条数（不一致项应当都是有意修正，见回归测试）。
+
+旧实现取自引入 herb_extraction.py 之前的提交（git show），无需手工保留旧文件。
+
+用法：
+    python tests/benchmarks/bench_herb_extraction.py [--rounds 20] [--baseline-rev REV]
+"""
+
+import argparse
+import ast
+import importlib.util
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "tests", "unit"))
+
+from test_herb_extraction_regression import _load_corpus, extract_all
+
+PARSER_FILES = {
+    "checker": "core/prescription/prescription_checker.py",
+    "integrated": "core/prescription/integrated_prescription_parser.py",
+    "intelligent": "core/prescription/intelligent_prescription_analyzer.py",
+}
+MAIN_PATH = "api/main.py"
+MAIN_FUNCTIONS = ("extract_herbs_from_prescription", "extract_herbs_from_table")
+
+
+def _baseline_revision() -> str:
+    """引入 herb_extraction.py 的提交的父提交"""
+    added = subprocess.check_output(
+        ["git", "log", "--diff-filter=A", "--format=%H", "--", "core/prescription/herb_extraction.py"],
+        cwd=PROJECT_ROOT,
+    ).decode().split()
+    return f"{added[-1]}^" if added else "HEAD"
+
+
+def _git_show(revision: str, path: str) -> str:
+    return subprocess.check_output(["git", "show", f"{revision}:{path}"], cwd=PROJECT_ROOT).decode("utf-8")
+
+
+def _load_module(name: str, source: str, directory: str):
+    path = os.path.join(directory, f"{name}.py")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(source)
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _load_main_functions(source: str) -> dict:
+    """只取出 api/main.py 中的提取函数，避免导入整个应用"""
+    tree = ast.parse(source)
+    nodes = [node for node in tree.body if isinstance(node, ast.FunctionDef) and node.name in MAIN_FUNCTIONS]
+    namespace = {}
+    exec(compile(ast.Module(body=nodes, type_ignores=[]), MAIN_PATH, "exec"), namespace)
+    return namespace
+
+
+def _legacy_extract_all(text, parsers, main_functions):
+    checker, integrated, intelligent = parsers
+    return {
+        "prescription_parser": [
+            [h.name, h.dosage, h.unit, h.preparation]
+            for h in checker._extract_herbs(checker._clean_text(text))
+        ],
+        "integrated_parser": [
+            [h.name, h.dosage, h.extraction_method, round(h.confidence, 3)]
+            for h in integrated._extract_herbs_enhanced(text)
+        ],
+        "intelligent_analyzer": [
+            [h.name, h.dosage, round(h.confidence, 3)]
+            for h in intelligent._extract_chinese_herbs(text)
+        ],
+        "api_main": [list(pair) for pair in main_functions["extract_herbs_from_prescription"](text)],
+    }
+
+
+def _time_entrypoints(texts, calls, rounds, repeats=5):
+    """每个入口取 repeats 次中最快的一次，减少机器抖动的影响"""
+    results = {}
+    for name, call in calls.items():
+        call(texts[0])  # 预热（构建自动机、编译正则）
+        best = float("inf")
+        for _ in range(repeats):
+            start = time.perf_counter()
+            for _ in range(rounds):
+                for text in texts:
+                    call(text)
+            best = min(best, time.perf_counter() - start)
+        results[name] = len(texts) * rounds / best
+    return results
+
+
+def _entrypoints(parsers, extract_pairs):
+    checker, integrated, intelligent = parsers
+    return {
+        "PrescriptionParser": lambda t: checker._extract_herbs(checker._clean_text(t)),
+        "IntegratedPrescriptionParser": integrated._extract_herbs_enhanced,
+        "IntelligentPrescriptionAnalyzer": intelligent._extract_chinese_herbs,
+        "api.main": extract_pairs,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="处方药材提取吞吐基准")
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--baseline-rev", default=None, help="旧实现所在提交，默认为引入提取引擎之前的提交")
+    args = parser.parse_args()
+
+    texts = [item["text"] for item in _load_corpus()["prescriptions"]]
+    revision = args.baseline_rev or _baseline_revision()
+
+    from core.prescription.herb_extraction import extract_herb_dosage_pairs
+    from core.prescription.integrated_prescription_parser import IntegratedPrescriptionParser
+    from core.prescription.intelligent_prescription_analyzer import IntelligentPrescriptionAnalyzer
+    from core.prescription.prescription_checker import PrescriptionParser
+
+    current = (PrescriptionParser(), IntegratedPrescriptionParser(), IntelligentPrescriptionAnalyzer())
+
+    with tempfile.TemporaryDirectory() as directory:
+        modules = {
+            key: _load_module(f"legacy_{key}", _git_show(revision, path), directory)
+            for key, path in PARSER_FILES.items()
+        }
+        main_functions = _load_main_functions(_git_show(revision, MAIN_PATH))
+        legacy = (
+            modules["checker"].PrescriptionParser(),
+            modules["integrated"].IntegratedPrescriptionParser(),
+            modules["intelligent"].IntelligentPrescriptionAnalyzer(),
+        )
+
+        legacy_rates = _time_entrypoints(
+            texts, _entrypoints(legacy, main_functions["extract_herbs_from_prescription"]), args.rounds)
+        current_rates = _time_entrypoints(texts, _entrypoints(current, extract_herb_dosage_pairs), args.rounds)
+
+        changed = {}
+        for text in texts:
+            old = _legacy_extract_all(text, legacy, main_functions)
+            new = extract_all(text, current)
+            for name in new:
+                if old[name] != new[name]:
+                    changed[name] = changed.get(name, 0) + 1
+
+    print(f"语料 {len(texts)} 条 x {args.rounds} 轮，旧实现 {revision[:12]}")
+    for name in current_rates:
+        speedup = current_rates[name] / legacy_rates[name]
+        print(f"  {name:<32} legacy={legacy_rates[name]:>9.0f}/s  engine={current_rates[name]:>9.0f}/s  x{speedup:.1f}")
+    print("输出有变化的语料条数：" + ", ".join(f"{name}={count}" for name, count in changed.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+药材数据加载基准：TCMFormulaAnalyzer 内置字面量字典 vs 共享 HerbRegistry
+
+比较两项指标，每个场景在独立子进程中运行，避免互相影响：
+- 启动耗时：首次构造分析器（含模块导入）的耗时
+- 逐次构造：连续构造 N 个 TCMFormulaAnalyzer 的平均耗时与峰值RSS增量
+  （对应 _enhance_herb_info / analyze_formula_with_ai 原先每次调用都新建分析器的用法）
+
+旧实现取自引入 herb_registry.py 之前的提交（git show），无需手工保留旧文件。
+
+用法：
+    python tests/benchmarks/bench_herb_registry.py [--constructions 200] [--baseline-rev REV]
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
+
+ANALYZER_PATH = "core/prescription/tcm_formula_analyzer.py"
+
+
+def _max_rss_kb() -> int:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def run_scenario(module_file: str, constructions: int) -> dict:
+    """在当前进程中加载分析器模块并计时（由子进程调用）"""
+    import importlib.util
+
+    rss_before = _max_rss_kb()
+    start = time.perf_counter()
+    spec = importlib.util.spec_from_file_location("bench_tcm_formula_analyzer", module_file)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    first = module.TCMFormulaAnalyzer()
+    startup = time.perf_counter() - start
+    rss_startup = _max_rss_kb()
+
+    # 模拟逐药材/逐请求新建分析器，并让实例同时存活（如并发请求）
+    analyzers = [first]
+    start = time.perf_counter()
+    for _ in range(constructions):
+        analyzers.append(module.TCMFormulaAnalyzer())
+    per_construction = (time.perf_counter() - start) / max(constructions, 1)
+
+    return {
+        "startup_ms": startup * 1000,
+        "construct_ms": per_construction * 1000,
+        "startup_rss_mb": (rss_startup - rss_before) / 1024,
+        "total_rss_mb": (_max_rss_kb() - rss_before) / 1024,
+        "herbs": len(first.herb_database),
+    }
+
+
+def _spawn(module_file: str, constructions: int) -> dict:
+    output = subprocess.check_output(
+        [sys.executable, os.path.abspath(__file__), "--scenario", module_file,
+         "--constructions", str(constructions)],
+        cwd=PROJECT_ROOT,
+    )
+    return json.loads(output.decode("utf-8").strip().splitlines()[-1])
+
+
+def _baseline_revision() -> str:
+    """引入 herb_registry.py 的提交的父提交"""
+    added = subprocess.check_output(
+        ["git", "log", "--diff-filter=A", "--format=%H", "--", "core/prescription/herb_registry.py"],
+        cwd=PROJECT_ROOT,
+    ).decode().split()
+    return f"{added[-1]}^" if added else "HEAD"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="药材数据加载基准")
+    parser.add_argument("--constructions", type=int, default=200)
+    parser.add_argument("--baseline-rev", default=None, help="旧实现所在提交，默认为引入注册表之前的提交")
+    parser.add_argument("--scenario", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.scenario:
+        print(json.dumps(run_scenario(args.scenario, args.constructions)))
+        return
+
+    revision = args.baseline_rev or _baseline_revision()
+    legacy_source = subprocess.check_output(["git", "show", f"{revision}:{ANALYZER_PATH}"], cwd=PROJECT_ROOT)
+    with tempfile.NamedTemporaryFile("wb", suffix=".py", delete=False) as f:
+        f.write(legacy_source)
+        legacy_file = f.name
+
+    try:
+        results = {
+            f"legacy ({revision[:12]})": _spawn(legacy_file, args.constructions),
+            "HerbRegistry": _spawn(os.path.join(PROJECT_ROOT, ANALYZER_PATH), args.constructions),
+        }
+    finally:
+        os.unlink(legacy_file)
+
+    print(f"TCMFormulaAnalyzer x{args.constructions}")
+    for name, r in results.items():
+        print(f"  {name:<24} herbs={r['herbs']:<4} startup={r['startup_ms']:.1f}ms "
+              f"construct={r['construct_ms']:.3f}ms "
+              f"rss(startup)=+{r['startup_rss_mb']:.1f}MB rss(total)=+{r['total_rss_mb']:.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
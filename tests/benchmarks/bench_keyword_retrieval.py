@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+关键词检索微基准：TF-IDF全量余弦相似度 vs BM25倒排索引
+
+用合成语料（Zipf分布词项）比较两种实现的建索引耗时和单次查询延迟。
+TF-IDF一侧与原 keyword_search 相同：cosine_similarity 后全量 argsort。
+
+用法：
+    python tests/benchmarks/bench_keyword_retrieval.py [--sizes 10000 100000] [--queries 200]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from core.knowledge_retrieval.bm25_index import BM25InvertedIndex
+
+
+def make_corpus(num_docs: int, vocab_size: int = 30000, seed: int = 42):
+    """生成Zipf分布的合成语料，每个文档约80~200个词项"""
+    rng = np.random.default_rng(seed)
+    lengths = rng.integers(80, 200, size=num_docs)
+    term_ids = (rng.zipf(1.3, size=int(lengths.sum())) - 1) % vocab_size
+    docs, start = [], 0
+    for length in lengths:
+        docs.append([f"t{t}" for t in term_ids[start:start + length]])
+        start += length
+    return docs
+
+
+def make_queries(num_queries: int, vocab_size: int = 30000, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    return [
+        [f"t{t}" for t in (rng.zipf(1.3, size=rng.integers(3, 9)) - 1) % vocab_size]
+        for _ in range(num_queries)
+    ]
+
+
+def _percentiles(samples):
+    samples = np.asarray(samples) * 1000
+    return f"p50={np.percentile(samples, 50):.2f}ms p95={np.percentile(samples, 95):.2f}ms"
+
+
+def bench_tfidf(docs, queries, k):
+    start = time.perf_counter()
+    vectorizer = TfidfVectorizer(max_features=5000, ngram_range=(1, 2), token_pattern=r"\S+")
+    matrix = vectorizer.fit_transform(" ".join(doc) for doc in docs)
+    build = time.perf_counter() - start
+
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        similarities = cosine_similarity(vectorizer.transform([" ".join(query)]), matrix).flatten()
+        similarities.argsort()[-k:][::-1]
+        latencies.append(time.perf_counter() - start)
+    return build, latencies
+
+
+def bench_bm25(docs, queries, k):
+    start = time.perf_counter()
+    index = BM25InvertedIndex.build(docs)
+    build = time.perf_counter() - start
+
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        index.search(query, k)
+        latencies.append(time.perf_counter() - start)
+    return build, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=15)
+    args = parser.parse_args()
+
+    queries = make_queries(args.queries)
+    for size in args.sizes:
+        docs = make_corpus(size)
+        print(f"\n📊 语料规模: {size} 个分块")
+        for name, bench in (("TF-IDF cosine", bench_tfidf), ("BM25 inverted", bench_bm25)):
+            build, latencies = bench(docs, queries, args.k)
+            print(f"  {name:<14} 建索引 {build:.2f}s  查询 {_percentiles(latencies)}")
+
+
+if __name__ == "__main__":
+    main()
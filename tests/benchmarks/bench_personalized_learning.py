@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+个性化学习基准：逐症状查询 symptom_doctor_match vs 内存 症状×医生 矩阵
+
+在临时学习库中写入合成的 症状×医生 统计（默认 40 位医生 x 词典中全部学习症状），
+对一组查询分别调用新旧 recommend_doctor / get_doctor_performance / generate_learning_insights，
+逐条比对结果并报告平均耗时；再分别在两份库副本上连续记录反馈，比较 record_feedback 耗时，
+并在写回后比对两份库中的统计。
+
+旧实现取自引入 SymptomDoctorModel 之前的提交（git show）。
+得分相同的医生、成功率相同的症状在旧实现中先后没有定义，合成数据避免了这类并列。
+任何不一致都会以非零状态退出。
+
+用法：
+    python tests/benchmarks/bench_personalized_learning.py [--doctors 40] [--feedback 500] [--rounds 20]
+"""
+
+import argparse
+import logging
+import os
+import random
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+import types
+from datetime import datetime
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
+
+from core.text_matching.symptom_lexicon import get_symptom_lexicon
+from services.personalized_learning import PersonalizedLearningSystem, UserFeedback
+
+MODULE_PATH = "services/personalized_learning.py"
+
+QUERIES = [
+    "最近头痛失眠，晚上多梦", "孩子咳嗽发热", "长期便秘腹胀", "月经不调伴腰痛", "胃痛反酸",
+    "心悸胸闷乏力", "头晕耳鸣", "你好", "皮肤瘙痒湿疹", "口干口苦失眠",
+]
+
+
+def _baseline_revision() -> str:
+    """引入 SymptomDoctorModel 的提交的父提交"""
+    added = subprocess.check_output(
+        ["git", "log", "-S", "class SymptomDoctorModel", "--format=%H", "--", MODULE_PATH],
+        cwd=PROJECT_ROOT,
+    ).decode().split()
+    return f"{added[-1]}^" if added else "HEAD"
+
+
+def _load_legacy_system(revision: str, db_path: str):
+    source = subprocess.check_output(["git", "show", f"{revision}:{MODULE_PATH}"], cwd=PROJECT_ROOT).decode("utf-8")
+    module = types.ModuleType("legacy_personalized_learning")
+    exec(compile(source, MODULE_PATH, "exec"), module.__dict__)
+    return module.PersonalizedLearningSystem(db_path=db_path)
+
+
+def _learning_symptoms():
+    """词典中的学习症状（逐条扫描确认可被提取）"""
+    lexicon = get_symptom_lexicon()
+    symptoms = set()
+    for query in QUERIES:
+        symptoms.update(lexicon.scan(query.lower()).terms("learning_symptom"))
+    return sorted(symptoms)
+
+
+def _seed(db_path: str, doctors: int):
+    """合成统计：成功率互不相同，避免排序并列"""
+    rng = random.Random(5)
+    symptoms = _learning_symptoms()
+    names = [f"doctor_{d:03d}" for d in range(doctors)]
+    rates = rng.sample(range(1, 100000), len(symptoms) * doctors)
+    conn = sqlite3.connect(db_path)
+    now = datetime.now().isoformat()
+    conn.executemany(
+        "INSERT INTO symptom_doctor_match (symptom, doctor_name, success_rate, total_cases, last_updated) VALUES (?, ?, ?, ?, ?)",
+        [(symptom, name, rates[i * doctors + d] / 100000, rng.randint(1, 40), now)
+         for i, symptom in enumerate(symptoms) for d, name in enumerate(names)]
+    )
+    conn.executemany(
+        "INSERT INTO doctor_performance (doctor_name, total_sessions, total_rating_sum, positive_feedback_count, "
+        "negative_feedback_count, last_updated) VALUES (?, ?, ?, ?, ?, ?)",
+        [(name, n, n * rng.randint(2, 5), n // 2, n // 5, now) for name, n in ((name, rng.randint(1, 200)) for name in names)]
+    )
+    conn.commit()
+    conn.close()
+    return names
+
+
+def _feedbacks(names, count):
+    rng = random.Random(9)
+    return [
+        UserFeedback(session_id=f"bench_{i}", user_query=rng.choice(QUERIES), selected_doctor=rng.choice(names),
+                     ai_response="...", user_rating=rng.randint(1, 5), feedback_text=None, timestamp=datetime.now())
+        for i in range(count)
+    ]
+
+
+def _same_recommendation(old, new):
+    return old[0] == new[0] and abs(float(old[1]) - new[1]) < 1e-9
+
+
+def _same_matches(old, new):
+    return len(old) == len(new) and all(
+        a[:2] == b[:2] and abs(a[2] - b[2]) < 1e-9 and a[3] == b[3] for a, b in zip(old, new)
+    )
+
+
+def _dump(db_path):
+    conn = sqlite3.connect(db_path)
+    matches = conn.execute(
+        "SELECT symptom, doctor_name, ROUND(success_rate, 9), total_cases FROM symptom_doctor_match ORDER BY 1, 2"
+    ).fetchall()
+    performance = conn.execute(
+        "SELECT doctor_name, total_sessions, total_rating_sum, positive_feedback_count, negative_feedback_count "
+        "FROM doctor_performance ORDER BY 1"
+    ).fetchall()
+    conn.close()
+    return matches, performance
+
+
+def _best_time(call, rounds: int, repeats: int = 5) -> float:
+    call()  # 预热
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            call()
+        best = min(best, time.perf_counter() - start)
+    return best / rounds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="个性化学习基准")
+    parser.add_argument("--doctors", type=int, default=40)
+    parser.add_argument("--feedback", type=int, default=500, help="record_feedback 基准的反馈条数")
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--baseline-rev", default=None)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    revision = args.baseline_rev or _baseline_revision()
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, "learning.sqlite")
+        legacy = _load_legacy_system(revision, db_path)
+        names = _seed(db_path, args.doctors)
+        system = PersonalizedLearningSystem(db_path=db_path)
+
+        mismatches = 0
+        available_sets = [None, names[::3], names[:5]]
+        for query in QUERIES:
+            for available in available_sets:
+                if not _same_recommendation(legacy.recommend_doctor(query, available),
+                                            system.recommend_doctor(query, available)):
+                    mismatches += 1
+                    print(f"  不一致：recommend {query} available={None if available is None else len(available)}")
+        for name in names:
+            old, new = legacy.get_doctor_performance(name), system.get_doctor_performance(name)
+            if (old.total_sessions, old.average_rating, old.preferred_symptoms, old.improvement_areas) != \
+                    (new.total_sessions, new.average_rating, new.preferred_symptoms, new.improvement_areas):
+                mismatches += 1
+                print(f"  不一致：performance {name}")
+        old_insights, new_insights = legacy.generate_learning_insights(), system.generate_learning_insights()
+        if [i.insight_type for i in old_insights] != [i.insight_type for i in new_insights] or not all(
+                _same_matches(a.content["matches"], b.content["matches"]) for a, b in zip(old_insights, new_insights)):
+            mismatches += 1
+            print("  不一致：insights")
+
+        def run(target):
+            def call():
+                for query in QUERIES:
+                    target.recommend_doctor(query)
+            return call
+
+        recommend_legacy = _best_time(run(legacy), args.rounds) / len(QUERIES)
+        recommend_matrix = _best_time(run(system), args.rounds) / len(QUERIES)
+        insights_legacy = _best_time(legacy.generate_learning_insights, args.rounds)
+        insights_matrix = _best_time(system.generate_learning_insights, args.rounds)
+
+        # record_feedback：两份库副本各自记录同一批反馈
+        legacy_db, matrix_db = os.path.join(directory, "legacy.sqlite"), os.path.join(directory, "matrix.sqlite")
+        shutil.copyfile(db_path, legacy_db)
+        shutil.copyfile(db_path, matrix_db)
+        legacy_writer = _load_legacy_system(revision, legacy_db)
+        matrix_writer = PersonalizedLearningSystem(db_path=matrix_db)
+        matrix_writer.recommend_doctor(QUERIES[0])  # 预先加载模型
+        feedbacks = _feedbacks(names, args.feedback)
+
+        start = time.perf_counter()
+        for feedback in feedbacks:
+            legacy_writer.record_feedback(feedback)
+        record_legacy = (time.perf_counter() - start) / len(feedbacks)
+        start = time.perf_counter()
+        for feedback in feedbacks:
+            matrix_writer.record_feedback(feedback)
+        matrix_writer.flush()
+        record_matrix = (time.perf_counter() - start) / len(feedbacks)
+        if _dump(legacy_db) != _dump(matrix_db):
+            mismatches += 1
+            print("  不一致：记录反馈后写回的统计")
+
+    print(f"医生 {args.doctors} 位，症状 {len(_learning_symptoms())} 个，旧实现 {revision[:12]}")
+    print(f"  recommend_doctor            legacy={recommend_legacy * 1e6:>8.0f}µs/次  "
+          f"matrix={recommend_matrix * 1e6:>8.0f}µs/次  x{recommend_legacy / recommend_matrix:.1f}")
+    print(f"  generate_learning_insights  legacy={insights_legacy * 1e6:>8.0f}µs/次  "
+          f"matrix={insights_matrix * 1e6:>8.0f}µs/次  x{insights_legacy / insights_matrix:.1f}")
+    print(f"  record_feedback（{len(feedbacks)} 条，含写回）legacy={record_legacy * 1e6:>8.0f}µs/条  "
+          f"matrix={record_matrix * 1e6:>8.0f}µs/条  x{record_legacy / record_matrix:.1f}")
+    if mismatches:
+        print(f"结果不一致 {mismatches} 处")
+        sys.exit(1)
+    print("全部结果与旧实现一致")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+AI回复后处理基准：api/main.py 原有的逐条正则函数链 vs 预编译规则表引擎
+
+语料为已存储的AI回复（cache.sqlite 的 cache_entries.ai_response、conversation_logs 中的助手回复）
+加上 tests/fixtures/ai_reply_corpus.json 中覆盖各条规则的构造回复。
+每条回复分别在"未上传舌象"与"舌象分析成功"两种上下文下运行（构造回复使用自带的上下文），
+报告每条回复的平均耗时、引擎实际运行/跳过的正则次数，并逐项比对新旧输出：
+
+    check_medical_safety / sanitize_ai_response / normalize_prescription_dosage /
+    standardize_prescription_format / enhance_diagnosis_format /
+    detect_and_filter_western_medicine / 完整流水线
+
+任何一项输出不一致都会以非零状态退出。
+
+旧实现取自引入 response_sanitizer.py 之前的提交（git show），无需手工保留旧文件。
+
+用法：
+    python tests/benchmarks/bench_response_sanitizer.py [--rounds 20] [--baseline-rev REV]
+"""
+
+import argparse
+import ast
+import glob
+import json
+import logging
+import os
+import re
+import sqlite3
+import subprocess
+import sys
+import time
+from collections import Counter
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
+
+from core.ai_response.response_sanitizer import SanitizationReport, get_response_sanitizer
+
+MAIN_PATH = "api/main.py"
+MAIN_FUNCTIONS = (
+    "check_symptom_fabrication", "detect_fabricated_examination", "check_medical_safety",
+    "normalize_prescription_dosage", "extract_herbs_from_prescription", "standardize_prescription_format",
+    "generate_enhanced_prescription_format", "enhance_diagnosis_format",
+    "detect_and_filter_western_medicine", "sanitize_ai_response",
+)
+MAIN_CONSTANTS = ("STRICT_TONGUE_PULSE_PATTERNS",)
+CORPUS_PATH = os.path.join(PROJECT_ROOT, "tests", "fixtures", "ai_reply_corpus.json")
+CACHE_DB = os.path.join(PROJECT_ROOT, "data", "cache.sqlite")
+CONVERSATION_LOG_DIR = os.path.join(PROJECT_ROOT, "data", "conversation_logs")
+
+CONTEXTS = {
+    "no_image": {"has_tongue_image": False, "image_analysis_successful": False, "patient_described_tongue": ""},
+    "image_ok": {"has_tongue_image": True, "image_analysis_successful": True, "patient_described_tongue": ""},
+}
+
+
+def _baseline_revision() -> str:
+    """引入 response_sanitizer.py 的提交的父提交"""
+    added = subprocess.check_output(
+        ["git", "log", "--diff-filter=A", "--format=%H", "--", "core/ai_response/response_sanitizer.py"],
+        cwd=PROJECT_ROOT,
+    ).decode().split()
+    return f"{added[-1]}^" if added else "HEAD"
+
+
+def _git_show(revision: str, path: str) -> str:
+    return subprocess.check_output(["git", "show", f"{revision}:{path}"], cwd=PROJECT_ROOT).decode("utf-8")
+
+
+def _load_main_functions(source: str) -> dict:
+    """只取出 api/main.py 中的后处理函数与规则常量，避免导入整个应用"""
+    tree = ast.parse(source)
+    nodes = [
+        node for node in tree.body
+        if (isinstance(node, ast.FunctionDef) and node.name in MAIN_FUNCTIONS)
+        or (isinstance(node, ast.Assign) and any(getattr(t, "id", None) in MAIN_CONSTANTS for t in node.targets))
+    ]
+    namespace = {"re": re, "logger": logging.getLogger("legacy_main")}
+    exec(compile(ast.Module(body=nodes, type_ignores=[]), MAIN_PATH, "exec"), namespace)
+    return namespace
+
+
+def load_cases(cache_db: str = CACHE_DB, log_dir: str = CONVERSATION_LOG_DIR) -> list:
+    """(来源, 回复, 患者消息, 上下文) 列表"""
+    cases = []
+    with open(CORPUS_PATH, "r", encoding="utf-8") as f:
+        for item in json.load(f)["replies"]:
+            context = {key: item[key] for key in CONTEXTS["no_image"]}
+            cases.append((item["id"], item["text"], item["patient_message"], context))
+
+    stored = []
+    if os.path.exists(cache_db):
+        with sqlite3.connect(cache_db) as conn:
+            stored.extend(conn.execute(
+                "SELECT symptom_pattern, ai_response FROM cache_entries WHERE ai_response IS NOT NULL"
+            ).fetchall())
+    for path in sorted(glob.glob(os.path.join(log_dir, "*.json"))):
+        with open(path, "r", encoding="utf-8") as f:
+            messages = json.load(f)
+        for user, reply in zip(messages, messages[1:]):
+            if user.get("role") == "user" and reply.get("role") == "assistant":
+                stored.append((user.get("content", ""), reply.get("content", "")))
+
+    for index, (message, reply) in enumerate(stored):
+        for name, context in CONTEXTS.items():
+            cases.append((f"stored-{index}-{name}", reply, message or "", dict(context)))
+    return cases
+
+
+def legacy_pipeline(functions: dict, text: str, message: str, context: dict) -> str:
+    """与线上调用顺序一致的旧函数链"""
+    text = functions["sanitize_ai_response"](
+        text, context["has_tongue_image"], context["patient_described_tongue"],
+        context["image_analysis_successful"], message)
+    text = functions["normalize_prescription_dosage"](text)
+    text = functions["standardize_prescription_format"](text)
+    text = functions["enhance_diagnosis_format"](text)
+    has_western_content, filtered = functions["detect_and_filter_western_medicine"](text)
+    return filtered if has_western_content else text
+
+
+def engine_pipeline(text: str, message: str, context: dict):
+    return get_response_sanitizer().process(
+        text, context["has_tongue_image"], context["patient_described_tongue"],
+        context["image_analysis_successful"], message)
+
+
+def _legacy_outputs(functions, text, message, context):
+    return {
+        "check_medical_safety": functions["check_medical_safety"](
+            text, context["has_tongue_image"], context["patient_described_tongue"],
+            context["image_analysis_successful"], message),
+        "sanitize_ai_response": functions["sanitize_ai_response"](
+            text, context["has_tongue_image"], context["patient_described_tongue"],
+            context["image_analysis_successful"], message),
+        "normalize_prescription_dosage": functions["normalize_prescription_dosage"](text),
+        "standardize_prescription_format": functions["standardize_prescription_format"](text),
+        "enhance_diagnosis_format": functions["enhance_diagnosis_format"](text),
+        "detect_and_filter_western_medicine": functions["detect_and_filter_western_medicine"](text),
+        "pipeline": legacy_pipeline(functions, text, message, context),
+    }
+
+
+def _engine_outputs(text, message, context):
+    sanitizer = get_response_sanitizer()
+    result = engine_pipeline(text, message, context)
+    return {
+        "check_medical_safety": sanitizer.check_medical_safety(
+            text, context["has_tongue_image"], context["patient_described_tongue"],
+            context["image_analysis_successful"], message),
+        "sanitize_ai_response": sanitizer.sanitize(
+            text, context["has_tongue_image"], context["patient_described_tongue"],
+            context["image_analysis_successful"], message),
+        "normalize_prescription_dosage": sanitizer.normalize_dosage(text),
+        "standardize_prescription_format": sanitizer.standardize_prescription(text),
+        "enhance_diagnosis_format": sanitizer.enhance_format(text),
+        "detect_and_filter_western_medicine": sanitizer.filter_western_medicine(text),
+        "pipeline": result.text,
+    }
+
+
+def _best_time(call, cases, rounds, repeats=5) -> float:
+    """repeats 次中最快的一次，返回每条回复的平均秒数"""
+    for case in cases[:3]:
+        call(*case[1:])  # 预热
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for case in cases:
+                call(*case[1:])
+        best = min(best, time.perf_counter() - start)
+    return best / (rounds * len(cases))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AI回复后处理基准")
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--baseline-rev", default=None, help="旧实现所在提交，默认为引入后处理引擎之前的提交")
+    parser.add_argument("--cache-db", default=CACHE_DB, help="存储AI回复的缓存库")
+    args = parser.parse_args()
+
+    # 两边的清理日志都很多，计时时关闭
+    logging.disable(logging.CRITICAL)
+
+    cases = load_cases(args.cache_db)
+    revision = args.baseline_rev or _baseline_revision()
+    legacy = _load_main_functions(_git_show(revision, MAIN_PATH))
+
+    mismatches = Counter()
+    for case_id, text, message, context in cases:
+        old = _legacy_outputs(legacy, text, message, context)
+        new = _engine_outputs(text, message, context)
+        for name in old:
+            if old[name] != new[name]:
+                mismatches[name] += 1
+                print(f"  不一致：{case_id} {name}")
+
+    legacy_cost = _best_time(lambda *case: legacy_pipeline(legacy, *case), cases, args.rounds)
+    engine_cost = _best_time(engine_pipeline, cases, args.rounds)
+
+    fired = Counter()
+    scans = skipped = 0
+    for _, text, message, context in cases:
+        report: SanitizationReport = engine_pipeline(text, message, context).report
+        fired.update(rule_id.split(".")[0] for rule_id in report.fired)
+        scans += report.regex_scans
+        skipped += report.skipped
+
+    stored = sum(case_id.startswith("stored-") for case_id, *_ in cases)
+    print(f"语料 {len(cases)} 条（存储回复 {stored}，构造回复 {len(cases) - stored}）x {args.rounds} 轮，旧实现 {revision[:12]}")
+    print(f"  完整流水线  legacy={legacy_cost * 1e6:>8.0f}µs/条  engine={engine_cost * 1e6:>8.0f}µs/条  "
+          f"x{legacy_cost / engine_cost:.1f}")
+    print(f"  引擎每条平均运行正则 {scans / len(cases):.1f} 次，预筛跳过 {skipped / len(cases):.1f} 次")
+    print("  命中规则（按类别）：" + ", ".join(f"{name}={count}" for name, count in fired.most_common()))
+    if mismatches:
+        print("输出不一致：" + ", ".join(f"{name}={count}" for name, count in mismatches.items()))
+        sys.exit(1)
+    print("全部输出与旧实现逐字节一致")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+会话验证开销基准：每次请求查库+写 last_activity_at 的旧实现 vs 会话缓存 + 去抖批量写入
+
+在临时数据库中创建若干会话，模拟每个会话连续发起多次已认证请求，
+报告每次 verify_session 的平均耗时与写入 unified_sessions 的次数。
+
+旧实现取自引入会话缓存之前的提交（git show）。
+
+用法：
+    python tests/benchmarks/bench_session_verify.py [--sessions 50] [--requests 40] [--baseline-rev REV]
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "tests", "unit"))
+
+from test_unified_auth_session_cache import _make_db
+
+SERVICE_PATH = "core/security/unified_auth_service.py"
+
+
+def _baseline_revision() -> str:
+    """引入会话缓存的提交的父提交"""
+    commits = subprocess.check_output(
+        ["git", "log", "-S", "_session_cache", "--format=%H", "--", SERVICE_PATH], cwd=PROJECT_ROOT
+    ).decode().split()
+    return f"{commits[-1]}^" if commits else "HEAD"
+
+
+def _load_legacy_service(revision: str, directory: str):
+    source = subprocess.check_output(["git", "show", f"{revision}:{SERVICE_PATH}"], cwd=PROJECT_ROOT).decode("utf-8")
+    path = os.path.join(directory, "legacy_unified_auth_service.py")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(source)
+    spec = importlib.util.spec_from_file_location("legacy_unified_auth_service", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.UnifiedAuthService
+
+
+def _count_writes(db_path: str):
+    """统计 unified_sessions 上的 UPDATE 次数（触发器计数）"""
+    import sqlite3
+    conn = sqlite3.connect(db_path)
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS bench_writes (n INTEGER);
+        DELETE FROM bench_writes;
+        INSERT INTO bench_writes VALUES (0);
+        CREATE TRIGGER IF NOT EXISTS bench_count AFTER UPDATE ON unified_sessions
+        BEGIN UPDATE bench_writes SET n = n + 1; END;
+    """)
+    conn.commit()
+    conn.close()
+
+    def read():
+        conn = sqlite3.connect(db_path)
+        value = conn.execute("SELECT n FROM bench_writes").fetchone()[0]
+        conn.close()
+        return value
+    return read
+
+
+async def _run(service, tokens, requests):
+    for _ in range(requests):
+        for token in tokens:
+            assert await service.verify_session(token) is not None
+
+
+def _measure(service, db_path, tokens, requests):
+    writes = _count_writes(db_path)
+    started = time.perf_counter()
+    asyncio.run(_run(service, tokens, requests))
+    if hasattr(service, "flush_activity"):
+        service.flush_activity()
+    elapsed = time.perf_counter() - started
+    calls = len(tokens) * requests
+    return elapsed * 1000 / calls, writes()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="会话验证开销基准")
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=40, help="每个会话的请求数")
+    parser.add_argument("--baseline-rev", default=None, help="旧实现所在提交，默认为引入会话缓存之前的提交")
+    args = parser.parse_args()
+
+    from core.security.unified_auth_service import UnifiedAuthService
+
+    revision = args.baseline_rev or _baseline_revision()
+    tokens = [f"bench-token-{i}" for i in range(args.sessions)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        legacy_dir = os.path.join(directory, "legacy")
+        current_dir = os.path.join(directory, "current")
+        os.makedirs(legacy_dir)
+        os.makedirs(current_dir)
+
+        legacy_db = _make_db(legacy_dir, tokens)
+        current_db = _make_db(current_dir, tokens)
+
+        legacy = _load_legacy_service(revision, directory)(db_path=legacy_db)
+        current = UnifiedAuthService(db_path=current_db)
+
+        legacy_ms, legacy_writes = _measure(legacy, legacy_db, tokens, args.requests)
+        current_ms, current_writes = _measure(current, current_db, tokens, args.requests)
+        current.shutdown()
+
+    calls = args.sessions * args.requests
+    print(f"{args.sessions} 个会话 x {args.requests} 次请求 = {calls} 次验证，旧实现 {revision[:12]}")
+    print(f"  legacy  {legacy_ms:.3f} ms/请求  写入 {legacy_writes} 次")
+    print(f"  cached  {current_ms:.3f} ms/请求  写入 {current_writes} 次  x{legacy_ms / current_ms:.1f}")
+    print(f"  统计: {current.get_stats()}")
+
+
+if __name__ == "__main__":
+    main()
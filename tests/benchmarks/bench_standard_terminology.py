@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+标准术语解析基准：逐名称 name = ? OR alias LIKE '%x%' 查询 vs 进程内术语字典
+
+在临时库中执行 020_clinical_decision_data_driven.sql 建立四张 tcm_*_standard 表，
+并追加合成的疾病、症状、处方、药材（带别名）放大表规模；对一组决策树文本分别调用新旧
+text_to_structured，逐条比对解析出的标准库ID并报告平均耗时；另逐名称比对四个
+_get_*_from_standard 的返回值。
+
+旧实现取自引入 standard_terminology.py 之前的提交（git show）。
+未命中标准库的条目ID为随机生成，比对时只比较是否命中。
+合成名称均不含 _ 与 %：旧实现的 LIKE 把它们当作通配符，新实现按字面匹配，含这两个字符的名称结果可能不同。
+任何不一致都会以非零状态退出。
+
+用法：
+    python tests/benchmarks/bench_standard_terminology.py [--extra-terms 2000] [--rounds 20]
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+import types
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
+
+from services.decision_tree_data_service import DecisionTreeDataService
+
+SERVICE_PATH = "services/decision_tree_data_service.py"
+MIGRATION_PATH = os.path.join(PROJECT_ROOT, "database", "migrations", "020_clinical_decision_data_driven.sql")
+
+TEXTS = [
+    "【疾病】风寒感冒\n【主症】恶寒发热（重）、头痛（中）、身痛（中）\n【兼症】鼻塞、流清涕、咳嗽\n"
+    "【舌象】舌淡红，苔薄白\n【脉象】脉浮紧\n【证候】风寒表证\n【处方】麻黄汤\n"
+    "【方剂】麻黄9克(君药) + 桂枝6克(臣药) + 杏仁6克(佐药) + 甘草3克(使药)",
+    "【疾病】合成病证17\n【主症】合成症状3、合成症状250（轻）、胸闷\n【兼症】合成症状999、口干\n"
+    "【证候】脾气虚证\n【处方】加减方\n【方剂】合成药材5 10克(君药)、别名药材42 6克、白芍9克、大枣12枚、未知药15克",
+    "【疾病】别名病证88\n【主症】合成症状1500、乏力\n【处方】别名方剂7\n【方剂】合成药材1 9克",
+    "【疾病】不存在的病\n【主症】头痛、咳嗽、合成症状77\n【处方】自拟方\n"
+    "【方剂】" + "、".join(f"合成药材{i} {i % 15 + 3}克" for i in range(0, 400, 20)),
+]
+
+
+def _baseline_revision() -> str:
+    """引入 standard_terminology.py 的提交的父提交"""
+    added = subprocess.check_output(
+        ["git", "log", "--diff-filter=A", "--format=%H", "--",
+         "core/knowledge_retrieval/standard_terminology.py"],
+        cwd=PROJECT_ROOT,
+    ).decode().split()
+    return f"{added[-1]}^" if added else "HEAD"
+
+
+def _load_legacy_service(revision: str, db_path: str):
+    source = subprocess.check_output(["git", "show", f"{revision}:{SERVICE_PATH}"], cwd=PROJECT_ROOT).decode("utf-8")
+    module = types.ModuleType("legacy_decision_tree_data_service")
+    exec(compile(source, SERVICE_PATH, "exec"), module.__dict__)
+    return module.DecisionTreeDataService(db_path=db_path)
+
+
+def _create_db(db_path: str, extra: int):
+    rng = random.Random(3)
+    conn = sqlite3.connect(db_path)
+    with open(MIGRATION_PATH, encoding="utf-8") as f:
+        conn.executescript(f.read())
+    conn.executemany("INSERT INTO tcm_diseases_standard (id, name, category, alias) VALUES (?, ?, ?, ?)", [
+        (f"disease_x{i}", f"合成病证{i}", "内伤病", json.dumps([f"别名病证{i}"], ensure_ascii=False) if i % 2 else None)
+        for i in range(extra // 10)
+    ])
+    conn.executemany("INSERT INTO tcm_symptoms_standard (id, name, category) VALUES (?, ?, ?)", [
+        (f"symptom_x{i}", f"合成症状{i}", rng.choice(["主症", "兼症"])) for i in range(extra)
+    ])
+    conn.executemany("""
+        INSERT INTO tcm_prescriptions_standard (id, name, alias, composition, effects, indications)
+        VALUES (?, ?, ?, '[]', '', '')
+    """, [
+        (f"prescription_x{i}", f"合成方剂{i}", json.dumps([f"别名方剂{i}"], ensure_ascii=False))
+        for i in range(extra // 10)
+    ])
+    conn.executemany("INSERT INTO tcm_herbs_standard (id, name, alias, category, effects) VALUES (?, ?, ?, ?, ?)", [
+        (f"herb_x{i}", f"合成药材{i}", json.dumps([f"别名药材{i}"], ensure_ascii=False) if i % 3 else None,
+         "补益药", f"功效{i}")
+        for i in range(extra)
+    ])
+    conn.commit()
+    standard_ids = {row[0] for table in ("tcm_diseases_standard", "tcm_symptoms_standard",
+                                         "tcm_prescriptions_standard", "tcm_herbs_standard")
+                    for row in conn.execute(f"SELECT id FROM {table}")}
+    names = {
+        kind: [row[0] for row in conn.execute(f"SELECT name FROM {table}")] + [f"别名{label}{i}" for i in range(0, 60, 7)]
+        for kind, table, label in [
+            ("disease", "tcm_diseases_standard", "病证"), ("symptom", "tcm_symptoms_standard", "症状"),
+            ("prescription", "tcm_prescriptions_standard", "方剂"), ("herb", "tcm_herbs_standard", "药材"),
+        ]
+    }
+    conn.close()
+    return names, standard_ids
+
+
+def _standard_ids(data, standard_ids):
+    """解析结果中的标准库ID；未命中（随机ID）只记为 None"""
+    def standard(item_id):
+        return item_id if item_id in standard_ids else None
+
+    symptoms = data["diagnosis"]["main_symptoms"] + data["diagnosis"]["secondary_symptoms"]
+    return (
+        standard(data["disease"].get("id")),
+        [(s["name"], standard(s["id"]), s["severity"]) for s in symptoms],
+        [(standard(p["id"]), [(h["name"], standard(h["herb_id"]), h["dosage"], h["role"], h["effect"])
+                              for h in p["composition"]])
+         for p in data["prescriptions"]],
+    )
+
+
+def _best_time(call, rounds: int, repeats: int = 5) -> float:
+    call()  # 预热
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            call()
+        best = min(best, time.perf_counter() - start)
+    return best / rounds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="标准术语解析基准")
+    parser.add_argument("--extra-terms", type=int, default=2000, help="追加的合成症状、药材数（疾病、处方为其1/10）")
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--baseline-rev", default=None)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    revision = args.baseline_rev or _baseline_revision()
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, "user_history.sqlite")
+        names, standard_ids = _create_db(db_path, args.extra_terms)
+        legacy = _load_legacy_service(revision, db_path)
+        service = DecisionTreeDataService(db_path=db_path)
+
+        mismatches = 0
+        lookups = {
+            "disease": "_get_disease_from_standard", "symptom": "_get_symptom_from_standard",
+            "prescription": "_get_prescription_from_standard", "herb": "_get_herb_from_standard",
+        }
+        rng = random.Random(1)
+        for kind, method in lookups.items():
+            for name in rng.sample(names[kind], min(300, len(names[kind]))) + ["不存在", "汤", "合成"]:
+                if getattr(legacy, method)(name) != getattr(service, method)(name):
+                    mismatches += 1
+                    print(f"  不一致：{kind} {name}")
+        for text in TEXTS:
+            old = _standard_ids(legacy.text_to_structured(text, "d"), standard_ids)
+            if old != _standard_ids(service.text_to_structured(text, "d"), standard_ids):
+                mismatches += 1
+                print(f"  不一致：text_to_structured {text[:20]}")
+
+        legacy_cost = _best_time(lambda: [legacy.text_to_structured(text, "d") for text in TEXTS], args.rounds)
+        indexed_cost = _best_time(lambda: [service.text_to_structured(text, "d") for text in TEXTS], args.rounds)
+        terms = service.terminology.get_stats()["terms"]
+
+    print(f"标准库 {terms}，决策树文本 {len(TEXTS)} 段，旧实现 {revision[:12]}")
+    print(f"  text_to_structured  legacy={legacy_cost / len(TEXTS) * 1e3:>8.2f}ms/次  "
+          f"indexed={indexed_cost / len(TEXTS) * 1e3:>8.3f}ms/次  x{legacy_cost / indexed_cost:.1f}")
+    if mismatches:
+        print(f"解析结果不一致 {mismatches} 处")
+        sys.exit(1)
+    print("全部解析结果与旧实现一致")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+多设备同步广播负载测试：多个worker进程 + SQLite同步总线 + 模拟设备连接
+
+每个用户的设备随机分布在各worker进程上（默认 4 个worker、250 个用户 x 4 台设备 = 1000 台设备），
+每个用户从其中一台设备所在的worker发出若干条 message_sync（排除发送设备），
+再连续发出一组同会话的 state_sync 以观察积压时的合并效果。
+
+报告：
+- 送达完整性：每条 message_sync 应到达该用户除发送设备外的全部设备（跨worker也必须送达）；
+  只在本进程内广播时的可达比例作为对照
+- 送达延迟 p50/p95/max（发送到模拟连接 send_text 的时间）
+- 总线写入/读取事件数、通道合并数
+
+任何 message_sync 漏发或重复都会以非零状态退出。
+
+用法：
+    python tests/benchmarks/bench_websocket_fanout.py [--workers 4] [--users 250] [--devices-per-user 4]
+        [--messages 5] [--poll-ms 50]
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
+
+from core.realtime import ConnectionHub, SQLiteBackplane
+
+
+class SimulatedDevice:
+    """模拟设备连接：记录收到的帧与延迟"""
+
+    def __init__(self, device_id: str):
+        self.device_id = device_id
+        self.received = Counter()
+        self.latencies = []
+        self.state_frames = 0
+
+    async def send_text(self, text: str):
+        now = time.time()
+        await asyncio.sleep(0)
+        message = json.loads(text)
+        data = message["data"]
+        if message["type"] == "message_sync":
+            self.received[data["message_id"]] += 1
+            self.latencies.append(now - data["sent_at"])
+        elif message["type"] == "state_sync":
+            self.state_frames += 1
+
+
+def plan_devices(workers: int, users: int, devices_per_user: int, seed: int = 7):
+    """{user_id: [(device_id, worker_index), ...]}"""
+    rng = random.Random(seed)
+    return {
+        f"user_{u}": [(f"user_{u}_device_{d}", rng.randrange(workers)) for d in range(devices_per_user)]
+        for u in range(users)
+    }
+
+
+async def _worker_main(index, plan, db_path, messages, state_updates, poll_ms, barrier, drain_seconds):
+    backplane = SQLiteBackplane(db_path=db_path, worker_id=f"worker_{index}", poll_interval=poll_ms / 1000)
+    hub = ConnectionHub(backplane=backplane, max_pending=1024)
+
+    devices = {}
+    for user_id, placement in plan.items():
+        for device_id, worker in placement:
+            if worker == index:
+                devices[device_id] = SimulatedDevice(device_id)
+                hub.register(devices[device_id], user_id, device_id)
+    await backplane.exchange()
+    await asyncio.to_thread(barrier.wait)
+
+    # 每个用户由其第一台设备所在的worker发出消息
+    senders = [(user_id, placement[0][0]) for user_id, placement in plan.items() if placement[0][1] == index]
+    start = time.perf_counter()
+    for seq in range(messages):
+        for user_id, device_id in senders:
+            await hub.broadcast(user_id, {
+                "type": "message_sync",
+                "data": {"message_id": f"{user_id}:{seq}", "sent_at": time.time(), "sent_by_device": device_id}
+            }, exclude_device=device_id)
+        await asyncio.sleep(0)
+    for stage in range(state_updates):
+        for user_id, device_id in senders:
+            await hub.broadcast(user_id, {
+                "type": "state_sync",
+                "data": {"conversation_id": f"{user_id}:conv", "current_stage": stage}
+            }, exclude_device=device_id)
+    publish_seconds = time.perf_counter() - start
+
+    await asyncio.sleep(drain_seconds)
+    await asyncio.to_thread(barrier.wait)
+    stats = hub.get_all_connection_stats()
+    await hub.close()
+    return {
+        "received": {device_id: dict(device.received) for device_id, device in devices.items()},
+        "latencies": [latency for device in devices.values() for latency in device.latencies],
+        "state_frames": sum(device.state_frames for device in devices.values()),
+        "publish_seconds": publish_seconds,
+        "events_published": stats["backplane"]["events_published"],
+        "events_received": stats["backplane"]["events_received"],
+        "coalesced": stats["channels"]["coalesced"],
+        "dropped": stats["channels"]["dropped"],
+    }
+
+
+def _worker_process(index, plan, db_path, messages, state_updates, poll_ms, barrier, drain_seconds, results):
+    results.put((index, asyncio.run(
+        _worker_main(index, plan, db_path, messages, state_updates, poll_ms, barrier, drain_seconds))))
+
+
+def _percentile(values, fraction):
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)] if values else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="多设备同步广播负载测试")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--users", type=int, default=250)
+    parser.add_argument("--devices-per-user", type=int, default=4)
+    parser.add_argument("--messages", type=int, default=5, help="每个用户发出的 message_sync 条数")
+    parser.add_argument("--state-updates", type=int, default=10, help="每个用户连续发出的 state_sync 条数")
+    parser.add_argument("--poll-ms", type=int, default=50)
+    parser.add_argument("--drain-seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    plan = plan_devices(args.workers, args.users, args.devices_per_user)
+    expected = {}
+    local_reachable = total_targets = 0
+    for user_id, placement in plan.items():
+        sender, sender_worker = placement[0]
+        for device_id, worker in placement[1:]:
+            expected[device_id] = {f"{user_id}:{seq}": 1 for seq in range(args.messages)}
+            total_targets += 1
+            local_reachable += worker == sender_worker
+        expected[sender] = {}
+
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, "realtime_sync.sqlite")
+        SQLiteBackplane(db_path=db_path)  # 先建表，避免各进程同时建表
+        context = multiprocessing.get_context("spawn")
+        barrier = context.Barrier(args.workers)
+        results = context.Queue()
+        processes = [
+            context.Process(target=_worker_process, args=(
+                index, plan, db_path, args.messages, args.state_updates, args.poll_ms,
+                barrier, args.drain_seconds, results))
+            for index in range(args.workers)
+        ]
+        for process in processes:
+            process.start()
+        reports = dict(results.get() for _ in processes)
+        for process in processes:
+            process.join()
+
+    received = {}
+    for report in reports.values():
+        received.update(report["received"])
+    missing = duplicated = 0
+    for device_id, messages in expected.items():
+        got = received.get(device_id, {})
+        missing += sum(1 for message_id in messages if message_id not in got)
+        duplicated += sum(count - 1 for count in got.values() if count > 1)
+        duplicated += sum(count for message_id, count in got.items() if message_id not in messages)
+
+    latencies = [latency for report in reports.values() for latency in report["latencies"]]
+    deliveries = len(latencies)
+    state_sent = args.users * args.state_updates * (args.devices_per_user - 1)
+    state_frames = sum(report["state_frames"] for report in reports.values())
+
+    print(f"{args.workers} 个worker，{args.users} 个用户 x {args.devices_per_user} 台设备 = "
+          f"{args.users * args.devices_per_user} 台设备，每用户 {args.messages} 条消息，总线轮询 {args.poll_ms}ms")
+    print(f"  message_sync 送达 {deliveries}/{total_targets * args.messages}，漏发 {missing}，重复 {duplicated}；"
+          f"仅本进程广播可达 {local_reachable / total_targets:.1%}")
+    print(f"  延迟 p50={_percentile(latencies, 0.5) * 1000:.1f}ms  p95={_percentile(latencies, 0.95) * 1000:.1f}ms  "
+          f"max={max(latencies, default=0) * 1000:.1f}ms")
+    print(f"  发布耗时（最慢worker）{max(report['publish_seconds'] for report in reports.values()) * 1000:.1f}ms")
+    print(f"  总线写入事件 {sum(report['events_published'] for report in reports.values())}，"
+          f"读取事件 {sum(report['events_received'] for report in reports.values())}")
+    print(f"  state_sync 应发 {state_sent} 帧，实际 {state_frames} 帧，通道合并 "
+          f"{sum(report['coalesced'] for report in reports.values())} 次，丢弃 "
+          f"{sum(report['dropped'] for report in reports.values())} 条")
+    if missing or duplicated:
+        sys.exit(1)
+    print("全部 message_sync 恰好送达一次")
+
+
+if __name__ == "__main__":
+    main()
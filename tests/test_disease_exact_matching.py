@@ -133,11 +133,8 @@ def quick_test():
         # 测试疾病精确匹配加成函数
         if results:
             test_result = results[0]
-            bonus = retrieval._calculate_disease_exact_bonus(
-                disease, 
-                test_result['document'], 
-                test_result['metadata']
-            )
+            _, disease_bonuses = retrieval.bonus_index.score(disease, [test_result['index']])
+            bonus = disease_bonuses[0]
             print(f"  📈 疾病精确匹配加成: {bonus:.2f}")
     
     print("\n✅ 疾病精确匹配功能基本正常")
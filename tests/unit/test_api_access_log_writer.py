@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+API访问日志批量写入单元测试
+验证批量写入与用户补全（含统一认证会话与token脱敏）、队列溢出计数、关闭时写完剩余记录、滚动聚合窗口
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from core.security.security_monitor import ApiAccessLogWriter, RollingApiStats
+
+SCHEMA = """
+CREATE TABLE api_access_log (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT NOT NULL, ip_address TEXT,
+    user_agent TEXT, method TEXT, endpoint TEXT, status_code INTEGER,
+    response_time_ms REAL, user_id TEXT, session_token TEXT
+);
+CREATE TABLE user_sessions (session_token TEXT PRIMARY KEY, user_id TEXT, expires_at TEXT, is_active INTEGER);
+CREATE TABLE unified_sessions (session_id TEXT PRIMARY KEY, user_id TEXT, expires_at TEXT, session_status TEXT);
+CREATE TABLE security_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, event_type TEXT NOT NULL, user_id TEXT, ip_address TEXT,
+    user_agent TEXT, timestamp TEXT, details TEXT, risk_level TEXT
+);
+INSERT INTO user_sessions VALUES ('tok-1', 'user-1', '2999-01-01T00:00:00', 1);
+INSERT INTO unified_sessions VALUES
+    ('bearer-token-abcdef', 'global-7', '2999-01-01T00:00:00', 'active'),
+    ('bearer-token-expired', 'global-8', '2000-01-01T00:00:00', 'active');
+"""
+
+
+def _record(index, user_id=None, token=None):
+    return ("2025-01-01T00:00:00", "10.0.0.1", "pytest", "GET", f"/api/{index}", 200, 1.5, user_id, token)
+
+
+def _rows(path):
+    conn = sqlite3.connect(path)
+    rows = conn.execute("SELECT endpoint, user_id FROM api_access_log ORDER BY id").fetchall()
+    conn.close()
+    return rows
+
+
+def test_batches_overflow_and_close():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "monitor.sqlite")
+        conn = sqlite3.connect(path)
+        conn.executescript(SCHEMA)
+        conn.close()
+
+        # 批量足够大、间隔足够长，确保测试期间后台线程不会抢先写入
+        writer = ApiAccessLogWriter(path, max_queue_size=3, batch_size=100, flush_interval_ms=60000)
+        assert writer.enqueue(_record(0, token="tok-1"))
+        assert writer.enqueue(_record(1, token="tok-unknown"))
+        assert writer.enqueue(_record(2, user_id="anonymous"))
+        assert not writer.enqueue(_record(3))
+        assert _rows(path) == []
+
+        assert writer.flush() == 3
+        assert _rows(path) == [("/api/0", "user-1"), ("/api/1", "anonymous"), ("/api/2", "anonymous")]
+
+        writer.enqueue(_record(4, user_id="user-2"))
+        writer.close()
+        assert _rows(path)[-1] == ("/api/4", "user-2")
+
+        stats = writer.get_stats()
+        assert (stats["enqueued"], stats["written"], stats["dropped"], stats["queued"]) == (4, 4, 1, 0)
+        assert not writer.enqueue(_record(5))  # 关闭后不再接收
+
+
+def test_unified_session_tokens_resolved_and_masked():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "monitor.sqlite")
+        conn = sqlite3.connect(path)
+        conn.executescript(SCHEMA)
+        conn.close()
+
+        writer = ApiAccessLogWriter(path, batch_size=100, flush_interval_ms=60000)
+        writer.enqueue(_record(0, token="bearer-token-abcdef"))
+        writer.enqueue(_record(1, token="bearer-token-expired"))
+        writer.enqueue(_record(2, token="forged-token-123456"))
+        writer.enqueue(_record(3))
+        assert writer.flush() == 4
+
+        conn = sqlite3.connect(path)
+        rows = conn.execute("SELECT user_id, session_token FROM api_access_log ORDER BY id").fetchall()
+        events = conn.execute("SELECT event_type, ip_address, details FROM security_events ORDER BY id").fetchall()
+        conn.close()
+        # Bearer 统一认证会话按 unified_sessions 补全；日志中只保留token前缀
+        assert rows == [
+            ("global-7", "bearer-tok..."), ("anonymous", "bearer-tok..."),
+            ("anonymous", "forged-tok..."), ("anonymous", None),
+        ]
+        # 过期与伪造的token各记一条安全事件
+        assert events == [
+            ("INVALID_TOKEN_ACCESS", "10.0.0.1", '{"token": "bearer-tok..."}'),
+            ("INVALID_TOKEN_ACCESS", "10.0.0.1", '{"token": "forged-tok..."}'),
+        ]
+        writer.close()
+
+
+def test_rolling_stats_window():
+    stats = RollingApiStats(window_minutes=60)
+    start = 1_700_000_000.0
+    stats.record("1.1.1.1", 200, 10.0, now=start)
+    stats.record("1.1.1.1", 500, 30.0, now=start + 30 * 60)
+    stats.record("2.2.2.2", 404, 20.0, now=start + 59 * 60)
+
+    assert stats.per_ip(now=start + 59 * 60) == {"1.1.1.1": (2, 1), "2.2.2.2": (1, 1)}
+    totals = stats.totals(now=start + 59 * 60)
+    assert totals["api_calls"] == 3 and totals["avg_response_time_ms"] == 20.0
+
+    # 第一条滑出窗口
+    assert stats.per_ip(now=start + 61 * 60)["1.1.1.1"] == (1, 1)
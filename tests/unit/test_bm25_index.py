@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+BM25倒排索引单元测试
+验证 MaxScore 剪枝后的 top-k 与逐文档暴力计算的BM25结果一致
+"""
+
+import math
+import os
+import random
+import sys
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from core.knowledge_retrieval.bm25_index import BM25InvertedIndex
+
+
+def _brute_force_scores(docs, query, k1=1.5, b=0.75):
+    num_docs = len(docs)
+    avg_length = sum(len(doc) for doc in docs) / num_docs
+    df = Counter(term for doc in docs for term in set(doc))
+    scores = []
+    for doc in docs:
+        tf = Counter(doc)
+        score = 0.0
+        for term, weight in Counter(query).items():
+            if not tf[term]:
+                continue
+            idf = math.log(1 + (num_docs - df[term] + 0.5) / (df[term] + 0.5))
+            norm = k1 * (1 - b + b * len(doc) / avg_length)
+            score += weight * idf * tf[term] * (k1 + 1) / (tf[term] + norm)
+        scores.append(score)
+    return scores
+
+
+def test_top_k_matches_brute_force():
+    rng = random.Random(11)
+    # 词频呈长尾分布，让常见词与罕见词的得分上界差异明显，触发剪枝
+    vocabulary = [f"词{i}" for i in range(40)]
+    weights = [1.0 / (i + 1) for i in range(len(vocabulary))]
+    docs = [rng.choices(vocabulary, weights, k=rng.randint(3, 30)) for _ in range(300)]
+    index = BM25InvertedIndex.build(docs)
+
+    queries = [rng.sample(vocabulary, rng.randint(1, 5)) for _ in range(60)]
+    queries += [["词0", "词0", "词39"], ["词3", "未收录"], ["未收录"]]
+    for query in queries:
+        expected = _brute_force_scores(docs, query)
+        matched = sum(1 for score in expected if score > 0)
+        for k in (1, 5, 20):
+            hits = index.search(query, k)
+            assert len(hits) == min(k, matched), (query, k)
+
+            scores = [score for _, score in hits]
+            assert scores == sorted(scores, reverse=True)
+            for doc_id, score in hits:
+                assert math.isclose(score, expected[doc_id], rel_tol=1e-4), (query, doc_id)
+
+            # 未返回的文档不能比第k名更高
+            returned = {doc_id for doc_id, _ in hits}
+            if hits:
+                best_left_out = max((s for i, s in enumerate(expected) if i not in returned), default=0.0)
+                assert best_left_out <= hits[-1][1] * (1 + 1e-4), (query, k)
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+问诊准备阶段单元测试
+验证超时、用户结束、命中缓存等直接返回的请求不会开始思维库匹配（不产生大模型调用）
+"""
+
+import asyncio
+import os
+import sys
+from datetime import datetime
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from core.consultation.unified_consultation_service import (
+    ConsultationRequest, ConsultationResponse, StageTimer, UnifiedConsultationService, _PreparedConsultation
+)
+
+
+class FakeStateManager:
+    def __init__(self, timed_out=False):
+        self.timed_out = timed_out
+
+    def check_timeout(self, conversation_id):
+        return (self.timed_out, "对话超时")
+
+    def end_conversation(self, *args):
+        pass
+
+    def update_symptoms(self, *args):
+        pass
+
+    def get_conversation_progress(self, conversation_id):
+        return {}
+
+    def get_stage_guidance(self, conversation_id):
+        return {}
+
+
+def _service(timed_out=False, should_end=False, cached=None):
+    service = object.__new__(UnifiedConsultationService)
+    service.state_manager = FakeStateManager(timed_out)
+    service.analyzer = SimpleNamespace(analyze_user_message=lambda *args: SimpleNamespace(
+        should_end=should_end, end_type="user", end_reason="用户结束", extracted_symptoms=[]
+    ))
+    service.thinking_calls = 0
+
+    async def manage_state(request):
+        return SimpleNamespace(current_stage="inquiry", turn_count=1)
+
+    async def check_cache(request):
+        return cached
+
+    async def thinking(request, conversation_state):
+        service.thinking_calls += 1
+        return {"pattern_id": "p1"}
+
+    def end_response(request, start_time, reason):
+        return ConsultationResponse(reply=reason, conversation_id=request.conversation_id,
+                                    doctor_name=request.selected_doctor, contains_prescription=False,
+                                    should_end=True, end_reason=reason)
+
+    service._manage_conversation_state = manage_state
+    service._check_cache = check_cache
+    service._get_thinking_library_context = thinking
+    service._create_end_response = end_response
+    service._generate_doctor_persona_prompt = lambda request, state: "persona"
+    service._build_message_context = lambda request, persona, thinking_context: [
+        {"role": "system", "content": persona}, {"role": "user", "content": str(thinking_context)}
+    ]
+    return service
+
+
+def _prepare(service):
+    request = ConsultationRequest(message="头痛", conversation_id="c1", selected_doctor="zhang_zhongjing")
+    return asyncio.run(service._prepare_consultation(request, datetime.now(), StageTimer()))
+
+
+def test_early_returns_skip_thinking_library():
+    cached = ConsultationResponse(reply="缓存回复", conversation_id="c1", doctor_name="zhang_zhongjing",
+                                  contains_prescription=False)
+    for service in (_service(timed_out=True), _service(should_end=True), _service(cached=cached)):
+        prepared = _prepare(service)
+        assert isinstance(prepared, ConsultationResponse)
+        assert service.thinking_calls == 0
+
+
+def test_thinking_library_used_when_consultation_continues():
+    service = _service()
+    prepared = _prepare(service)
+    assert isinstance(prepared, _PreparedConsultation)
+    assert service.thinking_calls == 1
+    assert prepared.messages[1]["content"] == str({"pattern_id": "p1"})
+    assert "thinking_library" in prepared.timer.timings
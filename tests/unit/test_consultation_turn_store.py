@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+问诊对话轮次存储单元测试
+验证追加写、旧日志回填、keyset分页、并发追加的 seq 分配与列表页批量读取
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from core.conversation.consultation_turn_store import (
+    ROLE_ASSISTANT, ROLE_PATIENT, append_turns, backfill_from_log, build_log_projection,
+    ensure_turn_table, load_conversation_histories, load_conversation_history, materialize_conversation_log
+)
+
+
+def _append_round(cursor, consultation_uuid, query, reply):
+    return append_turns(cursor, consultation_uuid, [
+        (ROLE_PATIENT, query, "inquiry", None),
+        (ROLE_ASSISTANT, reply, "inquiry", None),
+    ])
+
+
+def test_backfill_then_append_and_paginate():
+    """测试旧日志回填后继续追加，并按游标分页读取"""
+    conn = sqlite3.connect(":memory:")
+    cursor = conn.cursor()
+    ensure_turn_table(cursor)
+
+    legacy_log = json.dumps({"conversation_history": [
+        {"patient_query": "头痛两天", "ai_response": "请问是否发热？", "timestamp": "2025-01-01T00:00:00"}
+    ]})
+    assert backfill_from_log(cursor, "c1", legacy_log) == 2
+    # 已有消息行时不会重复回填
+    assert backfill_from_log(cursor, "c1", legacy_log) == 2
+
+    assert _append_round(cursor, "c1", "有点发热", "可能是外感风热") == 4
+    assert _append_round(cursor, "c1", "咽喉痛", "建议疏风清热") == 6
+
+    first_page, cursor_seq = load_conversation_history(cursor, "c1", limit=2)
+    assert [item["patient_query"] for item in first_page] == ["头痛两天", "有点发热"]
+    assert cursor_seq == 4
+
+    second_page, next_cursor = load_conversation_history(cursor, "c1", after_seq=cursor_seq, limit=2)
+    assert [item["ai_response"] for item in second_page] == ["建议疏风清热"]
+    assert next_cursor is None
+
+    projection = build_log_projection("c1", 6, "inquiry", 0.8, "咽喉痛", "建议疏风清热")
+    assert json.loads(projection)["message_count"] == 6
+    assert "conversation_history" not in json.loads(projection)
+
+    log_data = materialize_conversation_log(cursor, "c1", projection)
+    assert [item["patient_query"] for item in log_data["conversation_history"]] == ["头痛两天", "有点发热", "咽喉痛"]
+    assert log_data["last_query"] == "咽喉痛"
+    assert "turn_store" not in log_data
+
+
+def test_legacy_log_without_turns():
+    """测试尚未迁移的旧列表格式日志可以直接读取"""
+    conn = sqlite3.connect(":memory:")
+    cursor = conn.cursor()
+
+    legacy_log = json.dumps([
+        {"type": "user", "content": "失眠多梦"},
+        {"type": "ai", "content": "心脾两虚"},
+    ])
+    history, next_cursor = load_conversation_history(cursor, "c2", legacy_log)
+    assert history[0]["patient_query"] == "失眠多梦"
+    assert history[0]["ai_response"] == "心脾两虚"
+    assert next_cursor is None
+
+
+def test_concurrent_appends_get_distinct_seq(tmp_path):
+    """测试另一连接追加未提交时，本连接等待其提交后再分配 seq，而不是读到旧的 MAX(seq)"""
+    db_path = str(tmp_path / "turns.sqlite")
+    first = sqlite3.connect(db_path, check_same_thread=False)
+    ensure_turn_table(first.cursor())
+    first.commit()
+
+    assert _append_round(first.cursor(), "c1", "头痛", "疏风散寒") == 2
+    committer = threading.Timer(0.2, first.commit)
+    committer.start()
+
+    second = sqlite3.connect(db_path, timeout=5)
+    assert _append_round(second.cursor(), "c1", "发热", "辛凉解表") == 4
+    second.commit()
+    committer.join()
+
+    seqs = [row[0] for row in second.execute("SELECT seq FROM consultation_turns ORDER BY seq")]
+    assert seqs == [1, 2, 3, 4]
+    first.close()
+    second.close()
+
+
+def test_load_histories_in_one_query():
+    """测试列表页一次读取多个问诊：有消息行的取消息行，旧记录回退解析日志"""
+    conn = sqlite3.connect(":memory:")
+    cursor = conn.cursor()
+    ensure_turn_table(cursor)
+    _append_round(cursor, "c1", "头痛", "疏风散寒")
+    _append_round(cursor, "c3", "失眠", "养心安神")
+    _append_round(cursor, "c3", "多梦", "交通心肾")
+    legacy_log = json.dumps([{"type": "user", "content": "咳嗽"}, {"type": "ai", "content": "宣肺止咳"}])
+
+    statements = []
+    conn.set_trace_callback(statements.append)
+    histories = load_conversation_histories(cursor, [("c1", None), ("c2", legacy_log), ("c3", None), ("c4", None)])
+    conn.set_trace_callback(None)
+
+    assert sum("consultation_turns" in sql for sql in statements) == 1
+    assert [item["ai_response"] for item in histories["c1"]] == ["疏风散寒"]
+    assert [item["patient_query"] for item in histories["c2"]] == ["咳嗽"]
+    assert [item["patient_query"] for item in histories["c3"]] == ["失眠", "多梦"]
+    assert histories["c4"] == []
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SQLite连接池单元测试
+验证重复 close() 不影响已归还的连接，以及归还时重置借用方修改的连接级设置
+"""
+
+import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from core.database.connection import connect, get_pool
+
+
+def test_double_close_is_noop(tmp_path):
+    db_path = str(tmp_path / "pool.sqlite")
+    conn = connect(db_path)
+    conn.execute("CREATE TABLE t (x INTEGER)")
+    conn.commit()
+    conn.close()
+    conn.close()
+
+    again = connect(db_path)
+    assert again is conn
+    assert again.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+    again.close()
+    assert get_pool(db_path).get_stats()["idle_connections"] == 1
+
+
+def test_release_resets_connection_state(tmp_path):
+    db_path = str(tmp_path / "pool.sqlite")
+    conn = connect(db_path, row_factory=sqlite3.Row)
+    conn.isolation_level = None
+    conn.text_factory = bytes
+    conn.create_function("double_it", 1, lambda x: x * 2)
+    conn.create_collation("reverse", lambda a, b: (a < b) - (a > b))
+    conn.close()
+
+    again = connect(db_path)
+    assert again is conn
+    assert again.row_factory is None
+    assert again.isolation_level == ""
+    assert again.execute("SELECT 'a'").fetchone()[0] == "a"
+    for sql in ("SELECT double_it(2)", "SELECT 'a' ORDER BY 1 COLLATE reverse"):
+        try:
+            again.execute(sql)
+        except sqlite3.OperationalError:
+            pass
+        else:
+            raise AssertionError(f"{sql} 不应在归还后仍然可用")
+    again.close()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+决策树注册表单元测试
+验证预解析、增量刷新、替换与删除同步
+"""
+
+import json
+import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from core.consultation.decision_tree_registry import DecisionTreeRegistry
+
+
+def _create_table(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+        CREATE TABLE doctor_clinical_patterns (
+            id TEXT PRIMARY KEY,
+            doctor_id TEXT NOT NULL,
+            disease_name TEXT NOT NULL,
+            thinking_process TEXT NOT NULL,
+            tree_structure TEXT NOT NULL,
+            clinical_patterns TEXT NOT NULL,
+            doctor_expertise TEXT NOT NULL,
+            usage_count INTEGER DEFAULT 0,
+            success_count INTEGER DEFAULT 0,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL,
+            UNIQUE(doctor_id, disease_name)
+        )
+    """)
+    conn.commit()
+    conn.close()
+
+
+def _save_pattern(db_path, pattern_id, doctor_id, disease_name, description, updated_at):
+    tree = {"nodes": [{"type": "root", "name": disease_name},
+                      {"type": "symptom", "description": description}]}
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+        INSERT OR REPLACE INTO doctor_clinical_patterns
+        (id, doctor_id, disease_name, thinking_process, tree_structure,
+         clinical_patterns, doctor_expertise, usage_count, created_at, updated_at)
+        VALUES (?, ?, ?, '', ?, '{}', '{}', 0, ?, ?)
+    """, (pattern_id, doctor_id, disease_name, json.dumps(tree, ensure_ascii=False),
+          updated_at, updated_at))
+    conn.commit()
+    conn.close()
+
+
+def test_registry_tracks_saves_and_deletes(tmp_path):
+    """测试注册表在保存、替换、删除后保持与数据库一致"""
+    db_path = str(tmp_path / "user_history.sqlite")
+    _create_table(db_path)
+    _save_pattern(db_path, "p1", "usr_a", "感冒", "发热恶风，咽痛", "2025-01-01T00:00:00")
+
+    registry = DecisionTreeRegistry(db_path, refresh_interval=3600)
+    entries = registry.get_all("usr_a")
+    assert [e.pattern_id for e in entries] == ["p1"]
+    assert entries[0].syndrome_description == "发热恶风，咽痛"
+
+    # 同一医生同一疾病再次保存会以新ID替换旧记录
+    _save_pattern(db_path, "p2", "usr_a", "感冒", "恶寒无汗，清涕", "2025-01-02T00:00:00")
+    registry.notify_changed()
+    assert registry.get("p1") is None
+    assert registry.get_by_disease("usr_a", "感冒").syndrome_description == "恶寒无汗，清涕"
+
+    conn = sqlite3.connect(db_path)
+    conn.execute("DELETE FROM doctor_clinical_patterns WHERE id = 'p2'")
+    conn.commit()
+    conn.close()
+    registry.notify_changed()
+    assert registry.get_all("usr_a") == []
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+医生专科索引单元测试
+验证专科筛选与排序、排除医生、修改后的重建、症状专科匹配，以及请求范围内的患者偏好缓存
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from core.doctor_matching.doctor_index import DoctorSpecialtyIndex, SymptomSpecialtyMatcher
+from core.doctor_matching.doctor_matching_service import (
+    DoctorMatchingService, MatchingCriteria, matching_request_scope
+)
+
+DOCTORS = [
+    # id, name, specialties, rating, consultations, status
+    (1, "张医生", ["内科", "脾胃病科"], 4.8, 890, "active"),
+    (2, "李医生", ["妇科", "内科"], 4.9, 1200, "active"),
+    (3, "王医生", ["骨伤科"], 4.8, 890, "active"),
+    (4, "赵医生", ["内科"], 5.0, 10, "inactive"),
+    (5, "孙医生", None, 4.8, 900, "active"),
+]
+
+
+def _create_db(directory):
+    db_path = os.path.join(directory, "user_history.sqlite")
+    conn = sqlite3.connect(db_path)
+    conn.executescript("""
+        CREATE TABLE doctors (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, speciality TEXT,
+            status TEXT DEFAULT 'active', specialties TEXT, average_rating DECIMAL(3,2) DEFAULT 0.00,
+            total_reviews INTEGER DEFAULT 0, consultation_count INTEGER DEFAULT 0,
+            available_hours TEXT, introduction TEXT
+        );
+        CREATE TABLE doctor_selection_preferences (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, uuid VARCHAR(50) NOT NULL UNIQUE,
+            patient_id VARCHAR(50) NOT NULL, preferred_specialties TEXT, preferred_doctor_id VARCHAR(50),
+            avoid_doctor_ids TEXT, preferred_consultation_time VARCHAR(20), language_preference VARCHAR(10),
+            gender_preference VARCHAR(10), created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+    """)
+    conn.executemany(
+        "INSERT INTO doctors (id, name, specialties, average_rating, consultation_count, status) VALUES (?, ?, ?, ?, ?, ?)",
+        [(i, name, json.dumps(spec, ensure_ascii=False) if spec else None, rating, count, status)
+         for i, name, spec, rating, count, status in DOCTORS]
+    )
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+def _ids(doctors):
+    return [doctor.uuid for doctor in doctors]
+
+
+def test_query_filters_by_specialty_and_orders_by_rating():
+    with tempfile.TemporaryDirectory() as directory:
+        index = DoctorSpecialtyIndex(_create_db(directory))
+
+        assert _ids(index.query(["内科"])) == ["2", "1"]
+        assert _ids(index.query(["骨伤科", "妇科"])) == ["2", "3"]
+        # 不筛选专科：评分、问诊量相同时按ID顺序
+        assert _ids(index.query()) == ["2", "5", "1", "3"]
+        assert _ids(index.query(limit=2)) == ["2", "5"]
+        assert _ids(index.query(["内科"], exclude_ids=[2, "9"])) == ["1"]
+        assert index.query(["不存在的专科"]) == []
+        assert index.get("4") is None
+        assert index.get(1).specialties == ["内科", "脾胃病科"]
+
+
+def test_notify_changed_rebuilds_index():
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = _create_db(directory)
+        index = DoctorSpecialtyIndex(db_path)
+        assert _ids(index.query(["内科"])) == ["2", "1"]
+
+        conn = sqlite3.connect(db_path)
+        conn.execute("UPDATE doctors SET status = 'active' WHERE id = 4")
+        conn.commit()
+        conn.close()
+
+        # 未通知且未到刷新间隔时沿用旧索引
+        assert _ids(index.query(["内科"])) == ["2", "1"]
+        index.notify_changed()
+        assert _ids(index.query(["内科"])) == ["4", "2", "1"]
+        assert index.get_stats()["rebuilds"] == 2
+
+
+def test_symptom_matcher_finds_overlapping_keywords():
+    matcher = SymptomSpecialtyMatcher()
+
+    assert matcher.match(["小儿发热三天"]) == {"儿科", "内科"}
+    assert matcher.match(["最近失眠", "胃痛"]) == {"内科", "神志病科", "脾胃病科"}
+    assert matcher.match(["无明显不适"]) == set()
+
+
+def test_recommendation_uses_preferences_once_per_request():
+    with tempfile.TemporaryDirectory() as directory:
+        service = DoctorMatchingService(db_path=_create_db(directory))
+        service.save_patient_preferences("p1", {"preferred_specialties": ["骨伤科"], "avoid_doctor_ids": ["2"]})
+
+        loads = []
+        original = service._load_patient_preferences
+        service._load_patient_preferences = lambda patient_id: loads.append(patient_id) or original(patient_id)
+
+        with matching_request_scope():
+            first = service.recommend_doctors_for_symptoms(["胃痛"], "p1")
+            second = service.recommend_doctors_for_symptoms(["腰痛"], "p1")
+
+        assert _ids(first) == ["1", "3"]
+        assert _ids(second) == ["1", "3"]
+        assert loads == ["p1"]
+        # 未匹配到症状时默认内科，仍合并患者偏好专科
+        assert _ids(service.recommend_doctors_for_symptoms(["无明显不适"], "p1")) == ["1", "3"]
+        assert _ids(service.get_available_doctors(MatchingCriteria("p1", [], max_results=1))) == ["2"]
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+向量化服务单元测试
+验证标准化文本命中缓存、并发请求合批（含调用方取消）、内存层与SQLite层的回填，以及确定性本地向量
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from core.llm import EmbeddingService, EmbeddingStore, HashingEmbeddingBackend
+
+
+def _service(directory, backend=None, **kwargs):
+    store = EmbeddingStore(db_path=os.path.join(directory, "cache.sqlite"), memory_entries=kwargs.pop("memory_entries", 100))
+    return EmbeddingService(backend=backend or HashingEmbeddingBackend(), model="test-embedding",
+                            store=store, batch_window_ms=50, max_batch_size=kwargs.pop("max_batch_size", 10))
+
+
+def test_concurrent_requests_are_batched_and_deduplicated():
+    with tempfile.TemporaryDirectory() as directory:
+        backend = HashingEmbeddingBackend()
+        service = _service(directory, backend)
+
+        async def run():
+            return await asyncio.gather(
+                service.embed(["失眠多梦"]),
+                service.embed(["头痛", "失眠多梦"]),
+                service.embed(["口干"])
+            )
+
+        first, second, third = asyncio.run(run())
+
+        assert len(backend.calls) == 1
+        assert sorted(backend.calls[0]) == sorted(["失眠多梦", "头痛", "口干"])
+        assert first[0] == second[1] == backend.vector("失眠多梦")
+        assert third[0] == backend.vector("口干")
+
+
+def test_cancelled_caller_does_not_cancel_shared_batch():
+    with tempfile.TemporaryDirectory() as directory:
+        backend = HashingEmbeddingBackend()
+        service = _service(directory, backend)
+
+        async def run():
+            abandoned = asyncio.ensure_future(service.embed(["失眠多梦"]))
+            waiting = asyncio.ensure_future(service.embed(["失眠多梦", "头痛"]))
+            await asyncio.sleep(0.01)
+            # 合批窗口内第一个调用方放弃，同批次的另一调用方仍应拿到结果
+            abandoned.cancel()
+            return await waiting, abandoned
+
+        vectors, abandoned = asyncio.run(run())
+
+        assert abandoned.cancelled()
+        assert vectors == [backend.vector("失眠多梦"), backend.vector("头痛")]
+        assert len(backend.calls) == 1
+
+
+def test_batches_are_split_at_max_batch_size():
+    with tempfile.TemporaryDirectory() as directory:
+        backend = HashingEmbeddingBackend()
+        service = _service(directory, backend, max_batch_size=2)
+
+        asyncio.run(service.embed(["头痛", "头晕", "乏力"]))
+
+        assert [len(batch) for batch in backend.calls] == [2, 1]
+
+
+def test_normalized_text_hits_memory_then_persistent_tier():
+    with tempfile.TemporaryDirectory() as directory:
+        backend = HashingEmbeddingBackend()
+        service = _service(directory, backend)
+
+        vector = asyncio.run(service.embed(["失眠多梦。"]))[0]
+        # 空白与标点不同的同一主诉直接命中内存层
+        assert asyncio.run(service.embed([" 失眠 多梦 "]))[0] == vector
+        assert len(backend.calls) == 1
+
+        # 清空内存层后从SQLite读取（float32存储，允许精度误差）
+        service.store.clear_memory()
+        restored = asyncio.run(service.embed(["失眠多梦"]))[0]
+        assert len(backend.calls) == 1
+        assert max(abs(a - b) for a, b in zip(restored, vector)) < 1e-6
+
+        stats = service.get_stats()
+        assert stats["memory_hits"] == 1
+        assert stats["persistent_hits"] == 1
+        assert stats["misses"] == 1
+
+
+def test_memory_tier_is_bounded_lru():
+    with tempfile.TemporaryDirectory() as directory:
+        service = _service(directory, memory_entries=2)
+
+        asyncio.run(service.embed(["头痛", "头晕", "乏力"]))
+
+        assert service.store.memory_size() == 2
+
+
+def test_hashing_backend_is_deterministic_and_normalized():
+    backend = HashingEmbeddingBackend(dimension=64)
+
+    vector = backend.vector("胃脘胀痛")
+    assert vector == HashingEmbeddingBackend(dimension=64).vector("胃脘胀痛")
+    assert abs(sum(v * v for v in vector) - 1.0) < 1e-9
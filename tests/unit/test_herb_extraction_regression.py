@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+药材提取回归测试
+四个处方解析入口共用 herb_extraction 引擎，逐条比对语料上旧解析器的输出
+
+语料见 tests/fixtures/prescription_corpus.json：
+- legacy_output：引入 herb_extraction.py 之前各解析器的输出（git show 旧实现生成，不由新引擎产生）
+- intended_changes：经人工核对、有意偏离旧输出的条目，注明原因（change_reasons）与新的期望输出
+
+新实现必须逐条等于旧输出，或等于已登记的有意修正。重新生成旧输出并列出未登记的偏差：
+    python tests/unit/test_herb_extraction_regression.py --regenerate
+列出的偏差核对无误后，手工登记到对应条目的 intended_changes。
+"""
+
+import json
+import os
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
+
+from core.prescription.herb_extraction import extract_herb_dosage_pairs, get_herb_extractor
+from core.prescription.integrated_prescription_parser import IntegratedPrescriptionParser
+from core.prescription.intelligent_prescription_analyzer import IntelligentPrescriptionAnalyzer
+from core.prescription.prescription_checker import PrescriptionParser
+
+CORPUS_PATH = os.path.join(PROJECT_ROOT, "tests", "fixtures", "prescription_corpus.json")
+
+
+def _load_corpus():
+    with open(CORPUS_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def extract_all(text, parsers):
+    """各解析入口对同一文本的提取结果（可JSON序列化）"""
+    checker, integrated, intelligent = parsers
+    return {
+        "prescription_parser": [
+            [h.name, h.dosage, h.unit, h.preparation]
+            for h in checker._extract_herbs(checker._clean_text(text))
+        ],
+        "integrated_parser": [
+            [h.name, h.dosage, h.extraction_method, round(h.confidence, 3)]
+            for h in integrated._extract_herbs_enhanced(text)
+        ],
+        "intelligent_analyzer": [
+            [h.name, h.dosage, round(h.confidence, 3)]
+            for h in intelligent._extract_chinese_herbs(text)
+        ],
+        "api_main": [list(pair) for pair in extract_herb_dosage_pairs(text)],
+    }
+
+
+def _parsers():
+    return PrescriptionParser(), IntegratedPrescriptionParser(), IntelligentPrescriptionAnalyzer()
+
+
+def expected_outputs(item):
+    """旧解析器输出，叠加已登记的有意修正"""
+    expected = dict(item["legacy_output"])
+    for parser_name, change in item.get("intended_changes", {}).items():
+        expected[parser_name] = change["expected"]
+    return expected
+
+
+def test_corpus_matches_legacy_or_intended_changes():
+    corpus = _load_corpus()
+    parsers = _parsers()
+    for item in corpus["prescriptions"]:
+        actual = extract_all(item["text"], parsers)
+        for parser_name, expected in expected_outputs(item).items():
+            assert actual[parser_name] == expected, f"{item['id']} / {parser_name}"
+
+
+def test_intended_changes_are_documented():
+    corpus = _load_corpus()
+    for item in corpus["prescriptions"]:
+        for parser_name, change in item.get("intended_changes", {}).items():
+            assert change["reasons"], f"{item['id']} / {parser_name}"
+            assert set(change["reasons"]) <= set(corpus["change_reasons"]), f"{item['id']} / {parser_name}"
+            # 与旧输出相同的登记已失去意义
+            assert change["expected"] != item["legacy_output"][parser_name], f"{item['id']} / {parser_name}"
+
+
+def test_mention_positions_and_gap():
+    mentions = get_herb_extractor().mentions_in_line("桔梗（净）10(克)*7帖 12.11  酒当归 6g")
+    assert [(m.name, m.canonical, m.dosage, m.unit) for m in mentions] == [
+        ("桔梗", "桔梗", "10", "克"),
+        ("酒当归", "当归", "6", "g"),
+    ]
+    assert mentions[0].gap == "（净）"
+    assert mentions[0].line[mentions[0].start:mentions[0].end] == "桔梗"
+
+
+def test_unknown_herb_requires_weight_unit():
+    extractor = get_herb_extractor()
+    unknown = [m for m in extractor.mentions_in_line("羚羊角粉 0.6g 冲服") if not m.is_known]
+    assert [(m.name, m.dosage) for m in unknown] == [("羚羊角粉", "0.6")]
+    # 没有重量单位的数字不当作未登记药材的剂量
+    assert extractor.mentions_in_line("小火煎煮 20 分钟") == []
+
+
+def _regenerate(revision=None):
+    """用旧实现重新生成 legacy_output，并列出与新实现不一致且未登记的条目"""
+    import tempfile
+    sys.path.insert(0, os.path.join(PROJECT_ROOT, "tests", "benchmarks"))
+    import bench_herb_extraction as bench
+
+    revision = revision or bench._baseline_revision()
+    corpus = _load_corpus()
+    parsers = _parsers()
+    with tempfile.TemporaryDirectory() as directory:
+        modules = {
+            key: bench._load_module(f"legacy_{key}", bench._git_show(revision, path), directory)
+            for key, path in bench.PARSER_FILES.items()
+        }
+        main_functions = bench._load_main_functions(bench._git_show(revision, bench.MAIN_PATH))
+        legacy = (
+            modules["checker"].PrescriptionParser(),
+            modules["integrated"].IntegratedPrescriptionParser(),
+            modules["intelligent"].IntelligentPrescriptionAnalyzer(),
+        )
+        unreviewed = []
+        for item in corpus["prescriptions"]:
+            # 经JSON往返，使元组等与读取时的形式一致
+            item["legacy_output"] = json.loads(json.dumps(bench._legacy_extract_all(item["text"], legacy, main_functions)))
+            actual = extract_all(item["text"], parsers)
+            for parser_name, expected in expected_outputs(item).items():
+                if actual[parser_name] != expected:
+                    unreviewed.append(f"{item['id']} / {parser_name}")
+
+    with open(CORPUS_PATH, "w", encoding="utf-8") as f:
+        json.dump(corpus, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+    print(f"已按旧实现 {revision[:12]} 更新 {len(corpus['prescriptions'])} 条 legacy_output: {CORPUS_PATH}")
+    if unreviewed:
+        print("以下输出与旧实现及已登记的修正都不一致，核对后登记到 intended_changes：")
+        for entry in unreviewed:
+            print(f"  {entry}")
+
+
+if __name__ == "__main__":
+    if "--regenerate" in sys.argv:
+        _regenerate()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+大模型网关单元测试
+验证相同在途请求合并、每个模型的并发上限、超时与调用点指标
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from core.llm import FakeLLMBackend, LLMGateway, LLMTimeoutError
+
+
+def _gateway(backend, **kwargs):
+    return LLMGateway(backend=backend, default_model="fake-model", api_key="test-key", **kwargs)
+
+
+def test_identical_in_flight_prompts_are_coalesced():
+    backend = FakeLLMBackend(responder=lambda model, messages, parameters: "回复", delay=0.05)
+    gateway = _gateway(backend)
+    messages = [{"role": "user", "content": "头痛三天"}]
+
+    async def run():
+        return await asyncio.gather(*(gateway.complete(messages, call_site="chat") for _ in range(5)))
+
+    results = asyncio.run(run())
+
+    assert len(backend.calls) == 1
+    assert backend.calls[0]["messages"] == [{"role": "user", "content": [{"text": "头痛三天"}]}]
+    assert [result.text for result in results] == ["回复"] * 5
+    assert sum(result.coalesced for result in results) == 4
+
+    metrics = gateway.get_metrics()["call_sites"]["chat"]
+    assert metrics["calls"] == 5
+    assert metrics["coalesced"] == 4
+    # 合并的调用不重复计token
+    assert metrics["output_tokens"] == len("回复")
+
+
+def test_different_parameters_are_not_coalesced():
+    backend = FakeLLMBackend(delay=0.01)
+    gateway = _gateway(backend)
+    messages = [{"role": "user", "content": "失眠"}]
+
+    async def run():
+        await asyncio.gather(
+            gateway.complete(messages, temperature=0.1),
+            gateway.complete(messages, temperature=0.7)
+        )
+
+    asyncio.run(run())
+    assert len(backend.calls) == 2
+
+
+def test_per_model_concurrency_limit():
+    active = {"now": 0, "peak": 0}
+
+    async def responder(model, messages, parameters):
+        active["now"] += 1
+        active["peak"] = max(active["peak"], active["now"])
+        await asyncio.sleep(0.02)
+        active["now"] -= 1
+        return "ok"
+
+    gateway = _gateway(FakeLLMBackend(responder=responder), model_concurrency=2, concurrency_overrides={"big": 1})
+
+    async def run(model):
+        await asyncio.gather(*(
+            gateway.complete([{"role": "user", "content": f"问题{i}"}], model=model) for i in range(6)
+        ))
+
+    asyncio.run(run("fake-model"))
+    assert active["peak"] == 2
+
+    active["peak"] = 0
+    asyncio.run(run("big"))
+    assert active["peak"] == 1
+
+
+def test_timeout_is_recorded_per_call_site():
+    gateway = _gateway(FakeLLMBackend(delay=0.5))
+
+    with pytest.raises(LLMTimeoutError):
+        asyncio.run(gateway.complete([{"role": "user", "content": "咳嗽"}], timeout=0.05, call_site="slow"))
+    # 同时兼容原有的 asyncio.TimeoutError 分支
+    assert issubclass(LLMTimeoutError, asyncio.TimeoutError)
+
+    metrics = gateway.get_metrics()["call_sites"]["slow"]
+    assert metrics["calls"] == 1
+    assert metrics["timeouts"] == 1
+    assert metrics["errors"] == 0
+
+
+def test_use_backend_restores_previous_backend():
+    original = FakeLLMBackend(responder=lambda *args: "original")
+    gateway = _gateway(original)
+
+    with gateway.use_backend(FakeLLMBackend(responder=lambda *args: "patched")):
+        assert asyncio.run(gateway.complete_text([{"role": "user", "content": "x"}])) == "patched"
+
+    assert gateway.backend is original
+    assert asyncio.run(gateway.complete_text([{"role": "user", "content": "x"}])) == "original"
+
+
+def test_stream_yields_chunks_and_records_first_token():
+    backend = FakeLLMBackend(responder=lambda *args: "舌淡苔白，脉沉细", chunk_size=3)
+    gateway = _gateway(backend, model_concurrency=1)
+
+    async def run():
+        return [delta async for delta in gateway.stream([{"role": "user", "content": "乏力"}], call_site="stream")]
+
+    deltas = asyncio.run(run())
+
+    assert deltas == ["舌淡苔", "白，脉", "沉细"]
+    metrics = gateway.get_metrics()["call_sites"]["stream"]
+    assert metrics["streams"] == 1
+    assert metrics["output_tokens"] == len("舌淡苔白，脉沉细")
+    assert metrics["avg_first_token_ms"] > 0
+
+
+def test_abandoned_stream_releases_concurrency_slot():
+    gateway = _gateway(FakeLLMBackend(chunk_size=1), model_concurrency=1)
+
+    async def run():
+        stream = gateway.stream([{"role": "user", "content": "abcdefgh"}])
+        async for _ in stream:
+            break
+        await stream.aclose()
+        # 名额已释放，后续调用不会排队超时
+        return await gateway.complete_text([{"role": "user", "content": "y"}], timeout=0.5)
+
+    assert asyncio.run(run()) == "y"
+
+
+def test_upstream_call_cancelled_after_last_waiter_gives_up():
+    events = []
+
+    async def responder(model, messages, parameters):
+        text = messages[-1]["content"][0]["text"]
+        try:
+            if text == "胃痛":
+                await asyncio.sleep(0.2)
+            return text
+        except asyncio.CancelledError:
+            events.append("upstream_cancelled")
+            raise
+
+    gateway = _gateway(FakeLLMBackend(responder=responder), model_concurrency=1)
+    messages = [{"role": "user", "content": "胃痛"}]
+
+    async def run():
+        first = asyncio.ensure_future(gateway.complete_text(messages))
+        second = asyncio.ensure_future(gateway.complete_text(messages))
+        await asyncio.sleep(0.02)
+        # 仍有调用方在等待：上游请求继续
+        first.cancel()
+        await asyncio.sleep(0.02)
+        assert events == []
+        second.cancel()
+        await asyncio.sleep(0.02)
+        assert events == ["upstream_cancelled"]
+        # 并发名额已释放
+        return await gateway.complete_text([{"role": "user", "content": "z"}], timeout=0.5)
+
+    assert asyncio.run(run()) == "z"
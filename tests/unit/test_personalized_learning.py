@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+个性化学习系统单元测试
+验证内存模型上的推荐、医生表现与学习洞察，以及增量写回与多实例合并
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from services.personalized_learning import PersonalizedLearningSystem, UserFeedback
+
+
+def _feedback(query, doctor, rating):
+    return UserFeedback(
+        session_id="s", user_query=query, selected_doctor=doctor, ai_response="...",
+        user_rating=rating, feedback_text=None, timestamp=datetime.now()
+    )
+
+
+def _record(system, query, doctor, ratings):
+    for rating in ratings:
+        system.record_feedback(_feedback(query, doctor, rating))
+
+
+def _match_rows(db_path):
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute("""
+        SELECT symptom, doctor_name, ROUND(success_rate, 6), total_cases FROM symptom_doctor_match
+        ORDER BY symptom, doctor_name
+    """).fetchall()
+    conn.close()
+    return rows
+
+
+def test_recommendation_and_statistics_from_memory():
+    with tempfile.TemporaryDirectory() as directory:
+        system = PersonalizedLearningSystem(db_path=os.path.join(directory, "learning.sqlite"))
+        _record(system, "头痛失眠", "ye_tianshi", [5, 5, 5, 4, 4, 2])
+        _record(system, "头痛", "li_dongyuan", [5, 3, 3, 2, 1])
+        _record(system, "失眠", "li_dongyuan", [5, 5, 5, 5])
+
+        doctor, confidence = system.recommend_doctor("最近头痛，晚上失眠")
+        # 头痛: 5/6 * (0.7 + 0.3 * 6/20)，失眠: 同上
+        assert doctor == "ye_tianshi"
+        assert abs(confidence - 5 / 6 * 0.79) < 1e-9
+        doctor, confidence = system.recommend_doctor("头痛", available_doctors=["li_dongyuan"])
+        assert doctor == "li_dongyuan"
+        assert abs(confidence - 0.2 * 0.775) < 1e-9
+        # 病例数不足或没有症状时返回默认推荐
+        assert system.recommend_doctor("便秘") == ("zhang_zhongjing", 0.5)
+        assert system.recommend_doctor("你好") == ("zhang_zhongjing", 0.5)
+
+        performance = system.get_doctor_performance("li_dongyuan")
+        assert performance.total_sessions == 9
+        assert performance.positive_feedback_count == 5
+        assert performance.negative_feedback_count == 2
+        assert performance.preferred_symptoms == []
+        assert performance.improvement_areas == ["头痛"]
+        assert system.get_doctor_performance("unknown") is None
+        assert system.get_adaptive_weights("ye_tianshi") == {"semantic_weight": 0.7, "keyword_weight": 0.3}
+        assert system.get_adaptive_weights("li_dongyuan") == {"semantic_weight": 0.6, "keyword_weight": 0.4}
+
+        insights = {insight.insight_type: insight for insight in system.generate_learning_insights()}
+        assert set(insights) == {"poor_symptom_doctor_matches"}
+        assert insights["poor_symptom_doctor_matches"].content["matches"] == [("头痛", "li_dongyuan", 0.2, 5)]
+
+
+def test_flush_merges_increments_from_multiple_instances():
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, "learning.sqlite")
+        first = PersonalizedLearningSystem(db_path=db_path, flush_interval=3600)
+        second = PersonalizedLearningSystem(db_path=db_path, flush_interval=3600)
+
+        _record(first, "便秘", "li_dongyuan", [5, 5, 1])
+        _record(second, "便秘", "li_dongyuan", [5, 2])
+        # 未到写回间隔：统计只在内存中
+        assert _match_rows(db_path) == []
+        assert first.get_doctor_performance("li_dongyuan").total_sessions == 3
+
+        assert first.flush() and second.flush()
+        assert _match_rows(db_path) == [("便秘", "li_dongyuan", 0.6, 5)]
+
+        reloaded = PersonalizedLearningSystem(db_path=db_path)
+        performance = reloaded.get_doctor_performance("li_dongyuan")
+        assert (performance.total_sessions, performance.positive_feedback_count,
+                performance.negative_feedback_count) == (5, 3, 2)
+        assert performance.average_rating == 18 / 5
+        assert reloaded.recommend_doctor("便秘")[0] == "li_dongyuan"
+
+
+def test_pending_increments_flush_when_threshold_reached():
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, "learning.sqlite")
+        system = PersonalizedLearningSystem(db_path=db_path, flush_interval=3600, max_pending=3)
+
+        system.record_feedback(_feedback("咳嗽", "ye_tianshi", 5))
+        assert _match_rows(db_path) == []
+        # 症状增量 2 个 + 医生增量 1 个，达到阈值后写回
+        system.record_feedback(_feedback("头痛", "ye_tianshi", 4))
+        assert _match_rows(db_path) == [("咳嗽", "ye_tianshi", 1.0, 1), ("头痛", "ye_tianshi", 1.0, 1)]
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+多设备实时同步单元测试
+验证连接双向索引、发送通道的合并与顺序、失败连接的清理，以及SQLite总线的跨worker转发、发布后立即写出与失联后的重新登记
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from core.realtime import ConnectionHub, LocalBackplane, SQLiteBackplane
+
+
+class FakeWebSocket:
+    """只实现 send_text 的模拟连接"""
+
+    def __init__(self, fail: bool = False):
+        self.frames = []
+        self.fail = fail
+
+    async def send_text(self, text: str):
+        if self.fail:
+            raise ConnectionError("closed")
+        await asyncio.sleep(0)
+        self.frames.append(json.loads(text))
+
+
+async def _settle(rounds: int = 5):
+    for _ in range(rounds):
+        await asyncio.sleep(0)
+
+
+def test_bidirectional_index_and_reconnect():
+    async def run():
+        hub = ConnectionHub(backplane=LocalBackplane())
+        old, new = FakeWebSocket(), FakeWebSocket()
+        hub.register(old, "u1", "phone")
+        hub.register(FakeWebSocket(), "u1", "pc")
+        assert hub.get_device_id_by_websocket(old) == "phone"
+
+        # 同一设备重连：旧连接的迟到断开不能注销新连接
+        hub.register(new, "u1", "phone")
+        assert hub.get_device_id_by_websocket(old) is None
+        assert not hub.unregister("u1", "phone", old)
+        assert hub.get_device_id_by_websocket(new) == "phone"
+        assert hub.get_user_connection_count("u1") == 2
+
+        assert hub.unregister("u1", "phone", new)
+        assert hub.unregister("u1", "pc")
+        assert hub.get_all_connection_stats()["total_users"] == 0
+
+    asyncio.run(run())
+
+
+def test_broadcast_excludes_sender_and_coalesces_state_snapshots():
+    async def run():
+        hub = ConnectionHub(backplane=LocalBackplane())
+        phone, pc = FakeWebSocket(), FakeWebSocket()
+        hub.register(phone, "u1", "phone")
+        hub.register(pc, "u1", "pc")
+
+        # 同一轮事件循环内连续广播：尚未发出的同会话状态只保留最新一条
+        for stage in ("问诊", "辨证", "处方"):
+            await hub.broadcast("u1", {"type": "state_sync", "data": {"conversation_id": "c1", "current_stage": stage}},
+                                exclude_device="phone")
+        await hub.broadcast("u1", {"type": "message_sync", "data": {"message": "a"}}, exclude_device="phone")
+        await hub.broadcast("u1", {"type": "message_sync", "data": {"message": "b"}}, exclude_device="phone")
+        await _settle()
+
+        assert phone.frames == []
+        assert [frame["type"] for frame in pc.frames] == ["state_sync", "message_sync", "message_sync"]
+        assert pc.frames[0]["data"]["current_stage"] == "处方"
+        assert [frame["data"]["message"] for frame in pc.frames[1:]] == ["a", "b"]
+        assert hub.get_all_connection_stats()["channels"]["coalesced"] == 2
+
+    asyncio.run(run())
+
+
+def test_failed_connection_is_unregistered():
+    async def run():
+        hub = ConnectionHub(backplane=LocalBackplane())
+        hub.register(FakeWebSocket(fail=True), "u1", "broken")
+        healthy = FakeWebSocket()
+        hub.register(healthy, "u1", "healthy")
+
+        await hub.broadcast("u1", {"type": "message_sync", "data": {"message": "hi"}})
+        await _settle()
+
+        assert len(healthy.frames) == 1
+        assert "broken" not in hub.device_connections
+        assert hub.get_user_connection_count("u1") == 1
+
+    asyncio.run(run())
+
+
+def test_sqlite_backplane_forwards_only_to_workers_holding_the_user():
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, "sync.sqlite")
+
+        async def run():
+            workers = [SQLiteBackplane(db_path=db_path, worker_id=f"w{i}", poll_interval=3600) for i in range(3)]
+            hubs = [ConnectionHub(backplane=backplane) for backplane in workers]
+            phone, pc = FakeWebSocket(), FakeWebSocket()
+            hubs[0].register(phone, "u1", "phone")
+            hubs[1].register(pc, "u1", "pc")
+            for backplane in workers:
+                await backplane.exchange()
+
+            await hubs[0].broadcast("u1", {"type": "message_sync", "data": {"message": "来自手机"}},
+                                    exclude_device="phone")
+            await hubs[2].broadcast("u2", {"type": "message_sync", "data": {"message": "无人持有"}})
+            for backplane in workers:
+                await backplane.exchange()
+            await _settle()
+
+            assert phone.frames == []
+            assert [frame["data"]["message"] for frame in pc.frames] == ["来自手机"]
+            # 只有被其他worker持有的用户才写入事件表
+            assert workers[0].events_published == 1
+            assert workers[2].events_published == 0
+            assert workers[1].events_received == 1
+            assert workers[2].events_received == 0
+
+            # 注销后不再转发
+            hubs[1].unregister("u1", "pc")
+            await workers[1].exchange()
+            await hubs[0].broadcast("u1", {"type": "message_sync", "data": {"message": "x"}})
+            await workers[0].exchange()
+            assert workers[0].events_published == 1
+
+            for hub in hubs:
+                await hub.close()
+
+        asyncio.run(run())
+
+
+def test_pruned_worker_reasserts_subscriptions_on_next_heartbeat():
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, "sync.sqlite")
+
+        async def run():
+            sender = SQLiteBackplane(db_path=db_path, worker_id="w0", poll_interval=3600, heartbeat_interval=0)
+            receiver = SQLiteBackplane(db_path=db_path, worker_id="w1", poll_interval=3600, heartbeat_interval=0)
+            hubs = [ConnectionHub(backplane=sender), ConnectionHub(backplane=receiver)]
+            pc = FakeWebSocket()
+            hubs[1].register(pc, "u1", "pc")
+            # register 启动的后台交换排在第一次交换之后；再交换一次等它完成，避免与下面的模拟并发
+            for backplane in (receiver, sender, receiver):
+                await backplane.exchange()
+
+            # 模拟 w1 心跳超时：其他worker的心跳会清理它的worker行与订阅
+            conn = sqlite3.connect(db_path)
+            conn.execute("UPDATE sync_workers SET heartbeat_at = 0 WHERE worker_id = 'w1'")
+            conn.commit()
+            await sender.exchange()
+            assert conn.execute("SELECT COUNT(*) FROM sync_subscriptions WHERE worker_id = 'w1'").fetchone()[0] == 0
+
+            # w1 恢复后下一次心跳重新登记订阅，转发随之恢复
+            await receiver.exchange()
+            assert conn.execute("SELECT user_id FROM sync_subscriptions WHERE worker_id = 'w1'").fetchall() == [("u1",)]
+            conn.close()
+
+            await hubs[0].broadcast("u1", {"type": "message_sync", "data": {"message": "恢复后"}})
+            await sender.exchange()
+            await receiver.exchange()
+            await _settle()
+            assert [frame["data"]["message"] for frame in pc.frames] == ["恢复后"]
+
+            for hub in hubs:
+                await hub.close()
+
+        asyncio.run(run())
+
+
+def test_pending_events_are_written_without_waiting_for_poll():
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, "sync.sqlite")
+
+        async def wait_for(predicate, timeout=2.0):
+            deadline = asyncio.get_running_loop().time() + timeout
+            while not predicate() and asyncio.get_running_loop().time() < deadline:
+                await asyncio.sleep(0.01)
+            return predicate()
+
+        async def run():
+            sender = SQLiteBackplane(db_path=db_path, worker_id="w0", poll_interval=3600)
+            receiver = SQLiteBackplane(db_path=db_path, worker_id="w1", poll_interval=3600)
+            hubs = [ConnectionHub(backplane=sender), ConnectionHub(backplane=receiver)]
+            hubs[1].register(FakeWebSocket(), "u1", "pc")
+            await receiver.exchange()
+
+            # 第一次发布启动后台任务；之后的发布不必等待一小时的轮询间隔
+            for expected in (1, 2):
+                await hubs[0].broadcast("u1", {"type": "message_sync", "data": {"message": expected}})
+                assert await wait_for(lambda: sender.events_published == expected)
+
+            for hub in hubs:
+                await hub.close()
+
+        asyncio.run(run())
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+AI回复后处理引擎测试
+逐条比对语料的期望输出，并验证规则预筛与命中记录
+
+语料与期望输出见 tests/fixtures/ai_reply_corpus.json；期望输出最初由重构前
+api/main.py 的函数链生成（与旧实现的完整比对见 tests/benchmarks/bench_response_sanitizer.py）。
+有意调整规则后，运行本文件重新生成期望输出：
+    python tests/unit/test_response_sanitizer.py --regenerate
+"""
+
+import json
+import os
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
+
+from core.ai_response.response_sanitizer import SanitizationReport, get_response_sanitizer, required_literals
+
+CORPUS_PATH = os.path.join(PROJECT_ROOT, "tests", "fixtures", "ai_reply_corpus.json")
+
+
+def _load_corpus():
+    with open(CORPUS_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def process_item(item):
+    """语料条目的完整后处理结果（可JSON序列化）"""
+    result = get_response_sanitizer().process(
+        item["text"], item["has_tongue_image"], item["patient_described_tongue"],
+        item["image_analysis_successful"], item["patient_message"])
+    return {"text": result.text, "is_safe": result.is_safe, "has_western_content": result.has_western_content}
+
+
+def test_corpus_matches_expected_outputs():
+    for item in _load_corpus()["replies"]:
+        assert process_item(item) == item["expected"], item["id"]
+
+
+def test_required_literals():
+    assert required_literals(r'吾观其舌.*[淡红紫暗]') == ("吾观其舌",)
+    assert required_literals(r'患者苔薄[白黄][，。]?') == ("患者苔薄",)
+    assert required_literals(r'建议服用阿司匹林[^。]*。?') == ("建议服用阿司匹林",)
+    assert required_literals(r'\*\*【处方】\*\*[\s\n]*\*\*\*\*') == ("**【处方】**", "****")
+    assert required_literals(r'(\w+)\s+(\d+)-(\d+)g') == ("-", "g")
+    # 顶层分支无法推导，不做预筛
+    assert required_literals(r'请.*?就医|建议.*?医师') == ()
+    # 忽略大小写时丢弃含字母的片段
+    assert required_literals(r'建议做CT', 0) == ("建议做CT",)
+    assert required_literals(r'建议做CT[^。]*', 2) == ()
+
+
+def test_plain_reply_skips_regex_rules():
+    report = SanitizationReport()
+    text = "您好！请描述您的不适症状，以便进行辨证分析。"
+    sanitizer = get_response_sanitizer()
+
+    assert sanitizer.check_medical_safety(text, False, original_patient_message="你好", report=report) == (True, "")
+    assert report.fired == []
+    assert report.regex_scans == 0
+    assert report.skipped > 0
+
+
+def test_report_lists_fired_rules():
+    result = get_response_sanitizer().process(
+        "患者舌边尖红，脉象：浮数，宜疏风清热。", has_tongue_image=False, original_patient_message="发烧咽痛")
+
+    assert not result.is_safe
+    assert "examination.脉浮描述" in result.report.fired
+    assert "sanitize.fabrication.1" in result.report.fired
+    assert "sanitize.fabrication.3" in result.report.fired
+    assert result.text.startswith("脉象需要面诊切诊。")
+
+
+def _regenerate():
+    corpus = _load_corpus()
+    for item in corpus["replies"]:
+        item["expected"] = process_item(item)
+    with open(CORPUS_PATH, "w", encoding="utf-8") as f:
+        json.dump(corpus, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+    print(f"已更新 {len(corpus['replies'])} 条期望输出: {CORPUS_PATH}")
+
+
+if __name__ == "__main__":
+    if "--regenerate" in sys.argv:
+        _regenerate()
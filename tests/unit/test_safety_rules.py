@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+处方安全规则索引单元测试
+验证配伍禁忌位运算检查与逐对比较一致、药名归一、剂量上限与特殊人群禁忌
+"""
+
+import itertools
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from core.prescription.prescription_checker import Herb, Prescription, PrescriptionSafetyChecker
+from core.prescription.safety_rules import INCOMPATIBILITY_RULES, SafetyRuleIndex, get_safety_rule_index
+
+
+def test_pairs_match_pairwise_comparison():
+    index = SafetyRuleIndex(registry=False)
+    names = sorted({name for _, primary, opposed in INCOMPATIBILITY_RULES for name in primary + opposed})
+    forbidden = {
+        (a, b) for _, primary, opposed in INCOMPATIBILITY_RULES for a in primary for b in opposed
+    }
+    for combo in itertools.combinations(names, 3):
+        expected = [(a, b) for a in combo for b in combo if (a, b) in forbidden]
+        actual = [(pair.herb1, pair.herb2) for pair in index.incompatible_pairs(list(combo))]
+        assert actual == expected, combo
+
+
+def test_processed_names_are_canonicalized():
+    index = get_safety_rule_index()
+    pairs = index.incompatible_pairs(["炙甘草", "当归", "甘遂（醋制）"])
+    assert [(p.herb1, p.herb2, p.rule_type) for p in pairs] == [("炙甘草", "甘遂（醋制）", "十八反")]
+    assert pairs[0].description == "甘草反甘遂，禁忌配伍"
+    assert index.pair_interaction("半夏", "附子").description == "附子反半夏，禁忌配伍"
+
+
+def test_toxic_ceilings_and_populations():
+    report = get_safety_rule_index().check(
+        [("附子", "20g"), ("半夏", "6-9g"), ("川芎", "10"), ("朱砂", "适量")],
+        populations=["孕妇", "儿童"],
+    )
+    assert [(f.herb, f.exceeded) for f in report.toxic_findings] == [
+        ("附子", True), ("半夏", False), ("朱砂", None)
+    ]
+    assert report.population_hits == {
+        "孕妇禁用": ["附子", "川芎"],
+        "孕妇慎用": ["川芎"],
+        "儿童慎用": ["朱砂"],
+    }
+
+
+def test_checker_check_many_matches_single_checks():
+    checker = PrescriptionSafetyChecker()
+    prescriptions = [
+        Prescription(herbs=[Herb("甘草", "6"), Herb("海藻", "10"), Herb("茯苓", "12")]),
+        Prescription(herbs=[Herb("附子", "30g"), Herb("干姜", "6g"), Herb("炙甘草", "6g")]),
+    ]
+    batch = checker.check_many(prescriptions)
+    assert batch == [checker.check_prescription_safety(p) for p in prescriptions]
+    assert batch[0]["errors"] == ["配伍禁忌：甘草 与 海藻 不能同用"]
+    assert batch[1]["is_safe"] and batch[1]["warnings"][0].startswith("附子 用量 30g 超过安全剂量 15g")
+
+
+def test_processed_variants_keep_their_own_ceilings():
+    index = get_safety_rule_index()
+    for name in ("法半夏", "姜半夏", "清半夏"):
+        assert index.toxic_finding(name, "12g") is None, name
+        assert index.pair_interaction(name, "附子") is not None, name
+    assert index.toxic_finding("生半夏", "12g").exceeded is True
+    assert index.toxic_finding("附子（先煎）", "20g").exceeded is True
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+决策树语义分数缓存单元测试
+验证证候描述相同的不同决策树各自缓存，按 pattern_id 失效时只清除所属条目，
+以及TTL过期与按最近访问时间的LRU淘汰
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from core.consultation.semantic_score_cache import SemanticScoreCache
+
+
+def test_same_syndrome_text_is_cached_per_pattern(tmp_path):
+    cache = SemanticScoreCache(db_path=str(tmp_path / "cache.sqlite"))
+    patient, syndrome, model = "发热头痛，咽痛", "外感风热，邪袭肺卫", "m"
+
+    cache.set(patient, syndrome, model, 0.9, "吻合", pattern_id="p1", doctor_id="d1", disease_name="感冒")
+    cache.set(patient, syndrome, model, 0.7, "部分吻合", pattern_id="p2", doctor_id="d2", disease_name="感冒")
+
+    # 标点、空白差异不影响命中
+    assert cache.get("发热头痛 咽痛", syndrome, model, "p1") == (0.9, "吻合")
+    assert cache.get(patient, syndrome, model, "p2") == (0.7, "部分吻合")
+
+    assert cache.invalidate_pattern("p1") == 1
+    assert cache.get(patient, syndrome, model, "p1") is None
+    assert cache.get(patient, syndrome, model, "p2") == (0.7, "部分吻合")
+
+
+def test_expired_entries_miss_and_are_removed(tmp_path):
+    cache = SemanticScoreCache(db_path=str(tmp_path / "cache.sqlite"), ttl_seconds=0.05)
+    cache.set("咳嗽痰黄", "痰热壅肺", "m", 0.8, "吻合", pattern_id="p1")
+    cache.set("咳嗽痰白", "风寒袭肺", "m", 0.6, "部分吻合", pattern_id="p2")
+    assert cache.get("咳嗽痰黄", "痰热壅肺", "m", "p1") == (0.8, "吻合")
+
+    time.sleep(0.1)
+    # 查询时发现过期即视为未命中并删除该条
+    assert cache.get("咳嗽痰黄", "痰热壅肺", "m", "p1") is None
+    assert cache.get_stats()["total_entries"] == 1
+
+    # evict() 清理其余过期条目
+    cache.evict()
+    assert cache.get_stats()["total_entries"] == 0
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_evict_drops_least_recently_accessed(tmp_path):
+    cache = SemanticScoreCache(db_path=str(tmp_path / "cache.sqlite"), max_entries=2)
+    for pattern_id in ("p1", "p2", "p3"):
+        cache.set("腹痛腹泻", "湿热下注", "m", 0.5, "吻合", pattern_id=pattern_id)
+        time.sleep(0.01)
+
+    # 访问 p1 后，最久未访问的是 p2
+    assert cache.get("腹痛腹泻", "湿热下注", "m", "p1") is not None
+    cache.evict()
+
+    assert cache.get_stats()["total_entries"] == 2
+    assert cache.get("腹痛腹泻", "湿热下注", "m", "p2") is None
+    assert cache.get("腹痛腹泻", "湿热下注", "m", "p1") is not None
+    assert cache.get("腹痛腹泻", "湿热下注", "m", "p3") is not None
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+中医标准术语字典单元测试
+验证名称/别名解析与原SQL一致的优先顺序、别名按字面匹配（_ 与 % 不作通配符）、批量解析、
+修改后的重载，以及决策树文本解析的接入
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from core.knowledge_retrieval.standard_terminology import StandardTerminology
+from services.decision_tree_data_service import DecisionTreeDataService
+
+
+def _create_db(directory):
+    db_path = os.path.join(directory, "user_history.sqlite")
+    conn = sqlite3.connect(db_path)
+    conn.executescript("""
+        CREATE TABLE tcm_diseases_standard (
+            id TEXT PRIMARY KEY, name TEXT NOT NULL UNIQUE, category TEXT NOT NULL, alias TEXT, description TEXT
+        );
+        CREATE TABLE tcm_symptoms_standard (id TEXT PRIMARY KEY, name TEXT NOT NULL UNIQUE, category TEXT NOT NULL);
+        CREATE TABLE tcm_prescriptions_standard (
+            id TEXT PRIMARY KEY, name TEXT NOT NULL UNIQUE, alias TEXT, source TEXT, category TEXT,
+            composition TEXT NOT NULL, effects TEXT NOT NULL, indications TEXT NOT NULL
+        );
+        CREATE TABLE tcm_herbs_standard (
+            id TEXT PRIMARY KEY, name TEXT NOT NULL UNIQUE, alias TEXT, category TEXT NOT NULL, effects TEXT
+        );
+        INSERT INTO tcm_diseases_standard VALUES
+            ('disease_001', '风寒感冒', '外感病', '["伤风", "Common Cold"]', '感受风寒之邪'),
+            ('disease_002', '伤风', '外感病', NULL, '');
+        INSERT INTO tcm_symptoms_standard VALUES ('symptom_001', '恶寒发热', '主症'), ('symptom_002', '头痛', '主症');
+        INSERT INTO tcm_prescriptions_standard VALUES
+            ('prescription_001', '麻黄汤', NULL, '《伤寒论》', '解表剂', '[]', '发汗解表', '外感风寒表实证');
+        INSERT INTO tcm_herbs_standard VALUES
+            ('herb_001', '麻黄', NULL, '解表药', '发汗解表'),
+            ('herb_002', '桂枝', '["柳桂"]', '解表药', '发汗解肌'),
+            ('herb_003', '甘草', '["国老", "甜草"]', '补益药', '调和诸药');
+    """)
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+def test_resolve_by_name_and_alias_in_table_order():
+    with tempfile.TemporaryDirectory() as directory:
+        terminology = StandardTerminology(_create_db(directory))
+
+        resolved = terminology.resolve_many("herb", ["麻黄", "国老", "柳桂", "人参"])
+        assert resolved["麻黄"] == {"id": "herb_001", "name": "麻黄", "effects": "发汗解表"}
+        assert resolved["国老"]["id"] == "herb_003"
+        assert resolved["柳桂"]["id"] == "herb_002"
+        assert resolved["人参"] is None
+        # 名称与别名同时命中时取表内靠前的行（与 WHERE name = ? OR alias LIKE ? 的首行一致）
+        assert terminology.resolve("disease", "伤风")["id"] == "disease_001"
+        # 别名匹配对ASCII字母不区分大小写，且不跨别名段
+        assert terminology.resolve("disease", "common cold")["id"] == "disease_001"
+        assert terminology.resolve("herb", "老\"") is not None
+        assert terminology.resolve("herb", "甜草\"]") is not None
+        assert terminology.resolve("herb", "柳桂\"][\"国老") is None
+        # 别名按字面包含匹配：原 LIKE 中 _ 与 % 是通配符，这里只匹配自身
+        assert terminology.resolve("herb", "柳_") is None
+        assert terminology.resolve("herb", "国%草") is None
+        assert terminology.resolve("disease", "common%") is None
+        # 症状只按名称匹配
+        assert terminology.resolve("symptom", "头") is None
+        assert terminology.resolve("symptom", "头痛")["id"] == "symptom_002"
+
+
+def test_notify_changed_reloads_dictionary():
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = _create_db(directory)
+        terminology = StandardTerminology(db_path)
+        assert terminology.resolve("herb", "人参") is None
+
+        conn = sqlite3.connect(db_path)
+        conn.execute("INSERT INTO tcm_herbs_standard VALUES ('herb_004', '人参', NULL, '补益药', '大补元气')")
+        conn.commit()
+        conn.close()
+
+        # 未通知且未到刷新间隔时沿用缓存结果
+        assert terminology.resolve("herb", "人参") is None
+        terminology.notify_changed()
+        assert terminology.resolve("herb", "人参")["id"] == "herb_004"
+        assert terminology.get_stats()["loads"] == 2
+
+
+def test_missing_tables_resolve_to_none():
+    with tempfile.TemporaryDirectory() as directory:
+        terminology = StandardTerminology(os.path.join(directory, "empty.sqlite"))
+        assert terminology.resolve_many("disease", ["风寒感冒"]) == {"风寒感冒": None}
+
+
+def test_text_to_structured_uses_standard_library():
+    with tempfile.TemporaryDirectory() as directory:
+        service = DecisionTreeDataService(db_path=_create_db(directory))
+        data = service.text_to_structured(
+            "【疾病】伤风\n【主症】恶寒发热（重）、头痛、咽痛\n【处方】加减方\n【方剂】麻黄9克(君药)、国老3克",
+            "doctor_1"
+        )
+
+        assert data["disease"]["id"] == "disease_001"
+        assert [s["id"] for s in data["diagnosis"]["main_symptoms"][:2]] == ["symptom_001", "symptom_002"]
+        assert data["diagnosis"]["main_symptoms"][0]["severity"] == "重"
+        assert data["diagnosis"]["main_symptoms"][2]["id"].startswith("symptom_")
+        composition = data["prescriptions"][0]["composition"]
+        assert [(h["herb_id"], h["name"], h["dosage"], h["role"]) for h in composition] == [
+            ("herb_001", "麻黄", 9.0, "君药"), ("herb_003", "国老", 3.0, "")
+        ]
+        assert composition[1]["effect"] == "调和诸药"
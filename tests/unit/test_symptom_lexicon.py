@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+症状词表单元测试
+验证单遍扫描与逐词 `in` 判断结果一致、疾病别名定位与请求范围缓存
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from core.text_matching.symptom_lexicon import (
+    DEFAULT_CATEGORIES,
+    DISEASE_ALIASES,
+    SymptomLexicon,
+    get_symptom_lexicon,
+    lexicon_request_scope
+)
+
+MESSAGES = [
+    "医生您好，我最近偏头痛，晚上入睡困难多梦，口干口苦",
+    "胃脘隐痛三天，大便溏薄，食欲不振，怕冷",
+    "好的，谢谢医生，我明白了谢谢",
+    "突然胸痛厉害，喘不过气，需要急救",
+    "处方：柴胡 10g，黄芩 9g，水煎服，每日一剂，饭后温服",
+    "患者发热恶风，汗出不畅，头痛鼻塞，舌红苔黄，脉浮数",
+    "",
+]
+
+
+def test_terms_match_naive_containment():
+    lexicon = get_symptom_lexicon()
+    for message in MESSAGES:
+        scan = lexicon.scan(message)
+        for category, keywords in DEFAULT_CATEGORIES.items():
+            expected = {keyword for keyword in keywords if keyword in message}
+            assert set(scan.terms(category)) == expected, (category, message)
+
+
+def test_terms_follow_text_order():
+    scan = get_symptom_lexicon().scan("口苦，偏头痛")
+    # 重叠词条都命中；同一位置较长者在前
+    assert scan.terms("symptom") == ["口苦", "偏头痛", "头痛"]
+
+
+def _naive_disease_positions(text):
+    """原 extract_disease_from_text 的逐别名查找：按别名表顺序第一个出现的别名"""
+    positions = {}
+    for disease, aliases in DISEASE_ALIASES.items():
+        for alias in aliases:
+            if alias in text:
+                positions[disease] = text.find(alias)
+                break
+    return positions
+
+
+def test_disease_alias_positions():
+    lexicon = get_symptom_lexicon()
+    positions = lexicon.disease_positions(lexicon.scan("胃脘隐痛，大便溏薄，偶有头晕"))
+    assert positions["腹泻"] == 5
+    assert positions["眩晕"] == 12
+    assert "胃痛" not in positions  # "胃脘隐痛"不是别名
+
+    # 取别名表中靠前的别名，而非任一别名的最早位置："外感"在前，但"感冒"排在别名表首位
+    text = "外感后咳嗽，至今感冒未愈"
+    positions = lexicon.disease_positions(lexicon.scan(text))
+    assert positions["感冒"] == text.find("感冒")
+    assert positions["咳嗽"] == 3
+    for message in MESSAGES + [text, "头晕目眩，晕得厉害，便溏腹泻", "偏头痛，头痛欲裂，头疼"]:
+        assert lexicon.disease_positions(lexicon.scan(message)) == _naive_disease_positions(message), message
+
+
+def test_first_hit_per_category():
+    scan = get_symptom_lexicon().scan("就这样吧，非常满意")
+    assert scan.first("end_natural").term == "就这样吧"
+    assert scan.first("end_satisfied").term == "非常满意"
+    assert scan.first("emergency") is None
+
+
+def test_request_scope_caches_scans():
+    lexicon = SymptomLexicon()
+    calls = []
+    original = lexicon._scan_uncached
+
+    def counting(text):
+        calls.append(text)
+        return original(text)
+
+    lexicon._scan_uncached = counting
+    message = MESSAGES[0]
+
+    lexicon.scan(message)
+    lexicon.scan(message)
+    assert len(calls) == 2  # 范围外不缓存
+
+    with lexicon_request_scope():
+        first = lexicon.scan(message)
+        with lexicon_request_scope():
+            assert lexicon.scan(message) is first
+    assert len(calls) == 3
+
+    # 离开范围后缓存丢弃
+    lexicon.scan(message)
+    assert len(calls) == 4
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+症状向量索引单元测试
+验证缓存相似度匹配走常驻索引，缓存表变更后索引会重建，评分变更原地同步到索引
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from core.cache_system.intelligent_cache_system import IntelligentCacheSystem, SymptomVectorIndex
+
+
+def test_index_query_ranks_most_similar_first():
+    """测试索引按相似度返回最接近的缓存条目"""
+    index = SymptomVectorIndex([
+        ("k1", "咳嗽 感冒 鼻涕", 1, None),
+        ("k2", "失眠 心烦", 1, None),
+        ("k3", "头痛 头晕", 1, None),
+    ])
+
+    results = index.query("咳嗽 感冒", top_k=2)
+    assert results[0][0] == "k1"
+    assert results[0][1] > results[1][1]
+
+    assert index.query("咳嗽 感冒", top_k=3, min_similarity=0.99) == []
+
+
+def test_cache_response_invalidates_index(tmp_path):
+    """测试新增缓存条目后相似度匹配可以立即命中"""
+    cache = IntelligentCacheSystem(
+        cache_db_path=str(tmp_path / "cache.sqlite"),
+        similarity_threshold=0.5
+    )
+
+    assert cache.get_cached_response("最近感冒咳嗽流鼻涕", "张仲景") is None
+
+    cache.cache_response("最近感冒咳嗽流鼻涕", "张仲景", "外感风寒证", ["文档1"])
+    result = cache.get_cached_response("感冒咳嗽流鼻涕头痛", "张仲景")
+    assert result is not None
+    assert result[0] == "外感风寒证"
+
+    cache.clear_cache()
+    assert cache.get_cached_response("感冒咳嗽流鼻涕头痛", "张仲景") is None
+
+
+def test_rebuild_in_progress_serves_previous_index(tmp_path):
+    """测试某医生的索引重建进行中时，查询沿用旧索引而不等待，其他医生不受影响"""
+    cache = IntelligentCacheSystem(
+        cache_db_path=str(tmp_path / "cache.sqlite"),
+        similarity_threshold=0.5
+    )
+    cache.cache_response("最近感冒咳嗽流鼻涕", "张仲景", "外感风寒证", ["文档1"])
+    previous = cache._get_symptom_index("张仲景")
+
+    cache.cache_response("失眠心烦多梦", "张仲景", "心火亢盛证", ["文档2"])
+    build_lock = cache._index_build_locks["张仲景"]
+    assert build_lock.acquire(blocking=False)  # 模拟其他线程正在重建
+    try:
+        assert cache._get_symptom_index("张仲景") is previous
+        assert len(cache._get_symptom_index("叶天士")) == 0
+    finally:
+        build_lock.release()
+
+    rebuilt = cache._get_symptom_index("张仲景")
+    assert rebuilt is not previous and len(rebuilt) == 2
+
+
+def test_rating_updates_index_in_place(tmp_path):
+    """测试评分变更（含重复缓存同一响应）直接更新常驻索引，无需重建"""
+    cache = IntelligentCacheSystem(
+        cache_db_path=str(tmp_path / "cache.sqlite"),
+        similarity_threshold=0.5
+    )
+    cache.cache_response("最近感冒咳嗽流鼻涕", "张仲景", "外感风寒证", ["文档1"])
+    index = cache._get_symptom_index("张仲景")
+    cache_key = index.cache_keys[0]
+    access_count = index.access_counts[0]
+
+    cache.update_user_rating("最近感冒咳嗽流鼻涕", "张仲景", 4.5)
+    assert cache._get_symptom_index("张仲景") is index
+    assert index.user_ratings[0] == 4.5
+
+    cache.cache_response("最近感冒咳嗽流鼻涕", "张仲景", "外感风寒证", ["文档1"], user_rating=3.0)
+    assert cache._get_symptom_index("张仲景") is index
+    assert index.user_ratings[0] == 3.0
+    assert index.access_counts[0] == access_count + 1
+    assert index.key_positions[cache_key] == 0
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+统一认证会话缓存单元测试
+验证缓存命中不访问数据库、登出/按用户失效（含跨worker）、last_activity_at 去抖批量写入
+"""
+
+import asyncio
+import os
+import sqlite3
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from core.security.unified_auth_service import UnifiedAuthService
+
+SCHEMA = """
+CREATE TABLE unified_users (
+    global_user_id TEXT PRIMARY KEY, username TEXT, display_name TEXT, account_status TEXT
+);
+CREATE TABLE unified_sessions (
+    session_id TEXT PRIMARY KEY, user_id TEXT, ip_address TEXT, user_agent TEXT,
+    session_status TEXT, created_at TEXT, last_activity_at TEXT, expires_at TEXT
+);
+CREATE TABLE user_roles_new (
+    user_id TEXT, role_name TEXT, is_primary INTEGER, is_active INTEGER,
+    expires_at TEXT, assigned_at TEXT
+);
+CREATE TABLE patients (user_id TEXT, name TEXT);
+"""
+
+
+def _make_db(directory, tokens=("tok-a", "tok-b")):
+    path = os.path.join(directory, "auth.sqlite")
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    conn.execute("INSERT INTO unified_users VALUES ('u1', 'alice', 'Alice', 'active')")
+    conn.execute("INSERT INTO user_roles_new VALUES ('u1', 'PATIENT', 1, 1, NULL, '2025-01-01')")
+    expires = (datetime.utcnow() + timedelta(days=1)).strftime("%Y-%m-%d %H:%M:%S")
+    for token in tokens:
+        conn.execute(
+            "INSERT INTO unified_sessions VALUES (?, 'u1', '127.0.0.1', 'pytest', 'active', ?, NULL, ?)",
+            (token, datetime.now().isoformat(), expires),
+        )
+    conn.commit()
+    conn.close()
+    return path
+
+
+def _counting_service(path, **kwargs):
+    service = UnifiedAuthService(db_path=path, **kwargs)
+    loads = []
+    original = service._load_session
+
+    def counting(token):
+        loads.append(token)
+        return original(token)
+
+    service._load_session = counting
+    return service, loads
+
+
+def test_cached_session_skips_database_until_invalidated():
+    with tempfile.TemporaryDirectory() as directory:
+        service, loads = _counting_service(_make_db(directory), activity_flush_interval=3600)
+
+        first = asyncio.run(service.verify_session("tok-a"))
+        second = asyncio.run(service.verify_session("tok-a"))
+        assert first.username == second.username == "alice"
+        assert loads == ["tok-a"]
+
+        # 返回的是副本
+        second.roles.append("ADMIN")
+        assert asyncio.run(service.verify_session("tok-a")).roles == ["PATIENT"]
+
+        asyncio.run(service.verify_session("tok-b"))
+        service.invalidate_user("u1")
+        asyncio.run(service.verify_session("tok-a"))
+        asyncio.run(service.verify_session("tok-b"))
+        assert loads == ["tok-a", "tok-b", "tok-a", "tok-b"]
+
+        assert asyncio.run(service.logout("tok-a"))
+        assert asyncio.run(service.verify_session("tok-a")) is None
+        stats = service.get_stats()
+        assert stats["cache_hits"] == 2 and stats["verify_calls"] == 7
+
+
+def test_invalidation_reaches_other_workers():
+    with tempfile.TemporaryDirectory() as directory:
+        path = _make_db(directory)
+        # 两个服务实例共用同一数据库，模拟两个worker
+        worker_a, loads = _counting_service(path, activity_flush_interval=3600, revocation_check_interval=0)
+        worker_b, _ = _counting_service(path, activity_flush_interval=3600, revocation_check_interval=0)
+
+        asyncio.run(worker_a.verify_session("tok-a"))
+        asyncio.run(worker_a.verify_session("tok-a"))
+        assert loads == ["tok-a"]
+
+        worker_b.invalidate_user("u1")
+        asyncio.run(worker_a.verify_session("tok-a"))
+        assert loads == ["tok-a", "tok-a"]
+
+        assert asyncio.run(worker_b.logout("tok-a"))
+        assert asyncio.run(worker_a.verify_session("tok-a")) is None
+        assert worker_a.get_stats()["remote_invalidations"] == 2
+
+
+def test_activity_writes_are_debounced_and_batched():
+    with tempfile.TemporaryDirectory() as directory:
+        path = _make_db(directory)
+        service, _ = _counting_service(path, activity_flush_interval=3600)
+
+        for _ in range(5):
+            asyncio.run(service.verify_session("tok-a"))
+        asyncio.run(service.verify_session("tok-b"))
+
+        def activity():
+            conn = sqlite3.connect(path)
+            rows = dict(conn.execute("SELECT session_id, last_activity_at FROM unified_sessions"))
+            conn.close()
+            return rows
+
+        assert activity() == {"tok-a": None, "tok-b": None}
+        assert service.flush_activity() == 2
+        assert all(activity().values())
+
+        # 刷新间隔内再次访问不产生新的写入
+        asyncio.run(service.verify_session("tok-a"))
+        assert service.flush_activity() == 0
+        service.shutdown()
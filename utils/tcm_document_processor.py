@@ -12,12 +12,19 @@ from docx import Document
 from typing import List, Dict, Any, Optional, Tuple
 import logging
 
+from core.knowledge_retrieval.near_duplicate import NearDuplicateIndex, minhash_signature
+
 logger = logging.getLogger(__name__)
 
 class TCMDocumentProcessor:
     """中医文档处理器"""
     
-    def __init__(self):
+    def __init__(self, dedup_threshold: float = 0.95):
+        # 入库去重：与已处理分块字符集合相似度超过阈值的分块直接跳过（跨文档生效）
+        self.dedup_threshold = dedup_threshold
+        self._chunk_index = NearDuplicateIndex(dedup_threshold)
+        self._chunk_keys: Dict[str, List[Tuple[str, int]]] = {}
+
         # 中医专业词汇（jieba分词优化）
         self.tcm_terms = [
             # 病症
@@ -246,6 +253,24 @@ class TCMDocumentProcessor:
             return text
         return text[-overlap_size:]
     
+    def _drop_near_duplicates(self, filename: str, chunks: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], int]:
+        """计算分块MinHash签名，去掉近重复分块，返回 (保留的分块, 跳过数量)"""
+        # 同一文档重新处理时，先移除其上次入库的分块，避免与自身判重
+        for key in self._chunk_keys.pop(filename, []):
+            self._chunk_index.remove(key)
+
+        kept = []
+        keys = self._chunk_keys.setdefault(filename, [])
+        for chunk in chunks:
+            signature = minhash_signature(chunk['text'])
+            if self._chunk_index.find(signature) is not None:
+                continue
+            keys.append((filename, len(kept)))
+            self._chunk_index.add(keys[-1], signature)
+            chunk['minhash'] = signature.tolist()
+            kept.append(chunk)
+        return kept, len(chunks) - len(kept)
+    
     def process_tcm_document(self, docx_path: str, chunk_size: int = 400, overlap: int = 100) -> Dict[str, Any]:
         """处理单个中医文档的完整流程"""
         result = {
@@ -276,8 +301,10 @@ class TCMDocumentProcessor:
             sections = self.extract_sections(cleaned_text)
             result['sections'] = sections
             
-            # 4. 生成分块
-            chunks = self.chunk_tcm_document(cleaned_text, chunk_size, overlap)
+            # 4. 生成分块，并跳过与已入库分块近乎相同的分块
+            chunks, skipped = self._drop_near_duplicates(
+                result['filename'], self.chunk_tcm_document(cleaned_text, chunk_size, overlap)
+            )
             result['chunks'] = chunks
             
             # 5. 统计信息
@@ -286,6 +313,7 @@ class TCMDocumentProcessor:
                 'cleaned_char_count': len(cleaned_text),
                 'sections_count': len([s for s in sections.values() if s]),
                 'chunks_count': len(chunks),
+                'duplicate_chunks_skipped': skipped,
                 'avg_chunk_size': sum(c['char_count'] for c in chunks) / len(chunks) if chunks else 0
             }
             